@@ -10,19 +10,128 @@ This service analyzes contractor cancellation patterns and provides:
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
+import numpy as np
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+try:
+    from app.utils.cache import LRUTTLCache, get_cache_service
+except ImportError:
+    from utils.cache import LRUTTLCache, get_cache_service
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROFILE_COLUMNS = """
+            primary_reason,
+            secondary_reasons,
+            avg_lead_score,
+            preferred_service_areas,
+            preferred_trade_types,
+            total_leads_purchased,
+            leads_won"""
+
+# Columns record_cancellation() may write (migrations/003_cancellations_table.sql)
+CANCELLATION_COLUMNS = (
+    'account_id', 'canceled_at', 'primary_reason', 'secondary_reasons', 'feedback_text',
+    'total_leads_purchased', 'leads_contacted', 'leads_quoted', 'leads_won', 'avg_lead_score',
+    'preferred_service_areas', 'preferred_trade_types'
+)
+
+# Cached marker for accounts with no cancellation history
+NO_PROFILE = {}
+
+
+class CancellationProfileCache:
+    """
+    Per-account cancellation profile cache.
+    
+    An in-process LRU with TTL, optionally backed by Redis so that workers
+    share profiles. Accounts without cancellations are cached too, since
+    they are the common case.
+    """
+    
+    REDIS_PREFIX = "cancellation_profile:"
+    
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[int] = None,
+                 use_redis: Optional[bool] = None, redis_cache=None):
+        """
+        Initialize profile cache.
+        
+        Args:
+            maxsize: Max profiles kept in-process (default: CANCELLATION_PROFILE_CACHE_SIZE or 10000)
+            ttl: Seconds a profile stays cached (default: CANCELLATION_PROFILE_TTL or 900)
+            use_redis: Back the cache with Redis (default: CANCELLATION_PROFILE_CACHE_REDIS or true)
+            redis_cache: RedisCache to use instead of the global cache service
+        """
+        self.ttl = ttl if ttl is not None else int(os.getenv('CANCELLATION_PROFILE_TTL', '900'))
+        maxsize = maxsize if maxsize is not None else int(os.getenv('CANCELLATION_PROFILE_CACHE_SIZE', '10000'))
+        self.local = LRUTTLCache(maxsize=maxsize, ttl=self.ttl)
+        if use_redis is None:
+            use_redis = os.getenv('CANCELLATION_PROFILE_CACHE_REDIS', 'true').lower() == 'true'
+        self.redis = (redis_cache or get_cache_service()) if use_redis else None
+    
+    def get_many(self, account_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached profiles for the given accounts (missing accounts are omitted)."""
+        found = {}
+        for account_id in account_ids:
+            profile = self.local.get(account_id)
+            if profile is not None:
+                found[account_id] = profile
+        
+        if self.redis is not None and len(found) < len(account_ids) and self.redis.is_enabled():
+            for account_id in account_ids:
+                if account_id in found:
+                    continue
+                profile = self.redis.get(self.REDIS_PREFIX + account_id)
+                if profile is not None:
+                    found[account_id] = profile
+                    self.local.set(account_id, profile)
+        
+        return found
+    
+    def set_many(self, profiles: Dict[str, Dict[str, Any]]):
+        self.local.set_many(profiles)
+        if self.redis is not None and self.redis.is_enabled():
+            for account_id, profile in profiles.items():
+                self.redis.set(self.REDIS_PREFIX + account_id, profile, self.ttl)
+    
+    def invalidate(self, account_id: str):
+        self.local.delete(account_id)
+        if self.redis is not None and self.redis.is_enabled():
+            self.redis.delete(self.REDIS_PREFIX + account_id)
+    
+    def clear(self):
+        self.local.clear()
+        if self.redis is not None:
+            self.redis.clear_cache_pattern(self.REDIS_PREFIX + '*')
+
+
+# Global profile cache shared by all service instances in this process
+_profile_cache: Optional[CancellationProfileCache] = None
+
+def get_profile_cache() -> CancellationProfileCache:
+    """Get the global cancellation profile cache instance."""
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = CancellationProfileCache()
+    return _profile_cache
+
+def _profile_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe profile dict from a cancellations row."""
+    profile = {key: value for key, value in row.items() if key != 'account_id'}
+    if profile.get('avg_lead_score') is not None:
+        profile['avg_lead_score'] = float(profile['avg_lead_score'])
+    return profile
+
 class CancellationFeedbackService:
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, profile_cache: Optional[CancellationProfileCache] = None):
         """Initialize service with database connection."""
         self.db_url = db_url
+        self.profile_cache = profile_cache or get_profile_cache()
         
     def connect_db(self):
         """Create database connection."""
@@ -93,77 +202,159 @@ class CancellationFeedbackService:
         logger.info(f"Calculated adjustments for {len(adjustments)} jurisdictions")
         return adjustments
     
-    def calculate_personalized_adjustments(self, account_id: str, lead_features: Dict[str, Any]) -> float:
+    def get_cancellation_profile(self, account_id: str) -> Optional[Dict[str, Any]]:
         """
-        Calculate personalized score adjustment based on contractor's cancellation history.
+        Get a contractor's most recent cancellation record (cached).
         
         Args:
             account_id: Contractor's account ID
-            lead_features: Features of the lead being scored
             
         Returns:
-            Score adjustment (-20 to +5)
+            Cancellation profile, or None if the contractor never canceled
         """
-        query = """
-        SELECT 
-            primary_reason,
-            secondary_reasons,
-            avg_lead_score,
-            preferred_service_areas,
-            preferred_trade_types,
-            total_leads_purchased,
-            leads_won
+        return self.get_cancellation_profiles([account_id])[account_id]
+    
+    def get_cancellation_profiles(self, account_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get cancellation profiles for many contractors with at most one query.
+        
+        Args:
+            account_ids: Contractor account IDs
+            
+        Returns:
+            Dict mapping account ID to profile (None if never canceled)
+        """
+        account_ids = list(dict.fromkeys(account_ids))
+        profiles = self.profile_cache.get_many(account_ids)
+        
+        missing = [account_id for account_id in account_ids if account_id not in profiles]
+        if missing:
+            fetched = {account_id: NO_PROFILE for account_id in missing}
+            
+            with self.connect_db() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    if len(missing) == 1:
+                        cursor.execute(f"""
+                        SELECT {PROFILE_COLUMNS}
+                        FROM cancellations
+                        WHERE account_id = %s
+                        ORDER BY canceled_at DESC
+                        LIMIT 1
+                        """, missing)
+                        cancellation = cursor.fetchone()
+                        if cancellation:
+                            fetched[missing[0]] = _profile_from_row(cancellation)
+                    else:
+                        cursor.execute(f"""
+                        SELECT DISTINCT ON (account_id)
+                            account_id,{PROFILE_COLUMNS}
+                        FROM cancellations
+                        WHERE account_id = ANY(%s)
+                        ORDER BY account_id, canceled_at DESC
+                        """, [missing])
+                        for row in cursor.fetchall():
+                            fetched[str(row['account_id'])] = _profile_from_row(row)
+            
+            self.profile_cache.set_many(fetched)
+            profiles.update(fetched)
+        
+        return {account_id: (profiles[account_id] or None) for account_id in account_ids}
+    
+    def warm_profile_cache(self, lookback_days: int = 90) -> int:
+        """
+        Bulk-load profiles of contractors who canceled recently into the cache.
+        
+        Args:
+            lookback_days: Only load cancellations from this many days back
+            
+        Returns:
+            Number of profiles cached
+        """
+        query = f"""
+        SELECT DISTINCT ON (account_id)
+            account_id,{PROFILE_COLUMNS}
         FROM cancellations
-        WHERE account_id = %s
-        ORDER BY canceled_at DESC
-        LIMIT 1
+        WHERE canceled_at >= %s
+        ORDER BY account_id, canceled_at DESC
         """
         
+        cutoff_date = datetime.now() - timedelta(days=lookback_days)
+        
         with self.connect_db() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, [account_id])
-                cancellation = cursor.fetchone()
-        
-        if not cancellation:
-            return 0.0  # No cancellation history
-        
-        adjustment = 0.0
-        
-        # Analyze primary cancellation reason
-        primary_reason = cancellation['primary_reason']
-        if primary_reason == 'poor_lead_quality':
-            adjustment -= 15.0  # Strong negative signal
-        elif primary_reason in ['wrong_lead_type', 'leads_not_qualified']:
-            adjustment -= 10.0  # Moderate negative signal
-        elif primary_reason in ['leads_too_expensive', 'too_many_competitors']:
-            adjustment -= 5.0   # Light negative signal
-        elif primary_reason in ['seasonal_business', 'financial_issues']:
-            adjustment += 2.0   # Not lead quality related
-        
-        # Check geographic preferences
-        preferred_areas = cancellation.get('preferred_service_areas', [])
-        lead_jurisdiction = lead_features.get('jurisdiction', '')
-        if preferred_areas and lead_jurisdiction not in preferred_areas:
-            adjustment -= 8.0
-        
-        # Check trade type preferences
-        preferred_trades = cancellation.get('preferred_trade_types', [])
-        lead_trade_tags = lead_features.get('trade_tags', [])
-        if preferred_trades and not any(tag in preferred_trades for tag in lead_trade_tags):
-            adjustment -= 5.0
+                cursor.execute(query, [cutoff_date])
+                rows = cursor.fetchall()
+        
+        profiles = {str(row['account_id']): _profile_from_row(row) for row in rows}
+        self.profile_cache.set_many(profiles)
+        
+        logger.info(f"Cached {len(profiles)} cancellation profiles")
+        return len(profiles)
+    
+    def record_cancellation(self, account_id: str, cancellation: Dict[str, Any]):
+        """
+        Record a contractor cancellation and invalidate their cached profile.
+        
+        Args:
+            account_id: Contractor's account ID
+            cancellation: Column values for the cancellations row
+            
+        Raises:
+            ValueError: If cancellation has keys that are not CANCELLATION_COLUMNS
+        """
+        row = {**cancellation, 'account_id': account_id}
+        unknown = sorted(set(row) - set(CANCELLATION_COLUMNS))
+        if unknown:
+            raise ValueError(f"Unknown cancellations columns: {', '.join(unknown)}")
+        # Column names come from the fixed list, never from the caller's keys
+        columns = [column for column in CANCELLATION_COLUMNS if column in row]
+        query = f"""
+        INSERT INTO cancellations ({', '.join(columns)})
+        VALUES ({', '.join(['%s'] * len(columns))})
+        """
         
-        # Consider historical performance
-        total_leads = cancellation.get('total_leads_purchased', 0)
-        leads_won = cancellation.get('leads_won', 0)
-        if total_leads > 10:  # Enough data
-            win_rate = leads_won / total_leads
-            if win_rate < 0.05:  # Very low win rate
-                adjustment -= 10.0
-            elif win_rate < 0.10:  # Low win rate
-                adjustment -= 5.0
+        with self.connect_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, [row[column] for column in columns])
+            conn.commit()
         
-        # Clamp adjustment to reasonable range
-        return max(-20.0, min(5.0, adjustment))
+        self.invalidate_profile(account_id)
+        logger.info(f"Recorded cancellation for account {account_id}")
+    
+    def invalidate_profile(self, account_id: str):
+        """Drop a contractor's cached profile (call after writing to cancellations)."""
+        self.profile_cache.invalidate(account_id)
+    
+    def calculate_personalized_adjustments(self, account_id: str, lead_features: Dict[str, Any]) -> float:
+        """
+        Calculate personalized score adjustment based on contractor's cancellation history.
+        
+        Args:
+            account_id: Contractor's account ID
+            lead_features: Features of the lead being scored
+            
+        Returns:
+            Score adjustment (-20 to +5)
+        """
+        profile = self.get_cancellation_profile(account_id)
+        return float(personalized_adjustments_from_profile(profile, [lead_features])[0])
+    
+    def calculate_personalized_adjustments_batch(self, account_id: str,
+                                                 leads: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Calculate personalized score adjustments for many leads of one contractor.
+        
+        The cancellation profile is fetched once and applied to all leads.
+        
+        Args:
+            account_id: Contractor's account ID
+            leads: Features of the leads being scored
+            
+        Returns:
+            Array of score adjustments (-20 to +5), one per lead
+        """
+        profile = self.get_cancellation_profile(account_id)
+        return personalized_adjustments_from_profile(profile, leads)
     
     def update_lead_cancellation_scores(self, batch_size: int = 1000):
         """
@@ -230,6 +421,65 @@ class CancellationFeedbackService:
         logger.info(f"Updated cancellation scores for {updated_count} leads")
         return updated_count
 
+def personalized_adjustments_from_profile(cancellation: Optional[Dict[str, Any]],
+                                         leads: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Apply a contractor's cancellation profile to a batch of leads.
+    
+    Args:
+        cancellation: Profile from get_cancellation_profile (None = no history)
+        leads: Lead features with optional 'jurisdiction' and 'trade_tags'
+        
+    Returns:
+        Array of score adjustments (-20 to +5), one per lead
+    """
+    if not cancellation:
+        return np.zeros(len(leads))  # No cancellation history
+    
+    adjustment = 0.0
+    
+    # Analyze primary cancellation reason
+    primary_reason = cancellation['primary_reason']
+    if primary_reason == 'poor_lead_quality':
+        adjustment -= 15.0  # Strong negative signal
+    elif primary_reason in ['wrong_lead_type', 'leads_not_qualified']:
+        adjustment -= 10.0  # Moderate negative signal
+    elif primary_reason in ['leads_too_expensive', 'too_many_competitors']:
+        adjustment -= 5.0   # Light negative signal
+    elif primary_reason in ['seasonal_business', 'financial_issues']:
+        adjustment += 2.0   # Not lead quality related
+    
+    # Consider historical performance
+    total_leads = cancellation.get('total_leads_purchased') or 0
+    leads_won = cancellation.get('leads_won') or 0
+    if total_leads > 10:  # Enough data
+        win_rate = leads_won / total_leads
+        if win_rate < 0.05:  # Very low win rate
+            adjustment -= 10.0
+        elif win_rate < 0.10:  # Low win rate
+            adjustment -= 5.0
+    
+    adjustments = np.full(len(leads), adjustment)
+    
+    # Check geographic preferences
+    preferred_areas = set(cancellation.get('preferred_service_areas') or [])
+    if preferred_areas:
+        outside_area = np.fromiter(
+            (lead.get('jurisdiction', '') not in preferred_areas for lead in leads), dtype=bool, count=len(leads)
+        )
+        adjustments -= 8.0 * outside_area
+    
+    # Check trade type preferences
+    preferred_trades = set(cancellation.get('preferred_trade_types') or [])
+    if preferred_trades:
+        other_trade = np.fromiter(
+            (preferred_trades.isdisjoint(lead.get('trade_tags') or []) for lead in leads), dtype=bool, count=len(leads)
+        )
+        adjustments -= 5.0 * other_trade
+    
+    # Clamp adjustment to reasonable range
+    return np.clip(adjustments, -20.0, 5.0)
+
 def main():
     """Main entry point for cancellation feedback service."""
     db_url = os.getenv('DATABASE_URL')
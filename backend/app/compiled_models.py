@@ -0,0 +1,518 @@
+"""
+Compiled tree-ensemble inference for lead and surge models.
+
+Exports a fitted model, together with its StandardScaler, into flat numpy
+node arrays saved as a single ``.npz`` file. CompiledModel loads that file
+and scores every tree of the ensemble at once with vectorized traversal,
+so serving processes never import scikit-learn, LightGBM or XGBoost and
+skip their per-call wrapper overhead on small batches.
+
+Supported models (binary classification):
+    - CalibratedClassifierCV (isotonic or sigmoid) over a RandomForest or
+      GradientBoosting classifier, as trained by train_model.py and the
+      demand forecaster
+    - Bare RandomForestClassifier / GradientBoostingClassifier
+    - LightGBM Booster (binary objective, numerical splits)
+    - XGBoost Booster (binary:logistic, gbtree, numerical splits)
+
+Compiling imports the model's own training library lazily; loading and
+predicting need only numpy.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+COMPILED_MODEL_SUFFIX = '.npz'
+
+# How a node routes missing values
+MISSING_NONE = 0  # NaN is compared as 0.0 (LightGBM missing_type None)
+MISSING_ZERO = 1  # NaN and zero take the default branch (LightGBM missing_type Zero)
+MISSING_NAN = 2   # NaN takes the default branch
+
+# LightGBM treats |x| <= kZeroThreshold as zero
+ZERO_THRESHOLD = 1e-35
+
+# Rows scored per traversal pass (keeps the row x tree index arrays cache sized)
+CHUNK_ROWS = 256
+
+ENSEMBLE_ARRAYS = ('feature', 'threshold', 'left', 'default_left', 'missing', 'value', 'roots')
+
+
+@dataclass
+class TreeEnsemble:
+    """
+    Flattened trees sharing one set of node arrays.
+
+    Children of a node are stored next to each other, so the next node is
+    ``left[node] + go_right``. Leaves point to themselves with a NaN
+    threshold, which lets every row walk a fixed number of steps.
+    """
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    default_left: np.ndarray
+    missing: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    strict: bool = False        # True: go left when x < threshold (XGBoost); else x <= threshold
+    input_dtype: str = 'float64'
+    average: bool = False       # Mean of tree outputs instead of sum
+    scale: float = 1.0
+    bias: float = 0.0
+
+    def __post_init__(self):
+        self._zero_missing = bool((self.missing == MISSING_ZERO).any())
+
+    def raw(self, X: np.ndarray) -> np.ndarray:
+        """Aggregated ensemble output (margin or mean leaf value) per row."""
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        n_rows, n_features = X.shape
+        check_missing = self._zero_missing or bool(np.isnan(X).any())
+
+        totals = np.empty(n_rows, dtype=np.float64)
+        for start in range(0, n_rows, CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            leaves = self._leaves(chunk.ravel(), len(chunk), n_features, check_missing)
+            leaf_values = self.value.take(leaves, mode='wrap')
+            totals[start:start + len(chunk)] = leaf_values.mean(axis=1) if self.average else leaf_values.sum(axis=1)
+
+        return totals * self.scale + self.bias
+
+    def _leaves(self, flat: np.ndarray, n_rows: int, n_features: int, check_missing: bool) -> np.ndarray:
+        offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        nodes = np.repeat(self.roots[None, :].astype(np.intp), n_rows, axis=0)
+
+        # Node and row indices are always in range, so skip take()'s bounds checks
+        for _ in range(self.depth):
+            values = flat.take(offsets + self.feature.take(nodes, mode='wrap'), mode='wrap')
+            thresholds = self.threshold.take(nodes, mode='wrap')
+            if check_missing:
+                kind = self.missing.take(nodes, mode='wrap')
+                nan = np.isnan(values)
+                is_missing = (nan & (kind != MISSING_NONE)) | (
+                    (kind == MISSING_ZERO) & (np.abs(values) <= ZERO_THRESHOLD))
+                values = np.where(nan, 0.0, values)
+                go_right = np.where(is_missing, ~self.default_left.take(nodes, mode='wrap'),
+                                    self._go_right(values, thresholds))
+            else:
+                go_right = self._go_right(values, thresholds)
+            nodes = self.left.take(nodes, mode='wrap') + go_right
+
+        return nodes
+
+    def _go_right(self, values: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        # NaN thresholds (leaves) compare False and keep the row in place
+        return values >= thresholds if self.strict else values > thresholds
+
+
+@dataclass
+class CompiledMember:
+    """One ensemble plus its link function and optional probability calibrator."""
+    ensemble: TreeEnsemble
+    link: str = 'identity'                     # 'identity' or 'sigmoid'
+    calibration: Optional[str] = None          # None, 'isotonic' or 'sigmoid'
+    calibration_x: Optional[np.ndarray] = None  # isotonic thresholds, or [a, b] for sigmoid
+    calibration_y: Optional[np.ndarray] = None
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        output = self.ensemble.raw(X)
+        if self.link == 'sigmoid':
+            output = _sigmoid(output)
+
+        if self.calibration == 'isotonic':
+            output = np.interp(output, self.calibration_x, self.calibration_y)
+        elif self.calibration == 'sigmoid':
+            a, b = self.calibration_x
+            output = _sigmoid(-(a * output + b))
+        return output
+
+
+class CompiledModel:
+    """Positive-class probabilities from compiled trees, using numpy only."""
+
+    def __init__(self, members: List[CompiledMember], n_features: int,
+                 scaler_mean: Optional[np.ndarray] = None, scaler_scale: Optional[np.ndarray] = None,
+                 feature_columns: Optional[List[str]] = None, source: str = ''):
+        """
+        Initialize compiled model.
+
+        Args:
+            members: Ensembles whose probabilities are averaged
+            n_features: Expected number of input columns
+            scaler_mean: StandardScaler mean_, applied before the trees
+            scaler_scale: StandardScaler scale_, applied before the trees
+            feature_columns: Training column order, if known
+            source: Library the model was compiled from
+        """
+        self.members = members
+        self.n_features = n_features
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.feature_columns = list(feature_columns or [])
+        self.source = source
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Positive-class probability for every row.
+
+        Args:
+            X: 2-D array-like of raw (unscaled) features in training column order
+
+        Returns:
+            1-D float array of probabilities
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+
+        if self.scaler_mean is not None:
+            X = X - self.scaler_mean
+        if self.scaler_scale is not None:
+            X = X / self.scaler_scale
+
+        probabilities = self.members[0].predict(X)
+        for member in self.members[1:]:
+            probabilities = probabilities + member.predict(X)
+        if len(self.members) > 1:
+            probabilities = probabilities / len(self.members)
+        return np.clip(probabilities, 0.0, 1.0)
+
+    def save(self, path: str) -> str:
+        """Write the model to a single ``.npz`` file."""
+        arrays = {}
+        members = []
+        for i, member in enumerate(self.members):
+            ensemble = member.ensemble
+            for name in ENSEMBLE_ARRAYS:
+                arrays[f"m{i}_{name}"] = getattr(ensemble, name)
+            if member.calibration:
+                arrays[f"m{i}_calibration_x"] = member.calibration_x
+                if member.calibration_y is not None:
+                    arrays[f"m{i}_calibration_y"] = member.calibration_y
+            members.append({
+                'depth': ensemble.depth,
+                'strict': ensemble.strict,
+                'input_dtype': ensemble.input_dtype,
+                'average': ensemble.average,
+                'scale': ensemble.scale,
+                'bias': ensemble.bias,
+                'link': member.link,
+                'calibration': member.calibration,
+            })
+        if self.scaler_mean is not None:
+            arrays['scaler_mean'] = self.scaler_mean
+        if self.scaler_scale is not None:
+            arrays['scaler_scale'] = self.scaler_scale
+
+        spec = {
+            'format_version': FORMAT_VERSION,
+            'source': self.source,
+            'n_features': self.n_features,
+            'feature_columns': self.feature_columns,
+            'members': members,
+        }
+        arrays['spec'] = np.array(json.dumps(spec))
+
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+        return str(path)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        """Read a model written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data['spec']))
+            if spec.get('format_version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled model format: {spec.get('format_version')}")
+
+            members = []
+            for i, member in enumerate(spec['members']):
+                arrays = {name: data[f"m{i}_{name}"] for name in ENSEMBLE_ARRAYS}
+                ensemble = TreeEnsemble(
+                    depth=member['depth'], strict=member['strict'], input_dtype=member['input_dtype'],
+                    average=member['average'], scale=member['scale'], bias=member['bias'], **arrays
+                )
+                members.append(CompiledMember(
+                    ensemble,
+                    link=member['link'],
+                    calibration=member['calibration'],
+                    calibration_x=data[f"m{i}_calibration_x"] if member['calibration'] else None,
+                    calibration_y=data[f"m{i}_calibration_y"] if f"m{i}_calibration_y" in data else None,
+                ))
+
+            return cls(
+                members,
+                n_features=spec['n_features'],
+                scaler_mean=data['scaler_mean'] if 'scaler_mean' in data else None,
+                scaler_scale=data['scaler_scale'] if 'scaler_scale' in data else None,
+                feature_columns=spec.get('feature_columns'),
+                source=spec.get('source', ''),
+            )
+
+
+def compiled_model_path(model_path: str) -> Path:
+    """Compiled model file that sits next to a native model file."""
+    return Path(model_path).with_suffix(COMPILED_MODEL_SUFFIX)
+
+
+def compile_model(model: Any, scaler: Any = None, feature_columns: Optional[List[str]] = None,
+                  n_features: Optional[int] = None) -> CompiledModel:
+    """
+    Compile a fitted model and its scaler.
+
+    Args:
+        model: Fitted scikit-learn classifier, LightGBM Booster or XGBoost Booster
+        scaler: Fitted StandardScaler applied to inputs before the model, if any
+        feature_columns: Training column order (stored with the model)
+        n_features: Input width, when it cannot be read from the model
+
+    Returns:
+        CompiledModel with the same predicted probabilities
+
+    Raises:
+        ValueError: If the model type or its configuration is not supported
+    """
+    module = type(model).__module__
+    if module.startswith('lightgbm'):
+        members, width, source = [_compile_lightgbm(model)], model.num_feature(), 'lightgbm'
+    elif module.startswith('xgboost'):
+        members, width, source = [_compile_xgboost(model)], model.num_features(), 'xgboost'
+    elif module.startswith('sklearn'):
+        width = getattr(model, 'n_features_in_', n_features)
+        members, source = _compile_sklearn(model, width), 'sklearn'
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    scaler_mean = scaler_scale = None
+    if scaler is not None:
+        scaler_mean = None if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+        scaler_scale = None if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+
+    return CompiledModel(
+        members,
+        n_features=int(width or n_features or len(feature_columns or [])),
+        scaler_mean=scaler_mean,
+        scaler_scale=scaler_scale,
+        feature_columns=feature_columns,
+        source=source,
+    )
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return np.exp(-np.logaddexp(0.0, -x))
+
+
+def _logit(p: float) -> float:
+    return float(np.log(p / (1.0 - p)))
+
+
+def _build_ensemble(trees: List[Dict[str, np.ndarray]], threshold_dtype: str, **options) -> TreeEnsemble:
+    """
+    Flatten per-tree node arrays into one TreeEnsemble.
+
+    Each tree is a dict of arrays indexed by the library's own node ids:
+    left/right (-1 for leaves), feature, threshold, default_left, missing
+    and value (leaf output).
+    """
+    columns = {name: [] for name in ('feature', 'threshold', 'left', 'default_left', 'missing', 'value')}
+    roots = []
+    depth = 0
+    offset = 0
+
+    for tree in trees:
+        # Breadth-first renumbering so both children of a node are adjacent
+        order = [0]
+        new_ids = {0: offset}
+        node_depth = {0: 0}
+        for old in order:
+            left, right = int(tree['left'][old]), int(tree['right'][old])
+            if left < 0:
+                continue
+            new_ids[left] = offset + len(order)
+            new_ids[right] = offset + len(order) + 1
+            node_depth[left] = node_depth[right] = node_depth[old] + 1
+            order.extend([left, right])
+
+        for old in order:
+            left = int(tree['left'][old])
+            is_leaf = left < 0
+            columns['feature'].append(0 if is_leaf else int(tree['feature'][old]))
+            columns['threshold'].append(np.nan if is_leaf else tree['threshold'][old])
+            columns['left'].append(new_ids[old] if is_leaf else new_ids[left])
+            columns['default_left'].append(True if is_leaf else bool(tree['default_left'][old]))
+            columns['missing'].append(MISSING_NONE if is_leaf else int(tree['missing'][old]))
+            columns['value'].append(float(tree['value'][old]) if is_leaf else 0.0)
+
+        roots.append(offset)
+        depth = max(depth, max(node_depth.values()))
+        offset += len(order)
+
+    return TreeEnsemble(
+        feature=np.asarray(columns['feature'], dtype=np.int32),
+        threshold=np.asarray(columns['threshold'], dtype=threshold_dtype),
+        left=np.asarray(columns['left'], dtype=np.int32),
+        default_left=np.asarray(columns['default_left'], dtype=bool),
+        missing=np.asarray(columns['missing'], dtype=np.int8),
+        value=np.asarray(columns['value'], dtype=np.float64),
+        roots=np.asarray(roots, dtype=np.int32),
+        depth=depth,
+        **options
+    )
+
+
+def _sklearn_tree(estimator: Any, value: np.ndarray) -> Dict[str, np.ndarray]:
+    tree = estimator.tree_
+    missing_go_to_left = getattr(tree, 'missing_go_to_left', None)
+    return {
+        'left': tree.children_left,
+        'right': tree.children_right,
+        'feature': tree.feature,
+        'threshold': tree.threshold,
+        'default_left': (missing_go_to_left.astype(bool) if missing_go_to_left is not None
+                         else np.ones(tree.node_count, dtype=bool)),
+        'missing': np.full(tree.node_count, MISSING_NAN, dtype=np.int8),
+        'value': value,
+    }
+
+
+def _compile_sklearn_estimator(estimator: Any, n_features: int) -> Tuple[TreeEnsemble, str, str]:
+    """Ensemble for a fitted forest or gradient boosting classifier, plus its link and response."""
+    name = type(estimator).__name__
+    if len(getattr(estimator, 'classes_', [])) != 2:
+        raise ValueError(f"Only binary classifiers can be compiled, got {name}")
+
+    if hasattr(estimator, 'estimators_') and hasattr(estimator, 'learning_rate'):
+        # Gradient boosting: decision = init + learning_rate * sum(tree outputs)
+        if estimator.estimators_.shape[1] != 1:
+            raise ValueError(f"Unsupported {name} configuration")
+        trees = [_sklearn_tree(stage[0], stage[0].tree_.value[:, 0, 0]) for stage in estimator.estimators_]
+        ensemble = _build_ensemble(trees, 'float64', input_dtype='float32', scale=float(estimator.learning_rate))
+
+        # The init estimator's constant raw prediction
+        zeros = np.zeros((1, n_features))
+        ensemble.bias = float(estimator.decision_function(zeros)[0]) - float(ensemble.raw(zeros)[0])
+        return ensemble, 'sigmoid', 'decision_function'
+
+    if hasattr(estimator, 'estimators_') and all(hasattr(tree, 'tree_') for tree in estimator.estimators_):
+        # Random forest: mean over trees of the positive-class leaf fraction
+        trees = []
+        for tree in estimator.estimators_:
+            counts = tree.tree_.value[:, 0, :]
+            trees.append(_sklearn_tree(tree, counts[:, 1] / counts.sum(axis=1)))
+        return _build_ensemble(trees, 'float64', input_dtype='float32', average=True), 'identity', 'predict_proba'
+
+    raise ValueError(f"Unsupported scikit-learn model: {name}")
+
+
+def _compile_sklearn(model: Any, n_features: int) -> List[CompiledMember]:
+    if not hasattr(model, 'calibrated_classifiers_'):
+        ensemble, link, _ = _compile_sklearn_estimator(model, n_features)
+        return [CompiledMember(ensemble, link=link)]
+
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary calibrated classifiers can be compiled")
+
+    members = []
+    for calibrated in model.calibrated_classifiers_:
+        estimator = getattr(calibrated, 'estimator', None) or getattr(calibrated, 'base_estimator')
+        ensemble, link, response = _compile_sklearn_estimator(estimator, n_features)
+        # CalibratedClassifierCV calibrates the decision function when one exists
+        link = 'identity' if response == 'decision_function' else link
+
+        calibrator = calibrated.calibrators[0]
+        if hasattr(calibrator, 'X_thresholds_'):
+            members.append(CompiledMember(
+                ensemble, link=link, calibration='isotonic',
+                calibration_x=np.asarray(calibrator.X_thresholds_, dtype=np.float64),
+                calibration_y=np.asarray(calibrator.y_thresholds_, dtype=np.float64),
+            ))
+        elif hasattr(calibrator, 'a_'):
+            members.append(CompiledMember(
+                ensemble, link=link, calibration='sigmoid',
+                calibration_x=np.array([calibrator.a_, calibrator.b_], dtype=np.float64),
+            ))
+        else:
+            raise ValueError(f"Unsupported calibrator: {type(calibrator).__name__}")
+    return members
+
+
+def _compile_lightgbm(booster: Any) -> CompiledMember:
+    dump = booster.dump_model()
+    objective = dump.get('objective', '').split()
+    if not objective or objective[0] != 'binary':
+        raise ValueError(f"Unsupported LightGBM objective: {dump.get('objective')}")
+    sigmoid = 1.0
+    for option in objective[1:]:
+        if option.startswith('sigmoid:'):
+            sigmoid = float(option.split(':', 1)[1])
+
+    missing_types = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+    trees = []
+    for tree_info in dump['tree_info']:
+        nodes = []  # (left, right, feature, threshold, default_left, missing, value)
+        stack = [(tree_info['tree_structure'], None, None)]
+        while stack:
+            node, parent, side = stack.pop()
+            node_id = len(nodes)
+            if parent is not None:
+                nodes[parent][side] = node_id
+            if 'leaf_value' in node:
+                nodes.append([-1, -1, 0, 0.0, True, MISSING_NONE, node['leaf_value']])
+                continue
+            if node.get('decision_type') != '<=':
+                raise ValueError("Categorical LightGBM splits are not supported")
+            nodes.append([-1, -1, node['split_feature'], node['threshold'], node['default_left'],
+                          missing_types[node.get('missing_type', 'None')], 0.0])
+            stack.append((node['right_child'], node_id, 1))
+            stack.append((node['left_child'], node_id, 0))
+
+        columns = list(zip(*nodes))
+        trees.append({
+            name: np.asarray(column)
+            for name, column in zip(('left', 'right', 'feature', 'threshold', 'default_left', 'missing', 'value'),
+                                    columns)
+        })
+
+    ensemble = _build_ensemble(trees, 'float64', input_dtype='float64',
+                               average=bool(dump.get('average_output')), scale=sigmoid)
+    return CompiledMember(ensemble, link='sigmoid')
+
+
+def _compile_xgboost(booster: Any) -> CompiledMember:
+    model = json.loads(booster.save_raw(raw_format='json'))
+    learner = model['learner']
+    objective = learner['objective']['name']
+    if objective not in ('binary:logistic', 'reg:logistic'):
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise ValueError(f"Unsupported XGBoost booster: {learner['gradient_booster']['name']}")
+
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        if any(tree.get('split_type', [])):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        trees.append({
+            'left': np.asarray(tree['left_children']),
+            'right': np.asarray(tree['right_children']),
+            'feature': np.asarray(tree['split_indices']),
+            'threshold': conditions,
+            'default_left': np.asarray(tree['default_left'], dtype=bool),
+            'missing': np.full(len(conditions), MISSING_NAN, dtype=np.int8),
+            'value': conditions.astype(np.float64),  # leaf values are stored in split_conditions
+        })
+
+    ensemble = _build_ensemble(trees, 'float32', strict=True, input_dtype='float32', bias=_logit(base_score))
+    return CompiledMember(ensemble, link='sigmoid')
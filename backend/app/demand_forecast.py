@@ -34,6 +34,8 @@ import xgboost as xgb
 
 # Database
 from app.supabase_client import get_supabase_client
+from app.model_registry import ModelRegistry, get_model_registry, model_type_from_version
+from app.compiled_models import CompiledModel
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,8 @@ class ForecastConfig:
     rolling_windows: List[int] = None  # [4, 12, 26] weeks
     cv_splits: int = 5
     random_state: int = 42
+    model_threads: Optional[int] = None  # LightGBM num_threads / XGBoost nthread (None = library default)
+    compile_models: bool = False  # Also register numpy-only compiled exports for serving
     
     def __post_init__(self):
         if self.feature_lags is None:
@@ -167,6 +171,49 @@ class SurgeLabeler:
         except Exception as e:
             logger.error(f"Error storing surge labels: {str(e)}")
 
+def rolling_ols_slope(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None,
+                      min_periods: int = 2) -> np.ndarray:
+    """
+    Least-squares slope over a trailing window, computed from cumulative sums.
+    
+    Equivalent to ``rolling(window, min_periods).apply(lambda x:
+    np.polyfit(range(len(x)), x, 1)[0])`` without a Python call per window.
+    
+    Args:
+        values: 1-D array of observations (no NaNs)
+        window: Maximum window length
+        positions: Position of each value within its series (e.g. groupby
+            cumcount) so windows never cross series boundaries; defaults to a
+            single series
+        min_periods: Minimum observations required for a slope
+        
+    Returns:
+        Array of slopes, NaN where fewer than ``min_periods`` observations
+    """
+    y = np.asarray(values, dtype=float)
+    total = len(y)
+    if positions is None:
+        positions = np.arange(total)
+    
+    t = np.arange(total, dtype=float)
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    cum_ty = np.concatenate(([0.0], np.cumsum(t * y)))
+    
+    n = np.minimum(np.asarray(positions) + 1, window).astype(float)
+    end = np.arange(1, total + 1)
+    start = end - n.astype(int)
+    
+    # x runs 0..n-1 inside each window: sum(x*y) = sum(t*y) - t_start * sum(y)
+    sum_y = cum_y[end] - cum_y[start]
+    sum_xy = (cum_ty[end] - cum_ty[start]) - start * sum_y
+    sum_x = n * (n - 1) / 2
+    sum_xx = (n - 1) * n * (2 * n - 1) / 6
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+    slope[n < max(min_periods, 2)] = np.nan
+    return slope
+
 class FeatureEngineer:
     """Generates features for demand surge forecasting"""
     
@@ -195,8 +242,52 @@ class FeatureEngineer:
             logger.warning(f"No permit data found for region {region_id}")
             return pd.DataFrame()
         
+        features_df = self._build_features(permit_data, region_id)
+        
+        # Store features
+        self._store_features(region_id, features_df)
+        
+        logger.info(f"Generated {len(features_df)} feature records with {len(features_df.columns)} features")
+        return features_df
+    
+    def generate_features_batch(self, region_ids: List[str], start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Generate forecast features for many regions in a single frame.
+        
+        Permit counts for all regions are fetched with one query and features
+        are computed group-wise, so the cost no longer scales with one
+        pipeline run per region.
+        
+        Args:
+            region_ids: UUIDs of the regions
+            start_date: Start date for feature generation
+            end_date: End date for feature generation
+            
+        Returns:
+            DataFrame with a ``region_id`` column and features for each date
+        """
+        logger.info(f"Generating features for {len(region_ids)} regions: {start_date} to {end_date}")
+        
+        permit_data = self._get_permit_time_series_batch(region_ids, start_date, end_date)
+        
+        if permit_data.empty:
+            logger.warning("No permit data found for requested regions")
+            return pd.DataFrame()
+        
+        features_df = self._build_features(permit_data, group_col='region_id')
+        
+        # Store features per region
+        for region_id, region_df in features_df.groupby('region_id', sort=False):
+            self._store_features(region_id, region_df.drop(columns=['region_id']))
+        
+        logger.info(f"Generated {len(features_df)} feature records for {len(region_ids)} regions")
+        return features_df
+    
+    def _build_features(self, permit_data: pd.DataFrame, region_id: Optional[str] = None,
+                        group_col: Optional[str] = None) -> pd.DataFrame:
+        """Run the feature pipeline on a daily permit frame (one or many regions)."""
         # Generate lagged features
-        features_df = self._create_lagged_features(permit_data)
+        features_df = self._create_lagged_features(permit_data, group_col=group_col)
         
         # Add trend and seasonality features
         features_df = self._add_trend_seasonality_features(features_df)
@@ -207,10 +298,6 @@ class FeatureEngineer:
         # Add external features (placeholder for now)
         features_df = self._add_external_features(features_df, region_id)
         
-        # Store features
-        self._store_features(region_id, features_df)
-        
-        logger.info(f"Generated {len(features_df)} feature records with {len(features_df.columns)} features")
         return features_df
     
     def _get_permit_time_series(self, region_id: str, start_date: date, end_date: date) -> pd.DataFrame:
@@ -253,58 +340,98 @@ class FeatureEngineer:
             logger.error(f"Error getting permit time series: {str(e)}")
             return pd.DataFrame()
     
-    def _create_lagged_features(self, permit_data: pd.DataFrame) -> pd.DataFrame:
-        """Create lagged features from permit data"""
-        df = permit_data.copy()
+    def _get_permit_time_series_batch(self, region_ids: List[str], start_date: date, end_date: date) -> pd.DataFrame:
+        """Get daily permit counts for several regions as one long frame"""
+        full_range = pd.date_range(start=start_date, end=end_date, freq='D')
+        full_index = pd.MultiIndex.from_product([list(region_ids), full_range], names=['region_id', 'date'])
+        
+        try:
+            region_list = ", ".join(f"'{region_id}'" for region_id in region_ids)
+            query = f"""
+                SELECT 
+                    region_id,
+                    issue_date as date,
+                    COUNT(*) as permit_count
+                FROM leads 
+                WHERE region_id IN ({region_list})
+                    AND issue_date >= '{start_date}'
+                    AND issue_date <= '{end_date}'
+                    AND issue_date IS NOT NULL
+                GROUP BY region_id, issue_date
+                ORDER BY region_id, issue_date
+            """
+            
+            result = self.supabase.rpc('sql_query', {'query': query}).execute()
+            df = pd.DataFrame(result.data if result.data else [])
+            
+            if df.empty:
+                # Create empty daily structure
+                return pd.DataFrame({'permit_count': 0}, index=full_index).reset_index()
+            
+            df['region_id'] = df['region_id'].astype(str)
+            df['date'] = pd.to_datetime(df['date'])
+            
+            # Fill missing region/dates with 0
+            counts = df.set_index(['region_id', 'date'])['permit_count']
+            return counts.reindex(full_index, fill_value=0).reset_index()
+            
+        except Exception as e:
+            logger.error(f"Error getting batch permit time series: {str(e)}")
+            return pd.DataFrame()
+    
+    def _create_lagged_features(self, permit_data: pd.DataFrame, group_col: Optional[str] = None) -> pd.DataFrame:
+        """
+        Create lagged features from permit data.
+        
+        Daily counts are aggregated to W-MON weeks, weekly features are
+        computed per group and broadcast back to the daily rows with a single
+        merge. With ``group_col`` set (e.g. ``region_id``), all regions are
+        processed in one frame.
+        
+        Args:
+            permit_data: Daily frame with ``date`` and ``permit_count`` columns
+            group_col: Optional column identifying independent series
+            
+        Returns:
+            Daily frame with weekly lag, moving-average, trend and seasonal features
+        """
+        if permit_data.empty:
+            return permit_data.copy()
+        
+        keys = [group_col] if group_col else []
         
         # Convert to weekly aggregation for lagged features
-        df['week'] = df['date'].dt.to_period('W-MON')
-        weekly_df = df.groupby('week')['permit_count'].sum().reset_index()
-        weekly_df['week_start'] = weekly_df['week'].dt.start_time
+        daily = permit_data.assign(week=permit_data['date'].dt.to_period('W-MON'))
+        daily = daily.sort_values(keys + ['week'], kind='stable').reset_index(drop=True)
+        weekly_df = daily.groupby(keys + ['week'], sort=True)['permit_count'].sum().reset_index()
+        
+        counts = weekly_df['permit_count']
+        group_ids = weekly_df[group_col] if group_col else np.zeros(len(weekly_df), dtype=int)
+        grouped = counts.groupby(group_ids, sort=False)
         
         # Create lagged features
         for lag in self.config.feature_lags:
-            weekly_df[f'permits_lag_{lag}w'] = weekly_df['permit_count'].shift(lag)
+            weekly_df[f'permits_lag_{lag}w'] = grouped.shift(lag)
         
         # Create rolling averages
         for window in self.config.rolling_windows:
-            weekly_df[f'permits_ma_{window}w'] = weekly_df['permit_count'].rolling(window=window, min_periods=1).mean()
+            weekly_df[f'permits_ma_{window}w'] = grouped.transform(
+                lambda x: x.rolling(window=window, min_periods=1).mean()
+            )
         
-        # Create trend features (slope of recent periods)
+        # Create trend features (OLS slope over the trailing window)
+        positions = grouped.cumcount().to_numpy()
         for window in [4, 12]:
-            weekly_df[f'permits_trend_{window}w'] = weekly_df['permit_count'].rolling(window=window, min_periods=2).apply(
-                lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) >= 2 else 0
-            )
+            weekly_df[f'permits_trend_{window}w'] = rolling_ols_slope(counts.to_numpy(), window, positions)
         
         # Seasonal index (ratio to 52-week moving average)
-        weekly_df['permits_seasonal_index'] = (
-            weekly_df['permit_count'] / 
-            weekly_df['permit_count'].rolling(window=52, min_periods=26, center=True).mean()
-        ).fillna(1.0)
+        seasonal_ma = grouped.transform(lambda x: x.rolling(window=52, min_periods=26, center=True).mean())
+        weekly_df['permits_seasonal_index'] = (counts / seasonal_ma).fillna(1.0)
         
         # Expand back to daily
-        daily_features = []
-        for _, week_row in weekly_df.iterrows():
-            week_start = week_row['week_start']
-            # Get all days in this week from original data
-            week_days = permit_data[
-                (permit_data['date'] >= week_start) & 
-                (permit_data['date'] < week_start + timedelta(days=7))
-            ].copy()
-            
-            # Add weekly features to each day
-            for col in weekly_df.columns:
-                if col not in ['week', 'week_start', 'permit_count']:
-                    week_days[col] = week_row[col]
-            
-            daily_features.append(week_days)
-        
-        if daily_features:
-            result_df = pd.concat(daily_features, ignore_index=True)
-        else:
-            result_df = permit_data.copy()
-            
-        return result_df
+        weekly_features = weekly_df.drop(columns=['permit_count'])
+        result_df = daily.merge(weekly_features, on=keys + ['week'], how='left', sort=False)
+        return result_df.drop(columns=['week'])
     
     def _add_trend_seasonality_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add trend and seasonality features"""
@@ -360,18 +487,19 @@ class FeatureEngineer:
         """Store features in the database"""
         try:
             # Prepare records for insertion
+            feature_columns = [col for col in features_df.columns if col not in ['date', 'permit_count']]
+            feature_dates = features_df['date'].dt.strftime('%Y-%m-%d').tolist()
             records = []
-            for _, row in features_df.iterrows():
+            for feature_date, row in zip(feature_dates, features_df[feature_columns].to_dict('records')):
                 record = {
                     'region_id': region_id,
-                    'feature_date': row['date'].date().isoformat()
+                    'feature_date': feature_date
                 }
                 
                 # Add all feature columns
-                feature_columns = [col for col in features_df.columns if col not in ['date', 'permit_count']]
-                for col in feature_columns:
-                    if pd.notna(row[col]):
-                        record[col] = float(row[col]) if isinstance(row[col], (int, float, np.number)) else row[col]
+                for col, value in row.items():
+                    if pd.notna(value):
+                        record[col] = float(value) if isinstance(value, (int, float, np.number)) else value
                 
                 records.append(record)
             
@@ -386,16 +514,35 @@ class FeatureEngineer:
 class DemandSurgeForecaster:
     """Main forecasting class that combines all components"""
     
-    def __init__(self, config: ForecastConfig = None):
+    def __init__(self, config: ForecastConfig = None, registry: Optional[ModelRegistry] = None):
         self.config = config or ForecastConfig()
         self.surge_labeler = SurgeLabeler(self.config)
         self.feature_engineer = FeatureEngineer(self.config)
         self.supabase = get_supabase_client()
+        self.registry = registry or get_model_registry()
         
-        # Model components
+        # Model components (in-process cache; persisted models load lazily from the registry)
         self.models = {}
         self.scalers = {}
         self.calibrators = {}
+        self.feature_columns = {}
+    
+    @classmethod
+    def for_training(cls, config: ForecastConfig = None) -> "DemandSurgeForecaster":
+        """
+        Create a forecaster that can only fit models (no database clients).
+        
+        Used inside training worker processes, which receive prepared
+        training data and return fitted models to the parent.
+        """
+        forecaster = cls.__new__(cls)
+        forecaster.config = config or ForecastConfig()
+        forecaster.registry = None
+        forecaster.models = {}
+        forecaster.scalers = {}
+        forecaster.calibrators = {}
+        forecaster.feature_columns = {}
+        return forecaster
     
     def train_models(self, region_id: str, end_date: date = None) -> Dict[str, Any]:
         """
@@ -440,8 +587,12 @@ class DemandSurgeForecaster:
         # 3. XGBoost
         results['xgboost'] = self._train_xgboost(X, y, region_id)
         
-        # Store model performance
+        for metrics in results.values():
+            self.feature_columns[metrics['model_version']] = list(X.columns)
+        
+        # Store model performance and persist models
         self._store_model_performance(results, region_id)
+        self._register_models({region_id: results})
         
         logger.info(f"Completed model training for region {region_id}")
         return results
@@ -541,6 +692,8 @@ class DemandSurgeForecaster:
             'verbose': -1,
             'random_state': self.config.random_state
         }
+        if self.config.model_threads:
+            params['num_threads'] = self.config.model_threads
         
         # Train with cross-validation
         cv_results = lgb.cv(
@@ -598,6 +751,8 @@ class DemandSurgeForecaster:
             'colsample_bytree': 0.8,
             'random_state': self.config.random_state
         }
+        if self.config.model_threads:
+            params['nthread'] = self.config.model_threads
         
         # DMatrix
         dtrain = xgb.DMatrix(X, label=y)
@@ -639,37 +794,83 @@ class DemandSurgeForecaster:
             'train_f1': f1_score(y, y_pred),
             'train_precision': precision_score(y, y_pred, zero_division=0),
             'train_recall': recall_score(y, y_pred, zero_division=0),
-            'feature_importance': dict(zip(X.columns, xgb_model.feature_importances_))
+            'feature_importance': xgb_model.get_score(importance_type='weight')
         }
         
         logger.info(f"XGBoost model trained: AUC={metrics['train_auc']:.3f}")
         return metrics
     
+    def _register_models(self, results_by_region: Dict[str, Dict[str, Any]]):
+        """Persist trained models to the on-disk registry"""
+        if self.registry is None:
+            return
+        
+        try:
+            entries = []
+            for region_id, results in results_by_region.items():
+                for metrics in results.values():
+                    model_version = metrics['model_version']
+                    entries.append({
+                        'model_version': model_version,
+                        'model': self.models[model_version],
+                        'scaler': self.scalers.get(model_version),
+                        'region_id': region_id,
+                        'metrics': metrics,
+                        'feature_columns': self.feature_columns.get(model_version),
+                    })
+            self.registry.save_many(entries, compile_models=self.config.compile_models)
+            
+        except Exception as e:
+            logger.error(f"Error registering models: {str(e)}")
+    
+    def _load_model(self, model_version: str) -> bool:
+        """Make a model available in-process, loading it from the registry on first use"""
+        if model_version in self.models:
+            return True
+        if self.registry is None:
+            return False
+        
+        try:
+            model, scaler = self.registry.load(model_version)
+        except KeyError:
+            return False
+        
+        self.models[model_version] = model
+        if scaler is not None:
+            self.scalers[model_version] = scaler
+        self.feature_columns[model_version] = self.registry.get(model_version).get('feature_columns') or []
+        return True
+    
     def _store_model_performance(self, results: Dict[str, Any], region_id: str):
         """Store model performance metrics in database"""
+        self._store_model_performance_bulk({region_id: results})
+    
+    def _store_model_performance_bulk(self, results_by_region: Dict[str, Dict[str, Any]]):
+        """Store model performance metrics for many regions in one upsert"""
         try:
             records = []
-            for model_type, metrics in results.items():
-                record = {
-                    'model_version': metrics['model_version'],
-                    'model_type': metrics['model_type'],
-                    'validation_type': 'time_series_cv',
-                    'pr_auc': None,  # Would calculate from precision-recall curve
-                    'brier_score': metrics['train_brier'],
-                    'roc_auc': metrics['train_auc'],
-                    'f1_score': metrics['train_f1'],
-                    'precision': metrics['train_precision'],
-                    'recall': metrics['train_recall'],
-                    'model_config': {
-                        'cv_auc_mean': metrics['cv_auc_mean'],
-                        'cv_auc_std': metrics['cv_auc_std'],
-                        'region_id': region_id
-                    },
-                    'feature_config': {
-                        'feature_importance': metrics['feature_importance']
+            for region_id, results in results_by_region.items():
+                for model_type, metrics in results.items():
+                    record = {
+                        'model_version': metrics['model_version'],
+                        'model_type': metrics['model_type'],
+                        'validation_type': 'time_series_cv',
+                        'pr_auc': None,  # Would calculate from precision-recall curve
+                        'brier_score': metrics['train_brier'],
+                        'roc_auc': metrics['train_auc'],
+                        'f1_score': metrics['train_f1'],
+                        'precision': metrics['train_precision'],
+                        'recall': metrics['train_recall'],
+                        'model_config': {
+                            'cv_auc_mean': metrics['cv_auc_mean'],
+                            'cv_auc_std': metrics['cv_auc_std'],
+                            'region_id': region_id
+                        },
+                        'feature_config': {
+                            'feature_importance': metrics['feature_importance']
+                        }
                     }
-                }
-                records.append(record)
+                    records.append(record)
             
             if records:
                 result = self.supabase.table('model_performance').upsert(records).execute()
@@ -693,9 +894,8 @@ class DemandSurgeForecaster:
         if target_date is None:
             target_date = date.today() + timedelta(days=7)
         
-        # Get target week bounds
+        # Get target week start
         target_week_start = target_date - timedelta(days=target_date.weekday())
-        target_week_end = target_week_start + timedelta(days=6)
         
         logger.info(f"Generating forecast for region {region_id}, week {target_week_start}")
         
@@ -709,33 +909,109 @@ class DemandSurgeForecaster:
         if model_version is None:
             model_version = self._select_best_model(region_id)
         
-        if model_version not in self.models:
+        if not self._load_model(model_version):
             raise ValueError(f"Model {model_version} not found")
         
         # Generate prediction
         forecast_result = self._predict_with_model(features, model_version)
+        self._add_forecast_bounds(forecast_result)
+        
+        # Store prediction
+        prediction_record = self._prediction_record(region_id, target_week_start, model_version, forecast_result)
+        self._store_prediction(prediction_record)
         
-        # Add confidence intervals (simplified)
+        logger.info(f"Generated forecast: p_surge={forecast_result['p_surge']:.3f}")
+        return forecast_result
+    
+    def generate_forecasts_batch(self, region_ids: List[str], target_date: date = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Generate demand surge forecasts for many regions at once.
+        
+        Latest features for all regions are fetched with one query, regions
+        are grouped by their selected model so each model runs a single
+        vectorized prediction, and all predictions are stored in one upsert.
+        
+        Args:
+            region_ids: UUIDs of the regions
+            target_date: Date to forecast (defaults to next week)
+            
+        Returns:
+            Tuple of (forecast results by region_id, error message by region_id)
+        """
+        if target_date is None:
+            target_date = date.today() + timedelta(days=7)
+        
+        target_week_start = target_date - timedelta(days=target_date.weekday())
+        
+        logger.info(f"Generating batch forecasts for {len(region_ids)} regions, week {target_week_start}")
+        
+        forecasts = {}
+        errors = {}
+        
+        features = self._get_latest_features_batch(region_ids, target_date)
+        if not features.empty:
+            features = features.set_index('region_id')
+        
+        # Select a model per region and group regions sharing a model
+        regions_by_model = {}
+        for region_id in region_ids:
+            if region_id not in features.index:
+                errors[region_id] = f"No features available for region {region_id}"
+                continue
+            try:
+                model_version = self._select_best_model(region_id)
+                if not self._load_model(model_version):
+                    raise ValueError(f"Model {model_version} not found")
+                regions_by_model.setdefault(model_version, []).append(region_id)
+            except Exception as e:
+                errors[region_id] = str(e)
+        
+        # One vectorized prediction per model
+        prediction_records = []
+        for model_version, model_regions in regions_by_model.items():
+            try:
+                p_surge = self._predict_proba(features.loc[model_regions], model_version)
+            except Exception as e:
+                logger.error(f"Batch prediction with {model_version} failed: {str(e)}")
+                for region_id in model_regions:
+                    errors[region_id] = str(e)
+                continue
+            
+            for region_id, probability in zip(model_regions, p_surge):
+                forecast_result = self._forecast_result(float(probability), model_version)
+                self._add_forecast_bounds(forecast_result)
+                forecasts[region_id] = forecast_result
+                prediction_records.append(
+                    self._prediction_record(region_id, target_week_start, model_version, forecast_result)
+                )
+        
+        self._store_predictions(prediction_records)
+        
+        logger.info(f"Generated {len(forecasts)} forecasts with {len(regions_by_model)} models "
+                    f"({len(errors)} regions failed)")
+        return forecasts, errors
+    
+    @staticmethod
+    def _add_forecast_bounds(forecast_result: Dict[str, Any]):
+        """Add confidence intervals (simplified)"""
         forecast_result['p80_lower'] = max(0, forecast_result['p_surge'] - 0.2)
         forecast_result['p80_upper'] = min(1, forecast_result['p_surge'] + 0.2)
         forecast_result['p20_lower'] = max(0, forecast_result['p_surge'] - 0.1)
         forecast_result['p20_upper'] = min(1, forecast_result['p_surge'] + 0.1)
-        
-        # Store prediction
-        prediction_record = {
+    
+    @staticmethod
+    def _prediction_record(region_id: str, target_week_start: date, model_version: str,
+                           forecast_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a forecast_predictions row"""
+        return {
             'region_id': region_id,
             'forecast_date': date.today().isoformat(),
             'target_week_start': target_week_start.isoformat(),
-            'target_week_end': target_week_end.isoformat(),
+            'target_week_end': (target_week_start + timedelta(days=6)).isoformat(),
             'model_version': model_version,
-            'model_type': model_version.split('_')[0],
+            'model_type': model_type_from_version(model_version),
             **forecast_result
         }
-        
-        self._store_prediction(prediction_record)
-        
-        logger.info(f"Generated forecast: p_surge={forecast_result['p_surge']:.3f}")
-        return forecast_result
     
     def _get_latest_features(self, region_id: str, target_date: date) -> pd.DataFrame:
         """Get the most recent features for a region"""
@@ -761,10 +1037,44 @@ class DemandSurgeForecaster:
             logger.error(f"Error getting latest features: {str(e)}")
             return pd.DataFrame()
     
+    def _get_latest_features_batch(self, region_ids: List[str], target_date: date) -> pd.DataFrame:
+        """Get the most recent feature row for each region in one query"""
+        if not region_ids:
+            return pd.DataFrame()
+        
+        try:
+            start_date = target_date - timedelta(days=30)
+            region_list = ", ".join(f"'{region_id}'" for region_id in region_ids)
+            
+            query = f"""
+                SELECT DISTINCT ON (region_id) * FROM forecast_features 
+                WHERE region_id IN ({region_list}) 
+                    AND feature_date >= '{start_date}'
+                    AND feature_date <= '{target_date}'
+                ORDER BY region_id, feature_date DESC
+            """
+            
+            result = self.supabase.rpc('sql_query', {'query': query}).execute()
+            df = pd.DataFrame(result.data if result.data else [])
+            
+            if not df.empty:
+                # Keep only the latest row per region if the backend ignores DISTINCT ON
+                df = df.sort_values('feature_date', ascending=False).drop_duplicates('region_id').reset_index(drop=True)
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error getting latest features: {str(e)}")
+            return pd.DataFrame()
+    
     def _select_best_model(self, region_id: str) -> str:
-        """Select the best performing model for a region"""
-        # For now, return the first available model
-        # In production, this would query model_performance table
+        """Select the best performing model for a region by stored CV AUC"""
+        if self.registry is not None:
+            best = self.registry.best_model(region_id)
+            if best is not None:
+                return best
+        
+        # Fall back to models trained in this process
         available_models = [k for k in self.models.keys() if region_id in k]
         if not available_models:
             raise ValueError(f"No trained models found for region {region_id}")
@@ -773,50 +1083,68 @@ class DemandSurgeForecaster:
     
     def _predict_with_model(self, features: pd.DataFrame, model_version: str) -> Dict[str, Any]:
         """Generate prediction using specified model"""
+        p_surge = self._predict_proba(features.iloc[0:1], model_version)[0]  # First (latest) row
+        return self._forecast_result(float(p_surge), model_version)
+    
+    def _predict_proba(self, features: pd.DataFrame, model_version: str) -> np.ndarray:
+        """Surge probabilities for every row of a feature frame"""
         model = self.models[model_version]
-        model_type = model_version.split('_')[0]
+        model_type = model_type_from_version(model_version)
         
-        # Prepare feature vector
+        # Prepare feature matrix
         feature_cols = [col for col in features.columns if col.startswith(('permits_', 'active_', 'new_', 'contractor_', 
                                                                            'avg_', 'inspection_', 'population_', 'business_',
                                                                            'housing_', 'median_', 'construction_', 'economic_',
                                                                            'weather_', 'day_of_', 'month_', 'quarter'))]
         
-        X = features[feature_cols].fillna(0).iloc[0:1]  # Get first (latest) row
+        X = features[feature_cols].fillna(0)
+        
+        # Match the column order the model was trained with
+        if self.feature_columns.get(model_version):
+            X = X.reindex(columns=self.feature_columns[model_version], fill_value=0)
+        
+        # Compiled exports carry their own scaler and work for every model type
+        if isinstance(model, CompiledModel):
+            return model.predict_proba(X.to_numpy(dtype=float))
         
         # Predict based on model type
         if model_type == 'gradient_boost':
             scaler = self.scalers[model_version]
-            X_scaled = scaler.transform(X)
-            p_surge = model.predict_proba(X_scaled)[0, 1]
-            predicted_activity = int(100 * p_surge)  # Rough estimate
-            
-        elif model_type in ['lightgbm', 'xgboost']:
-            if model_type == 'lightgbm':
-                p_surge = model.predict(X)[0]
-            else:  # xgboost
-                dtest = xgb.DMatrix(X)
-                p_surge = model.predict(dtest)[0]
-            predicted_activity = int(100 * p_surge)
-            
-        else:
-            raise ValueError(f"Unknown model type: {model_type}")
+            return model.predict_proba(scaler.transform(X))[:, 1]
+        elif model_type == 'lightgbm':
+            return model.predict(X)
+        elif model_type == 'xgboost':
+            return model.predict(xgb.DMatrix(X))
         
+        raise ValueError(f"Unknown model type: {model_type}")
+    
+    @staticmethod
+    def _forecast_result(p_surge: float, model_version: str) -> Dict[str, Any]:
+        """Forecast result fields for a surge probability"""
+        model_type = model_type_from_version(model_version)
         return {
-            'p_surge': float(p_surge),
-            'predicted_activity': predicted_activity,
+            'p_surge': p_surge,
+            'predicted_activity': int(100 * p_surge),  # Rough estimate
             'confidence_score': 0.8,  # Placeholder
-            'calibration_method': 'isotonic' if model_type == 'gradient_boost' else 'none'
+            'calibration_method': 'isotonic' if model_type == 'gradient_boost' else 'none',
+            'model_version': model_version
         }
     
     def _store_prediction(self, prediction_record: Dict[str, Any]):
         """Store prediction in database"""
+        self._store_predictions([prediction_record])
+    
+    def _store_predictions(self, prediction_records: List[Dict[str, Any]]):
+        """Store many predictions in one upsert"""
+        if not prediction_records:
+            return
+        
         try:
-            result = self.supabase.table('forecast_predictions').upsert([prediction_record]).execute()
-            logger.info(f"Stored prediction for region {prediction_record['region_id']}")
+            result = self.supabase.table('forecast_predictions').upsert(prediction_records).execute()
+            logger.info(f"Stored {len(prediction_records)} predictions")
             
         except Exception as e:
-            logger.error(f"Error storing prediction: {str(e)}")
+            logger.error(f"Error storing predictions: {str(e)}")
 
 # Helper function for API usage
 def get_demand_surge_forecaster() -> DemandSurgeForecaster:
@@ -0,0 +1,334 @@
+"""
+Parallel multi-region training for demand surge forecasting.
+
+Fans (region, model type) training tasks out across a process pool:
+- Features for all regions are generated in one batch, surge labels per region
+- Each worker pins BLAS/OpenMP and LightGBM/XGBoost threads so that
+  workers x threads does not oversubscribe the machine
+- Fitted models are returned to the parent forecaster, saved to the model
+  registry, and all metrics are stored with a single bulk write
+
+Run as a CLI:
+    python -m app.forecast_training --all-active --workers 4
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig, get_demand_surge_forecaster
+
+logger = logging.getLogger(__name__)
+
+MODEL_TRAINERS = {
+    'gradient_boost': '_train_gradient_boost',
+    'lightgbm': '_train_lightgbm',
+    'xgboost': '_train_xgboost',
+}
+
+MIN_TRAINING_SAMPLES = 50
+
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks where supported)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def default_worker_count() -> int:
+    """Worker processes to use when none are configured (TRAINING_WORKERS or CPU count)."""
+    configured = os.getenv('TRAINING_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return available_cpus()
+
+
+def threads_per_worker(workers: int) -> int:
+    """Split available CPUs evenly across workers (at least one thread each)."""
+    return max(1, available_cpus() // max(1, workers))
+
+
+def _init_training_worker(threads: int):
+    """Pin native thread pools in a worker process before any model is fit."""
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+
+
+def _train_model_task(config: ForecastConfig, model_type: str, region_id: str,
+                      X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+    """Fit one model type for one region; runs in a worker process."""
+    started = time.time()
+    forecaster = DemandSurgeForecaster.for_training(config)
+    metrics = getattr(forecaster, MODEL_TRAINERS[model_type])(X, y, region_id)
+    model_version = metrics['model_version']
+    return {
+        'region_id': region_id,
+        'model_type': model_type,
+        'metrics': metrics,
+        'model': forecaster.models[model_version],
+        'scaler': forecaster.scalers.get(model_version),
+        'feature_columns': list(X.columns),
+        'started': started,
+        'finished': time.time(),
+    }
+
+
+@dataclass
+class RegionTrainingResult:
+    """Outcome of training all model types for one region."""
+    region_id: str
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    task_seconds: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class ForecastTrainingOrchestrator:
+    """Trains demand surge models for many regions in parallel."""
+
+    def __init__(self, forecaster: Optional[DemandSurgeForecaster] = None,
+                 workers: Optional[int] = None, threads: Optional[int] = None,
+                 model_types: Optional[List[str]] = None):
+        """
+        Initialize orchestrator.
+
+        Args:
+            forecaster: Forecaster that receives fitted models (default: new instance)
+            workers: Worker processes; 1 trains inline (default: TRAINING_WORKERS or CPU count)
+            threads: Native threads per worker (default: CPUs / workers)
+            model_types: Model types to train (default: all of MODEL_TRAINERS)
+        """
+        self.forecaster = forecaster or get_demand_surge_forecaster()
+        self.workers = workers or default_worker_count()
+        self.threads = threads or threads_per_worker(self.workers)
+        self.model_types = model_types or list(MODEL_TRAINERS)
+
+        unknown = set(self.model_types) - set(MODEL_TRAINERS)
+        if unknown:
+            raise ValueError(f"Unknown model types: {sorted(unknown)}")
+
+    def train_regions(self, region_ids: List[str], end_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Train all model types for every region.
+
+        Args:
+            region_ids: UUIDs of the regions to train
+            end_date: End date for training (defaults to today)
+
+        Returns:
+            Dictionary with per-region results, wall times and overall speedup
+        """
+        job_start = time.time()
+        end_date = end_date or date.today()
+
+        training_data, regions = self._prepare_regions(region_ids, end_date)
+        prep_seconds = time.time() - job_start
+
+        train_start = time.time()
+        for task in self._run_tasks(training_data):
+            region = regions[task['region_id']]
+            if 'error' in task:
+                region.errors[task['model_type']] = task['error']
+                continue
+
+            metrics = task['metrics']
+            model_version = metrics['model_version']
+            self.forecaster.models[model_version] = task['model']
+            if task['scaler'] is not None:
+                self.forecaster.scalers[model_version] = task['scaler']
+            self.forecaster.feature_columns[model_version] = task['feature_columns']
+
+            region.results[task['model_type']] = metrics
+            region.task_seconds += task['finished'] - task['started']
+            region.started = min(filter(None, [region.started, task['started']]))
+            region.finished = max(filter(None, [region.finished, task['finished']]))
+        train_seconds = time.time() - train_start
+
+        trained = {region_id: region.results for region_id, region in regions.items() if region.results}
+        if trained:
+            self.forecaster._store_model_performance_bulk(trained)
+            self.forecaster._register_models(trained)
+
+        task_seconds = sum(region.task_seconds for region in regions.values())
+        summary = {
+            'workers': self.workers,
+            'threads_per_worker': self.threads,
+            'regions': {region_id: {
+                'models_trained': sorted(region.results),
+                'errors': region.errors,
+                'wall_seconds': round(region.wall_seconds, 3),
+                'task_seconds': round(region.task_seconds, 3),
+            } for region_id, region in regions.items()},
+            'regions_trained': len(trained),
+            'regions_failed': len(regions) - len(trained),
+            'prep_seconds': round(prep_seconds, 3),
+            'train_seconds': round(train_seconds, 3),
+            'total_seconds': round(time.time() - job_start, 3),
+            'task_seconds': round(task_seconds, 3),
+            'parallelism': round(task_seconds / train_seconds, 2) if train_seconds > 0 else None,
+        }
+        logger.info(f"Trained {len(trained)}/{len(regions)} regions in {summary['total_seconds']:.1f}s "
+                    f"with {self.workers} workers x {self.threads} threads")
+        return summary
+
+    def _prepare_regions(self, region_ids: List[str], end_date: date) -> Tuple[
+            List[Tuple[str, pd.DataFrame, pd.Series]], Dict[str, RegionTrainingResult]]:
+        """Build (region_id, X, y) for each region with enough training data."""
+        config = self.forecaster.config
+        start_date = end_date - timedelta(weeks=config.lookback_weeks)
+        regions = {region_id: RegionTrainingResult(region_id) for region_id in region_ids}
+
+        features = self.forecaster.feature_engineer.generate_features_batch(region_ids, start_date, end_date)
+        features_by_region = dict(tuple(features.groupby('region_id', sort=False))) if not features.empty else {}
+
+        training_data = []
+        for region_id in region_ids:
+            try:
+                surge_labels = self.forecaster.surge_labeler.generate_surge_labels(region_id, start_date, end_date)
+                region_features = features_by_region.get(region_id)
+                if surge_labels.empty or region_features is None:
+                    raise ValueError(f"Insufficient data for training in region {region_id}")
+
+                X, y = self.forecaster._prepare_training_data(
+                    region_features.drop(columns=['region_id']).reset_index(drop=True), surge_labels
+                )
+                if len(X) < MIN_TRAINING_SAMPLES:
+                    raise ValueError(f"Insufficient training samples: {len(X)}")
+
+                training_data.append((region_id, X, y))
+            except Exception as e:
+                logger.error(f"Skipping region {region_id}: {str(e)}")
+                regions[region_id].errors['prepare'] = str(e)
+
+        return training_data, regions
+
+    def _run_tasks(self, training_data: List[Tuple[str, pd.DataFrame, pd.Series]]):
+        """Yield task results as (region, model type) jobs complete."""
+        config = replace(self.forecaster.config, model_threads=self.threads)
+        jobs = [(config, model_type, region_id, X, y)
+                for region_id, X, y in training_data
+                for model_type in self.model_types]
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            _init_training_worker(self.threads)
+            for job in jobs:
+                yield self._run_inline(job)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_training_worker,
+                                 initargs=(self.threads,)) as executor:
+            futures = {executor.submit(_train_model_task, *job): job for job in jobs}
+            for future in as_completed(futures):
+                _, model_type, region_id, _, _ = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Training {model_type} for region {region_id} failed: {str(e)}")
+                    yield {'region_id': region_id, 'model_type': model_type, 'error': str(e)}
+
+    @staticmethod
+    def _run_inline(job) -> Dict[str, Any]:
+        _, model_type, region_id, _, _ = job
+        try:
+            return _train_model_task(*job)
+        except Exception as e:
+            logger.error(f"Training {model_type} for region {region_id} failed: {str(e)}")
+            return {'region_id': region_id, 'model_type': model_type, 'error': str(e)}
+
+
+def main():
+    """CLI entry point for parallel multi-region training."""
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description='Train demand surge models for many regions in parallel')
+    parser.add_argument('--regions', help='Comma-separated region IDs')
+    parser.add_argument('--all-active', action='store_true', help='Train every active region')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: TRAINING_WORKERS or CPU count)')
+    parser.add_argument('--threads', type=int, help='Native threads per worker (default: CPUs / workers)')
+    parser.add_argument('--models', help=f"Comma-separated model types (default: {','.join(MODEL_TRAINERS)})")
+    parser.add_argument('--end-date', type=str, help='Training end date in YYYY-MM-DD format')
+    parser.add_argument('--baseline', action='store_true',
+                        help='Also train serially (1 worker) first and report the measured speedup')
+    parser.add_argument('--compile', action='store_true',
+                        help='Also register compiled (numpy-only) exports of the trained models')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    end_date = None
+    if args.end_date:
+        try:
+            end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date()
+        except ValueError:
+            print(f"Invalid date format: {args.end_date}. Use YYYY-MM-DD.")
+            return 1
+
+    model_types = args.models.split(',') if args.models else None
+    orchestrator = ForecastTrainingOrchestrator(workers=args.workers, threads=args.threads, model_types=model_types)
+    orchestrator.forecaster.config.compile_models = args.compile
+
+    if args.regions:
+        region_ids = [region_id.strip() for region_id in args.regions.split(',') if region_id.strip()]
+    elif args.all_active:
+        result = orchestrator.forecaster.supabase.table('regions').select('id').eq('active', True).execute()
+        region_ids = [row['id'] for row in (result.data or [])]
+    else:
+        parser.error('Specify --regions or --all-active')
+
+    baseline = None
+    if args.baseline:
+        serial = ForecastTrainingOrchestrator(orchestrator.forecaster, workers=1,
+                                              threads=available_cpus(), model_types=model_types)
+        baseline = serial.train_regions(region_ids, end_date)
+
+    summary = orchestrator.train_regions(region_ids, end_date)
+
+    print("\n=== Training Results ===")
+    print(f"Workers: {summary['workers']} x {summary['threads_per_worker']} threads")
+    print(f"{'region':<40} {'models':>6} {'wall_s':>9} {'task_s':>9}")
+    for region_id, region in summary['regions'].items():
+        print(f"{region_id:<40} {len(region['models_trained']):>6} {region['wall_seconds']:>9.2f} {region['task_seconds']:>9.2f}")
+        for stage, error in region['errors'].items():
+            print(f"  - {stage}: {error}")
+    print(f"Regions trained: {summary['regions_trained']}, failed: {summary['regions_failed']}")
+    print(f"Data prep: {summary['prep_seconds']:.1f}s, training: {summary['train_seconds']:.1f}s, "
+          f"total: {summary['total_seconds']:.1f}s")
+    if summary['parallelism']:
+        print(f"Model fitting: {summary['task_seconds']:.1f}s across tasks "
+              f"({summary['parallelism']:.2f}x overlap)")
+    if baseline and summary['train_seconds'] > 0:
+        print(f"Serial training: {baseline['train_seconds']:.1f}s, "
+              f"speedup: {baseline['train_seconds'] / summary['train_seconds']:.2f}x")
+
+    return 0 if summary['regions_failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -11,9 +11,10 @@ import sys
 import csv
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 from io import StringIO
 
+import pandas as pd
 import psycopg2
 
 # Import Supabase client
@@ -41,6 +42,160 @@ except ImportError:
     def is_metrics_enabled():
         return False
 
+# Shared date parsing from the top-level normalizers package (on PYTHONPATH in the
+# monorepo deployments); the standalone backend image falls back to a strptime loop
+try:
+    from normalizers.dates import DateParser
+except ImportError:
+    class DateParser:
+        """Tries each format in order."""
+        
+        def __init__(self, formats):
+            self.formats = tuple(formats)
+        
+        def parse(self, value):
+            for fmt in self.formats:
+                try:
+                    return datetime.strptime(value, fmt)
+                except ValueError:
+                    continue
+            return None
+        
+        def parse_many(self, values):
+            return [self.parse(value) if isinstance(value, str) else None for value in values]
+
+LEAD_DATE_PARSER = DateParser(['%Y-%m-%d', '%m/%d/%Y', '%Y-%m-%d %H:%M:%S'])
+SCRAPED_AT_PARSER = DateParser(['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'])
+
+# CSV field types
+STRING_FIELDS = [
+    'jurisdiction', 'permit_id', 'address', 'description', 'work_class',
+    'category', 'status', 'applicant', 'owner', 'apn', 'land_use',
+    'owner_kind', 'budget_band', 'scoring_version', 'state'
+]
+UUID_FIELDS = ['jurisdiction_id', 'region_id']
+NUMERIC_FIELDS = [
+    'value', 'latitude', 'longitude', 'lat', 'lon', 'heated_sqft', 'lot_size',
+    'lead_score', 'score_recency', 'score_trade_match', 'score_value',
+    'score_parcel_age', 'score_inspection'
+]
+INTEGER_FIELDS = ['year_built']
+DATE_FIELDS = ['issue_date', 'start_by_estimate']
+
+# Columns loaded into the COPY staging table (temp_leads), in order
+COPY_COLUMNS = [
+    'jurisdiction', 'permit_id', 'address', 'description', 'work_class',
+    'category', 'status', 'issue_date', 'applicant', 'owner', 'value',
+    'is_residential', 'scraped_at', 'latitude', 'longitude', 'apn',
+    'year_built', 'heated_sqft', 'lot_size', 'land_use', 'owner_kind',
+    'trade_tags', 'budget_band', 'start_by_estimate', 'lead_score',
+    'score_recency', 'score_trade_match', 'score_value', 'score_parcel_age',
+    'score_inspection', 'scoring_version'
+]
+
+# Rows per chunk read and COPYed by the columnar CSV path
+CSV_CHUNK_ROWS = int(os.getenv('INGEST_CSV_CHUNK_ROWS', '50000'))
+
+# COPY text format NULL marker
+COPY_NULL = '\\N'
+
+# Characters COPY text format needs escaped
+_COPY_SPECIAL = ('\\', '\t', '\n', '\r')
+
+
+def _parse_number(value: str) -> Optional[float]:
+    if value and value != 'None':
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def _parse_integer(value: str) -> Optional[int]:
+    if value and value != 'None':
+        try:
+            return int(float(value))  # handle case where it's "2020.0"
+        except (ValueError, TypeError, OverflowError):
+            return None
+    return None
+
+
+def _parse_bool(value: str) -> Optional[bool]:
+    value = value.lower()
+    if value in ['true', '1', 'yes']:
+        return True
+    if value in ['false', '0', 'no']:
+        return False
+    return None
+
+
+def _parse_trade_tags(value: str) -> Optional[List[str]]:
+    if not value or value == 'None':
+        return None
+    # Handle various formats: "['tag1', 'tag2']" or "tag1,tag2"
+    if value.startswith('[') and value.endswith(']'):
+        # Remove brackets and split by comma, clean quotes
+        tags = value[1:-1].split(',')
+        return [tag.strip().strip('\'"') for tag in tags if tag.strip()]
+    # Simple comma-separated
+    return [tag.strip() for tag in value.split(',') if tag.strip()]
+
+
+def _escape_copy_text(value: str) -> str:
+    """Escape backslash, tab and line breaks for COPY text format."""
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _copy_value(value: Any) -> str:
+    """Render a parsed value as a COPY text field."""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, list):
+        # PostgreSQL array literal, elements quoted
+        elements = ('"' + tag.replace('\\', '\\\\').replace('"', '\\"') + '"' for tag in value)
+        return _escape_copy_text('{' + ','.join(elements) + '}')
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return _escape_copy_text(str(value))
+
+
+def _copy_number(value: str) -> str:
+    """COPY field for a numeric CSV value (same result as _copy_value(_parse_number(value)))."""
+    try:
+        return str(float(value))
+    except ValueError:
+        return COPY_NULL
+
+
+def _copy_integer(value: str) -> str:
+    """COPY field for an integer CSV value (same result as _copy_value(_parse_integer(value)))."""
+    try:
+        return str(int(float(value)))
+    except (ValueError, OverflowError):
+        return COPY_NULL
+
+
+def _convert_distinct(values: List[str], convert: Callable[[str], str]) -> List[str]:
+    """Strip and convert a column, converting each distinct value once."""
+    converted = {value: convert(value.strip()) for value in dict.fromkeys(values)}
+    return list(map(converted.__getitem__, values))
+
+
+def _copy_strings(values: List[str]) -> List[str]:
+    """Strip a string column and render it as COPY text fields (empty strings as NULL)."""
+    values = [value.strip() for value in values]
+    # One scan of the whole column decides whether any value needs escaping
+    joined = '\x00'.join(values)
+    if any(char in joined for char in _COPY_SPECIAL):
+        return [_escape_copy_text(value) if value else COPY_NULL for value in values]
+    return [value if value else COPY_NULL for value in values]
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,15 +205,18 @@ logger = logging.getLogger(__name__)
 
 
 class LeadIngestor:
-    def __init__(self, db_url: str, use_copy: bool = True):
+    def __init__(self, db_url: str, use_copy: bool = True, columnar: bool = True):
         """Initialize ingestor with database connection.
         
         Args:
             db_url: PostgreSQL connection URL
             use_copy: Whether to use PostgreSQL COPY for bulk inserts (default: True)
+            columnar: Whether COPY reads and converts the CSV in column-wise chunks
+                instead of row by row (default: True)
         """
         self.db_url = db_url
         self.use_copy = use_copy
+        self.columnar = columnar
         
     def connect_db(self):
         """Create database connection."""
@@ -69,123 +227,147 @@ class LeadIngestor:
         parsed = {}
         
         # String fields (keep as-is or None for empty)
-        string_fields = [
-            'jurisdiction', 'permit_id', 'address', 'description', 'work_class',
-            'category', 'status', 'applicant', 'owner', 'apn', 'land_use',
-            'owner_kind', 'budget_band', 'scoring_version', 'state'
-        ]
-        
-        for field in string_fields:
+        for field in STRING_FIELDS:
             value = row.get(field, '').strip()
             parsed[field] = value if value else None
             
         # UUID fields for region/jurisdiction references
-        uuid_fields = ['jurisdiction_id', 'region_id']
-        for field in uuid_fields:
+        for field in UUID_FIELDS:
             value = row.get(field, '').strip()
             parsed[field] = value if value and value != 'None' else None
             
         # Numeric fields (including new lat/lon fields)
-        numeric_fields = [
-            'value', 'latitude', 'longitude', 'lat', 'lon', 'heated_sqft', 'lot_size',
-            'lead_score', 'score_recency', 'score_trade_match', 'score_value',
-            'score_parcel_age', 'score_inspection'
-        ]
-        
-        for field in numeric_fields:
-            value = row.get(field, '').strip()
-            if value and value != 'None':
-                try:
-                    parsed[field] = float(value)
-                except (ValueError, TypeError):
-                    parsed[field] = None
-            else:
-                parsed[field] = None
+        for field in NUMERIC_FIELDS:
+            parsed[field] = _parse_number(row.get(field, '').strip())
                 
         # Integer fields
-        integer_fields = ['year_built']
-        for field in integer_fields:
-            value = row.get(field, '').strip()
-            if value and value != 'None':
-                try:
-                    parsed[field] = int(float(value))  # handle case where it's "2020.0"
-                except (ValueError, TypeError):
-                    parsed[field] = None
-            else:
-                parsed[field] = None
+        for field in INTEGER_FIELDS:
+            parsed[field] = _parse_integer(row.get(field, '').strip())
                 
         # Boolean fields
-        bool_value = row.get('is_residential', '').strip().lower()
-        if bool_value in ['true', '1', 'yes']:
-            parsed['is_residential'] = True
-        elif bool_value in ['false', '0', 'no']:
-            parsed['is_residential'] = False
-        else:
-            parsed['is_residential'] = None
+        parsed['is_residential'] = _parse_bool(row.get('is_residential', '').strip())
             
         # Date fields
-        date_fields = ['issue_date', 'start_by_estimate']
-        for field in date_fields:
+        for field in DATE_FIELDS:
             value = row.get(field, '').strip()
             if value and value != 'None':
-                try:
-                    # Try parsing various date formats
-                    for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%Y-%m-%d %H:%M:%S']:
-                        try:
-                            parsed[field] = datetime.strptime(value, fmt).date()
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        parsed[field] = None
-                except (ValueError, TypeError):
-                    parsed[field] = None
+                date_value = LEAD_DATE_PARSER.parse(value)
+                parsed[field] = date_value.date() if date_value is not None else None
             else:
                 parsed[field] = None
                 
         # Timestamp fields
         timestamp_value = row.get('scraped_at', '').strip()
         if timestamp_value and timestamp_value != 'None':
-            try:
-                # Try parsing various timestamp formats
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                    try:
-                        parsed['scraped_at'] = datetime.strptime(timestamp_value, fmt)
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    parsed['scraped_at'] = None
-            except (ValueError, TypeError):
-                parsed['scraped_at'] = None
+            parsed['scraped_at'] = SCRAPED_AT_PARSER.parse(timestamp_value)
         else:
             parsed['scraped_at'] = None
             
         # Array fields (trade_tags)
-        trade_tags_value = row.get('trade_tags', '').strip()
-        if trade_tags_value and trade_tags_value != 'None':
-            try:
-                # Handle various formats: "['tag1', 'tag2']" or "tag1,tag2"
-                if trade_tags_value.startswith('[') and trade_tags_value.endswith(']'):
-                    # Remove brackets and split by comma, clean quotes
-                    tags = trade_tags_value[1:-1].split(',')
-                    parsed['trade_tags'] = [tag.strip().strip('\'"') for tag in tags if tag.strip()]
-                else:
-                    # Simple comma-separated
-                    parsed['trade_tags'] = [tag.strip() for tag in trade_tags_value.split(',') if tag.strip()]
-            except:
-                parsed['trade_tags'] = None
-        else:
-            parsed['trade_tags'] = None
+        parsed['trade_tags'] = _parse_trade_tags(row.get('trade_tags', '').strip())
             
         return parsed
     
-    def ingest_csv_with_copy(self, csv_file_path: str, trace_id: Optional[str] = None) -> int:
+    def parse_csv_frame(self, frame: pd.DataFrame) -> Dict[str, List[str]]:
+        """
+        Column-wise equivalent of parse_csv_row() for a chunk of CSV rows.
+        
+        Each column is converted in one pass; conversions that run per value
+        (numbers, dates, tags) run once per distinct value.
+        
+        Args:
+            frame: CSV rows read as strings (missing values as '')
+            
+        Returns:
+            COPY_COLUMNS -> column rendered as COPY text fields (NULL as \\N)
+        """
+        fields = {}
+        for field in COPY_COLUMNS:
+            values = frame[field].tolist() if field in frame else [''] * len(frame)
+            
+            if field in NUMERIC_FIELDS:
+                fields[field] = _convert_distinct(values, _copy_number)
+            elif field in INTEGER_FIELDS:
+                fields[field] = _convert_distinct(values, _copy_integer)
+            elif field in DATE_FIELDS:
+                fields[field] = self._convert_dates(values, LEAD_DATE_PARSER, as_date=True)
+            elif field == 'scraped_at':
+                fields[field] = self._convert_dates(values, SCRAPED_AT_PARSER, as_date=False)
+            elif field == 'is_residential':
+                fields[field] = _convert_distinct(values, lambda v: _copy_value(_parse_bool(v)))
+            elif field == 'trade_tags':
+                fields[field] = _convert_distinct(values, lambda v: _copy_value(_parse_trade_tags(v)))
+            else:
+                fields[field] = _copy_strings(values)
+        
+        return fields
+    
+    @staticmethod
+    def _convert_dates(values: List[str], parser: DateParser, as_date: bool) -> List[str]:
+        distinct = list(dict.fromkeys(values))
+        stripped = (value.strip() for value in distinct)
+        parsed = parser.parse_many(v if v and v != 'None' else None for v in stripped)
+        if as_date:
+            parsed = [value.date() if value is not None else None for value in parsed]
+        converted = dict(zip(distinct, map(_copy_value, parsed)))
+        return list(map(converted.__getitem__, values))
+    
+    def _copy_chunks_columnar(self, csv_file_path: str) -> Iterator[Tuple[str, int]]:
+        """COPY text for the CSV in chunks of CSV_CHUNK_ROWS rows, with the row count of each."""
+        try:
+            reader = pd.read_csv(
+                csv_file_path, dtype=object, na_filter=False, encoding='utf-8',
+                chunksize=CSV_CHUNK_ROWS, on_bad_lines='warn'
+            )
+        except pd.errors.EmptyDataError:
+            return
+        
+        with reader:
+            for chunk in reader:
+                if chunk.empty:
+                    continue
+                fields = self.parse_csv_frame(chunk)
+                lines = map('\t'.join, zip(*(fields[field] for field in COPY_COLUMNS)))
+                yield '\n'.join(lines) + '\n', len(chunk)
+    
+    def _copy_chunks_rows(self, csv_file_path: str) -> Iterator[Tuple[str, int]]:
+        """COPY text for the whole CSV parsed row by row (rows that fail to parse are skipped)."""
+        copy_buffer = StringIO()
+        records_prepared = 0
+        
+        with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            
+            for row in reader:
+                try:
+                    parsed_row = self.parse_csv_row(row)
+                    copy_buffer.write('\t'.join(_copy_value(parsed_row.get(field)) for field in COPY_COLUMNS) + '\n')
+                    records_prepared += 1
+                    
+                    if records_prepared % 1000 == 0:
+                        logger.info(f"Prepared {records_prepared} records for COPY...")
+                        
+                except Exception as e:
+                    logger.error(f"Error processing row {records_prepared + 1}: {e}")
+                    logger.error(f"Row data: {row}")
+                    continue
+        
+        yield copy_buffer.getvalue(), records_prepared
+    
+    def ingest_csv_with_copy(self, csv_file_path: str, trace_id: Optional[str] = None,
+                             columnar: Optional[bool] = None) -> int:
         """
         Ingest leads from CSV file using PostgreSQL COPY for better performance.
         
         This method uses COPY FROM with a temporary table approach to handle
-        conflicts and provide transaction safety.
+        conflicts and provide transaction safety. In columnar mode the CSV is
+        read, converted and COPYed chunk by chunk; otherwise it is parsed row
+        by row into a single COPY buffer.
+        
+        Args:
+            csv_file_path: Path to the CSV file to ingest
+            trace_id: Optional trace ID for logging ingest steps
+            columnar: Override the ingestor's columnar setting
         
         Returns:
             Number of records successfully ingested
@@ -237,77 +419,17 @@ class LeadIngestor:
             """
             cur.execute(temp_table_sql)
             
-            # Prepare cleaned data for COPY
-            copy_buffer = StringIO()
+            # Stream cleaned data into the staging table
             records_processed = 0
+            if self.columnar if columnar is None else columnar:
+                copy_chunks = self._copy_chunks_columnar(csv_file_path)
+            else:
+                copy_chunks = self._copy_chunks_rows(csv_file_path)
             
-            with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                
-                for row in reader:
-                    try:
-                        parsed_row = self.parse_csv_row(row)
-                        
-                        # Format row for COPY (tab-separated, handling NULL values)
-                        row_values = []
-                        for field in [
-                            'jurisdiction', 'permit_id', 'address', 'description', 'work_class',
-                            'category', 'status', 'issue_date', 'applicant', 'owner', 'value',
-                            'is_residential', 'scraped_at', 'latitude', 'longitude', 'apn',
-                            'year_built', 'heated_sqft', 'lot_size', 'land_use', 'owner_kind',
-                            'trade_tags', 'budget_band', 'start_by_estimate', 'lead_score',
-                            'score_recency', 'score_trade_match', 'score_value', 'score_parcel_age',
-                            'score_inspection', 'scoring_version'
-                        ]:
-                            value = parsed_row.get(field)
-                            if value is None:
-                                row_values.append('\\N')  # PostgreSQL NULL representation
-                            elif field == 'trade_tags' and isinstance(value, list):
-                                # Format array for PostgreSQL
-                                formatted_array = '{' + ','.join(f'"{tag}"' for tag in value) + '}'
-                                row_values.append(formatted_array)
-                            elif isinstance(value, bool):
-                                row_values.append('t' if value else 'f')
-                            elif isinstance(value, (int, float)):
-                                row_values.append(str(value))
-                            elif isinstance(value, datetime):
-                                row_values.append(value.strftime('%Y-%m-%d %H:%M:%S'))
-                            else:
-                                # Escape tabs and newlines in string values
-                                escaped_value = str(value).replace('\t', '\t').replace('\n', '\n').replace('\r', '\r')
-                                row_values.append(escaped_value)
-                        
-                        copy_buffer.write('\t'.join(row_values) + '\n')
-                        records_processed += 1
-                        
-                        if records_processed % 1000 == 0:
-                            logger.info(f"Prepared {records_processed} records for COPY...")
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing row {records_processed + 1}: {e}")
-                        logger.error(f"Row data: {row}")
-                        continue
-            
-            # Reset buffer to beginning
-            copy_buffer.seek(0)
-            
-            # Perform COPY operation
-            logger.info(f"Executing COPY operation for {records_processed} records...")
-            cur.copy_from(
-                copy_buffer,
-                'temp_leads',
-                sep='\t',
-                null='\\N',
-                columns=[
-                    'jurisdiction', 'permit_id', 'address', 'description', 'work_class',
-                    'category', 'status', 'issue_date', 'applicant', 'owner', 'value',
-                    'is_residential', 'scraped_at', 'latitude', 'longitude', 'apn',
-                    'year_built', 'heated_sqft', 'lot_size', 'land_use', 'owner_kind',
-                    'trade_tags', 'budget_band', 'start_by_estimate', 'lead_score',
-                    'score_recency', 'score_trade_match', 'score_value', 'score_parcel_age',
-                    'score_inspection', 'scoring_version'
-                ]
-            )
+            for copy_text, rows in copy_chunks:
+                logger.info(f"Executing COPY operation for {rows} records...")
+                cur.copy_from(StringIO(copy_text), 'temp_leads', sep='\t', null=COPY_NULL, columns=COPY_COLUMNS)
+                records_processed += rows
             
             # Insert from temporary table with conflict resolution
             insert_from_temp_sql = """
@@ -377,13 +499,12 @@ class LeadIngestor:
                     "records_processed": records_processed,
                     "rows_affected": rows_affected,
                     "total_records": total_records
-                })
+                }, buffered=True)
             
             # Track metrics if enabled
             if METRICS_AVAILABLE and is_metrics_enabled():
                 track_ingestion('csv_copy', records_processed, 'success')
             
-            copy_buffer.close()
             return records_processed
             
         except Exception as e:
@@ -396,7 +517,7 @@ class LeadIngestor:
                     "method": "copy",
                     "error": str(e),
                     "records_processed": records_processed
-                })
+                }, buffered=True)
             
             # Track failed ingestion if metrics enabled
             if METRICS_AVAILABLE and is_metrics_enabled():
@@ -425,7 +546,7 @@ class LeadIngestor:
             log_ingest_step(trace_id, "upsert", True, {
                 "csv_file": csv_file_path,
                 "method": "copy" if self.use_copy else "insert"
-            })
+            }, buffered=True)
         
         if self.use_copy:
             try:
@@ -436,7 +557,7 @@ class LeadIngestor:
                     log_ingest_step(trace_id, "upsert", False, {
                         "error": str(e),
                         "fallback": "INSERT method"
-                    })
+                    }, buffered=True)
                 self.use_copy = False
         
         return self.ingest_csv_with_insert(csv_file_path, trace_id)
@@ -569,7 +690,7 @@ class LeadIngestor:
                     "method": "insert",
                     "records_processed": records_processed,
                     "total_records": total_records
-                })
+                }, buffered=True)
             
             # Track metrics if enabled
             if METRICS_AVAILABLE and is_metrics_enabled():
@@ -587,7 +708,7 @@ class LeadIngestor:
                     "method": "insert",
                     "error": str(e),
                     "records_processed": records_processed
-                })
+                }, buffered=True)
             
             # Track failed ingestion if metrics enabled
             if METRICS_AVAILABLE and is_metrics_enabled():
@@ -650,17 +771,17 @@ def insert_lead(lead: dict, trace_id: Optional[str] = None) -> dict:
     # Validate required fields
     if not isinstance(lead, dict):
         if trace_id:
-            log_ingest_step(trace_id, "db_insert", False, {"error": "Lead must be a dictionary"})
+            log_ingest_step(trace_id, "db_insert", False, {"error": "Lead must be a dictionary"}, buffered=True)
         raise ValueError("Lead must be a dictionary")
     
     if not lead.get('jurisdiction'):
         if trace_id:
-            log_ingest_step(trace_id, "db_insert", False, {"error": "jurisdiction is required"})
+            log_ingest_step(trace_id, "db_insert", False, {"error": "jurisdiction is required"}, buffered=True)
         raise ValueError("jurisdiction is required")
     
     if not lead.get('permit_id'):
         if trace_id:
-            log_ingest_step(trace_id, "db_insert", False, {"error": "permit_id is required"})
+            log_ingest_step(trace_id, "db_insert", False, {"error": "permit_id is required"}, buffered=True)
         raise ValueError("permit_id is required")
     
     try:
@@ -746,12 +867,12 @@ def insert_lead(lead: dict, trace_id: Optional[str] = None) -> dict:
                     "jurisdiction": clean_lead.get('jurisdiction'),
                     "permit_id": clean_lead.get('permit_id'),
                     "lead_id": result.data[0].get('id') if result.data else None
-                })
+                }, buffered=True)
             return result.data[0]  # Return the first (and only) inserted record
         else:
             error_msg = "No data returned from Supabase insert operation"
             if trace_id:
-                log_ingest_step(trace_id, "db_insert", False, {"error": error_msg})
+                log_ingest_step(trace_id, "db_insert", False, {"error": error_msg}, buffered=True)
             raise Exception(error_msg)
             
     except Exception as e:
@@ -762,7 +883,7 @@ def insert_lead(lead: dict, trace_id: Optional[str] = None) -> dict:
                 "error": str(e),
                 "jurisdiction": lead.get('jurisdiction'),
                 "permit_id": lead.get('permit_id')
-            })
+            }, buffered=True)
         raise Exception(f"Failed to insert lead: {e}")
 
 
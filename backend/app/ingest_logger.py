@@ -4,11 +4,21 @@ Ingest logging utility for tracking critical steps in the lead processing pipeli
 
 This module provides a utility function to log critical steps (fetch_page, parse, upsert, db_insert)
 with a trace ID to enable debugging and monitoring of the lead processing flow.
+
+Hot paths (scrapers, bulk ingest) should log with ``buffered=True``: entries are
+queued in memory and written to ``ingest_logs`` in bulk by a background thread,
+so tracing never adds a network round trip per step. Under backpressure the
+bounded queue drops (and counts) entries instead of slowing ingestion.
 """
 
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime, timezone
 
 from .supabase_client import get_supabase_client
@@ -16,11 +26,173 @@ from .supabase_client import get_supabase_client
 logger = logging.getLogger(__name__)
 
 
+def _insert_log_entries(entries: List[Dict[str, Any]]) -> int:
+    """Bulk insert log entries into ingest_logs, returning the number written."""
+    supabase = get_supabase_client()
+    result = supabase.table('ingest_logs').insert(entries).execute()
+    return len(result.data or [])
+
+
+class IngestLogBuffer:
+    """
+    Bounded in-memory queue of ingest log entries flushed in bulk by a background thread.
+    
+    Entries are written when batch_size entries have accumulated or
+    flush_interval_ms has passed since the first entry of a batch, whichever
+    comes first. When the queue is full new entries are dropped and counted.
+    """
+    
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        writer: Optional[Callable[[List[Dict[str, Any]]], int]] = None
+    ):
+        """
+        Initialize the buffer.
+        
+        Args:
+            batch_size: Max entries per bulk insert (INGEST_LOG_BATCH_SIZE, default 200)
+            flush_interval_ms: Max time an entry waits before flushing (INGEST_LOG_FLUSH_MS, default 1000)
+            max_queue: Max queued entries before dropping (INGEST_LOG_MAX_QUEUE, default 10000)
+            writer: Function performing the bulk insert (defaults to Supabase ingest_logs)
+        """
+        self.batch_size = batch_size or int(os.getenv('INGEST_LOG_BATCH_SIZE', '200'))
+        self.flush_interval = (flush_interval_ms or int(os.getenv('INGEST_LOG_FLUSH_MS', '1000'))) / 1000.0
+        self.max_queue = max_queue or int(os.getenv('INGEST_LOG_MAX_QUEUE', '10000'))
+        self._writer = writer or _insert_log_entries
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._flush_requested = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+    
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ingest-log-flusher", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+    
+    def enqueue(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue a log entry without blocking.
+        
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            dropped = self.stats['dropped']
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(f"Ingest log queue full; dropped {dropped} entries so far")
+            return False
+        self.stats['enqueued'] += 1
+        return True
+    
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._flush_requested.is_set() or self._stopping.is_set():
+                # Drain what is already queued without waiting for more
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        try:
+            self._writer(batch)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['failed'] += len(batch)
+            logger.error(f"Error writing {len(batch)} ingest log entries: {e}")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+    
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._write_batch(batch)
+            elif self._flush_requested.is_set():
+                self._flush_requested.clear()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Write all queued entries now and wait for them to be written.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if the queue was drained within the timeout
+        """
+        if self._thread is None:
+            return True
+        self._flush_requested.set()
+        end = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Timed out flushing ingest logs ({self._queue.unfinished_tasks} pending)")
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        self._flush_requested.clear()
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """Flush remaining entries and stop the background thread."""
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        self._stopping.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+
+
+# Global ingest log buffer instance
+_ingest_log_buffer = None
+
+def get_ingest_log_buffer() -> IngestLogBuffer:
+    """Get the global ingest log buffer instance."""
+    global _ingest_log_buffer
+    if _ingest_log_buffer is None:
+        _ingest_log_buffer = IngestLogBuffer()
+    return _ingest_log_buffer
+
+
 def log_ingest_step(
     trace_id: str,
     stage: str,
     ok: bool,
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[Dict[str, Any]] = None,
+    buffered: bool = False
 ) -> bool:
     """
     Log a critical step in the lead ingestion pipeline.
@@ -30,9 +202,11 @@ def log_ingest_step(
         stage: Stage name (e.g., "fetch_page", "parse", "upsert", "db_insert")
         ok: Whether the stage completed successfully
         details: Additional details about the stage execution (optional)
+        buffered: Queue the entry for a background bulk insert instead of
+            inserting it synchronously
         
     Returns:
-        True if logging was successful, False otherwise
+        True if logging was successful (or the entry was queued), False otherwise
     """
     try:
         # Validate inputs
@@ -60,6 +234,9 @@ def log_ingest_step(
             "created_at": datetime.now(timezone.utc).isoformat()
         }
         
+        if buffered:
+            return get_ingest_log_buffer().enqueue(log_entry)
+        
         # Insert into Supabase
         supabase = get_supabase_client()
         result = supabase.table('ingest_logs').insert(log_entry).execute()
@@ -130,14 +307,16 @@ class IngestTracer:
             tracer.log("upsert", False, {"error": "Database connection failed"})
     """
     
-    def __init__(self, trace_id: Optional[str] = None):
+    def __init__(self, trace_id: Optional[str] = None, buffered: bool = True):
         """
         Initialize tracer with optional existing trace_id.
         
         Args:
             trace_id: Existing trace ID, or None to generate a new one
+            buffered: Queue log entries for bulk insert (flushed on exit)
         """
         self.trace_id = trace_id or generate_trace_id()
+        self.buffered = buffered
         self.stages_logged = []
         
     def __enter__(self):
@@ -158,6 +337,9 @@ class IngestTracer:
             })
         else:
             logger.info(f"Ingest trace {self.trace_id} completed successfully with {len(self.stages_logged)} stages")
+        
+        if self.buffered:
+            get_ingest_log_buffer().flush()
             
     def log(self, stage: str, ok: bool, details: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -171,7 +353,7 @@ class IngestTracer:
         Returns:
             True if logging was successful, False otherwise
         """
-        success = log_ingest_step(self.trace_id, stage, ok, details)
+        success = log_ingest_step(self.trace_id, stage, ok, details, buffered=self.buffered)
         if success:
             self.stages_logged.append(stage)
         return success
\ No newline at end of file
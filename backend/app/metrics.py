@@ -8,7 +8,7 @@ HTTP requests, request durations, and data ingestion metrics.
 
 import time
 from typing import Dict
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from prometheus_client.registry import REGISTRY
 import logging
 
@@ -35,6 +35,26 @@ ingest_rows_total = Counter(
     ['source', 'status']
 )
 
+# Job queue metrics (published by workers/queue_worker.py)
+queue_jobs_total = Counter(
+    'queue_jobs_total',
+    'Total number of queue jobs processed',
+    ['job', 'status']
+)
+
+queue_job_duration_seconds = Histogram(
+    'queue_job_duration_seconds',
+    'Queue job duration in seconds',
+    ['job'],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, float('inf'))
+)
+
+queue_messages = Gauge(
+    'queue_messages',
+    'Number of queue messages by state (depth, pending, lag, retry_scheduled, dead_letter, in_flight)',
+    ['stream', 'state']
+)
+
 
 class MetricsTracker:
     """Helper class for tracking metrics across the application."""
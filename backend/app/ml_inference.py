@@ -13,20 +13,50 @@ import os
 from pathlib import Path
 from typing import Dict, List, Any
 
+import numpy as np
 import pandas as pd
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default values for features missing from a lead (anything else defaults to 0)
+FEATURE_DEFAULTS = {
+    'rating_numeric': 0,
+    'estimated_deal_value': 0,
+    'feedback_age_days': 0,
+    'has_contact_issues': False,
+    'has_qualification_issues': False,
+    'is_weekend_feedback': False,
+    'feedback_hour': 12,
+    'source_cancellation_rate': 0.0,
+    'source_avg_cancellation_score': 0.0,
+    'contractor_canceled': False,
+    'canceled_for_quality': False,
+    'canceled_for_wrong_type': False,
+    'contractor_win_rate': 0.1,  # Default reasonable win rate
+    'lead_value_log': 0.0,
+}
+
 class LeadMLInference:
-    def __init__(self, model_dir: str = "./models"):
-        """Initialize inference with model directory."""
+    def __init__(self, model_dir: str = "./models", use_compiled: bool = None):
+        """
+        Initialize inference with model directory.
+        
+        Args:
+            model_dir: Directory containing latest_model.json
+            use_compiled: Prefer the compiled model export when one exists
+                (default: LEAD_MODEL_COMPILED env, true)
+        """
         self.model_dir = Path(model_dir)
         self.model = None
         self.scaler = None
+        self.compiled_model = None
         self.feature_columns = []
         self.model_metadata = {}
+        if use_compiled is None:
+            use_compiled = os.getenv('LEAD_MODEL_COMPILED', 'true').lower() == 'true'
+        self.use_compiled = use_compiled
         
     def load_model(self) -> bool:
         """Load the latest trained model."""
@@ -40,6 +70,10 @@ class LeadMLInference:
             with open(latest_model_file, 'r') as f:
                 self.model_metadata = json.load(f)
             
+            compiled_file = self.model_metadata.get('compiled_model_file')
+            if self.use_compiled and compiled_file and self._load_compiled_model(compiled_file):
+                return True
+            
             model_file = Path(self.model_metadata['model_file'])
             
             with open(model_file, 'rb') as f:
@@ -56,48 +90,37 @@ class LeadMLInference:
             logger.error(f"Error loading model: {e}")
             return False
     
+    def _load_compiled_model(self, compiled_file: str) -> bool:
+        """Load the numpy-only compiled export; no scikit-learn import or unpickling."""
+        try:
+            try:
+                from compiled_models import CompiledModel
+            except ImportError:
+                from .compiled_models import CompiledModel
+            self.compiled_model = CompiledModel.load(compiled_file)
+            self.feature_columns = self.compiled_model.feature_columns
+            logger.info(f"Loaded compiled model version: {self.model_metadata['model_version']}")
+            return True
+        except Exception as e:
+            logger.warning(f"Error loading compiled model, falling back to pickled model: {e}")
+            self.compiled_model = None
+            return False
+    
     def prepare_features(self, leads: List[Dict[str, Any]]) -> pd.DataFrame:
         """Prepare lead features for inference."""
-        features_list = []
+        records = [lead.get('features') or {} for lead in leads]
         
-        for lead in leads:
-            lead_features = lead.get('features', {})
-            
-            # Ensure all required features are present
-            feature_row = {}
-            for col in self.feature_columns:
-                if col in lead_features:
-                    feature_row[col] = lead_features[col]
-                else:
-                    # Default values for missing features
-                    if col == 'rating_numeric':
-                        feature_row[col] = 0
-                    elif col == 'estimated_deal_value':
-                        feature_row[col] = 0
-                    elif col == 'feedback_age_days':
-                        feature_row[col] = 0
-                    elif col in ['has_contact_issues', 'has_qualification_issues', 'is_weekend_feedback']:
-                        feature_row[col] = False
-                    elif col == 'feedback_hour':
-                        feature_row[col] = 12
-                    elif col in ['source_cancellation_rate', 'source_avg_cancellation_score']:
-                        feature_row[col] = 0.0
-                    elif col in ['contractor_canceled', 'canceled_for_quality', 'canceled_for_wrong_type']:
-                        feature_row[col] = False
-                    elif col == 'contractor_win_rate':
-                        feature_row[col] = 0.1  # Default reasonable win rate
-                    elif col == 'lead_value_log':
-                        feature_row[col] = 0.0
-                    else:
-                        feature_row[col] = 0
-                        
-            features_list.append(feature_row)
+        # Build the frame column-wise, then ensure all required features are present
+        features_df = pd.DataFrame.from_records(records) if records else pd.DataFrame()
+        features_df = features_df.reindex(columns=self.feature_columns)
         
-        return pd.DataFrame(features_list)
+        # Default values for missing features
+        defaults = {col: FEATURE_DEFAULTS.get(col, 0) for col in self.feature_columns}
+        return features_df.fillna(value=defaults).infer_objects()
     
     def predict(self, leads: List[Dict[str, Any]], account_id: str = None) -> List[Dict[str, Any]]:
         """Generate predictions for leads with optional personalized cancellation adjustments."""
-        if not self.model:
+        if not self.model and self.compiled_model is None:
             raise RuntimeError("Model not loaded")
         
         # Import cancellation service for personalized adjustments
@@ -115,45 +138,53 @@ class LeadMLInference:
         # Prepare features
         features_df = self.prepare_features(leads)
         
-        # Scale features
-        features_scaled = self.scaler.transform(features_df)
+        # Get predictions (the compiled model applies the scaler itself)
+        if self.compiled_model is not None:
+            probabilities = self.compiled_model.predict_proba(features_df.to_numpy(dtype=float))
+        else:
+            features_scaled = self.scaler.transform(features_df)
+            probabilities = np.asarray(self.model.predict_proba(features_scaled), dtype=float)[:, 1]
         
-        # Get predictions
-        probabilities = self.model.predict_proba(features_scaled)[:, 1]
-        predictions = self.model.predict(features_scaled)
+        # Personalized cancellation adjustments: one profile lookup for the whole batch
+        personalized_adjustments = np.zeros(len(leads))
+        if cancellation_service and account_id:
+            try:
+                personalized_adjustments = np.asarray(
+                    cancellation_service.calculate_personalized_adjustments_batch(account_id, leads), dtype=float
+                )
+            except Exception as e:
+                logger.warning(f"Error calculating personalized adjustment: {e}")
+        
+        # Apply adjustment to probability (convert to score, adjust, convert back)
+        adjusted_scores = np.clip(probabilities * 100 + personalized_adjustments, 0, 100)  # Clamp to 0-100
+        adjusted_probabilities = adjusted_scores / 100.0
+        confidences = self._calculate_confidence_batch(adjusted_probabilities)
+        model_version = self.model_metadata['model_version']
         
         # Prepare results
-        results = []
-        for i, lead in enumerate(leads):
-            base_probability = probabilities[i]
-            
-            # Apply personalized cancellation adjustment if available
-            personalized_adjustment = 0.0
-            if cancellation_service and account_id:
-                try:
-                    personalized_adjustment = cancellation_service.calculate_personalized_adjustments(
-                        account_id, lead
-                    )
-                except Exception as e:
-                    logger.warning(f"Error calculating personalized adjustment: {e}")
-            
-            # Apply adjustment to probability (convert to score, adjust, convert back)
-            adjusted_score = (base_probability * 100) + personalized_adjustment
-            adjusted_score = max(0, min(100, adjusted_score))  # Clamp to 0-100
-            adjusted_probability = adjusted_score / 100.0
-            
-            results.append({
+        return [
+            {
                 'lead_id': lead['id'],
                 'win_probability': float(base_probability),
                 'adjusted_probability': float(adjusted_probability),
                 'calibrated_score': float(adjusted_score),
                 'personalized_adjustment': float(personalized_adjustment),
                 'predicted_success': bool(adjusted_probability > 0.5),
-                'model_version': self.model_metadata['model_version'],
-                'confidence': self._calculate_confidence(adjusted_probability)
-            })
-        
-        return results
+                'model_version': model_version,
+                'confidence': confidence
+            }
+            for lead, base_probability, adjusted_probability, adjusted_score, personalized_adjustment, confidence
+            in zip(leads, probabilities.tolist(), adjusted_probabilities.tolist(), adjusted_scores.tolist(),
+                   personalized_adjustments.tolist(), confidences.tolist())
+        ]
+    
+    def _calculate_confidence_batch(self, probabilities: np.ndarray) -> np.ndarray:
+        """Calculate confidence levels for an array of probabilities."""
+        return np.select(
+            [(probabilities > 0.8) | (probabilities < 0.2), (probabilities > 0.6) | (probabilities < 0.4)],
+            ['high', 'medium'],
+            default='low'
+        )
     
     def _calculate_confidence(self, probability: float) -> str:
         """Calculate confidence level based on probability."""
@@ -0,0 +1,340 @@
+"""
+On-disk registry for demand surge forecast models.
+
+Each trained model is saved to its own versioned directory using the
+library's native format (LightGBM text, XGBoost UBJSON, joblib for
+scikit-learn estimators and scalers). A JSON manifest at the registry root
+records model type, region, feature columns, CV metrics and training run
+for every version, so any process can select the best model of a region's
+latest training run without loading models, then load only that model on
+first use. Each region keeps its last RETAINED_RUNS runs; older versions
+are removed from the manifest and disk when a new run is registered.
+
+Versions saved with ``compile_models=True`` also carry a compiled export
+(model plus scaler as numpy node arrays, see compiled_models). When present
+it is loaded in place of the native model, so serving needs no LightGBM,
+XGBoost or scikit-learn objects.
+
+Layout:
+    <root>/manifest.json
+    <root>/<model_version>/model.txt|model.ubj|model.joblib
+    <root>/<model_version>/scaler.joblib
+    <root>/<model_version>/model.npz (optional compiled export)
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+COMPILED_FILE = "model.npz"
+
+MODEL_FORMATS = {
+    'lightgbm': 'model.txt',
+    'xgboost': 'model.ubj',
+    'gradient_boost': 'model.joblib',
+}
+
+SELECTION_METRIC = 'cv_auc_mean'
+
+# Training runs kept per region (the previous run stays loadable by processes
+# that have not yet re-read the manifest)
+RETAINED_RUNS = max(1, int(os.getenv('FORECAST_MODEL_RETAINED_RUNS', '2')))
+
+
+def default_registry_dir() -> str:
+    """Registry root from FORECAST_MODEL_DIR, else <MODEL_DIR>/demand_forecast."""
+    return os.getenv(
+        'FORECAST_MODEL_DIR',
+        os.path.join(os.getenv('MODEL_DIR', './models'), 'demand_forecast')
+    )
+
+
+def training_run(entry: Dict[str, Any]) -> str:
+    """Sortable training run id of a manifest entry ('' for versions registered before runs were recorded)."""
+    return entry.get('training_run', '')
+
+
+def model_type_from_version(model_version: str) -> str:
+    """Model type encoded in a version string such as ``gradient_boost_<region>_<ts>``."""
+    for model_type in MODEL_FORMATS:
+        if model_version.startswith(f"{model_type}_"):
+            return model_type
+    return model_version.split('_')[0]
+
+
+class ModelRegistry:
+    """Versioned model store with a JSON manifest and lazy, cached loading."""
+
+    def __init__(self, root: Optional[str] = None, use_compiled: Optional[bool] = None):
+        """
+        Initialize registry.
+
+        Args:
+            root: Registry directory (default: FORECAST_MODEL_DIR or <MODEL_DIR>/demand_forecast)
+            use_compiled: Load compiled exports when available (default: FORECAST_MODEL_COMPILED env, true)
+        """
+        self.root = Path(root or default_registry_dir())
+        if use_compiled is None:
+            use_compiled = os.getenv('FORECAST_MODEL_COMPILED', 'true').lower() == 'true'
+        self.use_compiled = use_compiled
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[float] = None
+        self._loaded: Dict[str, Tuple[Any, Any]] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Current manifest, re-read only when the file has changed on disk."""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return self._manifest
+
+        if mtime != self._manifest_mtime:
+            with self._lock:
+                try:
+                    with open(self.manifest_path, 'r') as f:
+                        self._manifest = json.load(f).get('models', {})
+                    self._manifest_mtime = mtime
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error reading model manifest {self.manifest_path}: {str(e)}")
+        return self._manifest
+
+    def save(self, model_version: str, model: Any, scaler: Any = None, region_id: Optional[str] = None,
+             metrics: Optional[Dict[str, Any]] = None, feature_columns: Optional[List[str]] = None):
+        """Persist one model version and record it in the manifest."""
+        self.save_many([{
+            'model_version': model_version,
+            'model': model,
+            'scaler': scaler,
+            'region_id': region_id,
+            'metrics': metrics or {},
+            'feature_columns': feature_columns,
+        }])
+
+    def save_many(self, entries: List[Dict[str, Any]], compile_models: bool = False):
+        """
+        Persist several model versions with a single manifest update.
+
+        The versions form one training run: model selection only considers a
+        region's latest run, and runs beyond RETAINED_RUNS are pruned.
+
+        Args:
+            entries: Dicts with model_version, model and optional scaler,
+                region_id, metrics and feature_columns
+            compile_models: Also write a compiled export for each version
+        """
+        if not entries:
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        records = {}
+        for entry in entries:
+            model_version = entry['model_version']
+            model_type = model_type_from_version(model_version)
+            version_dir = self.root / model_version
+            staging_dir = Path(tempfile.mkdtemp(prefix=f".{model_version}.", dir=self.root))
+            try:
+                files = {'model': self._write_model(model_type, entry['model'], staging_dir)}
+                if entry.get('scaler') is not None:
+                    files['scaler'] = self._write_joblib(entry['scaler'], staging_dir / 'scaler.joblib')
+                if compile_models:
+                    compiled = self._write_compiled(entry, staging_dir / COMPILED_FILE)
+                    if compiled:
+                        files['compiled'] = compiled
+                if version_dir.exists():
+                    shutil.rmtree(version_dir)
+                staging_dir.rename(version_dir)
+            except Exception:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+
+            metrics = entry.get('metrics') or {}
+            records[model_version] = {
+                'model_type': model_type,
+                'region_id': entry.get('region_id'),
+                'files': files,
+                'feature_columns': list(entry.get('feature_columns') or []),
+                'metrics': {k: float(v) for k, v in metrics.items() if isinstance(v, (int, float))},
+                'created_at': datetime.now().isoformat(),
+                'training_run': run_id,
+            }
+            self._loaded.pop(model_version, None)
+
+        with self._lock:
+            manifest = self._read_manifest_file()
+            manifest.update(records)
+            pruned = self._prune(manifest, {record['region_id'] for record in records.values()})
+            self._write_manifest_file(manifest)
+            self._manifest = manifest
+            self._manifest_mtime = self.manifest_path.stat().st_mtime
+
+        for model_version in pruned:
+            self._loaded.pop(model_version, None)
+            shutil.rmtree(self.root / model_version, ignore_errors=True)
+
+        logger.info(f"Registered {len(records)} model versions in {self.root}"
+                    + (f", pruned {len(pruned)} superseded versions" if pruned else ""))
+
+    @staticmethod
+    def _prune(manifest: Dict[str, Dict[str, Any]], regions: set) -> List[str]:
+        """Drop entries of the given regions outside their last RETAINED_RUNS runs (in place)."""
+        pruned = []
+        for region_id in regions:
+            versions = [version for version, entry in manifest.items() if entry.get('region_id') == region_id]
+            kept = sorted({training_run(manifest[version]) for version in versions}, reverse=True)[:RETAINED_RUNS]
+            for version in versions:
+                if training_run(manifest[version]) not in kept:
+                    del manifest[version]
+                    pruned.append(version)
+        return pruned
+
+    def load(self, model_version: str) -> Tuple[Any, Any]:
+        """
+        Load a model (and scaler, if any), caching it for later calls.
+
+        Returns:
+            Tuple of (model, scaler); scaler is None for tree boosters and
+            for compiled models, which apply their scaler themselves
+
+        Raises:
+            KeyError: If the version is not in the manifest
+        """
+        cached = self._loaded.get(model_version)
+        if cached is not None:
+            return cached
+
+        entry = self.manifest().get(model_version)
+        if entry is None:
+            raise KeyError(model_version)
+
+        version_dir = self.root / model_version
+        if self.use_compiled and 'compiled' in entry['files']:
+            model = self._read_compiled(version_dir / entry['files']['compiled'])
+            if model is not None:
+                self._loaded[model_version] = (model, None)
+                logger.info(f"Loaded compiled model {model_version} from registry")
+                return model, None
+
+        model = self._read_model(entry['model_type'], version_dir / entry['files']['model'])
+        scaler = None
+        if 'scaler' in entry['files']:
+            scaler = self._read_joblib(version_dir / entry['files']['scaler'])
+
+        self._loaded[model_version] = (model, scaler)
+        logger.info(f"Loaded model {model_version} from registry")
+        return model, scaler
+
+    def get(self, model_version: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a model version."""
+        return self.manifest().get(model_version)
+
+    def versions(self, region_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Manifest entries, optionally limited to one region."""
+        manifest = self.manifest()
+        if region_id is None:
+            return dict(manifest)
+        return {version: entry for version, entry in manifest.items() if entry.get('region_id') == region_id}
+
+    def best_model(self, region_id: str, metric: str = SELECTION_METRIC) -> Optional[str]:
+        """Version with the highest stored metric in a region's latest training run (newest wins ties)."""
+        versions = self.versions(region_id)
+        if not versions:
+            return None
+        latest_run = max(training_run(entry) for entry in versions.values())
+        candidates = {version: entry for version, entry in versions.items() if training_run(entry) == latest_run}
+        return max(
+            candidates,
+            key=lambda version: (candidates[version]['metrics'].get(metric, float('-inf')),
+                                 candidates[version].get('created_at', ''))
+        )
+
+    def _read_manifest_file(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f).get('models', {})
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest_file(self, manifest: Dict[str, Dict[str, Any]]):
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest.', dir=self.root)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'updated_at': datetime.now().isoformat(), 'models': manifest}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write_model(self, model_type: str, model: Any, directory: Path) -> str:
+        filename = MODEL_FORMATS.get(model_type, 'model.joblib')
+        if model_type in ('lightgbm', 'xgboost'):
+            model.save_model(str(directory / filename))
+        else:
+            self._write_joblib(model, directory / filename)
+        return filename
+
+    def _read_model(self, model_type: str, path: Path) -> Any:
+        if model_type == 'lightgbm':
+            import lightgbm as lgb
+            return lgb.Booster(model_file=str(path))
+        if model_type == 'xgboost':
+            import xgboost as xgb
+            booster = xgb.Booster()
+            booster.load_model(str(path))
+            return booster
+        return self._read_joblib(path)
+
+    @staticmethod
+    def _write_compiled(entry: Dict[str, Any], path: Path) -> Optional[str]:
+        from app.compiled_models import compile_model
+        try:
+            compiled = compile_model(entry['model'], entry.get('scaler'), feature_columns=entry.get('feature_columns'))
+            compiled.save(path)
+            return path.name
+        except Exception as e:
+            # The native model is still registered; serving falls back to it
+            logger.warning(f"Could not compile model {entry['model_version']}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _read_compiled(path: Path) -> Any:
+        from app.compiled_models import CompiledModel
+        try:
+            return CompiledModel.load(str(path))
+        except Exception as e:
+            logger.error(f"Error loading compiled model {path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _write_joblib(obj: Any, path: Path) -> str:
+        import joblib
+        joblib.dump(obj, path)
+        return path.name
+
+    @staticmethod
+    def _read_joblib(path: Path) -> Any:
+        import joblib
+        # Memory-map numpy arrays so forked API workers share pages
+        return joblib.load(path, mmap_mode='r')
+
+
+# Global registry instance
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the global model registry instance."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
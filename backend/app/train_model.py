@@ -9,10 +9,12 @@ that can be used for API inference.
 
 import os
 import json
+import time
 import pickle
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 import pandas as pd
@@ -24,6 +26,11 @@ from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import roc_auc_score
 import psycopg2
 
+try:
+    from app.compiled_models import compile_model, compiled_model_path
+except ImportError:
+    from compiled_models import compile_model, compiled_model_path
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,22 +38,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Feedback window used for training
+TRAINING_WINDOW_DAYS = 90
+
+# Minimum samples needed to train
+MIN_TRAINING_SAMPLES = 50
+
+# Engineered feature rows from previous runs, keyed by feedback row
+FEATURE_CACHE_FILE = "feature_cache"
+FEATURE_CACHE_KEY = ['lead_id', 'account_id', 'feedback_date']
+
+# Training runs kept in latest_model.json (time vs data size)
+TRAINING_HISTORY_LIMIT = 50
+
+
+def to_utc(value: datetime) -> datetime:
+    """A datetime as UTC-aware (naive values, e.g. from older metadata, are taken as UTC)."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def feedback_dates(values) -> pd.Series:
+    """Feedback timestamps as UTC-aware (created_at is TIMESTAMPTZ; naive values are taken as UTC)."""
+    return pd.to_datetime(values, utc=True)
+
+
+def parquet_available() -> bool:
+    """True if pandas can write Parquet (pyarrow or fastparquet installed)."""
+    return any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet'))
+
+
 class LeadMLTrainer:
-    def __init__(self, db_url: str):
-        """Initialize trainer with database connection."""
+    def __init__(self, db_url: str, warm_start_trees: int = 20, max_trees: int = 300,
+                 full_refresh_days: int = 7):
+        """
+        Initialize trainer with database connection.
+        
+        Args:
+            db_url: PostgreSQL connection string
+            warm_start_trees: Trees added per forest when warm-starting on new feedback
+            max_trees: Cap on trees per forest; the oldest are dropped beyond it
+            full_refresh_days: Incremental runs rebuild from scratch once the
+                feature cache is this old
+        """
         self.db_url = db_url
         self.model = None
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_columns = []
         self.model_version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.warm_start_trees = warm_start_trees
+        self.max_trees = max_trees
+        self.full_refresh_days = full_refresh_days
         
     def connect_db(self):
         """Create database connection."""
         return psycopg2.connect(self.db_url)
     
-    def load_training_data(self) -> pd.DataFrame:
-        """Load feedback and lead data for training."""
+    def load_training_data(self, since: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Load feedback and lead data for training.
+        
+        Args:
+            since: Only load feedback created after this time (the previous
+                model's watermark, whose rows are already cached); defaults
+                to the full window
+        """
         logger.info("Loading training data...")
         
         query = """
@@ -73,14 +129,16 @@ class LeadMLTrainer:
         LEFT JOIN leads l ON lf.lead_id = l.id
         LEFT JOIN cancellations c ON lf.account_id = c.account_id
         WHERE lf.created_at >= %s
+          AND (%s::timestamptz IS NULL OR lf.created_at > %s)
         ORDER BY lf.created_at DESC
         """
         
-        # Get data from last 90 days
-        cutoff_date = datetime.now() - timedelta(days=90)
+        # Get data from last 90 days (or since the watermark, if later)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=TRAINING_WINDOW_DAYS)
+        since = to_utc(since) if since is not None else None
         
         with self.connect_db() as conn:
-            df = pd.read_sql(query, conn, params=[cutoff_date])
+            df = pd.read_sql(query, conn, params=[cutoff_date, since, since])
         
         logger.info(f"Loaded {len(df)} feedback records")
         return df
@@ -89,8 +147,11 @@ class LeadMLTrainer:
         """Create features for ML training."""
         logger.info("Engineering features...")
         
+        feedback_date = feedback_dates(df['feedback_date'])
+        df['feedback_date'] = feedback_date
+        
         # Basic features from feedback
-        df['feedback_age_days'] = (datetime.now() - pd.to_datetime(df['feedback_date'])).dt.days
+        df['feedback_age_days'] = (datetime.now(timezone.utc) - feedback_date).dt.days
         
         # Rating-based features
         rating_mapping = {
@@ -111,17 +172,14 @@ class LeadMLTrainer:
         }
         df['estimated_deal_value'] = df['deal_band'].map(deal_band_mapping).fillna(0)
         
-        # Reason codes features (simplified)
-        df['has_contact_issues'] = df['reason_codes'].apply(
-            lambda x: 'contact' in str(x).lower() if x else False
-        )
-        df['has_qualification_issues'] = df['reason_codes'].apply(
-            lambda x: 'qualified' in str(x).lower() if x else False
-        )
+        # Reason codes features (simplified); empty/None codes never contain these words
+        reason_text = df['reason_codes'].astype(str).str.lower()
+        df['has_contact_issues'] = reason_text.str.contains('contact', regex=False)
+        df['has_qualification_issues'] = reason_text.str.contains('qualified', regex=False)
         
         # Time-based features
-        df['is_weekend_feedback'] = pd.to_datetime(df['feedback_date']).dt.weekday >= 5
-        df['feedback_hour'] = pd.to_datetime(df['feedback_date']).dt.hour
+        df['is_weekend_feedback'] = feedback_date.dt.weekday >= 5
+        df['feedback_hour'] = feedback_date.dt.hour
         
         # Cancellation-based features
         df['source_cancellation_rate'] = df['source_cancellation_rate'].fillna(0)
@@ -143,7 +201,7 @@ class LeadMLTrainer:
         df['lead_value_log'] = np.log1p(df['lead_value'])
         
         # Target variable
-        df['success'] = df['win_label'].fillna(df['rating'].isin(['quoted', 'won']))
+        df['success'] = df['win_label'].fillna(df['rating'].isin(['quoted', 'won'])).astype(bool)
         
         feature_cols = [
             'rating_numeric', 'estimated_deal_value', 'feedback_age_days',
@@ -155,7 +213,10 @@ class LeadMLTrainer:
         ]
         
         self.feature_columns = feature_cols
-        return df[feature_cols + ['success']].dropna()
+        
+        # Keep the feedback row key so engineered rows can be cached and merged
+        key_cols = [col for col in FEATURE_CACHE_KEY if col in df.columns]
+        return df[key_cols + feature_cols + ['success']].dropna(subset=feature_cols + ['success'])
     
     def train_model(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Train and calibrate the ML model."""
@@ -206,8 +267,14 @@ class LeadMLTrainer:
         logger.info(f"Model trained - Accuracy: {metrics['accuracy']:.3f}, AUC: {metrics['roc_auc']:.3f}")
         return metrics
     
-    def save_model(self, model_dir: str, metrics: Dict[str, Any]):
-        """Save trained model and metadata."""
+    def save_model(self, model_dir: str, metrics: Dict[str, Any], export_compiled: bool = False):
+        """
+        Save trained model and metadata.
+        
+        With export_compiled, the model and scaler are also compiled to a
+        numpy-only ``.npz`` file that LeadMLInference loads without
+        unpickling scikit-learn objects.
+        """
         model_path = Path(model_dir)
         model_path.mkdir(parents=True, exist_ok=True)
         
@@ -221,39 +288,243 @@ class LeadMLTrainer:
                 'metrics': metrics
             }, f)
         
+        latest = {
+            'model_file': str(model_file),
+            'model_version': self.model_version,
+            'metrics': metrics,
+            'training_history': self._training_history(model_path, metrics)
+        }
+        
+        # Optional compiled export; the pickled model stays the source of truth
+        if export_compiled:
+            try:
+                compiled = compile_model(self.model, self.scaler, feature_columns=self.feature_columns)
+                latest['compiled_model_file'] = compiled.save(compiled_model_path(model_file))
+                logger.info(f"Compiled model saved to {latest['compiled_model_file']}")
+            except Exception as e:
+                logger.warning(f"Compiled model export failed: {str(e)}")
+        
         # Save latest model reference
         latest_file = model_path / "latest_model.json"
         with open(latest_file, 'w') as f:
-            json.dump({
-                'model_file': str(model_file),
-                'model_version': self.model_version,
-                'metrics': metrics
-            }, f, indent=2)
+            json.dump(latest, f, indent=2)
         
         logger.info(f"Model saved to {model_file}")
         return str(model_file)
     
-    def run_training(self, model_dir: str = "./models") -> Dict[str, Any]:
-        """Run complete training pipeline."""
+    def _training_history(self, model_path: Path, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Previous runs' timing and data size records plus this run's."""
+        history = []
+        try:
+            with open(model_path / "latest_model.json", 'r') as f:
+                history = json.load(f).get('training_history', [])
+        except (OSError, ValueError):
+            pass
+        
+        if metrics.get('training_stats'):
+            history.append({'model_version': self.model_version, **metrics['training_stats']})
+        return history[-TRAINING_HISTORY_LIMIT:]
+    
+    def load_previous_model(self, model_dir: str) -> Optional[Dict[str, Any]]:
+        """Latest saved model and its metadata, or None if there is none."""
+        try:
+            with open(Path(model_dir) / "latest_model.json", 'r') as f:
+                metadata = json.load(f)
+            with open(metadata['model_file'], 'rb') as f:
+                model_data = pickle.load(f)
+            return {**model_data, 'metadata': metadata}
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError) as e:
+            logger.info(f"No previous model to continue from: {str(e)}")
+            return None
+    
+    def feature_cache_path(self, model_dir: str) -> Path:
+        """Parquet when an engine is installed, else pickle."""
+        suffix = '.parquet' if parquet_available() else '.pkl'
+        return Path(model_dir) / f"{FEATURE_CACHE_FILE}{suffix}"
+    
+    def load_feature_cache(self, model_dir: str) -> Optional[pd.DataFrame]:
+        """Engineered feature rows saved by the previous run."""
+        path = self.feature_cache_path(model_dir)
+        if not path.exists():
+            return None
+        try:
+            return pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feature cache {path}: {str(e)}")
+            return None
+    
+    def save_feature_cache(self, model_dir: str, features: pd.DataFrame):
+        """Persist engineered feature rows for the next incremental run."""
+        path = self.feature_cache_path(model_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        if path.suffix == '.parquet':
+            features.to_parquet(tmp_path, index=False)
+        else:
+            features.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    
+    def merge_features(self, cached: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+        """
+        Combine cached and new feature rows for the training window.
+        
+        New rows replace cached rows with the same feedback key, rows older
+        than the window are dropped, and feedback_age_days is recomputed.
+        """
+        frames = [frame for frame in (cached, new) if frame is not None and len(frame)]
+        if not frames:
+            return new
+        features = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].copy()
+        
+        features['feedback_date'] = feedback_dates(features['feedback_date'])
+        now = datetime.now(timezone.utc)
+        features = features[features['feedback_date'] >= now - timedelta(days=TRAINING_WINDOW_DAYS)]
+        features = features.drop_duplicates(subset=FEATURE_CACHE_KEY, keep='last')
+        features['feedback_age_days'] = (now - features['feedback_date']).dt.days
+        return features.reset_index(drop=True)
+    
+    def warm_start_model(self, previous: Dict[str, Any], new_features: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Continue the previous model on new feedback instead of retraining.
+        
+        Each calibrated forest grows warm_start_trees trees fitted on the new
+        rows (oldest trees beyond max_trees are dropped); the scaler and
+        isotonic calibrators are kept. Returns None when the previous model
+        cannot be warm-started (different features, an estimator without
+        warm_start, or new rows without both outcomes), so the caller
+        retrains from scratch.
+        """
+        if previous.get('feature_columns') != self.feature_columns:
+            return None
+        
+        model = previous['model']
+        forests = [
+            getattr(calibrated, 'estimator', None) or getattr(calibrated, 'base_estimator', None)
+            for calibrated in getattr(model, 'calibrated_classifiers_', [])
+        ]
+        if not forests or not all(hasattr(forest, 'warm_start') for forest in forests):
+            return None
+        
+        X = new_features[self.feature_columns]
+        y = new_features['success']
+        try:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=y
+            )
+        except ValueError:
+            return None
+        if y_train.nunique() < 2:
+            return None
+        
+        scaler = previous['scaler']
+        X_train_scaled = scaler.transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        
+        for forest in forests:
+            forest.set_params(warm_start=True, n_estimators=len(forest.estimators_) + self.warm_start_trees)
+            forest.fit(X_train_scaled, y_train)
+            if len(forest.estimators_) > self.max_trees:
+                forest.estimators_ = forest.estimators_[-self.max_trees:]
+                forest.n_estimators = self.max_trees
+            forest.set_params(warm_start=False)
+        
+        self.model = model
+        self.scaler = scaler
+        
+        y_prob = self.model.predict_proba(X_test_scaled)[:, 1]
+        metrics = {
+            'model_version': self.model_version,
+            'training_samples': len(X_train),
+            'test_samples': len(X_test),
+            'accuracy': self.model.score(X_test_scaled, y_test),
+            'roc_auc': roc_auc_score(y_test, y_prob) if y_test.nunique() > 1 else None,
+            'feature_importance': dict(zip(self.feature_columns, forests[0].feature_importances_)),
+            'training_date': datetime.now().isoformat(),
+            'warm_started_from': previous['metadata'].get('model_version'),
+            'trees_per_forest': len(forests[0].estimators_)
+        }
+        
+        logger.info(f"Model warm-started on {len(X_train)} new samples - Accuracy: {metrics['accuracy']:.3f}")
+        return metrics
+    
+    def run_training(self, model_dir: str = "./models", export_compiled: bool = False,
+                     incremental: bool = False) -> Dict[str, Any]:
+        """
+        Run complete training pipeline.
+        
+        Args:
+            model_dir: Directory for models, metadata and the feature cache
+            export_compiled: Also write a compiled (numpy-only) model export
+            incremental: Only load feedback since the previous model's
+                watermark, merge it with the cached feature matrix and
+                warm-start the previous model where possible
+        """
         try:
             logger.info("Starting ML training pipeline...")
+            started = time.perf_counter()
+            
+            previous = self.load_previous_model(model_dir) if incremental else None
+            previous_metrics = (previous or {}).get('metadata', {}).get('metrics', {})
+            watermark = previous_metrics.get('data_watermark')
+            cache_built_at = previous_metrics.get('feature_cache_built_at')
+            cached = self.load_feature_cache(model_dir) if watermark and cache_built_at else None
+            
+            refresh_due = cache_built_at is None or (
+                datetime.now(timezone.utc) - to_utc(datetime.fromisoformat(cache_built_at))
+                > timedelta(days=self.full_refresh_days)
+            )
+            mode = 'incremental' if cached is not None and not refresh_due else 'full'
+            if incremental and mode == 'full':
+                logger.info("No usable feature cache or refresh due; running a full rebuild")
             
             # Load and prepare data
-            df = self.load_training_data()
+            df = self.load_training_data(since=datetime.fromisoformat(watermark) if mode == 'incremental' else None)
+            load_seconds = time.perf_counter() - started
             
-            if len(df) < 50:  # Minimum samples needed
+            if mode == 'full' and len(df) < MIN_TRAINING_SAMPLES:
                 logger.warning(f"Insufficient training data: {len(df)} samples. Skipping training.")
                 return {'status': 'skipped', 'reason': 'insufficient_data', 'samples': len(df)}
+            if mode == 'incremental' and df.empty:
+                logger.info("No new feedback since the last model. Skipping training.")
+                return {'status': 'skipped', 'reason': 'no_new_data', 'samples': 0}
+            
+            df_new = self.engineer_features(df)
+            df_features = self.merge_features(cached if mode == 'incremental' else None, df_new)
+            feature_seconds = time.perf_counter() - started - load_seconds
             
-            df_features = self.engineer_features(df)
+            if len(df_features) < MIN_TRAINING_SAMPLES:
+                logger.warning(f"Insufficient training data: {len(df_features)} samples. Skipping training.")
+                return {'status': 'skipped', 'reason': 'insufficient_data', 'samples': len(df_features)}
             
-            # Train model
-            metrics = self.train_model(df_features)
+            # Train model: warm start on the new rows when enough arrived, else retrain on the window
+            metrics = None
+            if mode == 'incremental' and len(df_new) >= MIN_TRAINING_SAMPLES:
+                metrics = self.warm_start_model(previous, df_new)
+            training_mode = 'warm_start' if metrics else ('retrain' if mode == 'incremental' else 'full')
+            if metrics is None:
+                metrics = self.train_model(df_features)
+            fit_seconds = time.perf_counter() - started - load_seconds - feature_seconds
+            
+            metrics['data_watermark'] = feedback_dates(df_features['feedback_date']).max().isoformat()
+            metrics['feature_cache_built_at'] = (cache_built_at if mode == 'incremental'
+                                                 else datetime.now(timezone.utc).isoformat())
+            metrics['training_stats'] = {
+                'mode': training_mode,
+                'rows_total': len(df_features),
+                'rows_new': len(df_new),
+                'load_seconds': round(load_seconds, 3),
+                'feature_seconds': round(feature_seconds, 3),
+                'fit_seconds': round(fit_seconds, 3),
+                'total_seconds': round(time.perf_counter() - started, 3),
+                'training_date': datetime.now().isoformat()
+            }
             
-            # Save model
-            model_file = self.save_model(model_dir, metrics)
+            # Save model and the feature matrix for the next incremental run
+            model_file = self.save_model(model_dir, metrics, export_compiled)
+            self.save_feature_cache(model_dir, df_features)
             
-            logger.info("Training pipeline completed successfully")
+            logger.info(f"Training pipeline completed successfully ({training_mode}, "
+                        f"{len(df_new)} new / {len(df_features)} total rows)")
             return {
                 'status': 'success',
                 'model_file': model_file,
@@ -277,7 +548,9 @@ def main():
     
     # Run training
     model_dir = os.getenv('MODEL_DIR', './backend/models')
-    result = trainer.run_training(model_dir)
+    export_compiled = os.getenv('EXPORT_COMPILED_MODEL', 'false').lower() == 'true'
+    incremental = os.getenv('TRAINING_MODE', 'full').lower() == 'incremental'
+    result = trainer.run_training(model_dir, export_compiled, incremental)
     
     # Log results
     logger.info(f"Training result: {json.dumps(result, indent=2)}")
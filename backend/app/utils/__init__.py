@@ -3,15 +3,16 @@ Utility modules for the Home Services Lead Generation backend.
 
 This package provides various utility functions and services including:
 - Cache management (Redis)
-- Export control
+- Export control and streaming export engine
 - Notifications (Email/SMS)
 - Launch configuration
 - Pricing configuration  
 - Schedule configuration
 """
 
-from .cache import get_cache_service, CacheConfig, RedisCache
+from .cache import get_cache_service, CacheConfig, RedisCache, LRUTTLCache
 from .export_control import get_export_controller, ExportController, ExportType
+from .export_engine import get_export_engine, ExportEngine, ExportFormat
 from .notifications import get_notification_service, NotificationService, NotificationConfig
 from .launch_config import get_launch_manager, get_launch_config, LaunchManager, LaunchConfig
 from .pricing_config import get_pricing_manager, get_pricing_config, PricingManager, PricingConfig
@@ -22,11 +23,15 @@ __all__ = [
     'get_cache_service',
     'CacheConfig', 
     'RedisCache',
+    'LRUTTLCache',
     
     # Export control
     'get_export_controller',
     'ExportController',
     'ExportType',
+    'get_export_engine',
+    'ExportEngine',
+    'ExportFormat',
     
     # Notifications
     'get_notification_service',
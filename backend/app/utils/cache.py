@@ -3,13 +3,17 @@
 Redis cache utility for caching lead data and session storage.
 
 This module provides Redis-based caching functionality for improving
-performance of lead processing and API responses.
+performance of lead processing and API responses, plus a small in-process
+LRU/TTL cache for hot per-key lookups.
 """
 
 import os
 import json
 import logging
-from typing import Optional, Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Hashable, Iterable
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
@@ -298,6 +302,79 @@ class RedisCache:
             return 0
 
 
+class LRUTTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL.
+    
+    Used in front of per-key database lookups on hot paths; values are
+    returned as stored, so callers should not mutate them.
+    """
+    
+    _MISSING = object()
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING or entry[0] <= time.monotonic():
+                if entry is not self._MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            return entry is not self._MISSING and entry[0] > time.monotonic()
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def set_many(self, items: Dict[Hashable, Any], ttl: Optional[float] = None):
+        """Store several values with one lock acquisition."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns True if it was cached."""
+        with self._lock:
+            return self._data.pop(key, self._MISSING) is not self._MISSING
+    
+    def delete_many(self, keys: Iterable[Hashable]):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 # Global cache instance
 _cache_service = None
 
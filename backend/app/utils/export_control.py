@@ -46,6 +46,7 @@ class ExportResult:
     record_count: Optional[int] = None
     file_path: Optional[str] = None
     timestamp: Optional[datetime] = None
+    status: Optional[str] = None
 
 
 class ExportController:
@@ -158,24 +159,30 @@ class ExportController:
             
             return result
         
-        # Export is allowed, proceed with actual export
+        # Export is allowed, hand it to the export engine
+        self._submit_export_job(request, result)
+        
+        # Log the export attempt
+        self._log_export_attempt(request, result)
+        
+        return result
+    
+    def _submit_export_job(self, request: ExportRequest, result: ExportResult):
+        """Queue the export on the export engine and record the job on the result."""
         try:
-            # This would be where the actual export logic is implemented
-            # For now, we'll just mark it as successful
+            from .export_engine import get_export_engine
+            
+            job = get_export_engine().submit(request)
             result.success = True
-            result.record_count = 0  # Would be set by actual export logic
+            result.status = job.status
+            result.file_path = job.file_path
             
-            logger.info(f"Export {request.export_id} completed successfully")
+            logger.info(f"Export {request.export_id} queued successfully")
             
         except Exception as e:
             result.success = False
             result.reason = f"Export failed: {str(e)}"
             logger.error(f"Export {request.export_id} failed: {str(e)}")
-        
-        # Log the export attempt
-        self._log_export_attempt(request, result)
-        
-        return result
     
     def _log_export_attempt(self, request: ExportRequest, result: ExportResult):
         """Log export attempt for audit purposes."""
@@ -188,6 +195,7 @@ class ExportController:
             'success': result.success,
             'reason': result.reason,
             'record_count': result.record_count,
+            'status': result.status,
             'admin_override': request.parameters.get('admin_override', False),
             'user_id': request.parameters.get('user_id', 'unknown')
         }
@@ -258,19 +266,20 @@ class ExportController:
         Create a successful export result for admin override cases.
         
         This method bypasses the normal export permission checks and 
-        creates a successful result for admin override scenarios.
+        queues the export job for admin override scenarios.
         """
         result = ExportResult(
             export_id=request.export_id,
-            success=True,
+            success=False,
             allowed=True,
             reason="Admin override authorized",
-            record_count=0,  # Would be set by actual export logic
             timestamp=datetime.now(timezone.utc)
         )
         
+        self._submit_export_job(request, result)
+        
         # Log the admin override export
-        logger.info(f"Admin override export {request.export_id} completed successfully")
+        logger.info(f"Admin override export {request.export_id} submitted")
         
         # Log the export attempt for audit
         self._log_export_attempt(request, result)
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Streaming export engine for data exports.
+
+This module implements the actual export work behind ExportController:
+rows are streamed from Postgres with a server-side (named) cursor and
+written incrementally as gzip CSV, NDJSON or Parquet to local object
+storage, so an export never materializes the full result set in memory.
+Jobs run on a small thread pool and their status is published through
+RedisCache.cache_export_result so any API worker can report on them.
+"""
+
+import os
+import io
+import csv
+import gzip
+import json
+import zlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, date, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator, Iterable, Tuple, Callable
+
+from .export_control import ExportType, ExportRequest
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ExportFormat(Enum):
+    """Supported export file formats."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ExportJobStatus(Enum):
+    """Lifecycle states for an export job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# File extension and media type for each format
+FORMAT_EXTENSIONS = {
+    ExportFormat.CSV: ".csv.gz",
+    ExportFormat.NDJSON: ".ndjson.gz",
+    ExportFormat.PARQUET: ".parquet",
+}
+
+FORMAT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    """SQL source definition for an export type."""
+    table: str
+    order_by: str
+    timestamp_column: str
+    filter_columns: Tuple[str, ...] = ()
+
+
+# Whitelisted sources per export type. Filters are only applied to the
+# listed columns so user-supplied filter keys never reach the SQL text.
+EXPORT_SOURCES: Dict[ExportType, ExportSource] = {
+    ExportType.LEADS: ExportSource(
+        table="leads",
+        order_by="id",
+        timestamp_column="created_at",
+        filter_columns=("jurisdiction", "state", "category", "status", "region_id"),
+    ),
+    ExportType.PERMITS: ExportSource(
+        table="permits",
+        order_by="id",
+        timestamp_column="created_at",
+        filter_columns=("jurisdiction", "county", "status", "permit_type"),
+    ),
+    ExportType.SCORED_LEADS: ExportSource(
+        table="gold.lead_scores",
+        order_by="lead_id, version",
+        timestamp_column="created_at",
+        filter_columns=("version",),
+    ),
+    ExportType.ANALYTICS: ExportSource(
+        table="lead_outcomes",
+        order_by="lead_id",
+        timestamp_column="updated_at",
+    ),
+    ExportType.FEEDBACK: ExportSource(
+        table="lead_feedback",
+        order_by="id",
+        timestamp_column="created_at",
+        filter_columns=("account_id", "rating"),
+    ),
+}
+
+
+@dataclass
+class ExportJob:
+    """Status record for a queued or finished export job."""
+    export_id: str
+    export_type: str
+    format: str
+    requester: str
+    status: str = ExportJobStatus.QUEUED.value
+    record_count: int = 0
+    bytes_written: int = 0
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    completed_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def parse_export_format(value: Optional[str]) -> ExportFormat:
+    """
+    Parse a user-supplied format string.
+
+    Args:
+        value: Format name (csv, ndjson, json or parquet); defaults to csv
+
+    Returns:
+        ExportFormat
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    normalized = (value or "csv").lower()
+    if normalized == "json":
+        normalized = "ndjson"
+    return ExportFormat(normalized)
+
+
+def build_export_query(export_type: ExportType, filters: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the SELECT statement for an export.
+
+    Supported filters are ``since``/``until`` (applied to the source's
+    timestamp column), equality on the whitelisted filter columns and
+    ``limit``. Unknown filter keys are ignored.
+
+    Args:
+        export_type: Type of export
+        filters: Optional filter dictionary from the export request
+
+    Returns:
+        Tuple of (sql, params)
+    """
+    source = EXPORT_SOURCES[export_type]
+    filters = filters or {}
+    conditions: List[str] = []
+    params: Dict[str, Any] = {}
+
+    if filters.get("since"):
+        conditions.append(f"{source.timestamp_column} >= %(since)s")
+        params["since"] = filters["since"]
+    if filters.get("until"):
+        conditions.append(f"{source.timestamp_column} < %(until)s")
+        params["until"] = filters["until"]
+
+    for column in source.filter_columns:
+        if filters.get(column) is not None:
+            conditions.append(f"{column} = %({column})s")
+            params[column] = filters[column]
+
+    sql = f"SELECT * FROM {source.table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {source.order_by}"
+
+    if filters.get("limit") is not None:
+        sql += " LIMIT %(limit)s"
+        params["limit"] = int(filters["limit"])
+
+    return sql, params
+
+
+def _to_text(value: Any) -> Any:
+    """Convert database values into JSON/CSV friendly scalars."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+class _CsvEncoder:
+    """Encode row batches as CSV text."""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def header(self, columns: List[str]) -> bytes:
+        return self._encode([columns])
+
+    def rows(self, columns: List[str], rows: Iterable[tuple]) -> bytes:
+        return self._encode(([_to_text(v) for v in row] for row in rows))
+
+    def _encode(self, rows: Iterable[List[Any]]) -> bytes:
+        self._writer.writerows(rows)
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return data
+
+
+class _NdjsonEncoder:
+    """Encode row batches as newline-delimited JSON."""
+
+    def header(self, columns: List[str]) -> bytes:
+        return b""
+
+    def rows(self, columns: List[str], rows: Iterable[tuple]) -> bytes:
+        lines = [
+            json.dumps({col: _to_text(v) for col, v in zip(columns, row)}, separators=(",", ":"))
+            for row in rows
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+class ExportEngine:
+    """Runs export jobs by streaming database rows into files or responses."""
+
+    def __init__(
+        self,
+        db_url: Optional[str] = None,
+        storage_dir: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        cache=None,
+        connect: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initialize the export engine.
+
+        Args:
+            db_url: Postgres connection URL (defaults to DATABASE_URL)
+            storage_dir: Directory used as local object storage (EXPORT_STORAGE_DIR)
+            batch_size: Rows fetched per server-side cursor round trip (EXPORT_BATCH_SIZE)
+            max_workers: Concurrent export jobs (EXPORT_MAX_WORKERS)
+            cache: RedisCache used to publish job status (defaults to global cache)
+            connect: Optional connection factory, used instead of psycopg2.connect
+        """
+        self.db_url = db_url or os.getenv('DATABASE_URL')
+        self.storage_dir = Path(storage_dir or os.getenv('EXPORT_STORAGE_DIR', 'exports'))
+        self.batch_size = batch_size or int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+        self.max_workers = max_workers or int(os.getenv('EXPORT_MAX_WORKERS', '2'))
+        self._cache = cache
+        self._connect = connect
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ----- connection and row streaming -----
+
+    def _get_cache(self):
+        if self._cache is None:
+            from .cache import get_cache_service
+            self._cache = get_cache_service()
+        return self._cache
+
+    def connect_db(self):
+        """Create database connection."""
+        if self._connect is not None:
+            return self._connect()
+        if not self.db_url:
+            raise RuntimeError("DATABASE_URL environment variable not set")
+        import psycopg2
+        return psycopg2.connect(self.db_url)
+
+    def iter_batches(
+        self,
+        export_type: ExportType,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor_name: str = "export_cursor",
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Stream rows for an export in batches using a server-side cursor.
+
+        Args:
+            export_type: Type of export
+            filters: Optional export filters
+            cursor_name: Name of the server-side cursor
+
+        Yields:
+            Tuples of (column_names, rows) with at most batch_size rows each
+        """
+        sql, params = build_export_query(export_type, filters)
+        conn = self.connect_db()
+        try:
+            # Named cursors live inside a transaction on the server and only
+            # ship itersize rows per round trip.
+            cur = conn.cursor(name=cursor_name)
+            cur.itersize = self.batch_size
+            cur.execute(sql, params)
+            columns: Optional[List[str]] = None
+            while True:
+                rows = cur.fetchmany(self.batch_size)
+                if columns is None and cur.description is not None:
+                    columns = [desc[0] for desc in cur.description]
+                if not rows:
+                    break
+                yield columns or [], rows
+            cur.close()
+        finally:
+            conn.close()
+
+    # ----- streaming responses -----
+
+    def stream(
+        self,
+        export_type: ExportType,
+        export_format: ExportFormat,
+        filters: Optional[Dict[str, Any]] = None,
+        compress: bool = True,
+    ) -> Iterator[bytes]:
+        """
+        Stream an export as encoded bytes, suitable for a StreamingResponse.
+
+        Only row-oriented formats (CSV, NDJSON) can be streamed; Parquet
+        needs a seekable file and is only available through export jobs.
+
+        Args:
+            export_type: Type of export
+            export_format: Output format
+            filters: Optional export filters
+            compress: Gzip-compress the stream
+
+        Yields:
+            Encoded chunks, one per fetched batch
+        """
+        if export_format == ExportFormat.PARQUET:
+            raise ValueError("Parquet exports cannot be streamed; submit an export job instead")
+
+        encoder = _CsvEncoder() if export_format == ExportFormat.CSV else _NdjsonEncoder()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+        wrote_header = False
+        for columns, rows in self.iter_batches(export_type, filters, cursor_name="export_stream"):
+            data = b""
+            if not wrote_header:
+                data += encoder.header(columns)
+                wrote_header = True
+            data += encoder.rows(columns, rows)
+            if compressor:
+                # Sync-flush each batch so clients receive data as it is fetched
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+
+        if compressor:
+            yield compressor.flush()
+
+    # ----- file jobs -----
+
+    def job_path(self, export_id: str, export_type: ExportType, export_format: ExportFormat) -> Path:
+        """Return the storage path for an export job's output file."""
+        return self.storage_dir / export_type.value / f"{export_id}{FORMAT_EXTENSIONS[export_format]}"
+
+    def submit(self, request: ExportRequest) -> ExportJob:
+        """
+        Queue an export job for background processing.
+
+        Args:
+            request: Export request (parameters may contain format and filters)
+
+        Returns:
+            ExportJob in the queued state
+        """
+        export_format = parse_export_format(request.parameters.get('format'))
+        job = ExportJob(
+            export_id=request.export_id,
+            export_type=request.export_type.value,
+            format=export_format.value,
+            requester=request.requester,
+            file_path=str(self.job_path(request.export_id, request.export_type, export_format)),
+        )
+        self._update_job(job)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="export"
+                )
+            executor = self._executor
+        executor.submit(self.run_job, request)
+
+        logger.info(f"Export {request.export_id} queued ({job.export_type}, {job.format})")
+        return job
+
+    def run_job(self, request: ExportRequest) -> ExportJob:
+        """
+        Run an export job to completion, writing output to local storage.
+
+        The file is written to a temporary path and renamed on success so a
+        partially written export is never served.
+
+        Args:
+            request: Export request to run
+
+        Returns:
+            Final ExportJob state
+        """
+        export_format = parse_export_format(request.parameters.get('format'))
+        path = self.job_path(request.export_id, request.export_type, export_format)
+        job = self.get_job(request.export_id) or ExportJob(
+            export_id=request.export_id,
+            export_type=request.export_type.value,
+            format=export_format.value,
+            requester=request.requester,
+            file_path=str(path),
+        )
+        job.status = ExportJobStatus.RUNNING.value
+        self._update_job(job)
+
+        tmp_path = path.with_name(path.name + ".part")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            batches = self.iter_batches(
+                request.export_type,
+                request.parameters.get('filters'),
+                cursor_name=f"export_{request.export_id.replace('-', '')}",
+            )
+            if export_format == ExportFormat.PARQUET:
+                record_count = self._write_parquet(tmp_path, batches)
+            else:
+                record_count = self._write_gzip(tmp_path, batches, export_format)
+            os.replace(tmp_path, path)
+
+            job.status = ExportJobStatus.COMPLETED.value
+            job.record_count = record_count
+            job.bytes_written = path.stat().st_size
+            logger.info(
+                f"AUDIT: Export job completed - export_id={job.export_id} "
+                f"type={job.export_type} records={record_count} requester={job.requester}"
+            )
+        except Exception as e:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            job.status = ExportJobStatus.FAILED.value
+            job.error = str(e)
+            logger.error(f"AUDIT: Export job failed - export_id={job.export_id} error={str(e)}")
+
+        job.completed_at = datetime.now(timezone.utc).isoformat()
+        self._update_job(job)
+        return job
+
+    def _write_gzip(
+        self,
+        path: Path,
+        batches: Iterable[Tuple[List[str], List[tuple]]],
+        export_format: ExportFormat,
+    ) -> int:
+        """Write batches as gzip CSV or NDJSON, returning the row count."""
+        encoder = _CsvEncoder() if export_format == ExportFormat.CSV else _NdjsonEncoder()
+        record_count = 0
+        with gzip.open(path, "wb") as fh:
+            wrote_header = False
+            for columns, rows in batches:
+                if not wrote_header:
+                    fh.write(encoder.header(columns))
+                    wrote_header = True
+                fh.write(encoder.rows(columns, rows))
+                record_count += len(rows)
+        return record_count
+
+    def _write_parquet(self, path: Path, batches: Iterable[Tuple[List[str], List[tuple]]]) -> int:
+        """Write batches as Parquet row groups, returning the row count."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("pyarrow is required for Parquet exports")
+
+        writer = None
+        record_count = 0
+        try:
+            for columns, rows in batches:
+                data = {col: [_to_text(row[i]) for row in rows] for i, col in enumerate(columns)}
+                if writer is None:
+                    # Columns that are entirely NULL in the first batch are
+                    # typed as strings so later batches can be cast to them.
+                    inferred = pa.Table.from_pydict(data).schema
+                    schema = pa.schema([
+                        pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                        for f in inferred
+                    ])
+                    table = pa.Table.from_pydict(data, schema=schema)
+                    writer = pq.ParquetWriter(str(path), schema, compression="snappy")
+                else:
+                    table = pa.Table.from_pydict(data, schema=writer.schema)
+                writer.write_table(table)
+                record_count += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            # Empty result: still produce a valid (schema-less) file
+            pq.write_table(pa.table({}), str(path))
+        return record_count
+
+    # ----- job status -----
+
+    def _update_job(self, job: ExportJob):
+        with self._lock:
+            self._jobs[job.export_id] = job
+        self._get_cache().cache_export_result(job.export_id, job.to_dict())
+
+    def get_job(self, export_id: str) -> Optional[ExportJob]:
+        """
+        Look up an export job, checking this process first and then the cache.
+
+        Args:
+            export_id: Export job ID
+
+        Returns:
+            ExportJob if known, None otherwise
+        """
+        with self._lock:
+            job = self._jobs.get(export_id)
+        if job is not None:
+            return job
+
+        cached = self._get_cache().get_cached_export_result(export_id)
+        if cached:
+            cached.pop('cached_at', None)
+            return ExportJob(**cached)
+        return None
+
+    def shutdown(self, wait: bool = True):
+        """Stop the job executor."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Global export engine instance
+_export_engine = None
+
+def get_export_engine() -> ExportEngine:
+    """Get the global export engine instance."""
+    global _export_engine
+    if _export_engine is None:
+        _export_engine = ExportEngine()
+    return _export_engine
@@ -111,44 +111,46 @@ class WeeklyInferenceJob:
             return []
     
     async def _generate_region_forecasts(self, regions: List[Dict[str, Any]], target_date: date) -> Dict[str, List]:
-        """Generate forecasts for all regions"""
+        """Generate forecasts for all regions with one batched inference pass"""
         successful = []
         failed = []
         
+        regions_by_id = {region['id']: region for region in regions if region.get('id')}
+        
+        try:
+            forecasts, errors = self.forecaster.generate_forecasts_batch(list(regions_by_id), target_date)
+        except Exception as e:
+            logger.error(f"Batch forecast generation failed: {str(e)}")
+            forecasts, errors = {}, {region_id: str(e) for region_id in regions_by_id}
+        
         for region in regions:
-            try:
-                region_id = region['id']
-                region_slug = region['slug']
-                region_name = region['name']
-                
-                logger.info(f"Generating forecast for {region_slug}")
-                
-                # Generate forecast
-                forecast_result = self.forecaster.generate_forecast(region_id, target_date)
-                
-                # Add region metadata
-                forecast_result['region_id'] = region_id
-                forecast_result['region_slug'] = region_slug
-                forecast_result['region_name'] = region_name
-                
-                successful.append({
+            region_id = region.get('id')
+            region_slug = region.get('slug', 'unknown')
+            region_name = region.get('name', 'unknown')
+            forecast_result = forecasts.get(region_id)
+            
+            if forecast_result is None:
+                error = errors.get(region_id, 'Region has no id')
+                logger.error(f"Failed to generate forecast for {region_slug}: {error}")
+                failed.append({
                     'region_slug': region_slug,
                     'region_name': region_name,
-                    'forecast': forecast_result
-                })
-                
-                logger.info(f"Generated forecast for {region_slug}: p_surge={forecast_result['p_surge']:.3f}")
-                
-            except Exception as e:
-                error_msg = f"Failed to generate forecast for {region.get('slug', 'unknown')}: {str(e)}"
-                logger.error(error_msg)
-                
-                failed.append({
-                    'region_slug': region.get('slug', 'unknown'),
-                    'region_name': region.get('name', 'unknown'),
-                    'error': str(e)
+                    'error': error
                 })
+                continue
+            
+            # Add region metadata
+            forecast_result['region_id'] = region_id
+            forecast_result['region_slug'] = region_slug
+            forecast_result['region_name'] = region_name
+            
+            successful.append({
+                'region_slug': region_slug,
+                'region_name': region_name,
+                'forecast': forecast_result
+            })
         
+        logger.info(f"Generated {len(successful)} forecasts ({len(failed)} failed)")
         return {'successful': successful, 'failed': failed}
     
     async def _update_gold_forecasts(self, forecast_results: Dict[str, List], target_date: date):
@@ -160,26 +162,17 @@ class WeeklyInferenceJob:
             
             gold_records = []
             
+            # Get prior year comparisons for all regions at once
+            prior_year_date = week_start - timedelta(days=365)
+            prior_year = self._get_prior_year_p_surge(
+                [result['region_slug'] for result in forecast_results['successful']], prior_year_date
+            )
+            
             for result in forecast_results['successful']:
                 forecast = result['forecast']
                 region_slug = result['region_slug']
                 region_name = result['region_name']
-                
-                # Get prior year comparison if available
-                prior_year_date = week_start - timedelta(days=365)
-                prior_query = f"""
-                    SELECT p_surge FROM gold.forecast_nowx 
-                    WHERE region_slug = '{region_slug}' 
-                        AND forecast_week_start = '{prior_year_date}'
-                    ORDER BY last_updated DESC
-                    LIMIT 1
-                """
-                
-                try:
-                    prior_result = self.supabase.rpc('sql_query', {'query': prior_query}).execute()
-                    prior_year_p_surge = prior_result.data[0]['p_surge'] if prior_result.data else None
-                except:
-                    prior_year_p_surge = None
+                prior_year_p_surge = prior_year.get(region_slug)
                 
                 # Calculate change percentage
                 surge_risk_change_pct = None
@@ -233,6 +226,30 @@ class WeeklyInferenceJob:
             logger.error(f"Error updating gold forecasts: {str(e)}")
             raise
     
+    def _get_prior_year_p_surge(self, region_slugs: List[str], prior_year_date: date) -> Dict[str, float]:
+        """Latest prior-year surge probability per region slug, in one query"""
+        if not region_slugs:
+            return {}
+        
+        slug_list = ", ".join(f"'{slug}'" for slug in region_slugs)
+        prior_query = f"""
+            SELECT DISTINCT ON (region_slug) region_slug, p_surge FROM gold.forecast_nowx 
+            WHERE region_slug IN ({slug_list}) 
+                AND forecast_week_start = '{prior_year_date}'
+            ORDER BY region_slug, last_updated DESC
+        """
+        
+        try:
+            prior_result = self.supabase.rpc('sql_query', {'query': prior_query}).execute()
+        except Exception as e:
+            logger.warning(f"Error getting prior year forecasts: {str(e)}")
+            return {}
+        
+        prior_year = {}
+        for row in prior_result.data or []:
+            prior_year.setdefault(row['region_slug'], row['p_surge'])
+        return prior_year
+    
     def _get_risk_level(self, p_surge: float) -> str:
         """Convert surge probability to risk level"""
         if p_surge >= 0.7:
@@ -18,7 +18,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from fastapi import FastAPI, HTTPException, Request, Depends, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse, FileResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -57,6 +57,9 @@ except ImportError:
 
 # Import export control
 from app.utils.export_control import get_export_controller, ExportType
+from app.utils.export_engine import (
+    get_export_engine, parse_export_format, ExportFormat, ExportJobStatus, FORMAT_MEDIA_TYPES
+)
 
 
 
@@ -197,7 +200,7 @@ def verify_metrics_auth(authorization: str = Header(None)) -> bool:
 
 class ExportDataRequest(BaseModel):
     export_type: str  # leads, permits, scored_leads, analytics, feedback
-    format: Optional[str] = "csv"  # csv, json, xlsx
+    format: Optional[str] = "csv"  # csv, ndjson (json), parquet
     filters: Optional[Dict[str, Any]] = None
     admin_override: Optional[bool] = False
 
@@ -486,6 +489,74 @@ async def get_cancellation_records(request: Request, admin_user_id: str = Query(
         logger.error(f"Error getting cancellation records: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _authorize_export(request: ExportDataRequest, user: AuthUser):
+    """
+    Validate an export request and enforce ALLOW_EXPORTS / admin override.
+
+    Returns:
+        Tuple of (export_type, export_format, is_admin_override)
+
+    Raises:
+        HTTPException: 400 for invalid type/format, 403 when not allowed
+    """
+    export_controller = get_export_controller()
+    
+    # Validate export type
+    try:
+        export_type = ExportType(request.export_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid export_type: {request.export_type}"
+        )
+    
+    # Validate export format
+    try:
+        export_format = parse_export_format(request.format)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format: {request.format}"
+        )
+    
+    # Check if this is an admin override request first
+    is_admin_override = False
+    if request.admin_override:
+        # Verify user has admin privileges for override
+        try:
+            admin_user(user)  # This will raise HTTPException if not admin
+            is_admin_override = True
+            logger.info(f"Admin override requested by {user.email} for {export_type.value}")
+        except HTTPException:
+            # User is not admin but requested override
+            logger.warning(f"Non-admin user {user.email} attempted admin override for export")
+            raise HTTPException(
+                status_code=403,
+                detail="Admin privileges required for export override"
+            )
+    
+    # Check if export is allowed (skip normal check if admin override)
+    if is_admin_override:
+        allowed = True
+        reason = f"Admin override by {user.email}"
+        logger.info(f"Export allowed via admin override: {user.email} exporting {export_type.value}")
+    else:
+        allowed, reason = export_controller.is_export_allowed(
+            export_type, 
+            user.email,
+            request.filters
+        )
+    
+    if not allowed:
+        # Log blocked export attempt for audit
+        logger.warning(f"Export blocked for {user.email}: {reason}")
+        raise HTTPException(
+            status_code=403,
+            detail=f"Export not allowed: {reason}"
+        )
+    
+    return export_type, export_format, is_admin_override
+
 @app.post("/api/export/data")
 async def export_data(request: ExportDataRequest, user: AuthUser = Depends(auth_user)):
     """
@@ -496,62 +567,20 @@ async def export_data(request: ExportDataRequest, user: AuthUser = Depends(auth_
     1. ALLOW_EXPORTS=true in environment, OR
     2. User has admin role and explicitly requests admin_override=true
     
+    Allowed exports are queued as background jobs; poll the returned
+    status_url and fetch the file from download_url once completed.
     All export attempts are logged for audit purposes.
     """
     try:
         export_controller = get_export_controller()
-        
-        # Validate export type
-        try:
-            export_type = ExportType(request.export_type)
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid export_type: {request.export_type}"
-            )
-        
-        # Check if this is an admin override request first
-        is_admin_override = False
-        if request.admin_override:
-            # Verify user has admin privileges for override
-            try:
-                admin_user(user)  # This will raise HTTPException if not admin
-                is_admin_override = True
-                logger.info(f"Admin override requested by {user.email} for {export_type.value}")
-            except HTTPException:
-                # User is not admin but requested override
-                logger.warning(f"Non-admin user {user.email} attempted admin override for export")
-                raise HTTPException(
-                    status_code=403,
-                    detail="Admin privileges required for export override"
-                )
-        
-        # Check if export is allowed (skip normal check if admin override)
-        if is_admin_override:
-            allowed = True
-            reason = f"Admin override by {user.email}"
-            logger.info(f"Export allowed via admin override: {user.email} exporting {export_type.value}")
-        else:
-            allowed, reason = export_controller.is_export_allowed(
-                export_type, 
-                user.email,
-                request.filters
-            )
-        
-        if not allowed:
-            # Log blocked export attempt for audit
-            logger.warning(f"Export blocked for {user.email}: {reason}")
-            raise HTTPException(
-                status_code=403,
-                detail=f"Export not allowed: {reason}"
-            )
+        export_type, export_format, is_admin_override = _authorize_export(request, user)
         
         # Create and process export request
         export_request = export_controller.create_export_request(
             export_type=export_type,
             requester=user.email,
             parameters={
-                "format": request.format,
+                "format": export_format.value,
                 "filters": request.filters,
                 "admin_override": request.admin_override,
                 "user_id": user.account_id,
@@ -561,7 +590,7 @@ async def export_data(request: ExportDataRequest, user: AuthUser = Depends(auth_
         
         # Process the export (skip is_export_allowed check if admin override)
         if is_admin_override:
-            # For admin override, manually create a successful result
+            # For admin override, queue the job without the permission check
             result = export_controller._create_admin_override_result(export_request)
         else:
             # Normal processing
@@ -574,10 +603,13 @@ async def export_data(request: ExportDataRequest, user: AuthUser = Depends(auth_
             )
         
         return {
-            "message": "Export completed successfully",
+            "message": "Export queued successfully",
             "export_id": result.export_id,
             "export_type": export_type.value,
-            "record_count": result.record_count,
+            "format": export_format.value,
+            "status": result.status,
+            "status_url": f"/api/export/jobs/{result.export_id}",
+            "download_url": f"/api/export/jobs/{result.export_id}/download",
             "allowed_via": "admin_override" if is_admin_override else "normal_permissions",
             "timestamp": result.timestamp.isoformat() if result.timestamp else None
         }
@@ -589,6 +621,104 @@ async def export_data(request: ExportDataRequest, user: AuthUser = Depends(auth_
         logger.error(f"Unexpected error in export endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/api/export/stream")
+async def export_stream(request: ExportDataRequest, user: AuthUser = Depends(auth_user)):
+    """
+    Stream an export directly in the response body.
+    
+    Applies the same ALLOW_EXPORTS / admin override rules as /api/export/data.
+    Rows are read with a server-side cursor and sent as gzip CSV or NDJSON
+    chunks as they are fetched, so large exports never sit in memory.
+    """
+    try:
+        export_type, export_format, is_admin_override = _authorize_export(request, user)
+        
+        if export_format == ExportFormat.PARQUET:
+            raise HTTPException(
+                status_code=400,
+                detail="Parquet exports cannot be streamed; use /api/export/data"
+            )
+        
+        logger.info(
+            f"AUDIT: Export stream started - requester={user.email} type={export_type.value} "
+            f"format={export_format.value} admin_override={is_admin_override}"
+        )
+        
+        filename = f"{export_type.value}.{export_format.value}"
+        return StreamingResponse(
+            get_export_engine().stream(export_type, export_format, request.filters),
+            media_type=FORMAT_MEDIA_TYPES[export_format],
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in export stream endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def _get_owned_export_job(export_id: str, user: AuthUser):
+    """Return an export job visible to the user, raising 404 otherwise."""
+    job = get_export_engine().get_job(export_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    
+    if job.requester != user.email:
+        try:
+            admin_user(user)
+        except HTTPException:
+            raise HTTPException(status_code=404, detail="Export job not found")
+    
+    return job
+
+@app.get("/api/export/jobs/{export_id}")
+async def get_export_job(export_id: str, user: AuthUser = Depends(auth_user)):
+    """
+    Get the status of a queued export job.
+    
+    Only the requester (or an admin) can see a job.
+    """
+    job = _get_owned_export_job(export_id, user)
+    return {
+        "export_id": job.export_id,
+        "export_type": job.export_type,
+        "format": job.format,
+        "status": job.status,
+        "record_count": job.record_count,
+        "bytes_written": job.bytes_written,
+        "error": job.error,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at,
+        "download_url": f"/api/export/jobs/{job.export_id}/download"
+            if job.status == ExportJobStatus.COMPLETED.value else None
+    }
+
+@app.get("/api/export/jobs/{export_id}/download")
+async def download_export_job(export_id: str, user: AuthUser = Depends(auth_user)):
+    """
+    Download the output file of a completed export job.
+    """
+    job = _get_owned_export_job(export_id, user)
+    
+    if job.status != ExportJobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Export job is {job.status}"
+        )
+    
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=410, detail="Export file is no longer available")
+    
+    logger.info(f"AUDIT: Export downloaded - export_id={job.export_id} requester={user.email}")
+    return FileResponse(
+        job.file_path,
+        filename=os.path.basename(job.file_path),
+        media_type="application/octet-stream"
+    )
+
 @app.get("/api/export/status")
 async def get_export_status(user: AuthUser = Depends(auth_user)):
     """
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark native vs compiled inference for lead and surge models.
+
+Trains the lead model (StandardScaler + isotonic-calibrated RandomForest,
+as in train_model.py) and the three demand surge model types on synthetic
+data, compiles each with app.compiled_models, checks prediction parity and
+times single-row and 10k-row predict calls through both paths. Cold load
+times (fresh interpreter: import + load + first prediction) show the import
+cost the compiled path avoids.
+
+Usage:
+    python scripts/benchmark_compiled_inference.py --rows 1 10000 --runs 20
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lightgbm as lgb  # noqa: E402
+import xgboost as xgb  # noqa: E402
+from sklearn.calibration import CalibratedClassifierCV  # noqa: E402
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+
+from app.compiled_models import compile_model  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_data(samples: int, features: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(samples, features))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, samples) > 0).astype(int)
+    return X, y
+
+
+def train_models(X: np.ndarray, y: np.ndarray):
+    """Native predict functions and compiled models, keyed by model name."""
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+
+    lead = CalibratedClassifierCV(
+        RandomForestClassifier(n_estimators=100, max_depth=10, min_samples_split=5, min_samples_leaf=2,
+                               random_state=42),
+        method='isotonic', cv=3
+    ).fit(X_scaled, y)
+    gradient_boost = CalibratedClassifierCV(
+        GradientBoostingClassifier(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42),
+        method='isotonic', cv=3
+    ).fit(X_scaled, y)
+    lightgbm = lgb.train({'objective': 'binary', 'num_leaves': 31, 'learning_rate': 0.05, 'verbose': -1},
+                         lgb.Dataset(X, y), num_boost_round=100)
+    xgboost = xgb.train({'objective': 'binary:logistic', 'max_depth': 6, 'learning_rate': 0.1},
+                        xgb.DMatrix(X, label=y), num_boost_round=100)
+
+    return {
+        'lead (calibrated RF)': (lambda rows: lead.predict_proba(scaler.transform(rows))[:, 1],
+                                 compile_model(lead, scaler), (lead, scaler)),
+        'surge gradient_boost': (lambda rows: gradient_boost.predict_proba(scaler.transform(rows))[:, 1],
+                                 compile_model(gradient_boost, scaler), (gradient_boost, scaler)),
+        'surge lightgbm': (lambda rows: lightgbm.predict(rows), compile_model(lightgbm), None),
+        'surge xgboost': (lambda rows: xgboost.predict(xgb.DMatrix(rows)), compile_model(xgboost), None),
+    }
+
+
+def median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def cold_load_ms(script: str) -> float:
+    """Wall time of a fresh interpreter running the script."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark native vs compiled model inference')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 10000], help='Batch sizes (default: 1 10000)')
+    parser.add_argument('--runs', type=int, default=20, help='Timed calls per measurement (default: 20)')
+    parser.add_argument('--samples', type=int, default=2000, help='Training samples (default: 2000)')
+    parser.add_argument('--features', type=int, default=14, help='Feature count (default: 14)')
+    args = parser.parse_args()
+
+    X, y = make_data(args.samples, args.features)
+    X_query, _ = make_data(max(args.rows), args.features, seed=7)
+    models = train_models(X, y)
+
+    print(f"Compiled inference benchmark ({args.samples} training rows, {args.features} features, "
+          f"median of {args.runs} calls)")
+    print(f"{'model':<22} {'rows':>6} {'native_ms':>10} {'compiled_ms':>12} {'speedup':>8} {'max_abs_diff':>13}")
+    for name, (native, compiled, _) in models.items():
+        for n in args.rows:
+            rows = X_query[:n]
+            diff = float(np.abs(native(rows) - compiled.predict_proba(rows)).max())
+            native_ms = median_ms(lambda: native(rows), args.runs)
+            compiled_ms = median_ms(lambda: compiled.predict_proba(rows), args.runs)
+            print(f"{name:<22} {n:>6} {native_ms:>10.3f} {compiled_ms:>12.3f} "
+                  f"{native_ms / compiled_ms:>7.1f}x {diff:>13.2e}")
+
+    # Cold start for the lead model: unpickle (imports scikit-learn) vs compiled load
+    _, compiled, native_objects = models['lead (calibrated RF)']
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, 'lead_model.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump({'model': native_objects[0], 'scaler': native_objects[1]}, f)
+        compiled_path = compiled.save(os.path.join(tmp, 'lead_model.npz'))
+        row = repr(X_query[0].tolist())
+
+        native_cold = statistics.median(cold_load_ms(
+            "import pickle\n"
+            f"data = pickle.load(open({pickle_path!r}, 'rb'))\n"
+            f"data['model'].predict_proba(data['scaler'].transform([{row}]))\n"
+        ) for _ in range(3))
+        compiled_cold = statistics.median(cold_load_ms(
+            "from app.compiled_models import CompiledModel\n"
+            f"CompiledModel.load({compiled_path!r}).predict_proba([{row}])\n"
+        ) for _ in range(3))
+
+    print(f"\nLead model cold start (fresh interpreter, load + 1 prediction): "
+          f"native {native_cold:.0f} ms, compiled {compiled_cold:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
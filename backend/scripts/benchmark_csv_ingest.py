@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CSV lead ingest through COPY.
+
+Compares the row-by-row COPY path (csv.DictReader + parse_csv_row per row,
+one COPY buffer) with the columnar path (pandas chunks converted column by
+column and COPYed chunk by chunk) on a generated leads CSV. The database is
+replaced by a stub cursor that only consumes the COPY data, so the timings
+cover CSV reading and type conversion.
+
+Usage:
+    python scripts/benchmark_csv_ingest.py --rows 1000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ingest import COPY_COLUMNS, LeadIngestor  # noqa: E402
+
+TRADES = ['roofing', 'hvac', 'solar', 'kitchen', 'bath', 'pool', 'fence']
+
+
+class _StubCursor:
+    rowcount = 0
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def execute(self, sql, params=None):
+        pass
+
+    def copy_from(self, buffer, table, sep, null, columns):
+        self.sink.append(buffer.getvalue())
+
+    def fetchone(self):
+        return [0]
+
+
+class _StubConnection:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def cursor(self):
+        return _StubCursor(self.sink)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StubIngestor(LeadIngestor):
+    """LeadIngestor that COPYs into memory."""
+
+    def __init__(self):
+        super().__init__("postgresql://benchmark")
+        self.copied = []
+
+    def connect_db(self):
+        return _StubConnection(self.copied)
+
+
+def write_csv(path: str, rows: int):
+    rng = random.Random(42)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COPY_COLUMNS)
+        for i in range(rows):
+            values = {
+                'jurisdiction': rng.choice(['city_of_houston', 'harris_county', 'dallas']),
+                'permit_id': f'BP{i:09d}',
+                'address': f'{rng.randint(100, 9999)} Main St, Houston, TX 770{rng.randint(10, 99)}',
+                'description': rng.choice(['Residential roof replacement', 'Kitchen remodel', 'New pool']),
+                'work_class': 'Residential Building',
+                'category': 'residential',
+                'status': 'Issued',
+                'issue_date': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                'value': repr(round(rng.uniform(1000, 500000), 2)),
+                'is_residential': rng.choice(['true', 'false']),
+                'scraped_at': f'2025-08-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00',
+                'latitude': repr(29.7 + rng.random() / 10),
+                'longitude': repr(-95.4 + rng.random() / 10),
+                'year_built': str(rng.randint(1950, 2024)),
+                'heated_sqft': f'{rng.randint(800, 5000)}.0',
+                'trade_tags': str(rng.sample(TRADES, 2)),
+                'budget_band': '$15–50k',
+                'start_by_estimate': f'{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025',
+                'lead_score': f'{rng.randint(0, 100)}.0',
+                'scoring_version': '2.0.0',
+            }
+            writer.writerow([values.get(column, '') for column in COPY_COLUMNS])
+
+
+def timed(path: str, columnar: bool):
+    ingestor = StubIngestor()
+    start = time.perf_counter()
+    rows = ingestor.ingest_csv_with_copy(path, columnar=columnar)
+    return time.perf_counter() - start, rows, ''.join(ingestor.copied)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV lead ingest through COPY')
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the generated CSV (default: 1000000)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, 'sample.csv')
+        write_csv(sample, 5000)
+        assert timed(sample, columnar=True)[2] == timed(sample, columnar=False)[2], "COPY data differs"
+
+        path = os.path.join(tmp, 'leads.csv')
+        write_csv(path, args.rows)
+        row_time, rows, _ = timed(path, columnar=False)
+        columnar_time, columnar_rows, _ = timed(path, columnar=True)
+        assert rows == columnar_rows == args.rows
+
+    print(f"CSV ingest benchmark ({args.rows} rows, COPY stubbed)")
+    print(f"{'path':<10} {'seconds':>8} {'rows_per_s':>11}")
+    print(f"{'row':<10} {row_time:>8.2f} {rows / row_time:>11.0f}")
+    print(f"{'columnar':<10} {columnar_time:>8.2f} {rows / columnar_time:>11.0f}")
+    print(f"speedup: {row_time / columnar_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark for demand forecast feature engineering.
+
+Compares the previous per-window/per-week FeatureEngineer._create_lagged_features
+implementation (kept below as the reference) against the vectorized pipeline,
+per region and as a single batched frame, and checks that outputs match.
+
+Usage:
+    python scripts/benchmark_feature_engineering.py --regions 50 --years 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import ForecastConfig, FeatureEngineer  # noqa: E402
+
+
+def legacy_create_lagged_features(config: ForecastConfig, permit_data: pd.DataFrame) -> pd.DataFrame:
+    """Reference implementation: rolling polyfit + per-week expansion."""
+    df = permit_data.copy()
+
+    df['week'] = df['date'].dt.to_period('W-MON')
+    weekly_df = df.groupby('week')['permit_count'].sum().reset_index()
+    weekly_df['week_start'] = weekly_df['week'].dt.start_time
+
+    for lag in config.feature_lags:
+        weekly_df[f'permits_lag_{lag}w'] = weekly_df['permit_count'].shift(lag)
+
+    for window in config.rolling_windows:
+        weekly_df[f'permits_ma_{window}w'] = weekly_df['permit_count'].rolling(window=window, min_periods=1).mean()
+
+    for window in [4, 12]:
+        weekly_df[f'permits_trend_{window}w'] = weekly_df['permit_count'].rolling(window=window, min_periods=2).apply(
+            lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) >= 2 else 0
+        )
+
+    weekly_df['permits_seasonal_index'] = (
+        weekly_df['permit_count'] /
+        weekly_df['permit_count'].rolling(window=52, min_periods=26, center=True).mean()
+    ).fillna(1.0)
+
+    daily_features = []
+    for _, week_row in weekly_df.iterrows():
+        week_start = week_row['week_start']
+        week_days = permit_data[
+            (permit_data['date'] >= week_start) &
+            (permit_data['date'] < week_start + timedelta(days=7))
+        ].copy()
+        for col in weekly_df.columns:
+            if col not in ['week', 'week_start', 'permit_count']:
+                week_days[col] = week_row[col]
+        daily_features.append(week_days)
+
+    if daily_features:
+        return pd.concat(daily_features, ignore_index=True)
+    return permit_data.copy()
+
+
+def make_permit_data(regions: int, years: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic daily permit counts with trend and seasonality per region."""
+    rng = np.random.default_rng(seed)
+    end = date(2024, 12, 31)
+    dates = pd.date_range(end=end, periods=365 * years, freq='D')
+    day_index = np.arange(len(dates))
+    frames = []
+    for i in range(regions):
+        base = rng.uniform(2, 40)
+        seasonal = 1 + 0.4 * np.sin(2 * np.pi * day_index / 365.25 + rng.uniform(0, np.pi))
+        trend = 1 + rng.uniform(-0.0003, 0.0006) * day_index
+        counts = rng.poisson(np.clip(base * seasonal * trend, 0.1, None))
+        frames.append(pd.DataFrame({'region_id': f'region-{i:03d}', 'date': dates, 'permit_count': counts}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark demand forecast feature engineering')
+    parser.add_argument('--regions', type=int, default=50, help='Number of regions (default: 50)')
+    parser.add_argument('--years', type=int, default=3, help='Years of daily history (default: 3)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Skip the slow reference implementation')
+    args = parser.parse_args()
+
+    config = ForecastConfig()
+    with patch('app.demand_forecast.get_supabase_client'):
+        engineer = FeatureEngineer(config)
+
+    data = make_permit_data(args.regions, args.years)
+    per_region = [
+        (region_id, frame.drop(columns=['region_id']).reset_index(drop=True))
+        for region_id, frame in data.groupby('region_id', sort=True)
+    ]
+    rows = len(data)
+    print(f"Feature engineering benchmark: {args.regions} regions x {args.years} years ({rows:,} daily rows)")
+
+    vectorized, vec_time = timed(lambda: [engineer._create_lagged_features(frame) for _, frame in per_region])
+    batched, batch_time = timed(lambda: engineer._create_lagged_features(data, group_col='region_id'))
+
+    results = [('vectorized (per region)', vec_time), ('vectorized (batched)', batch_time)]
+
+    if not args.skip_legacy:
+        legacy, legacy_time = timed(lambda: [legacy_create_lagged_features(config, frame) for _, frame in per_region])
+        results.insert(0, ('legacy (per region)', legacy_time))
+
+        for (region_id, _), old, new in zip(per_region, legacy, vectorized):
+            pd.testing.assert_frame_equal(old, new, check_exact=False, rtol=1e-9, atol=1e-9)
+            batch_region = batched[batched['region_id'] == region_id].drop(columns=['region_id']).reset_index(drop=True)
+            pd.testing.assert_frame_equal(old, batch_region, check_exact=False, rtol=1e-9, atol=1e-9)
+        print("Outputs match the reference implementation")
+
+    print(f"{'implementation':<26} {'seconds':>10} {'rows/s':>14}")
+    for name, elapsed in results:
+        print(f"{name:<26} {elapsed:>10.3f} {rows / elapsed:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start latency of demand surge forecasts.
+
+Before the model registry, a freshly started API worker had no models in
+memory, so serving /v1/signals/demand-index/{region} meant training the
+region's models first. With the registry, a fresh worker selects the best
+model from the manifest and lazily loads only that model.
+
+This script trains one synthetic region into a temporary registry, then
+times, for a fresh forecaster:
+- retrain: training every model type for the region (previous cold path)
+- cold: best-model selection + lazy load + prediction
+- warm: a second prediction with the model already loaded
+
+Usage:
+    python scripts/benchmark_forecast_cold_start.py --samples 156 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig  # noqa: E402
+from app.model_registry import ModelRegistry  # noqa: E402
+
+REGION_ID = 'region-bench'
+
+
+def make_training_data(samples: int, seed: int = 42):
+    """Synthetic weekly feature matrix and surge labels."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'permits_lag_1w': rng.poisson(40, samples).astype(float),
+        'permits_lag_2w': rng.poisson(40, samples).astype(float),
+        'permits_ma_4w': rng.normal(40, 5, samples),
+        'permits_trend_4w': rng.normal(0, 2, samples),
+        'permits_seasonal_index': rng.normal(1, 0.1, samples),
+        'month_of_year': rng.integers(1, 13, samples),
+    })
+    y = pd.Series((X['permits_lag_1w'] + rng.normal(0, 6, samples) > 46).astype(int))
+    return X, y
+
+
+def make_forecaster(registry: ModelRegistry) -> DemandSurgeForecaster:
+    with patch('app.demand_forecast.get_supabase_client', return_value=Mock()):
+        return DemandSurgeForecaster(ForecastConfig(), registry=registry)
+
+
+def train_region(forecaster: DemandSurgeForecaster, X: pd.DataFrame, y: pd.Series):
+    results = {
+        'gradient_boost': forecaster._train_gradient_boost(X, y, REGION_ID),
+        'lightgbm': forecaster._train_lightgbm(X, y, REGION_ID),
+        'xgboost': forecaster._train_xgboost(X, y, REGION_ID),
+    }
+    for metrics in results.values():
+        forecaster.feature_columns[metrics['model_version']] = list(X.columns)
+    return results
+
+
+def predict(forecaster: DemandSurgeForecaster, features: pd.DataFrame) -> float:
+    model_version = forecaster._select_best_model(REGION_ID)
+    forecaster._load_model(model_version)
+    return forecaster._predict_with_model(features, model_version)['p_surge']
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark demand forecast cold-start latency')
+    parser.add_argument('--samples', type=int, default=156, help='Weekly training samples (default: 156)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh-worker runs to time (default: 5)')
+    args = parser.parse_args()
+
+    X, y = make_training_data(args.samples)
+    features = X.iloc[[-1]]
+
+    with tempfile.TemporaryDirectory() as root:
+        trainer = make_forecaster(ModelRegistry(root))
+        trainer._register_models({REGION_ID: train_region(trainer, X, y)})
+
+        timings = {'retrain': [], 'cold': [], 'warm': []}
+        for _ in range(args.runs):
+            timings['retrain'].append(timed(lambda: train_region(make_forecaster(None), X, y)))
+
+            forecaster = make_forecaster(ModelRegistry(root))
+            timings['cold'].append(timed(lambda: predict(forecaster, features)))
+            timings['warm'].append(timed(lambda: predict(forecaster, features)))
+
+    print(f"Forecast cold-start benchmark ({args.samples} weekly samples, {args.runs} runs)")
+    print(f"{'path':<10} {'median_ms':>12} {'max_ms':>12}")
+    for name, values in timings.items():
+        print(f"{name:<10} {statistics.median(values) * 1000:>12.1f} {max(values) * 1000:>12.1f}")
+    speedup = statistics.median(timings['retrain']) / statistics.median(timings['cold'])
+    print(f"Cold start vs retrain: {speedup:,.0f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark for lead scoring inference throughput.
+
+Compares the previous per-lead LeadMLInference.prepare_features loop (kept
+below as the reference) with the columnar builder, and per-lead
+personalized adjustments (one cancellation profile query per lead) with
+the batched path (one query per call), at 1k and 100k leads.
+
+Profile queries are simulated; use --query-latency-ms to model the
+database round trip each query costs.
+
+Usage:
+    python scripts/benchmark_lead_inference.py --leads 1000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.cancellation_feedback import CancellationFeedbackService  # noqa: E402
+from app.ml_inference import LeadMLInference  # noqa: E402
+
+FEATURE_COLUMNS = [
+    'rating_numeric', 'estimated_deal_value', 'feedback_age_days', 'has_contact_issues',
+    'has_qualification_issues', 'is_weekend_feedback', 'feedback_hour', 'source_cancellation_rate',
+    'source_avg_cancellation_score', 'contractor_canceled', 'canceled_for_quality',
+    'canceled_for_wrong_type', 'contractor_win_rate', 'lead_value_log',
+]
+
+PROFILE = {
+    'primary_reason': 'wrong_lead_type',
+    'preferred_service_areas': ['city_of_houston', 'harris_county'],
+    'preferred_trade_types': ['roofing', 'hvac'],
+    'total_leads_purchased': 40,
+    'leads_won': 3,
+}
+
+
+def legacy_prepare_features(feature_columns: List[str], leads: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Reference implementation: per-lead dict with an if/elif default chain."""
+    features_list = []
+    for lead in leads:
+        lead_features = lead.get('features', {})
+        feature_row = {}
+        for col in feature_columns:
+            if col in lead_features:
+                feature_row[col] = lead_features[col]
+            elif col in ['has_contact_issues', 'has_qualification_issues', 'is_weekend_feedback']:
+                feature_row[col] = False
+            elif col == 'feedback_hour':
+                feature_row[col] = 12
+            elif col in ['source_cancellation_rate', 'source_avg_cancellation_score']:
+                feature_row[col] = 0.0
+            elif col in ['contractor_canceled', 'canceled_for_quality', 'canceled_for_wrong_type']:
+                feature_row[col] = False
+            elif col == 'contractor_win_rate':
+                feature_row[col] = 0.1
+            elif col == 'lead_value_log':
+                feature_row[col] = 0.0
+            else:
+                feature_row[col] = 0
+        features_list.append(feature_row)
+    return pd.DataFrame(features_list)
+
+
+class SimulatedProfileService(CancellationFeedbackService):
+    """Cancellation service whose profile query is simulated and counted."""
+
+    def __init__(self, latency_s: float):
+        super().__init__(db_url='')
+        self.latency_s = latency_s
+        self.queries = 0
+
+    def get_cancellation_profile(self, account_id: str):
+        self.queries += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return PROFILE
+
+
+def make_leads(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Synthetic leads with a sparse, varying subset of features."""
+    rng = np.random.default_rng(seed)
+    jurisdictions = ['city_of_houston', 'harris_county', 'fort_bend', 'dallas']
+    trades = ['roofing', 'hvac', 'pool', 'kitchen', 'solar']
+    leads = []
+    for i in range(n):
+        features = {
+            'rating_numeric': int(rng.integers(0, 5)),
+            'estimated_deal_value': float(rng.integers(1000, 80000)),
+            'source_cancellation_rate': float(rng.random() * 0.3),
+        }
+        if i % 3:
+            features['contractor_win_rate'] = float(rng.random() * 0.4)
+        if i % 5 == 0:
+            features['contractor_canceled'] = True
+        leads.append({
+            'id': i,
+            'jurisdiction': jurisdictions[i % len(jurisdictions)],
+            'trade_tags': [trades[i % len(trades)], trades[(i * 7) % len(trades)]],
+            'features': features,
+        })
+    return leads
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(n: int, latency_s: float) -> List[tuple]:
+    leads = make_leads(n)
+    inference = LeadMLInference()
+    inference.feature_columns = FEATURE_COLUMNS
+
+    legacy_df, legacy_time = timed(lambda: legacy_prepare_features(FEATURE_COLUMNS, leads))
+    columnar_df, columnar_time = timed(lambda: inference.prepare_features(leads))
+    np.testing.assert_allclose(legacy_df.astype(float).to_numpy(), columnar_df.astype(float).to_numpy())
+
+    per_lead_service = SimulatedProfileService(latency_s)
+    per_lead, per_lead_time = timed(
+        lambda: np.array([per_lead_service.calculate_personalized_adjustments('account', lead) for lead in leads])
+    )
+    batch_service = SimulatedProfileService(latency_s)
+    batched, batch_time = timed(lambda: batch_service.calculate_personalized_adjustments_batch('account', leads))
+    np.testing.assert_allclose(per_lead, batched)
+
+    return [
+        ('prepare_features (legacy)', legacy_time, '-'),
+        ('prepare_features (columnar)', columnar_time, '-'),
+        ('personalization (per lead)', per_lead_time, per_lead_service.queries),
+        ('personalization (batched)', batch_time, batch_service.queries),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lead scoring inference throughput')
+    parser.add_argument('--leads', type=int, nargs='+', default=[1000, 100000],
+                        help='Batch sizes to benchmark (default: 1000 100000)')
+    parser.add_argument('--query-latency-ms', type=float, default=0.0,
+                        help='Simulated latency per cancellation profile query (default: 0)')
+    args = parser.parse_args()
+
+    for n in args.leads:
+        print(f"\nLead inference benchmark: {n:,} leads")
+        print(f"{'stage':<30} {'seconds':>10} {'leads/s':>14} {'queries':>9}")
+        for name, elapsed, queries in run(n, args.query_latency_ms / 1000):
+            print(f"{name:<30} {elapsed:>10.3f} {n / elapsed:>14,.0f} {queries:>9}")
+
+
+if __name__ == '__main__':
+    main()
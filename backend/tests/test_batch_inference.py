@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for batched cross-region demand surge inference.
+"""
+
+import os
+import sys
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig
+from app.model_registry import ModelRegistry
+
+REGIONS = ['region-a', 'region-b', 'region-c']
+
+
+def training_frame(samples=120, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'permits_lag_1w': rng.poisson(20, samples).astype(float),
+        'permits_ma_4w': rng.normal(20, 3, samples),
+        'month_of_year': rng.integers(1, 13, samples),
+    })
+    y = pd.Series((X['permits_lag_1w'] + rng.normal(0, 4, samples) > 21).astype(int))
+    return X, y
+
+
+def make_forecaster(registry, supabase=None):
+    with patch('app.demand_forecast.get_supabase_client', return_value=supabase or Mock()):
+        return DemandSurgeForecaster(ForecastConfig(cv_splits=3), registry=registry)
+
+
+@pytest.fixture(scope='module')
+def registry_root(tmp_path_factory):
+    """Registry with a different model type per region."""
+    root = tmp_path_factory.mktemp('registry')
+    trainer = make_forecaster(ModelRegistry(root))
+    trainers = [trainer._train_gradient_boost, trainer._train_lightgbm, trainer._train_xgboost]
+    results = {}
+    for i, (region_id, train) in enumerate(zip(REGIONS, trainers)):
+        X, y = training_frame(seed=i)
+        metrics = train(X, y, region_id)
+        trainer.feature_columns[metrics['model_version']] = list(X.columns)
+        results[region_id] = {metrics['model_type']: metrics}
+    trainer._register_models(results)
+    return root
+
+
+def feature_rows():
+    rng = np.random.default_rng(7)
+    return [
+        {
+            'region_id': region_id,
+            'feature_date': '2024-06-03',
+            'month_of_year': 6,
+            'permits_ma_4w': float(rng.normal(20, 3)),
+            'permits_lag_1w': float(rng.poisson(20)),
+        }
+        for region_id in REGIONS
+    ]
+
+
+def test_batch_matches_per_region_forecasts(registry_root):
+    rows = feature_rows()
+    supabase = Mock()
+    supabase.rpc.return_value.execute.return_value.data = rows
+    forecaster = make_forecaster(ModelRegistry(registry_root), supabase)
+
+    forecasts, errors = forecaster.generate_forecasts_batch(REGIONS + ['region-missing'], date(2024, 6, 10))
+
+    assert supabase.rpc.call_count == 1
+    assert errors == {'region-missing': 'No features available for region region-missing'}
+    upserts = supabase.table.return_value.upsert.call_args_list
+    assert len(upserts) == 1
+    assert [record['region_id'] for record in upserts[0].args[0]] == REGIONS
+
+    for row in rows:
+        single = make_forecaster(ModelRegistry(registry_root))
+        single._get_latest_features = Mock(return_value=pd.DataFrame([row]))
+        expected = single.generate_forecast(row['region_id'], date(2024, 6, 10))
+        assert forecasts[row['region_id']] == pytest.approx(expected)
+
+
+def test_batch_keeps_latest_feature_row_per_region(registry_root):
+    older = dict(feature_rows()[0], feature_date='2024-05-27', permits_lag_1w=0.0)
+    supabase = Mock()
+    supabase.rpc.return_value.execute.return_value.data = [older] + feature_rows()
+    forecaster = make_forecaster(ModelRegistry(registry_root), supabase)
+
+    features = forecaster._get_latest_features_batch(REGIONS, date(2024, 6, 10))
+
+    assert sorted(features['region_id']) == REGIONS
+    assert (features['feature_date'] == '2024-06-03').all()
+    assert "IN ('region-a', 'region-b', 'region-c')" in supabase.rpc.call_args.args[1]['query']
+
+
+def test_batch_groups_regions_sharing_a_model(registry_root):
+    forecaster = make_forecaster(ModelRegistry(registry_root))
+    forecaster._get_latest_features_batch = Mock(return_value=pd.DataFrame(feature_rows()))
+    shared = ModelRegistry(registry_root).best_model('region-b')
+    forecaster._select_best_model = Mock(return_value=shared)
+
+    with patch.object(forecaster, '_predict_proba', wraps=forecaster._predict_proba) as predict:
+        forecasts, errors = forecaster.generate_forecasts_batch(REGIONS, date(2024, 6, 10))
+
+    assert errors == {}
+    assert predict.call_count == 1
+    assert len(predict.call_args.args[0]) == len(REGIONS)
+    assert {forecast['model_version'] for forecast in forecasts.values()} == {shared}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for cached per-account cancellation profiles.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.cache import LRUTTLCache
+
+with patch.dict('sys.modules', {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+    from app.cancellation_feedback import CancellationFeedbackService, CancellationProfileCache
+
+PROFILE_ROW = {
+    'primary_reason': 'poor_lead_quality',
+    'secondary_reasons': ['wrong_lead_type'],
+    'avg_lead_score': 40.0,
+    'preferred_service_areas': ['houston'],
+    'preferred_trade_types': ['roofing'],
+    'total_leads_purchased': 20,
+    'leads_won': 1,
+}
+
+
+def make_service(fetchone=None, fetchall=None):
+    """Service with an in-process-only cache and a mocked connection."""
+    service = CancellationFeedbackService('postgresql://test', CancellationProfileCache(use_redis=False))
+    cursor = MagicMock()
+    cursor.fetchone.return_value = fetchone
+    cursor.fetchall.return_value = fetchall or []
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    service.connect_db = Mock(return_value=MagicMock(__enter__=Mock(return_value=conn)))
+    return service, cursor
+
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert 'b' not in cache
+    assert cache.get('c') == 3
+
+
+def test_lru_ttl_cache_expires_entries():
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    with patch('app.utils.cache.time.monotonic', return_value=1000.0):
+        cache.set('a', 1)
+    with patch('app.utils.cache.time.monotonic', return_value=1059.0):
+        assert cache.get('a') == 1
+    with patch('app.utils.cache.time.monotonic', return_value=1061.0):
+        assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_scoring_a_page_of_leads_issues_one_query():
+    service, cursor = make_service(fetchone=PROFILE_ROW)
+    leads = [{'jurisdiction': 'houston', 'trade_tags': ['roofing']} for _ in range(100)]
+
+    per_lead = [service.calculate_personalized_adjustments('account-1', lead) for lead in leads]
+    batch = service.calculate_personalized_adjustments_batch('account-1', leads)
+
+    assert cursor.execute.call_count == 1
+    np.testing.assert_allclose(batch, per_lead)
+    np.testing.assert_allclose(batch, -20.0)
+
+
+def test_accounts_without_cancellations_are_cached():
+    service, cursor = make_service(fetchone=None)
+
+    assert service.get_cancellation_profile('account-1') is None
+    assert service.get_cancellation_profile('account-1') is None
+    assert cursor.execute.call_count == 1
+
+
+def test_bulk_profiles_use_one_query_for_missing_accounts():
+    service, cursor = make_service(fetchall=[dict(PROFILE_ROW, account_id='account-2')])
+    service.profile_cache.set_many({'account-1': dict(PROFILE_ROW, leads_won=5)})
+
+    profiles = service.get_cancellation_profiles(['account-1', 'account-2', 'account-3'])
+
+    assert cursor.execute.call_count == 1
+    assert cursor.execute.call_args.args[1] == [['account-2', 'account-3']]
+    assert profiles['account-1']['leads_won'] == 5
+    assert profiles['account-2']['primary_reason'] == 'poor_lead_quality'
+    assert profiles['account-3'] is None
+
+
+def test_recording_a_cancellation_invalidates_the_profile():
+    service, cursor = make_service(fetchone=None)
+    assert service.get_cancellation_profile('account-1') is None
+
+    service.record_cancellation('account-1', {'primary_reason': 'poor_lead_quality'})
+    cursor.fetchone.return_value = PROFILE_ROW
+
+    assert service.get_cancellation_profile('account-1')['primary_reason'] == 'poor_lead_quality'
+    assert cursor.execute.call_count == 3
+
+
+def test_recording_a_cancellation_rejects_unknown_columns():
+    service, cursor = make_service()
+
+    with pytest.raises(ValueError, match="Unknown cancellations columns"):
+        service.record_cancellation('account-1', {'primary_reason': 'other', 'id) VALUES (1); --': 'x'})
+
+    cursor.execute.assert_not_called()
+
+
+def test_profiles_are_shared_through_redis():
+    redis = Mock()
+    redis.is_enabled.return_value = True
+    redis.get.return_value = PROFILE_ROW
+    cache = CancellationProfileCache(use_redis=True, redis_cache=redis)
+
+    assert cache.get_many(['account-1']) == {'account-1': PROFILE_ROW}
+    redis.get.assert_called_once_with('cancellation_profile:account-1')
+    assert cache.get_many(['account-1']) == {'account-1': PROFILE_ROW}
+    assert redis.get.call_count == 1
+
+    cache.invalidate('account-1')
+    redis.delete.assert_called_once_with('cancellation_profile:account-1')
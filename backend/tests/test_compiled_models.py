@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled (numpy-only) lead and surge model inference.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from app.compiled_models import CompiledModel, compile_model  # noqa: E402
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig  # noqa: E402
+from app.ml_inference import LeadMLInference  # noqa: E402
+from app.model_registry import ModelRegistry  # noqa: E402
+
+with patch.dict('sys.modules', {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+    from app.train_model import LeadMLTrainer
+
+
+def make_data(samples=600, features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(samples, features))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, samples) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def data():
+    X, y = make_data()
+    X_new, _ = make_data(samples=500, seed=1)
+    return X, y, X_new
+
+
+def test_calibrated_forest_with_scaler_matches_sklearn(data):
+    X, y, X_new = data
+    scaler = StandardScaler().fit(X)
+    model = CalibratedClassifierCV(
+        RandomForestClassifier(n_estimators=30, max_depth=8, min_samples_leaf=2, random_state=42),
+        method='isotonic', cv=3
+    ).fit(scaler.transform(X), y)
+
+    compiled = compile_model(model, scaler)
+
+    expected = model.predict_proba(scaler.transform(X_new))[:, 1]
+    np.testing.assert_allclose(compiled.predict_proba(X_new), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize('method', ['isotonic', 'sigmoid'])
+def test_calibrated_gradient_boosting_matches_sklearn(data, method):
+    X, y, X_new = data
+    scaler = StandardScaler().fit(X)
+    model = CalibratedClassifierCV(
+        GradientBoostingClassifier(n_estimators=30, max_depth=4, random_state=42), method=method, cv=3
+    ).fit(scaler.transform(X), y)
+
+    compiled = compile_model(model, scaler)
+
+    expected = model.predict_proba(scaler.transform(X_new))[:, 1]
+    np.testing.assert_allclose(compiled.predict_proba(X_new), expected, atol=1e-12)
+
+
+def test_lightgbm_matches_booster_including_missing_values(data):
+    X, y, X_new = data
+    X_train = X.copy()
+    X_train[::7, 1] = np.nan
+    booster = lgb.train({'objective': 'binary', 'verbose': -1, 'num_leaves': 15},
+                        lgb.Dataset(X_train, y), num_boost_round=30)
+    X_query = X_new.copy()
+    X_query[::5, 1] = np.nan
+    X_query[::3, 2] = np.nan
+
+    compiled = compile_model(booster)
+
+    np.testing.assert_allclose(compiled.predict_proba(X_query), booster.predict(X_query), atol=1e-12)
+
+
+def test_xgboost_matches_booster_including_missing_values(data):
+    X, y, X_new = data
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 4}, xgb.DMatrix(X, label=y), 30)
+    X_query = X_new.copy()
+    X_query[::5, 1] = np.nan
+
+    compiled = compile_model(booster)
+
+    # XGBoost accumulates margins in float32
+    np.testing.assert_allclose(compiled.predict_proba(X_query), booster.predict(xgb.DMatrix(X_query)), atol=1e-6)
+
+
+def test_unsupported_models_are_rejected(data):
+    X, y, _ = data
+    booster = lgb.train({'objective': 'regression', 'verbose': -1}, lgb.Dataset(X, y.astype(float)), 5)
+
+    with pytest.raises(ValueError, match='objective'):
+        compile_model(booster)
+    with pytest.raises(ValueError, match='Unsupported model type'):
+        compile_model(object())
+
+
+def test_saved_model_predicts_without_training_libraries(data, tmp_path):
+    X, y, X_new = data
+    booster = xgb.train({'objective': 'binary:logistic', 'max_depth': 3}, xgb.DMatrix(X, label=y), 10)
+    path = compile_model(booster, feature_columns=[f"f{i}" for i in range(X.shape[1])]).save(tmp_path / 'model.npz')
+    np.save(tmp_path / 'rows.npy', X_new[:5])
+
+    script = (
+        "import sys, json, numpy as np\n"
+        "from app.compiled_models import CompiledModel\n"
+        f"model = CompiledModel.load({str(path)!r})\n"
+        f"probabilities = model.predict_proba(np.load({str(tmp_path / 'rows.npy')!r}))\n"
+        "loaded = [name for name in ('sklearn', 'lightgbm', 'xgboost') if name in sys.modules]\n"
+        "print(json.dumps({'p': probabilities.tolist(), 'loaded': loaded, 'columns': model.feature_columns}))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, capture_output=True,
+                            text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result['loaded'] == []
+    assert result['columns'] == [f"f{i}" for i in range(X.shape[1])]
+    np.testing.assert_allclose(result['p'], booster.predict(xgb.DMatrix(X_new[:5])), atol=1e-6)
+
+
+def test_lead_inference_prefers_compiled_export(tmp_path):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'rating_numeric': rng.integers(0, 5, 300),
+        'feedback_hour': rng.integers(0, 24, 300),
+        'contractor_win_rate': rng.random(300),
+    })
+    df['success'] = (df['rating_numeric'] + rng.normal(0, 1, 300) > 2).astype(bool)
+
+    trainer = LeadMLTrainer('postgresql://test')
+    trainer.feature_columns = ['rating_numeric', 'feedback_hour', 'contractor_win_rate']
+    metrics = trainer.train_model(df)
+    trainer.save_model(str(tmp_path), {'roc_auc': metrics['roc_auc']}, export_compiled=True)
+
+    latest = json.loads((tmp_path / 'latest_model.json').read_text())
+    assert latest['compiled_model_file'].endswith('.npz')
+
+    leads = [{'id': i, 'features': {'rating_numeric': i % 5, 'contractor_win_rate': 0.3}} for i in range(20)]
+    compiled = LeadMLInference(str(tmp_path), use_compiled=True)
+    native = LeadMLInference(str(tmp_path), use_compiled=False)
+    assert compiled.load_model() and native.load_model()
+
+    assert compiled.model is None and compiled.compiled_model is not None
+    assert native.compiled_model is None
+    np.testing.assert_allclose(
+        [result['win_probability'] for result in compiled.predict(leads)],
+        [result['win_probability'] for result in native.predict(leads)],
+        atol=1e-12
+    )
+
+
+def test_registry_serves_compiled_surge_models(tmp_path):
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame({
+        'permits_lag_1w': rng.poisson(20, 120).astype(float),
+        'permits_ma_4w': rng.normal(20, 3, 120),
+        'month_of_year': rng.integers(1, 13, 120),
+    })
+    y = pd.Series((X['permits_lag_1w'] + rng.normal(0, 4, 120) > 21).astype(int))
+
+    with patch('app.demand_forecast.get_supabase_client', return_value=Mock()):
+        trainer = DemandSurgeForecaster(ForecastConfig(cv_splits=3, compile_models=True), registry=ModelRegistry(tmp_path))
+    results = {}
+    for region_id, train in [('region-a', trainer._train_gradient_boost), ('region-b', trainer._train_lightgbm),
+                             ('region-c', trainer._train_xgboost)]:
+        metrics = train(X, y, region_id)
+        trainer.feature_columns[metrics['model_version']] = list(X.columns)
+        results[region_id] = {metrics['model_type']: metrics}
+    trainer._register_models(results)
+
+    features = X.iloc[-10:].copy()
+    for region_id, region_results in results.items():
+        model_version = next(iter(region_results.values()))['model_version']
+        assert ModelRegistry(tmp_path).get(model_version)['files']['compiled'] == 'model.npz'
+
+        predictions = {}
+        for use_compiled in (True, False):
+            with patch('app.demand_forecast.get_supabase_client', return_value=Mock()):
+                forecaster = DemandSurgeForecaster(ForecastConfig(), registry=ModelRegistry(tmp_path, use_compiled))
+            assert forecaster._load_model(model_version)
+            assert isinstance(forecaster.models[model_version], CompiledModel) == use_compiled
+            predictions[use_compiled] = forecaster._predict_proba(features, model_version)
+
+        np.testing.assert_allclose(predictions[True], predictions[False], atol=1e-6)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized demand forecast feature engineering.
+"""
+
+import os
+import sys
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import ForecastConfig, FeatureEngineer, rolling_ols_slope
+
+
+def make_engineer(supabase=None):
+    with patch('app.demand_forecast.get_supabase_client', return_value=supabase or Mock()):
+        return FeatureEngineer(ForecastConfig())
+
+
+def daily_counts(days=400, seed=0, start='2023-01-01'):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range(start=start, periods=days, freq='D'),
+        'permit_count': rng.poisson(8, size=days),
+    })
+
+
+def polyfit_slope(values, window):
+    return pd.Series(values, dtype=float).rolling(window=window, min_periods=2).apply(
+        lambda x: np.polyfit(range(len(x)), x, 1)[0]
+    ).to_numpy()
+
+
+@pytest.mark.parametrize('window', [2, 4, 12])
+def test_rolling_ols_slope_matches_polyfit(window):
+    values = np.random.default_rng(1).poisson(20, size=60).astype(float)
+
+    np.testing.assert_allclose(rolling_ols_slope(values, window), polyfit_slope(values, window), rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_ols_slope_restarts_at_group_boundaries():
+    first = np.array([1.0, 3.0, 5.0, 7.0])
+    second = np.array([10.0, 8.0, 6.0])
+    positions = np.array([0, 1, 2, 3, 0, 1, 2])
+
+    slope = rolling_ols_slope(np.concatenate([first, second]), 4, positions)
+
+    assert np.isnan(slope[0]) and np.isnan(slope[4])
+    np.testing.assert_allclose(slope[1:4], [2.0, 2.0, 2.0])
+    np.testing.assert_allclose(slope[5:], [-2.0, -2.0])
+
+
+def test_lagged_features_broadcast_weekly_values_to_days():
+    engineer = make_engineer()
+    data = daily_counts()
+
+    features = engineer._create_lagged_features(data)
+
+    assert len(features) == len(data)
+    assert list(features.columns[:2]) == ['date', 'permit_count']
+    weeks = features['date'].dt.to_period('W-MON')
+    per_week = features.groupby(weeks)[['permits_ma_4w', 'permits_trend_4w', 'permits_seasonal_index']].nunique(dropna=False)
+    assert (per_week <= 1).all().all()
+    weekly_totals = data.groupby(data['date'].dt.to_period('W-MON'))['permit_count'].sum()
+    np.testing.assert_allclose(
+        features.groupby(weeks)['permits_lag_1w'].first().to_numpy()[1:],
+        weekly_totals.to_numpy()[:-1],
+    )
+
+
+def test_batched_features_match_per_region_features():
+    engineer = make_engineer()
+    regions = {f'region-{i}': daily_counts(seed=i) for i in range(3)}
+    batch = pd.concat(
+        [frame.assign(region_id=region_id) for region_id, frame in regions.items()], ignore_index=True
+    )[['region_id', 'date', 'permit_count']]
+
+    batched = engineer._create_lagged_features(batch, group_col='region_id')
+
+    for region_id, frame in regions.items():
+        expected = engineer._create_lagged_features(frame)
+        actual = batched[batched['region_id'] == region_id].drop(columns=['region_id']).reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_generate_features_batch_uses_one_query_and_stores_per_region():
+    supabase = Mock()
+    supabase.rpc.return_value.execute.return_value.data = [
+        {'region_id': 'a', 'date': '2024-01-02', 'permit_count': 3},
+        {'region_id': 'b', 'date': '2024-01-05', 'permit_count': 1},
+    ]
+    engineer = make_engineer(supabase)
+
+    features = engineer.generate_features_batch(['a', 'b'], date(2024, 1, 1), date(2024, 3, 31))
+
+    assert supabase.rpc.call_count == 1
+    assert len(features) == 2 * 91
+    assert features.groupby('region_id')['permit_count'].sum().to_dict() == {'a': 3, 'b': 1}
+    stored = [call.args[0] for call in supabase.table.return_value.upsert.call_args_list]
+    assert [records[0]['region_id'] for records in stored] == ['a', 'b']
+    assert all(len(records) == 91 for records in stored)
@@ -121,7 +121,7 @@ class TestExportSecurity:
         )
         
         assert response.status_code == 200
-        assert response.json()["message"] == "Export completed successfully"
+        assert response.json()["message"] == "Export queued successfully"
         assert response.json()["export_type"] == "leads"
     
     def test_admin_override_allows_export_when_allow_exports_false(self, client, setup_env):
@@ -143,7 +143,7 @@ class TestExportSecurity:
         )
         
         assert response.status_code == 200
-        assert response.json()["message"] == "Export completed successfully"
+        assert response.json()["message"] == "Export queued successfully"
         assert response.json()["allowed_via"] == "admin_override"
     
     def test_non_admin_cannot_use_override(self, client, setup_env):
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel multi-region forecast training.
+"""
+
+import os
+import sys
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig
+from app.forecast_training import ForecastTrainingOrchestrator, RegionTrainingResult, _train_model_task
+from app.model_registry import ModelRegistry
+
+
+def make_forecaster(registry=None):
+    with patch('app.demand_forecast.get_supabase_client', return_value=Mock()):
+        return DemandSurgeForecaster(ForecastConfig(cv_splits=3), registry=registry or Mock())
+
+
+def training_frame(samples=80, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'permits_lag_1w': rng.poisson(20, samples).astype(float),
+        'permits_ma_4w': rng.normal(20, 3, samples),
+        'month_of_year': rng.integers(1, 13, samples),
+    })
+    y = pd.Series((X['permits_lag_1w'] > 21).astype(int))
+    return X, y
+
+
+def test_train_model_task_returns_fitted_model_and_timing():
+    X, y = training_frame()
+
+    task = _train_model_task(ForecastConfig(cv_splits=3, model_threads=1), 'lightgbm', 'region-a', X, y)
+
+    assert task['metrics']['model_type'] == 'lightgbm'
+    assert task['model'].predict(X).shape == (len(X),)
+    assert task['scaler'] is None
+    assert task['finished'] >= task['started']
+
+
+def test_orchestrator_trains_regions_inline_and_stores_once(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    forecaster = make_forecaster(registry)
+    frames = {'region-a': training_frame(seed=1), 'region-b': training_frame(seed=2)}
+    orchestrator = ForecastTrainingOrchestrator(forecaster, workers=1, threads=1,
+                                                model_types=['gradient_boost', 'xgboost'])
+
+    with patch.object(orchestrator, '_prepare_regions', return_value=(
+        [(region_id, X, y) for region_id, (X, y) in frames.items()],
+        {region_id: RegionTrainingResult(region_id) for region_id in [*frames, 'region-empty']},
+    )), patch.object(forecaster, '_store_model_performance_bulk') as store:
+        summary = orchestrator.train_regions(['region-a', 'region-b', 'region-empty'], date(2024, 6, 30))
+
+    store.assert_called_once()
+    stored = store.call_args.args[0]
+    assert set(stored) == {'region-a', 'region-b'}
+    assert all(set(results) == {'gradient_boost', 'xgboost'} for results in stored.values())
+    assert len(forecaster.models) == 4
+    assert len(forecaster.scalers) == 2
+    assert summary['regions_trained'] == 2
+    assert summary['regions_failed'] == 1
+    assert summary['regions']['region-a']['wall_seconds'] > 0
+    assert set(registry.versions()) == set(forecaster.models)
+
+
+def test_prepare_regions_skips_regions_without_enough_samples():
+    forecaster = make_forecaster()
+    days = pd.date_range('2023-01-02', periods=7 * 60, freq='D')
+    features = pd.DataFrame({
+        'region_id': np.repeat(['region-a', 'region-b'], [len(days), 21]),
+        'date': np.concatenate([days, days[:21]]),
+        'permits_lag_1w': 1.0,
+    })
+    labels = pd.DataFrame({'week_start': days.to_period('W-MON').start_time.unique(), 'is_surge': 0})
+    forecaster.feature_engineer.generate_features_batch = Mock(return_value=features)
+    forecaster.surge_labeler.generate_surge_labels = Mock(side_effect=lambda *args: labels.copy())
+    orchestrator = ForecastTrainingOrchestrator(forecaster, workers=1)
+
+    training_data, regions = orchestrator._prepare_regions(['region-a', 'region-b'], date(2024, 3, 1))
+
+    assert [region_id for region_id, _, _ in training_data] == ['region-a']
+    assert len(training_data[0][1]) == labels['week_start'].nunique()
+    assert 'Insufficient training samples' in regions['region-b'].errors['prepare']
+    forecaster.feature_engineer.generate_features_batch.assert_called_once()
+
+
+def test_orchestrator_rejects_unknown_model_types():
+    with pytest.raises(ValueError):
+        ForecastTrainingOrchestrator(make_forecaster(), workers=1, model_types=['prophet'])
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental (watermark + feature cache + warm start) lead model training.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+# Import before psycopg2 is patched below, so pickled models reference the same classes
+import sklearn.calibration  # noqa: F401
+import sklearn.ensemble  # noqa: F401
+import sklearn.metrics  # noqa: F401
+import sklearn.model_selection  # noqa: F401
+import sklearn.preprocessing  # noqa: F401
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with patch.dict('sys.modules', {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+    from app.train_model import LeadMLTrainer
+
+RATINGS = ['no_answer', 'bad_contact', 'not_qualified', 'quoted', 'won']
+
+
+def feedback_rows(n, start_id=0, newest=None, seed=0):
+    """Raw rows shaped like the load_training_data query (TIMESTAMPTZ dates), newest first."""
+    rng = np.random.default_rng(seed)
+    newest = newest or datetime.now(timezone.utc) - timedelta(hours=1)
+    ratings = rng.choice(RATINGS, n)
+    return pd.DataFrame({
+        'lead_id': np.arange(start_id, start_id + n),
+        'account_id': rng.choice(['acct-1', 'acct-2', 'acct-3'], n),
+        'rating': ratings,
+        'deal_band': rng.choice(['$0-5k', '$5-15k', '$15-50k', '$50k+'], n),
+        'reason_codes': rng.choice(np.array([['no_contact'], ['not_qualified'], None, []], dtype=object), n),
+        'feedback_date': [newest - timedelta(hours=int(h)) for h in range(n)],
+        'win_label': np.where(rng.random(n) < 0.3, None, np.isin(ratings, ['quoted', 'won'])),
+        'jurisdiction': 'houston',
+        'trade_tags': [['roofing']] * n,
+        'value': rng.integers(1000, 50000, n).astype(float),
+        'source_cancellation_rate': rng.random(n) * 0.2,
+        'source_avg_cancellation_score': rng.random(n),
+        'cancellation_reason': rng.choice(np.array([None, 'poor_lead_quality', 'wrong_lead_type'], dtype=object), n),
+        'contractor_avg_score': rng.random(n) * 100,
+        'contractor_total_leads': rng.integers(0, 50, n),
+        'contractor_leads_won': rng.integers(0, 5, n),
+    })
+
+
+class FeedbackSource:
+    """Stands in for the database; returns rows created after `since`."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, since=None):
+        self.calls.append(since)
+        if since is None:
+            return self.rows.copy()
+        return self.rows[self.rows['feedback_date'] > since].copy()
+
+
+def make_trainer(source):
+    trainer = LeadMLTrainer('postgresql://test')
+    trainer.load_training_data = source
+    return trainer
+
+
+def latest(model_dir):
+    return json.loads((model_dir / 'latest_model.json').read_text())
+
+
+def test_reason_code_flags_match_row_wise_rules():
+    codes = [['no_contact'], ['Not_Qualified'], None, [], '', 'CONTACT later', np.nan]
+    df = feedback_rows(len(codes))
+    df['reason_codes'] = pd.Series(codes, dtype=object)
+
+    features = LeadMLTrainer('postgresql://test').engineer_features(df)
+
+    expected_contact = [('contact' in str(x).lower()) if isinstance(x, (list, str)) and x else False for x in codes]
+    expected_qualified = [('qualified' in str(x).lower()) if isinstance(x, (list, str)) and x else False for x in codes]
+    assert features['has_contact_issues'].tolist() == expected_contact
+    assert features['has_qualification_issues'].tolist() == expected_qualified
+    assert list(features.columns[:3]) == ['lead_id', 'account_id', 'feedback_date']
+
+
+def test_incremental_run_only_loads_new_feedback_and_warm_starts(tmp_path):
+    rows = feedback_rows(300, newest=datetime.now(timezone.utc) - timedelta(days=6))
+    source = FeedbackSource(rows)
+    first = make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    assert first['status'] == 'success'
+    assert first['training_stats']['mode'] == 'full'
+    assert source.calls == [None]
+    watermark = latest(tmp_path)['metrics']['data_watermark']
+    assert pd.Timestamp(watermark) == rows['feedback_date'].max()
+
+    source.rows = pd.concat([feedback_rows(120, start_id=1000, seed=1), rows], ignore_index=True)
+    second = make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    assert second['status'] == 'success'
+    assert source.calls[-1] == datetime.fromisoformat(watermark)
+    assert second['training_stats']['mode'] == 'warm_start'
+    # Only rows after the watermark are loaded
+    assert second['training_stats']['rows_new'] == 120
+    assert second['training_stats']['rows_total'] == 420
+    assert second['trees_per_forest'] == 120
+    assert second['warm_started_from'] == first['model_version']
+
+    history = latest(tmp_path)['training_history']
+    assert [run['mode'] for run in history] == ['full', 'warm_start']
+    assert all(run['total_seconds'] >= 0 and run['rows_total'] for run in history)
+
+
+def test_few_new_rows_retrain_on_cached_window(tmp_path):
+    rows = feedback_rows(200, newest=datetime.now(timezone.utc) - timedelta(days=1))
+    source = FeedbackSource(rows)
+    make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    source.rows = pd.concat([feedback_rows(10, start_id=1000, seed=2), rows], ignore_index=True)
+    result = make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    assert result['training_stats']['mode'] == 'retrain'
+    assert result['training_stats']['rows_total'] == 210
+    assert 'warm_started_from' not in result
+
+
+def test_no_new_feedback_skips_training(tmp_path):
+    rows = feedback_rows(200, newest=datetime.now(timezone.utc) - timedelta(days=1))
+    source = FeedbackSource(rows)
+    make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    result = make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    assert result == {'status': 'skipped', 'reason': 'no_new_data', 'samples': 0}
+
+
+def test_stale_feature_cache_forces_full_rebuild(tmp_path):
+    rows = feedback_rows(200, newest=datetime.now(timezone.utc) - timedelta(days=1))
+    source = FeedbackSource(rows)
+    make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    metadata = latest(tmp_path)
+    # Older metadata stored naive timestamps
+    metadata['metrics']['feature_cache_built_at'] = (datetime.now() - timedelta(days=30)).isoformat()
+    (tmp_path / 'latest_model.json').write_text(json.dumps(metadata))
+
+    result = make_trainer(source).run_training(str(tmp_path), incremental=True)
+
+    assert source.calls[-1] is None
+    assert result['training_stats']['mode'] == 'full'
+
+
+def test_merge_drops_rows_outside_window_and_refreshes_age():
+    trainer = LeadMLTrainer('postgresql://test')
+    cached = trainer.engineer_features(feedback_rows(5, newest=datetime.now(timezone.utc) - timedelta(days=89, hours=20)))
+    cached['feedback_age_days'] = 0
+    new = trainer.engineer_features(feedback_rows(2, start_id=0, seed=3))
+
+    merged = trainer.merge_features(cached, new)
+
+    # Rows past 90 days drop out; new rows replace cached rows with the same key
+    assert len(merged) < len(cached) + len(new)
+    assert merged['feedback_age_days'].max() == pytest.approx(89, abs=1)
+    assert merged.duplicated(subset=['lead_id', 'account_id', 'feedback_date']).sum() == 0
@@ -214,6 +214,59 @@ def test_ingest_csv_fallback_to_insert(mock_connect):
         os.unlink(tmp_csv_path)
 
 
+@patch('app.ingest.CSV_CHUNK_ROWS', 64)
+@patch('app.ingest.psycopg2.connect')
+def test_columnar_copy_matches_row_copy(mock_connect):
+    """Test that the columnar COPY path produces the same COPY data as the row path."""
+    from app.ingest import COPY_COLUMNS, LeadIngestor
+    
+    header = ['jurisdiction', 'permit_id', 'description', 'issue_date', 'value', 'is_residential',
+              'scraped_at', 'year_built', 'trade_tags', 'start_by_estimate', 'latitude', 'extra']
+    samples = [
+        ['Houston', 'P1', 'Roof\treplace\\n "quoted"', '2025-01-15', '450000.0', 'true',
+         '2025-08-09 02:49:06', '2020.0', '["roofing", "hvac"]', '02/01/2025', '29.7604', 'x'],
+        ['Dallas', 'P2', '', '13/45/2025', 'abc', 'No', '2025-08-09T02:49:06.035319+00:00',
+         'None', 'roofing, solar', 'None', ' -95.3698 ', ''],
+        ['Austin', 'P3', 'Line\nbreak', '', 'nan', '', '2025-08-09', 'inf', '[]', '', '1e5', ''],
+    ]
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as tmp_file:
+        writer = csv.writer(tmp_file)
+        writer.writerow(header)
+        for i in range(200):
+            row = list(samples[i % len(samples)])
+            row[1] = f"{row[1]}-{i}"
+            row[3] = row[3] and f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}" if i % 2 else row[3]
+            row[4] = f"{i * 1000.5}" if i % 5 == 0 else row[4]
+            writer.writerow(row)
+        tmp_csv_path = tmp_file.name
+    
+    try:
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = [200]
+        
+        def copied(columnar):
+            mock_cursor.copy_from.reset_mock()
+            result = LeadIngestor("postgresql://test").ingest_csv_with_copy(tmp_csv_path, columnar=columnar)
+            assert result == 200
+            calls = mock_cursor.copy_from.call_args_list
+            assert all(call.kwargs['columns'] == COPY_COLUMNS for call in calls)
+            return len(calls), ''.join(call.args[0].getvalue() for call in calls)
+        
+        row_calls, row_data = copied(columnar=False)
+        columnar_calls, columnar_data = copied(columnar=True)
+        
+        assert (row_calls, columnar_calls) == (1, 4)
+        assert columnar_data == row_data
+        first = dict(zip(COPY_COLUMNS, row_data.split('\n')[0].split('\t')))
+        assert first['description'] == 'Roof\\treplace\\\\n "quoted"'
+        assert first['issue_date'] == '2025-01-15'
+        assert first['trade_tags'] == '{"roofing","hvac"}'
+        assert first['address'] == '\\N'
+    finally:
+        os.unlink(tmp_csv_path)
+
+
 def test_file_not_found_error():
     """Test handling of missing CSV files."""
     from app.ingest import LeadIngestor
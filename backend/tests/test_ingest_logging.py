@@ -5,6 +5,8 @@ Unit tests for ingest logging functionality.
 Tests the ingest_logger module functions without requiring database connections.
 """
 
+import threading
+import time
 import unittest
 import uuid
 from unittest.mock import patch, MagicMock
@@ -17,6 +19,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from app.ingest_logger import (
     generate_trace_id, 
     IngestTracer,
+    IngestLogBuffer,
     log_ingest_step,
     get_trace_logs
 )
@@ -154,6 +157,94 @@ class TestIngestLogging(unittest.TestCase):
         self.assertFalse(exception_call[0][2])  # ok parameter should be False
 
 
+class TestIngestLogBuffer(unittest.TestCase):
+    """Test cases for buffered bulk ingest logging."""
+    
+    def test_entries_are_written_in_batches(self):
+        """Entries are bulk inserted batch_size at a time."""
+        batches = []
+        buffer = IngestLogBuffer(batch_size=10, flush_interval_ms=5000, writer=batches.append)
+        
+        for i in range(25):
+            self.assertTrue(buffer.enqueue({"stage": f"stage_{i}"}))
+        self.assertTrue(buffer.flush(timeout=5))
+        buffer.close()
+        
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+        self.assertEqual(buffer.stats['written'], 25)
+        self.assertEqual(buffer.stats['batches'], 3)
+    
+    def test_partial_batch_is_written_after_interval(self):
+        """A partial batch is flushed once the flush interval elapses."""
+        batches = []
+        buffer = IngestLogBuffer(batch_size=100, flush_interval_ms=50, writer=batches.append)
+        
+        buffer.enqueue({"stage": "parse"})
+        
+        deadline = time.monotonic() + 2
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        buffer.close()
+        
+        self.assertEqual(batches, [[{"stage": "parse"}]])
+    
+    def test_full_queue_drops_and_counts_entries(self):
+        """Entries beyond max_queue are dropped instead of blocking."""
+        release = threading.Event()
+        
+        def slow_writer(batch):
+            release.wait(5)
+        
+        buffer = IngestLogBuffer(batch_size=1, flush_interval_ms=10, max_queue=2, writer=slow_writer)
+        
+        accepted = [buffer.enqueue({"n": i}) for i in range(10)]
+        release.set()
+        buffer.close()
+        
+        self.assertIn(False, accepted)
+        self.assertEqual(buffer.stats['dropped'], accepted.count(False))
+        self.assertEqual(buffer.stats['enqueued'], accepted.count(True))
+    
+    def test_writer_errors_are_counted(self):
+        """A failing bulk insert is counted and does not stop the flusher."""
+        def failing_writer(batch):
+            raise RuntimeError("Supabase unavailable")
+        
+        buffer = IngestLogBuffer(batch_size=5, flush_interval_ms=10, writer=failing_writer)
+        for i in range(3):
+            buffer.enqueue({"n": i})
+        self.assertTrue(buffer.flush(timeout=5))
+        buffer.close()
+        
+        self.assertEqual(buffer.stats['failed'], 3)
+        self.assertEqual(buffer.stats['written'], 0)
+    
+    @patch('app.ingest_logger.get_ingest_log_buffer')
+    def test_buffered_log_ingest_step_enqueues(self, mock_get_buffer):
+        """buffered=True queues the entry instead of inserting it."""
+        mock_get_buffer.return_value.enqueue.return_value = True
+        trace_id = str(uuid.uuid4())
+        
+        with patch('app.ingest_logger.get_supabase_client') as mock_get_supabase:
+            result = log_ingest_step(trace_id, "parse", True, {"n": 1}, buffered=True)
+            mock_get_supabase.assert_not_called()
+        
+        self.assertTrue(result)
+        entry = mock_get_buffer.return_value.enqueue.call_args[0][0]
+        self.assertEqual(entry["trace_id"], trace_id)
+        self.assertEqual(entry["stage"], "parse")
+    
+    @patch('app.ingest_logger.get_ingest_log_buffer')
+    def test_tracer_flushes_on_exit(self, mock_get_buffer):
+        """IngestTracer flushes the buffer when the context exits."""
+        mock_get_buffer.return_value.enqueue.return_value = True
+        
+        with IngestTracer() as tracer:
+            tracer.log("fetch_page", True)
+        
+        mock_get_buffer.return_value.flush.assert_called_once()
+
+
 class TestValidation(unittest.TestCase):
     """Test input validation functions."""
     
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar lead feature preparation and batched personalization.
+"""
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml_inference import LeadMLInference
+import app.utils.cache  # noqa: F401  (import before psycopg2 is patched below)
+
+with patch.dict('sys.modules', {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+    from app.cancellation_feedback import CancellationFeedbackService, CancellationProfileCache, personalized_adjustments_from_profile
+
+FEATURE_COLUMNS = [
+    'rating_numeric', 'feedback_hour', 'contractor_canceled', 'contractor_win_rate',
+    'source_cancellation_rate', 'is_weekend_feedback', 'other_feature'
+]
+
+PROFILE = {
+    'primary_reason': 'wrong_lead_type',
+    'preferred_service_areas': ['city_of_houston'],
+    'preferred_trade_types': ['roofing'],
+    'total_leads_purchased': 40,
+    'leads_won': 3,
+}
+
+LEADS = [
+    {'id': 1, 'jurisdiction': 'city_of_houston', 'trade_tags': ['roofing'],
+     'features': {'rating_numeric': 4, 'contractor_canceled': True}},
+    {'id': 2, 'jurisdiction': 'harris_county', 'trade_tags': ['roofing', 'hvac'],
+     'features': {'feedback_hour': 9}},
+    {'id': 3, 'jurisdiction': 'harris_county', 'trade_tags': ['pool'], 'features': {}},
+]
+
+
+def make_inference():
+    inference = LeadMLInference()
+    inference.feature_columns = FEATURE_COLUMNS
+    return inference
+
+
+def test_prepare_features_fills_defaults_per_column():
+    features_df = make_inference().prepare_features(LEADS)
+
+    assert list(features_df.columns) == FEATURE_COLUMNS
+    assert features_df['rating_numeric'].tolist() == [4, 0, 0]
+    assert features_df['feedback_hour'].tolist() == [12, 9, 12]
+    assert features_df['contractor_canceled'].tolist() == [True, False, False]
+    assert features_df['contractor_win_rate'].tolist() == [0.1, 0.1, 0.1]
+    assert features_df['is_weekend_feedback'].tolist() == [False, False, False]
+    assert features_df['other_feature'].tolist() == [0, 0, 0]
+
+
+def test_prepare_features_empty_batch_keeps_columns():
+    features_df = make_inference().prepare_features([])
+
+    assert list(features_df.columns) == FEATURE_COLUMNS
+    assert len(features_df) == 0
+
+
+def test_profile_adjustments_match_per_lead_rules():
+    adjustments = personalized_adjustments_from_profile(PROFILE, LEADS)
+
+    # wrong_lead_type -10, win rate 7.5% -5, outside area -8, no matching trade -5; clamped at -20
+    np.testing.assert_allclose(adjustments, [-15.0, -20.0, -20.0])
+    np.testing.assert_allclose(personalized_adjustments_from_profile(None, LEADS), [0.0, 0.0, 0.0])
+    np.testing.assert_allclose(
+        personalized_adjustments_from_profile({'primary_reason': 'seasonal_business'}, LEADS), [2.0, 2.0, 2.0]
+    )
+
+
+def test_batch_adjustments_fetch_profile_once():
+    service = CancellationFeedbackService('postgresql://test', CancellationProfileCache(use_redis=False))
+    service.get_cancellation_profile = Mock(return_value=PROFILE)
+
+    batch = service.calculate_personalized_adjustments_batch('account-1', LEADS)
+
+    service.get_cancellation_profile.assert_called_once_with('account-1')
+    assert [service.calculate_personalized_adjustments('account-1', lead) for lead in LEADS] == batch.tolist()
+
+
+def test_predict_applies_adjustments_vectorized():
+    inference = make_inference()
+    inference.model = Mock()
+    inference.model.predict_proba.return_value = [[0.1, 0.9], [0.5, 0.5], [0.85, 0.15]]
+    inference.scaler = Mock()
+    inference.model_metadata = {'model_version': 'v1'}
+    service = Mock()
+    service.calculate_personalized_adjustments_batch.return_value = np.array([-15.0, -20.0, 0.0])
+
+    module = Mock(CancellationFeedbackService=Mock(return_value=service))
+    with patch.dict('sys.modules', {'cancellation_feedback': module}):
+        results = inference.predict(LEADS, 'account-1')
+
+    service.calculate_personalized_adjustments_batch.assert_called_once()
+    assert [result['lead_id'] for result in results] == [1, 2, 3]
+    assert [result['calibrated_score'] for result in results] == pytest.approx([75.0, 30.0, 15.0])
+    assert [result['predicted_success'] for result in results] == [True, False, False]
+    assert [result['confidence'] for result in results] == ['medium', 'medium', 'high']
+    assert all(isinstance(result['personalized_adjustment'], float) for result in results)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the demand forecast model registry.
+"""
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.demand_forecast import DemandSurgeForecaster, ForecastConfig
+from app.model_registry import ModelRegistry, model_type_from_version
+
+
+def training_frame(samples=120, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'permits_lag_1w': rng.poisson(20, samples).astype(float),
+        'permits_ma_4w': rng.normal(20, 3, samples),
+        'month_of_year': rng.integers(1, 13, samples),
+    })
+    y = pd.Series((X['permits_lag_1w'] + rng.normal(0, 4, samples) > 21).astype(int))
+    return X, y
+
+
+def make_forecaster(registry):
+    with patch('app.demand_forecast.get_supabase_client', return_value=Mock()):
+        return DemandSurgeForecaster(ForecastConfig(cv_splits=3), registry=registry)
+
+
+@pytest.fixture(scope='module')
+def trained(tmp_path_factory):
+    """One region trained with every model type and saved to a registry."""
+    root = tmp_path_factory.mktemp('registry')
+    forecaster = make_forecaster(ModelRegistry(root))
+    X, y = training_frame()
+    results = {
+        'gradient_boost': forecaster._train_gradient_boost(X, y, 'region-a'),
+        'lightgbm': forecaster._train_lightgbm(X, y, 'region-a'),
+        'xgboost': forecaster._train_xgboost(X, y, 'region-a'),
+    }
+    for metrics in results.values():
+        forecaster.feature_columns[metrics['model_version']] = list(X.columns)
+    forecaster._register_models({'region-a': results})
+    return root, forecaster, results, X
+
+
+def test_model_type_from_version_handles_underscored_types():
+    assert model_type_from_version('gradient_boost_region-a_20240101_000000') == 'gradient_boost'
+    assert model_type_from_version('lightgbm_region-a_20240101_000000') == 'lightgbm'
+
+
+def test_saved_models_reload_with_identical_predictions(trained):
+    root, forecaster, results, X = trained
+    fresh = ModelRegistry(root)
+
+    for model_type, metrics in results.items():
+        model_version = metrics['model_version']
+        entry = fresh.get(model_version)
+        assert entry['model_type'] == model_type
+        assert entry['feature_columns'] == list(X.columns)
+        assert entry['metrics']['cv_auc_mean'] == pytest.approx(metrics['cv_auc_mean'])
+
+        model, scaler = fresh.load(model_version)
+        assert (scaler is not None) == (model_type == 'gradient_boost')
+        expected = forecaster._predict_with_model(X.iloc[[0]], model_version)['p_surge']
+
+        reloaded = make_forecaster(fresh)
+        assert reloaded._load_model(model_version)
+        assert reloaded._predict_with_model(X.iloc[[0]], model_version)['p_surge'] == pytest.approx(expected)
+
+
+def test_load_is_lazy_and_cached(trained):
+    root, _, results, _ = trained
+    registry = ModelRegistry(root)
+    model_version = results['lightgbm']['model_version']
+
+    assert registry._loaded == {}
+    model, _ = registry.load(model_version)
+    assert registry.load(model_version)[0] is model
+    assert list(registry._loaded) == [model_version]
+
+    with pytest.raises(KeyError):
+        registry.load('lightgbm_missing_20240101_000000')
+
+
+def test_best_model_uses_stored_cv_auc(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    X, y = training_frame()
+    forecaster = DemandSurgeForecaster.for_training(ForecastConfig(cv_splits=3))
+    metrics = forecaster._train_lightgbm(X, y, 'region-a')
+    model = forecaster.models[metrics['model_version']]
+
+    registry.save_many([
+        {'model_version': f'lightgbm_region-a_{i}', 'model': model, 'region_id': 'region-a',
+         'metrics': {'cv_auc_mean': auc}}
+        for i, auc in enumerate([0.71, 0.83, 0.64], start=1)
+    ])
+
+    assert ModelRegistry(tmp_path).best_model('region-a') == 'lightgbm_region-a_2'
+    assert ModelRegistry(tmp_path).best_model('region-b') is None
+
+
+def test_best_model_comes_from_latest_run_and_old_runs_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.model_registry.RETAINED_RUNS', 2)
+    registry = ModelRegistry(tmp_path)
+    X, y = training_frame()
+    forecaster = DemandSurgeForecaster.for_training(ForecastConfig(cv_splits=3))
+    model = forecaster.models[forecaster._train_lightgbm(X, y, 'region-a')['model_version']]
+
+    registry.save('lightgbm_region-a_old', model, region_id='region-a', metrics={'cv_auc_mean': 0.95})
+    registry.save('lightgbm_region-b_old', model, region_id='region-b', metrics={'cv_auc_mean': 0.90})
+    registry.save('lightgbm_region-a_mid', model, region_id='region-a', metrics={'cv_auc_mean': 0.80})
+    registry.save('lightgbm_region-a_new', model, region_id='region-a', metrics={'cv_auc_mean': 0.70})
+
+    fresh = ModelRegistry(tmp_path)
+    # A better score from an older data window does not outrank the latest retrain
+    assert fresh.best_model('region-a') == 'lightgbm_region-a_new'
+    assert sorted(fresh.versions('region-a')) == ['lightgbm_region-a_mid', 'lightgbm_region-a_new']
+    assert not (tmp_path / 'lightgbm_region-a_old').exists()
+    # Other regions keep their runs
+    assert fresh.best_model('region-b') == 'lightgbm_region-b_old'
+
+
+def test_fresh_forecaster_selects_registered_model(trained):
+    root, _, results, _ = trained
+    forecaster = make_forecaster(ModelRegistry(root))
+    best = max(results.values(), key=lambda metrics: metrics['cv_auc_mean'])['model_version']
+
+    assert forecaster.models == {}
+    assert forecaster._select_best_model('region-a') == best
+    assert forecaster._load_model(best)
+    assert best in forecaster.models
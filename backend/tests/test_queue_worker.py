@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis Streams queue worker.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workers.queue_worker import (
+    QueueWorker, PipelineHandlers, JobError, backoff_seconds,
+    STREAM, GROUP, RETRY_KEY, DEAD_LETTER_STREAM
+)
+
+
+def make_redis():
+    redis = Mock()
+    redis.xack = AsyncMock(return_value=1)
+    redis.xadd = AsyncMock(return_value="1-0")
+    redis.zadd = AsyncMock(return_value=1)
+    redis.xautoclaim = AsyncMock(return_value=["0-0", [], []])
+    redis.xclaim = AsyncMock(return_value=[])
+    redis.xreadgroup = AsyncMock(return_value=[])
+    redis.eval = AsyncMock(return_value=0)
+    return redis
+
+
+def message(payload, attempt=None):
+    fields = {"payload": json.dumps(payload)}
+    if attempt is not None:
+        fields["attempt"] = str(attempt)
+    return fields
+
+
+def test_backoff_is_exponential_and_capped():
+    assert backoff_seconds(1, base_s=10, max_s=100) == 10
+    assert backoff_seconds(2, base_s=10, max_s=100) == 20
+    assert backoff_seconds(3, base_s=10, max_s=100) == 40
+    assert backoff_seconds(10, base_s=10, max_s=100) == 100
+
+
+@pytest.mark.asyncio
+async def test_successful_job_is_acked():
+    redis = make_redis()
+    dispatch = Mock(return_value={"status": "success"})
+    worker = QueueWorker(redis, dispatch, concurrency=2)
+
+    await worker.handle("1-0", message({"job": "ingest", "source_id": "austin"}))
+
+    dispatch.assert_called_once_with({"job": "ingest", "source_id": "austin"})
+    redis.xack.assert_awaited_once_with(STREAM, GROUP, "1-0")
+    assert worker.stats["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_scheduled_for_retry_then_acked():
+    redis = make_redis()
+    worker = QueueWorker(redis, Mock(side_effect=JobError("timeout")), max_attempts=3)
+
+    await worker.handle("1-0", message({"job": "ingest", "source_id": "austin"}))
+
+    redis.zadd.assert_awaited_once()
+    key, mapping = redis.zadd.await_args.args
+    assert key == RETRY_KEY
+    envelope = json.loads(next(iter(mapping)))
+    assert envelope["attempt"] == 2
+    assert envelope["error"] == "timeout"
+    redis.xack.assert_awaited_once_with(STREAM, GROUP, "1-0")
+    redis.xadd.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_is_dead_lettered_after_max_attempts():
+    redis = make_redis()
+    worker = QueueWorker(redis, Mock(side_effect=JobError("timeout")), max_attempts=3)
+
+    await worker.handle("1-0", message({"job": "ingest", "source_id": "austin"}, attempt=3))
+
+    redis.zadd.assert_not_awaited()
+    stream, fields = redis.xadd.await_args.args
+    assert stream == DEAD_LETTER_STREAM
+    assert fields["attempt"] == "3"
+    assert fields["error"] == "timeout"
+    redis.xack.assert_awaited_once_with(STREAM, GROUP, "1-0")
+
+
+@pytest.mark.asyncio
+async def test_invalid_payload_is_dead_lettered_without_dispatch():
+    redis = make_redis()
+    dispatch = Mock()
+    worker = QueueWorker(redis, dispatch)
+
+    await worker.handle("1-0", {"payload": "not json"})
+
+    dispatch.assert_not_called()
+    assert redis.xadd.await_args.args[0] == DEAD_LETTER_STREAM
+
+
+@pytest.mark.asyncio
+async def test_claim_stale_spawns_claimed_messages_and_acks_deleted():
+    redis = make_redis()
+    redis.xautoclaim = AsyncMock(return_value=[
+        "5-0",
+        [("2-0", message({"job": "normalize"}))],
+        ["3-0"],
+    ])
+    dispatch = Mock(return_value={})
+    worker = QueueWorker(redis, dispatch, concurrency=4, claim_idle_ms=1000)
+
+    claimed = await worker.claim_stale()
+    for task in list(worker._in_flight.values()):
+        await task
+
+    assert claimed == 1
+    assert worker._claim_cursor == "5-0"
+    assert redis.xautoclaim.await_args.kwargs["min_idle_time"] == 1000
+    assert redis.xautoclaim.await_args.kwargs["count"] == 4
+    redis.xack.assert_any_await(STREAM, GROUP, "3-0")
+    redis.xack.assert_any_await(STREAM, GROUP, "2-0")
+    dispatch.assert_called_once_with({"job": "normalize"})
+
+
+@pytest.mark.asyncio
+async def test_read_new_requests_only_free_slots():
+    redis = make_redis()
+    worker = QueueWorker(redis, Mock(), concurrency=3)
+    worker._in_flight["9-0"] = Mock()
+
+    await worker.read_new()
+
+    assert redis.xreadgroup.await_args.kwargs["count"] == 2
+
+
+def test_dispatch_rejects_unknown_job_type():
+    handlers = PipelineHandlers(db_url="postgresql://test")
+
+    with pytest.raises(ValueError):
+        handlers.dispatch({"job": "bogus"})
+
+
+def test_ingest_error_result_raises_job_error():
+    handlers = PipelineHandlers(db_url="postgresql://test")
+    loader = Mock()
+    loader.sources_config = {"tier_1_sources": [{"id": "austin", "kind": "socrata"}]}
+    loader.ingest_source.return_value = {"status": "error", "error": "HTTP 503"}
+    handlers._loader = loader
+
+    with pytest.raises(JobError, match="HTTP 503"):
+        handlers.dispatch({"job": "ingest", "source_id": "austin"})
+
+    loader.ingest_source.assert_called_once_with({"id": "austin", "kind": "socrata"}, full_refresh=False)
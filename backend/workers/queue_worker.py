@@ -1,44 +1,430 @@
+#!/usr/bin/env python3
+"""
+Redis Streams job worker for scrape/ingest/normalize jobs.
+
+Consumes the ``queue:scrape`` stream as part of the ``scrapegrp`` consumer
+group and dispatches each message to RawDataLoader.ingest_source and/or
+DataNormalizer.normalize_permits. Delivery is at-least-once:
+
+- Up to WORKER_CONCURRENCY jobs run at once per process (in threads, since
+  the pipelines are synchronous).
+- Messages left pending by dead consumers are recovered with XAUTOCLAIM once
+  they have been idle for WORKER_CLAIM_IDLE_MS. In-flight jobs are heartbeated
+  with XCLAIM JUSTID so long-running jobs are not stolen.
+- Failed jobs are retried with exponential backoff through a delayed-retry
+  sorted set and moved to the ``queue:scrape:dead`` stream after
+  WORKER_MAX_ATTEMPTS attempts.
+
+Message payload (JSON in the ``payload`` field):
+    {"job": "ingest" | "normalize" | "ingest_normalize",
+     "source_id": "...", "full_refresh": false, "batch_size": 1000}
+
+Usage:
+    cd backend && python -m workers.queue_worker
+"""
+
 import os
-import asyncio
+import sys
 import json
-from app.redis_client import get_redis, stream_readgroup, stream_ack
+import time
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Repository root (for pipelines/) and backend/ (for app/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.redis_client import REDIS_URL
+
+logger = logging.getLogger(__name__)
 
 STREAM = "queue:scrape"
-GROUP = "scrapegrp" 
+GROUP = "scrapegrp"
 CONSUMER = os.getenv("HOSTNAME", "worker-1")
+RETRY_KEY = f"{STREAM}:retry"
+DEAD_LETTER_STREAM = f"{STREAM}:dead"
+
+CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+MAX_ATTEMPTS = int(os.getenv("WORKER_MAX_ATTEMPTS", "5"))
+RETRY_BASE_S = float(os.getenv("WORKER_RETRY_BASE_S", "30"))
+RETRY_MAX_S = float(os.getenv("WORKER_RETRY_MAX_S", "1800"))
+CLAIM_IDLE_MS = int(os.getenv("WORKER_CLAIM_IDLE_MS", "300000"))
+BLOCK_MS = int(os.getenv("WORKER_BLOCK_MS", "5000"))
+METRICS_INTERVAL_S = float(os.getenv("WORKER_METRICS_INTERVAL_S", "15"))
+STREAM_MAXLEN = 10000
+
+# Atomically move due retries from the sorted set back onto the stream so
+# that concurrent workers never promote the same retry twice.
+PROMOTE_RETRIES_LUA = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, item in ipairs(items) do
+    local env = cjson.decode(item)
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*',
+               'payload', env['payload'], 'attempt', tostring(env['attempt']))
+end
+return #items
+"""
+
+
+class JobError(Exception):
+    """Raised when a job handler reports a failed run."""
+
+
+def backoff_seconds(attempt: int, base_s: float = RETRY_BASE_S, max_s: float = RETRY_MAX_S) -> float:
+    """Exponential backoff delay before retrying a job that failed `attempt` times."""
+    return min(max_s, base_s * (2 ** max(0, attempt - 1)))
+
+
+class PipelineHandlers:
+    """Dispatches job payloads to the raw load and normalize pipelines."""
+
+    def __init__(self, db_url: Optional[str] = None, sources_config_path: Optional[str] = None):
+        self.db_url = db_url or os.getenv("DATABASE_URL")
+        self.sources_config_path = sources_config_path or os.getenv(
+            "SOURCES_CONFIG",
+            str(Path(__file__).resolve().parents[2] / "config" / "sources_tx.yaml"),
+        )
+        self._loader = None
+        self._normalizer = None
+
+    def _get_loader(self):
+        if self._loader is None:
+            from pipelines.load_raw import RawDataLoader
+            self._loader = RawDataLoader(self.db_url, self.sources_config_path)
+        return self._loader
+
+    def _get_normalizer(self):
+        if self._normalizer is None:
+            from pipelines.normalize import DataNormalizer
+            self._normalizer = DataNormalizer(self.db_url, self.sources_config_path)
+        return self._normalizer
+
+    def _find_source(self, source_id: str) -> Dict[str, Any]:
+        config = self._get_loader().sources_config
+        for source_list in ("tier_1_sources", "tier_2_sources", "sources"):
+            for source in config.get(source_list, []) or []:
+                if source.get("id") == source_id:
+                    return source
+        raise ValueError(f"Unknown source_id: {source_id}")
+
+    def ingest(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run RawDataLoader.ingest_source for the payload's source."""
+        source = self._find_source(payload["source_id"])
+        result = self._get_loader().ingest_source(source, full_refresh=bool(payload.get("full_refresh")))
+        if result.get("status") == "error":
+            raise JobError(result.get("error", "ingest failed"))
+        return result
+
+    def normalize(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run DataNormalizer.normalize_permits for the payload's source (or all)."""
+        return self._get_normalizer().normalize_permits(
+            source_id=payload.get("source_id"),
+            batch_size=int(payload.get("batch_size", 1000)),
+        )
+
+    def ingest_normalize(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Ingest a source, then normalize what was loaded."""
+        ingest_result = self.ingest(payload)
+        normalize_result = self.normalize(payload)
+        return {"ingest": ingest_result, "normalize": normalize_result}
+
+    def dispatch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the handler named by payload['job'] (defaults to ingest_normalize)."""
+        job = payload.get("job", "ingest_normalize")
+        handler: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "ingest": self.ingest,
+            "normalize": self.normalize,
+            "ingest_normalize": self.ingest_normalize,
+        }.get(job)
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job}")
+        return handler(payload)
+
+
+class QueueWorker:
+    """Concurrent Redis Streams consumer with claim, retry and dead-letter handling."""
+
+    def __init__(
+        self,
+        redis,
+        dispatch: Callable[[Dict[str, Any]], Any],
+        consumer: str = CONSUMER,
+        concurrency: int = CONCURRENCY,
+        max_attempts: int = MAX_ATTEMPTS,
+        claim_idle_ms: int = CLAIM_IDLE_MS,
+        block_ms: int = BLOCK_MS,
+        stream: str = STREAM,
+        group: str = GROUP,
+        retry_base_s: float = RETRY_BASE_S,
+        retry_max_s: float = RETRY_MAX_S,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.retry_key = f"{stream}:retry"
+        self.dead_letter_stream = f"{stream}:dead"
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.dispatch = dispatch
+        self.consumer = consumer
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.claim_idle_ms = claim_idle_ms
+        self.block_ms = block_ms
+        self._slots = asyncio.Semaphore(concurrency)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._claim_cursor = "0-0"
+        self._stopping = False
+        self.stats = {"processed": 0, "retried": 0, "dead_lettered": 0, "claimed": 0}
 
+    async def ensure_group(self):
+        """Create the consumer group (and stream) if needed."""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                logger.exception("Failed to create Redis group '%s' for stream '%s'", self.group, self.stream)
+                raise
+
+    # ----- message handling -----
+
+    async def handle(self, msg_id: str, fields: Dict[str, str]):
+        """Process one message and ack, reschedule or dead-letter it."""
+        attempt = int(fields.get("attempt", 1))
+        started = time.perf_counter()
+        try:
+            payload = json.loads(fields["payload"])
+        except (KeyError, TypeError, ValueError) as e:
+            await self._dead_letter(msg_id, fields, attempt, f"Invalid payload: {e}")
+            return
 
-async def ensure_group():
-    r = get_redis()
-    if r:
+        job = payload.get("job", "ingest_normalize") if isinstance(payload, dict) else "unknown"
         try:
-            await r.xgroup_create(STREAM, GROUP, id="$", mkstream=True)
-        except Exception:
+            result = await asyncio.to_thread(self.dispatch, payload)
+            await self.redis.xack(self.stream, self.group, msg_id)
+            self.stats["processed"] += 1
+            _observe_job(job, "success", time.perf_counter() - started)
+            logger.info("Job %s (%s) succeeded on attempt %d: %s", msg_id, job, attempt, result)
         except Exception as e:
-            logger.exception("Failed to create Redis group '%s' for stream '%s'", GROUP, STREAM)
+            _observe_job(job, "error", time.perf_counter() - started)
+            # Bad payloads (unknown job/source, missing keys) will never succeed
+            if attempt >= self.max_attempts or isinstance(e, (ValueError, KeyError)):
+                await self._dead_letter(msg_id, fields, attempt, str(e))
+            else:
+                await self._schedule_retry(msg_id, fields, attempt, str(e))
 
+    async def _schedule_retry(self, msg_id: str, fields: Dict[str, str], attempt: int, error: str):
+        delay = backoff_seconds(attempt, self.retry_base_s, self.retry_max_s)
+        envelope = json.dumps({
+            "payload": fields["payload"],
+            "attempt": attempt + 1,
+            "error": error,
+            "retry_id": str(uuid.uuid4()),
+        })
+        # Schedule before acking: a crash in between re-delivers the original
+        # (at-least-once) rather than losing the job.
+        await self.redis.zadd(self.retry_key, {envelope: time.time() + delay})
+        await self.redis.xack(self.stream, self.group, msg_id)
+        self.stats["retried"] += 1
+        logger.warning("Job %s failed (attempt %d/%d), retrying in %.0fs: %s",
+                       msg_id, attempt, self.max_attempts, delay, error)
 
-async def handle(msg):
-    payload = json.loads(msg["payload"])
-    # TODO: call normalize/ingest with payload
-    print(f"Processing message: {payload}")
+    async def _dead_letter(self, msg_id: str, fields: Dict[str, str], attempt: int, error: str):
+        await self.redis.xadd(self.dead_letter_stream, {
+            "payload": fields.get("payload", ""),
+            "attempt": str(attempt),
+            "error": error,
+            "source_id": msg_id,
+            "failed_at": str(time.time()),
+            "consumer": self.consumer,
+        }, maxlen=STREAM_MAXLEN, approximate=True)
+        await self.redis.xack(self.stream, self.group, msg_id)
+        self.stats["dead_lettered"] += 1
+        logger.error("Job %s moved to %s after %d attempt(s): %s", msg_id, self.dead_letter_stream, attempt, error)
 
+    # ----- scheduling -----
 
-async def run():
-    await ensure_group()
-    while True:
-        batches = await stream_readgroup(STREAM, GROUP, CONSUMER)
-        for stream, entries in batches or []:
-            ids = []
-            for _id, kv in entries:
+    def _free_slots(self) -> int:
+        return self.concurrency - len(self._in_flight)
+
+    async def _spawn(self, msg_id: str, fields: Dict[str, str]):
+        if msg_id in self._in_flight:
+            return
+        await self._slots.acquire()
+        task = asyncio.create_task(self.handle(msg_id, fields))
+        self._in_flight[msg_id] = task
+
+        def _done(_task, msg_id=msg_id):
+            self._in_flight.pop(msg_id, None)
+            self._slots.release()
+
+        task.add_done_callback(_done)
+
+    async def promote_retries(self, limit: int = 100) -> int:
+        """Move retries whose backoff has elapsed back onto the stream."""
+        return int(await self.redis.eval(
+            PROMOTE_RETRIES_LUA, 2, self.retry_key, self.stream, time.time(), limit, STREAM_MAXLEN
+        ) or 0)
+
+    async def claim_stale(self) -> int:
+        """Claim messages left pending by dead consumers via XAUTOCLAIM."""
+        free = self._free_slots()
+        if free <= 0:
+            return 0
+        result = await self.redis.xautoclaim(
+            self.stream, self.group, self.consumer,
+            min_idle_time=self.claim_idle_ms, start_id=self._claim_cursor, count=free,
+        )
+        next_cursor, messages = result[0], result[1]
+        self._claim_cursor = next_cursor or "0-0"
+        # Redis >= 7 reports entries trimmed from the stream separately
+        deleted = result[2] if len(result) > 2 else []
+        if deleted:
+            await self.redis.xack(self.stream, self.group, *deleted)
+        claimed = 0
+        for msg_id, fields in messages:
+            if fields is None:
+                # Entry was trimmed from the stream while pending
+                await self.redis.xack(self.stream, self.group, msg_id)
+                continue
+            claimed += 1
+            await self._spawn(msg_id, fields)
+        self.stats["claimed"] += claimed
+        if claimed:
+            logger.info("Claimed %d stale message(s) from dead consumers", claimed)
+        return claimed
+
+    async def heartbeat(self):
+        """Reset idle time of in-flight messages so other workers do not claim them."""
+        if self._in_flight:
+            await self.redis.xclaim(
+                self.stream, self.group, self.consumer, min_idle_time=0,
+                message_ids=list(self._in_flight), justid=True,
+            )
+
+    async def read_new(self) -> int:
+        """Read up to the number of free slots of new messages."""
+        free = self._free_slots()
+        if free <= 0:
+            await asyncio.sleep(0.1)
+            return 0
+        batches = await self.redis.xreadgroup(
+            groupname=self.group, consumername=self.consumer,
+            streams={self.stream: ">"}, count=free, block=self.block_ms,
+        )
+        count = 0
+        for _stream, entries in batches or []:
+            for msg_id, fields in entries:
+                count += 1
+                await self._spawn(msg_id, fields)
+        return count
+
+    async def queue_stats(self) -> Dict[str, Any]:
+        """Collect queue depth and lag figures for metrics and logging."""
+        stats: Dict[str, Any] = {
+            "depth": await self.redis.xlen(self.stream),
+            "retry_scheduled": await self.redis.zcard(self.retry_key),
+            "dead_letter": await self.redis.xlen(self.dead_letter_stream),
+            "in_flight": len(self._in_flight),
+        }
+        pending = await self.redis.xpending(self.stream, self.group)
+        stats["pending"] = int(pending.get("pending", 0)) if pending else 0
+        stats["lag"] = None
+        for group in await self.redis.xinfo_groups(self.stream):
+            if group.get("name") == self.group:
+                # 'lag' (entries not yet delivered to the group) needs Redis >= 7
+                stats["lag"] = group.get("lag")
+        return stats
+
+    async def _maintenance_loop(self):
+        last_metrics = 0.0
+        while not self._stopping:
+            try:
+                await self.heartbeat()
+                await self.promote_retries()
+                await self.claim_stale()
+                if time.monotonic() - last_metrics >= METRICS_INTERVAL_S:
+                    stats = await self.queue_stats()
+                    _publish_queue_stats(self.stream, stats)
+                    logger.info("Queue stats: %s worker: %s", stats, self.stats)
+                    last_metrics = time.monotonic()
+            except Exception:
+                logger.exception("Queue maintenance failed")
+            await asyncio.sleep(min(5.0, self.claim_idle_ms / 3000.0))
+
+    async def run(self):
+        """Run until stop() is called."""
+        await self.ensure_group()
+        maintenance = asyncio.create_task(self._maintenance_loop())
+        try:
+            while not self._stopping:
                 try:
-                    await handle({k: v for k, v in kv.items()})
-                    ids.append(_id)
+                    await self.read_new()
                 except Exception:
-                    logging.exception("Exception occurred while handling message")
-            if ids:
-                await stream_ack(STREAM, GROUP, *ids)
+                    logger.exception("Failed to read from stream '%s'", self.stream)
+                    await asyncio.sleep(1)
+        finally:
+            maintenance.cancel()
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+
+    def stop(self):
+        self._stopping = True
+
+
+def _observe_job(job: str, status: str, duration_s: float):
+    try:
+        from app.metrics import queue_jobs_total, queue_job_duration_seconds
+        queue_jobs_total.labels(job=job, status=status).inc()
+        queue_job_duration_seconds.labels(job=job).observe(duration_s)
+    except ImportError:
+        pass
+
+
+def _publish_queue_stats(stream: str, stats: Dict[str, Any]):
+    try:
+        from app.metrics import queue_messages
+        for name, value in stats.items():
+            if value is not None:
+                queue_messages.labels(stream=stream, state=name).set(value)
+    except ImportError:
+        pass
+
+
+def create_worker_redis():
+    """Create a Redis client whose socket timeout outlasts blocking reads."""
+    from redis.asyncio import Redis
+
+    if not REDIS_URL:
+        raise RuntimeError("REDIS_URL environment variable not set")
+    return Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_timeout=BLOCK_MS / 1000.0 + 5,
+        socket_connect_timeout=2,
+        health_check_interval=30,
+        ssl=REDIS_URL.startswith("rediss://"),
+    )
+
+
+async def run():
+    metrics_port = os.getenv("WORKER_METRICS_PORT")
+    if metrics_port:
+        from prometheus_client import start_http_server
+        start_http_server(int(metrics_port))
+
+    worker = QueueWorker(create_worker_redis(), PipelineHandlers().dispatch)
+    logger.info("Starting queue worker %s (concurrency=%d)", worker.consumer, worker.concurrency)
+    await worker.run()
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
\ No newline at end of file
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(run())
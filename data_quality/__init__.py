@@ -4,6 +4,12 @@ Data quality validation modules for Home Services Lead Generation.
 This package contains data quality validation suites for the ETL pipeline.
 """
 
-from .permits_validation import PermitsValidationSuite, create_permits_checkpoint, run_permits_checkpoint
+from .permits_validation import (
+    PermitsValidationSuite, create_permits_checkpoint, run_permits_checkpoint, validate_permits_drift
+)
+from .streaming_profile import ProfileStore, SourceProfile
 
-__all__ = ['PermitsValidationSuite', 'create_permits_checkpoint', 'run_permits_checkpoint']
\ No newline at end of file
+__all__ = [
+    'PermitsValidationSuite', 'create_permits_checkpoint', 'run_permits_checkpoint', 'validate_permits_drift',
+    'ProfileStore', 'SourceProfile'
+]
\ No newline at end of file
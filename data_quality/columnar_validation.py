@@ -0,0 +1,293 @@
+"""
+Columnar rule evaluation for raw ingestion files.
+
+Raw JSON files are read once into pandas DataFrames (in chunks for very
+large files) and each validation rule is evaluated as a boolean mask over
+whole columns. Results are aggregated per rule into counts plus a capped
+number of example messages, so validating millions of records does not
+build millions of error strings.
+
+The masks reproduce the record-by-record checks used by
+DataValidationSuite: a field is "present" when ``record.get(field)`` is
+truthy, dates must parse as ``%Y-%m-%d`` or ``%Y-%m-%dT%H:%M:%S``, numbers
+must convert with ``float()``, and coordinates must fall inside the Texas
+bounding box.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Files larger than this are parsed incrementally instead of with json.load
+STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Records per DataFrame chunk
+CHUNK_RECORDS = 100_000
+
+# Bytes read per block when streaming
+READ_BLOCK_BYTES = 4 * 1024 * 1024
+
+# Texas bounding box (approximate)
+TEXAS_LAT = (25.0, 37.0)
+TEXAS_LON = (-107.0, -93.0)
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
+
+class NotAListError(ValueError):
+    """Raised when a raw file's top-level JSON value is not an array."""
+
+
+def iter_record_chunks(file_path: str, chunk_size: int = CHUNK_RECORDS,
+                       stream_threshold: int = STREAM_THRESHOLD_BYTES) -> Iterator[List[Any]]:
+    """
+    Yield the records of a JSON array file in lists of at most chunk_size.
+
+    Files up to stream_threshold bytes are loaded with json.load; larger
+    files are decoded incrementally so only one chunk is held in memory.
+
+    Raises:
+        NotAListError: If the file does not contain a JSON array
+    """
+    if os.path.getsize(file_path) <= stream_threshold:
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise NotAListError("Data is not a list")
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+        return
+
+    chunk = []
+    for record in _stream_json_array(file_path):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _stream_json_array(file_path: str) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r') as f:
+        buffer = f.read(READ_BLOCK_BYTES)
+        eof = not buffer
+        pos = _skip_whitespace(buffer, 0)
+        if pos >= len(buffer) or buffer[pos] != '[':
+            raise NotAListError("Data is not a list")
+        pos += 1
+
+        while True:
+            pos = _skip_whitespace(buffer, pos)
+            # Need at least one character past the next value to know it is complete
+            if pos >= len(buffer) - 1 and not eof:
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] == ',':
+                pos += 1
+                continue
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+            if end >= len(buffer) and not eof:
+                # A scalar may continue in the next block; decode it again with more input
+                buffer, pos, eof = _refill(f, buffer, pos)
+                continue
+            yield record
+            pos = end
+
+
+def _refill(f, buffer: str, pos: int):
+    block = f.read(READ_BLOCK_BYTES)
+    return buffer[pos:] + block, 0, not block
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in ' \t\n\r':
+        pos += 1
+    return pos
+
+
+def truthy_mask(series: pd.Series) -> np.ndarray:
+    """True where the value is truthy, as ``record.get(field)`` would test it (NaN = missing)."""
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+        return ~np.isnan(values) & (values != 0)
+    present = series.notna().to_numpy()
+    if _is_string_column(series):
+        return present & (series.to_numpy() != '')
+    result = np.zeros(len(series), dtype=bool)
+    if present.any():
+        result[present] = series[present].map(bool).to_numpy(dtype=bool)
+    return result
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    """True if every non-missing value is a str."""
+    return pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+
+
+def _string_mask(series: pd.Series) -> np.ndarray:
+    if _is_string_column(series):
+        return series.notna().to_numpy()
+    return np.array(series.map(lambda value: isinstance(value, str)), dtype=bool)
+
+
+def valid_date_mask(series: pd.Series) -> np.ndarray:
+    """True where the value is a string matching one of DATE_FORMATS."""
+    is_string = _string_mask(series)
+    valid = np.zeros(len(series), dtype=bool)
+    if not is_string.any():
+        return valid
+
+    strings = series[is_string]
+    parsed = np.zeros(len(strings), dtype=bool)
+    for date_format in DATE_FORMATS:
+        pending = ~parsed
+        if not pending.any():
+            break
+        dates = pd.to_datetime(strings[pending], format=date_format, errors='coerce')
+        parsed[pending] = dates.notna().to_numpy()
+
+    # pandas accepts a few strings strptime rejects (leap seconds) and rejects none it accepts,
+    # so only failures and leap-second candidates need the exact check
+    recheck = ~parsed | strings.str[-2:].isin(['60', '61']).to_numpy()
+    if recheck.any():
+        parsed[recheck] = strings[recheck].map(_strptime_valid).to_numpy(dtype=bool)
+
+    valid[is_string] = parsed
+    return valid
+
+
+def _strptime_valid(value: str) -> bool:
+    for date_format in DATE_FORMATS:
+        try:
+            datetime.strptime(value, date_format)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def float_values(series: pd.Series) -> np.ndarray:
+    """Values as float64, NaN where ``float(value)`` would fail (or the value is missing)."""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return np.array(series, dtype=float)
+
+    # pandas never converts a value float() rejects, but rejects some it accepts ("1_000")
+    values = np.array(pd.to_numeric(series, errors='coerce'), dtype=float)
+    recheck = np.isnan(values) & series.notna().to_numpy()
+    if recheck.any():
+        values[recheck] = series[recheck].map(_to_float).to_numpy(dtype=float)
+    return values
+
+
+def valid_number_mask(series: pd.Series) -> np.ndarray:
+    """True where ``float(value)`` succeeds (float('nan') counts as valid, like the record check)."""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.notna().to_numpy()
+    converted = float_values(series)
+    valid = ~np.isnan(converted)
+    nan_like = np.isnan(converted) & series.notna().to_numpy()
+    if nan_like.any():
+        valid[nan_like] = series[nan_like].map(_float_ok).to_numpy(dtype=bool)
+    return valid
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _float_ok(value: Any) -> bool:
+    try:
+        float(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def texas_coordinates_mask(lat: pd.Series, lon: pd.Series) -> np.ndarray:
+    """True where both coordinates convert to floats inside the Texas bounding box."""
+    lat_values = float_values(lat)
+    lon_values = float_values(lon)
+    with np.errstate(invalid='ignore'):
+        return ((lat_values >= TEXAS_LAT[0]) & (lat_values <= TEXAS_LAT[1]) &
+                (lon_values >= TEXAS_LON[0]) & (lon_values <= TEXAS_LON[1]))
+
+
+class RuleResults:
+    """Per-rule violation counts with a capped number of example messages."""
+
+    def __init__(self, max_examples: Optional[int] = 20):
+        """
+        Args:
+            max_examples: Example messages kept per rule (None keeps all)
+        """
+        self.max_examples = max_examples
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, List[str]] = {}
+        self.summaries: Dict[str, str] = {}
+
+    def add(self, rule: str, mask: np.ndarray, offset: int, summary: str, message) -> int:
+        """
+        Record the rows flagged by a mask.
+
+        Args:
+            rule: Rule key (keeps counts from different chunks together)
+            mask: Boolean array over the chunk's rows
+            offset: Index of the chunk's first record in the file
+            summary: Description used for the "N more" line
+            message: Callable (row position) -> example message
+
+        Returns:
+            Number of rows flagged in this chunk
+        """
+        flagged = np.flatnonzero(mask)
+        if not len(flagged):
+            return 0
+
+        self.counts[rule] = self.counts.get(rule, 0) + len(flagged)
+        self.summaries[rule] = summary
+        examples = self.examples.setdefault(rule, [])
+        room = len(flagged) if self.max_examples is None else max(self.max_examples - len(examples), 0)
+        for position in flagged[:room]:
+            examples.append(message(int(position), offset + int(position)))
+        return len(flagged)
+
+    def add_message(self, rule: str, message: str):
+        """Record a file-level finding (not tied to a record)."""
+        self.counts[rule] = self.counts.get(rule, 0) + 1
+        self.examples.setdefault(rule, []).append(message)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def messages(self) -> List[str]:
+        """Example messages per rule, each followed by a count of the ones left out."""
+        messages = []
+        for rule, examples in self.examples.items():
+            messages.extend(examples)
+            hidden = self.counts[rule] - len(examples)
+            if hidden > 0:
+                messages.append(f"... and {hidden} more records: {self.summaries[rule]}")
+        return messages
@@ -7,12 +7,24 @@ to ensure data integrity and catch issues early in the pipeline.
 
 import logging
 import os
-from typing import Dict, Any, Optional
-import great_expectations as gx
+from typing import Dict, Any, List, Optional
 import pandas as pd
 
+try:
+    import great_expectations as gx
+except ImportError:
+    gx = None
+
+try:
+    from .streaming_profile import SourceProfile, compare_profiles, merge_profiles
+except ImportError:
+    from streaming_profile import SourceProfile, compare_profiles, merge_profiles
+
 logger = logging.getLogger(__name__)
 
+# Trailing days a drift check needs before it can flag anything
+MIN_DRIFT_HISTORY_DAYS = 3
+
 
 class PermitsValidationSuite:
     """Data quality validation suite for permits."""
@@ -30,6 +42,8 @@ class PermitsValidationSuite:
             Configured expectation suite
         """
         if context is None:
+            if gx is None:
+                raise ImportError("great_expectations is required to create expectation suites")
             context = gx.get_context()
         
         # Create a new expectation suite
@@ -209,6 +223,9 @@ def create_permits_checkpoint(context=None, data_path: str = "data/yesterday.csv
         Configured checkpoint
     """
     if context is None:
+        if gx is None:
+            logger.error("great_expectations is required to create checkpoints")
+            return None
         context = gx.get_context()
     
     checkpoint_name = "permits_checkpoint"
@@ -346,6 +363,60 @@ def validate_permits_rowcount_delta(
     return result
 
 
+def validate_permits_drift(
+    profile: SourceProfile,
+    history: List[SourceProfile],
+    tolerance_percent: float = 50.0
+) -> Dict[str, Any]:
+    """
+    Validate a streaming ingest profile against its trailing window.
+    
+    Compares the day's row count with the trailing daily average (same rule as
+    validate_permits_rowcount_delta) and field null rates, quantiles and
+    category mix with the merged trailing profile. Nothing is re-read; only the
+    persisted sketches are used.
+    
+    Args:
+        profile: Today's profile for a source (all runs so far)
+        history: Profiles for the trailing days, newest first
+        tolerance_percent: Acceptable row count change vs. the trailing average
+        
+    Returns:
+        Validation result dictionary
+    """
+    result = {
+        "check": "distribution_drift",
+        "source_id": profile.source_id,
+        "day": profile.day.isoformat(),
+        "row_count": profile.row_count,
+        "history_days": len(history),
+        "success": True,
+        "findings": [],
+        "message": ""
+    }
+    
+    if len(history) < MIN_DRIFT_HISTORY_DAYS:
+        result["message"] = f"Building baseline: {len(history)}/{MIN_DRIFT_HISTORY_DAYS} trailing days"
+        return result
+    
+    average_count = round(sum(day.row_count for day in history) / len(history))
+    rowcount = validate_permits_rowcount_delta(profile.row_count, average_count, tolerance_percent)
+    result["rowcount_validation"] = rowcount
+    if not rowcount["success"]:
+        result["findings"].append({"field": None, "check": "row_count", "message": rowcount["message"]})
+    
+    result["findings"].extend(compare_profiles(profile, merge_profiles(history)))
+    
+    if result["findings"]:
+        result["success"] = False
+        result["severity"] = "warning"  # Can be upgraded to "error" by caller
+        result["message"] = f"Drift detected in {len(result['findings'])} checks"
+    else:
+        result["message"] = f"No drift against {len(history)} trailing days"
+    
+    return result
+
+
 def run_full_validation(data_path: str = "data/yesterday.csv") -> Dict[str, Any]:
     """
     Run complete validation suite on permits data.
@@ -0,0 +1,443 @@
+"""
+Streaming data profiles for ingestion drift checks.
+
+Records are profiled one at a time as they are fetched, so the profile is a
+side channel of ingestion rather than a second scan of the data. Memory is
+bounded per field regardless of record count:
+
+- row count and null rate
+- numeric quantiles from a merging t-digest
+- category frequencies from a capped space-saving sketch
+
+Profiles are persisted as one JSON sketch per source per day; sketches from
+several runs on the same day are merged. ``compare_profiles`` flags drift of
+today's profile against the merged trailing window.
+"""
+
+import json
+import logging
+import math
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# t-digest compression (max centroids is roughly 2x this)
+DIGEST_COMPRESSION = 100
+
+# Distinct categories tracked per field by the space-saving sketch
+MAX_CATEGORIES = 64
+
+# Fields profiled per source (extra fields are ignored)
+MAX_FIELDS = 200
+
+# Strings longer than this are not tracked as categories
+MAX_CATEGORY_LENGTH = 64
+
+# Drift thresholds
+NULL_RATE_TOLERANCE = 0.2      # absolute change in null rate
+QUANTILE_SHIFT_TOLERANCE = 1.0  # shift of p50/p90 in units of the baseline IQR
+PSI_TOLERANCE = 0.25           # population stability index over categories
+MIN_CATEGORY_COVERAGE = 0.8    # skip category drift for high-cardinality fields
+MIN_FIELD_COUNT = 30           # rows/values needed on both sides to compare a field
+
+DRIFT_QUANTILES = (0.5, 0.9)
+
+
+class TDigest:
+    """Merging t-digest for streaming quantile estimates."""
+
+    def __init__(self, compression: int = DIGEST_COMPRESSION):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[List[float]] = []
+
+    def add(self, value: float, weight: float = 1.0):
+        self._buffer.append([value, weight])
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        """Fold another digest's centroids into this one."""
+        other._compress()
+        for mean, weight in zip(other.means, other.weights):
+            self._buffer.append([mean, weight])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted([[m, w] for m, w in zip(self.means, self.weights)] + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        means, weights = [], []
+        current_mean, current_weight = points[0]
+        q0 = 0.0
+        q_limit = self._q_limit(q0)
+        for mean, weight in points[1:]:
+            if q0 + (current_weight + weight) / total <= q_limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                means.append(current_mean)
+                weights.append(current_weight)
+                q0 += current_weight / total
+                q_limit = self._q_limit(q0)
+                current_mean, current_weight = mean, weight
+        means.append(current_mean)
+        weights.append(current_weight)
+        self.means, self.weights = means, weights
+
+    def _q_limit(self, q: float) -> float:
+        # k1 scale function: small centroids near the tails, large ones near the median
+        k = self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1) + 1
+        return (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (None if empty)."""
+        self._compress()
+        if not self.means:
+            return None
+        if len(self.means) == 1:
+            return self.means[0]
+
+        target = q * self.count
+        cumulative = 0.0
+        previous_mid, previous_mean = 0.0, self.min
+        for mean, weight in zip(self.means, self.weights):
+            mid = cumulative + weight / 2
+            if target < mid:
+                span = mid - previous_mid
+                fraction = (target - previous_mid) / span if span > 0 else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+            previous_mid, previous_mean = mid, mean
+        span = self.count - previous_mid
+        fraction = (target - previous_mid) / span if span > 0 else 1.0
+        return previous_mean + min(fraction, 1.0) * (self.max - previous_mean)
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "centroids": [[mean, weight] for mean, weight in zip(self.means, self.weights)],
+            "count": self.count,
+            "min": self.min if self.means else None,
+            "max": self.max if self.means else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data.get("compression", DIGEST_COMPRESSION))
+        for mean, weight in data.get("centroids", []):
+            digest.means.append(mean)
+            digest.weights.append(weight)
+        digest.count = data.get("count", sum(digest.weights))
+        if digest.means:
+            digest.min = data.get("min", digest.means[0])
+            digest.max = data.get("max", digest.means[-1])
+        return digest
+
+
+class FieldProfile:
+    """Null rate, numeric quantiles and category frequencies for one field."""
+
+    def __init__(self):
+        self.count = 0  # records that had the field (null or not)
+        self.nulls = 0
+        self.digest = TDigest()
+        self.categories: Dict[str, int] = {}
+        self.categorized = 0
+        self.evictions = 0
+
+    def update(self, value: Any):
+        self.count += 1
+        if value is None or value == "":
+            self.nulls += 1
+            return
+        if isinstance(value, bool):
+            self._add_category(str(value))
+        elif isinstance(value, (int, float)):
+            if not math.isnan(value) and not math.isinf(value):
+                self.digest.add(float(value))
+        elif isinstance(value, str):
+            number = _to_number(value)
+            if number is not None:
+                self.digest.add(number)
+            elif len(value) <= MAX_CATEGORY_LENGTH:
+                self._add_category(value)
+        # Dates, geometries and nested values only count towards the null rate
+
+    def _add_category(self, value: str):
+        # Space-saving: once full, the rarest category is replaced and its count inherited
+        self.categorized += 1
+        if value in self.categories:
+            self.categories[value] += 1
+        elif len(self.categories) < MAX_CATEGORIES:
+            self.categories[value] = 1
+        elif self.evictions < 1000 or 2 * self.evictions < self.categorized:
+            rarest = min(self.categories, key=self.categories.get)
+            self.categories[value] = self.categories.pop(rarest) + 1
+            self.evictions += 1
+        # Otherwise the field is high-cardinality (IDs, addresses): stop paying for evictions
+
+    def null_rate(self, row_count: int) -> float:
+        """Share of rows where the field is missing, None or empty."""
+        if not row_count:
+            return 0.0
+        return (self.nulls + row_count - self.count) / row_count
+
+    @property
+    def category_coverage(self) -> float:
+        """Share of categorized values counted exactly (low for high-cardinality fields)."""
+        if not self.categorized:
+            return 0.0
+        # Inherited counts are overestimates; the smallest counter bounds the error
+        error = min(self.categories.values()) if len(self.categories) >= MAX_CATEGORIES else 0
+        exact = sum(self.categories.values()) - error * len(self.categories)
+        return max(exact, 0) / self.categorized
+
+    def merge(self, other: "FieldProfile"):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.digest.merge(other.digest)
+        self.categorized += other.categorized
+        self.evictions += other.evictions
+        combined = dict(self.categories)
+        for value, count in other.categories.items():
+            combined[value] = combined.get(value, 0) + count
+        self.categories = dict(sorted(combined.items(), key=lambda item: -item[1])[:MAX_CATEGORIES])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "digest": self.digest.to_dict(),
+            "categories": self.categories,
+            "categorized": self.categorized,
+            "evictions": self.evictions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FieldProfile":
+        profile = cls()
+        profile.count = data.get("count", 0)
+        profile.nulls = data.get("nulls", 0)
+        profile.digest = TDigest.from_dict(data.get("digest", {}))
+        profile.categories = dict(data.get("categories", {}))
+        profile.categorized = data.get("categorized", 0)
+        profile.evictions = data.get("evictions", 0)
+        return profile
+
+
+class SourceProfile:
+    """Streaming profile of the records ingested from one source on one day."""
+
+    def __init__(self, source_id: str, day: Optional[date] = None):
+        self.source_id = source_id
+        self.day = day or datetime.now().date()
+        self.row_count = 0
+        self.runs = 1
+        self.fields: Dict[str, FieldProfile] = {}
+
+    def update(self, record: Dict[str, Any]):
+        """Add one record to the profile."""
+        self.row_count += 1
+        for field, value in record.items():
+            profile = self.fields.get(field)
+            if profile is None:
+                if len(self.fields) >= MAX_FIELDS:
+                    continue
+                profile = self.fields[field] = FieldProfile()
+            profile.update(value)
+
+    def merge(self, other: "SourceProfile"):
+        """Fold another profile (e.g. an earlier run the same day) into this one."""
+        for field, theirs in other.fields.items():
+            if field not in self.fields:
+                self.fields[field] = FieldProfile()
+            self.fields[field].merge(theirs)
+        self.row_count += other.row_count
+        self.runs += other.runs
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source_id": self.source_id,
+            "day": self.day.isoformat(),
+            "row_count": self.row_count,
+            "runs": self.runs,
+            "fields": {field: profile.to_dict() for field, profile in self.fields.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SourceProfile":
+        profile = cls(data["source_id"], date.fromisoformat(data["day"]))
+        profile.row_count = data.get("row_count", 0)
+        profile.runs = data.get("runs", 1)
+        profile.fields = {field: FieldProfile.from_dict(value) for field, value in data.get("fields", {}).items()}
+        return profile
+
+
+class ProfileStore:
+    """Daily profile sketches on disk: <root>/<source_id>/<YYYY-MM-DD>.json."""
+
+    def __init__(self, root: str, retention_days: int = 90):
+        """
+        Args:
+            root: Directory for sketch files
+            retention_days: Sketches older than this are deleted on save
+        """
+        self.root = Path(root)
+        self.retention_days = retention_days
+
+    def _path(self, source_id: str, day: date) -> Path:
+        return self.root / source_id / f"{day.isoformat()}.json"
+
+    def load(self, source_id: str, day: date) -> Optional[SourceProfile]:
+        path = self._path(source_id, day)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f:
+                return SourceProfile.from_dict(json.load(f))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable profile {path}: {str(e)}")
+            return None
+
+    def save(self, profile: SourceProfile) -> SourceProfile:
+        """Persist a run's profile, merged with any earlier runs the same day."""
+        existing = self.load(profile.source_id, profile.day)
+        if existing is not None:
+            existing.merge(profile)
+            profile = existing
+
+        path = self._path(profile.source_id, profile.day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(profile.to_dict(), f)
+        os.replace(tmp_path, path)
+
+        self._prune(profile.source_id, profile.day)
+        return profile
+
+    def trailing(self, source_id: str, day: date, days: int = 7) -> List[SourceProfile]:
+        """Profiles for the `days` days before `day` (days without data are skipped)."""
+        profiles = []
+        for offset in range(1, days + 1):
+            profile = self.load(source_id, day - timedelta(days=offset))
+            if profile is not None:
+                profiles.append(profile)
+        return profiles
+
+    def _prune(self, source_id: str, day: date):
+        cutoff = day - timedelta(days=self.retention_days)
+        for path in (self.root / source_id).glob("*.json"):
+            try:
+                if date.fromisoformat(path.stem) < cutoff:
+                    path.unlink()
+            except ValueError:
+                continue
+
+
+def merge_profiles(profiles: List[SourceProfile]) -> Optional[SourceProfile]:
+    """Single profile covering all the given profiles (None if empty)."""
+    if not profiles:
+        return None
+    merged = SourceProfile.from_dict(profiles[0].to_dict())
+    for profile in profiles[1:]:
+        merged.merge(profile)
+    return merged
+
+
+def compare_profiles(current: SourceProfile, baseline: SourceProfile) -> List[Dict[str, Any]]:
+    """
+    Distribution drift of a profile against a baseline profile.
+
+    Args:
+        current: Profile being checked
+        baseline: Merged profile of the trailing window
+
+    Returns:
+        One finding per drifted field statistic (empty if nothing drifted)
+    """
+    findings = []
+    for field, profile in current.fields.items():
+        reference = baseline.fields.get(field)
+        if reference is None or current.row_count < MIN_FIELD_COUNT or baseline.row_count < MIN_FIELD_COUNT:
+            continue
+
+        null_rate = profile.null_rate(current.row_count)
+        baseline_null_rate = reference.null_rate(baseline.row_count)
+        if abs(null_rate - baseline_null_rate) > NULL_RATE_TOLERANCE:
+            findings.append({
+                "field": field,
+                "check": "null_rate",
+                "current": round(null_rate, 4),
+                "baseline": round(baseline_null_rate, 4),
+                "message": f"{field}: null rate {baseline_null_rate:.1%} -> {null_rate:.1%}",
+            })
+
+        if profile.digest.count >= MIN_FIELD_COUNT and reference.digest.count >= MIN_FIELD_COUNT:
+            iqr = reference.digest.quantile(0.75) - reference.digest.quantile(0.25)
+            for q in DRIFT_QUANTILES:
+                now, before = profile.digest.quantile(q), reference.digest.quantile(q)
+                scale = iqr if iqr > 0 else max(abs(before), 1.0)
+                shift = abs(now - before) / scale
+                if shift > QUANTILE_SHIFT_TOLERANCE:
+                    findings.append({
+                        "field": field,
+                        "check": f"p{int(q * 100)}",
+                        "current": now,
+                        "baseline": before,
+                        "shift_iqr": round(shift, 3),
+                        "message": f"{field}: p{int(q * 100)} {before:g} -> {now:g}",
+                    })
+
+        if (profile.categorized >= MIN_FIELD_COUNT and reference.categorized >= MIN_FIELD_COUNT
+                and profile.category_coverage >= MIN_CATEGORY_COVERAGE
+                and reference.category_coverage >= MIN_CATEGORY_COVERAGE):
+            psi = _population_stability(profile, reference)
+            if psi > PSI_TOLERANCE:
+                findings.append({
+                    "field": field,
+                    "check": "categories",
+                    "psi": round(psi, 4),
+                    "message": f"{field}: category mix shifted (PSI {psi:.2f})",
+                })
+    return findings
+
+
+def _population_stability(current: FieldProfile, baseline: FieldProfile) -> float:
+    psi = 0.0
+    for value in set(current.categories) | set(baseline.categories):
+        # Floor at half a record so categories absent on one side stay finite
+        actual = max(current.categories.get(value, 0), 0.5) / current.categorized
+        expected = max(baseline.categories.get(value, 0), 0.5) / baseline.categorized
+        psi += (actual - expected) * math.log(actual / expected)
+    return psi
+
+
+def _to_number(value: str) -> Optional[float]:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if math.isnan(number) or math.isinf(number):
+        return None
+    return number
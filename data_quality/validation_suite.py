@@ -1,329 +1,217 @@
 """Great Expectations data validation suite for Texas data ingestion."""
 
+import itertools
 import logging
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+try:
+    from .columnar_validation import (
+        CHUNK_RECORDS, STREAM_THRESHOLD_BYTES, NotAListError, RuleResults, iter_record_chunks,
+        texas_coordinates_mask, truthy_mask, valid_date_mask, valid_number_mask
+    )
+except ImportError:
+    from columnar_validation import (
+        CHUNK_RECORDS, STREAM_THRESHOLD_BYTES, NotAListError, RuleResults, iter_record_chunks,
+        texas_coordinates_mask, truthy_mask, valid_date_mask, valid_number_mask
+    )
+
 logger = logging.getLogger(__name__)
 
+# Rules per data category. Severity is "errors" or "warnings"; messages match
+# the per-record wording used in reports.
+CATEGORY_RULES = {
+    "permits": {
+        "label": "permit",
+        "required": ["permit_number", "issued_date", "address"],
+        "dates": {"issued_date": "errors"},
+        "numbers": {"value": "Invalid numeric value"},
+        "coordinates": "Record {i}: Coordinates outside Texas bounds: [REDACTED]",
+        "duplicates": ("permit_number", "permit numbers"),
+        "min_records": 10,
+        "present_metrics": {"records_with_value": "value"},
+    },
+    "violations": {
+        "label": "violation",
+        "required": ["case_number", "created_date", "address"],
+        "dates": {"created_date": "errors"},
+        "coordinates": "Record {i}: Coordinates outside Texas bounds: {lat}, {lon}",
+        "duplicates": ("case_number", "case numbers"),
+    },
+    "inspections": {
+        "label": "inspection",
+        "required": ["inspection_id", "inspection_date"],
+        "dates": {"inspection_date": "errors"},
+    },
+    "awards": {
+        "label": "award",
+        "required": ["contract_number", "award_date", "vendor_name"],
+        "numbers": {"amount": "Invalid amount"},
+        "dates": {"award_date": "errors"},
+        "present_metrics": {"records_with_amount": "amount"},
+    },
+    "contractors": {
+        "label": "contractor",
+        "required": ["license_number", "business_name"],
+        "duplicates": ("license_number", "license numbers"),
+        "dates": {"issue_date": "warnings", "expiration_date": "warnings"},
+    },
+    "generic": {
+        "label": "generic",
+        "metadata": ["_source", "_category"],
+    },
+}
+CATEGORY_RULES["bids"] = CATEGORY_RULES["awards"]
+
+# Fields every normalized (gold) record carries
+NORMALIZED_REQUIRED_FIELDS = ["id", "source", "category", "jurisdiction", "normalized_at"]
+
 
 class DataValidationSuite:
     """Data validation suite for Texas construction industry data."""
     
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the validation suite."""
+    def __init__(self, data_dir: str = "data", max_examples: Optional[int] = 20,
+                 chunk_size: int = CHUNK_RECORDS, stream_threshold: int = STREAM_THRESHOLD_BYTES):
+        """
+        Initialize the validation suite.
+        
+        Args:
+            data_dir: Root directory containing raw/ and gold/
+            max_examples: Example messages kept per rule in errors/warnings
+                (None keeps one message per offending record)
+            chunk_size: Records validated per columnar chunk
+            stream_threshold: Files larger than this (bytes) are parsed incrementally
+        """
         self.data_dir = Path(data_dir)
         self.validation_results = []
+        self.max_examples = max_examples
+        self.chunk_size = chunk_size
+        self.stream_threshold = stream_threshold
         
     def validate_raw_data(self, file_path: str) -> Dict[str, Any]:
         """Validate raw data file."""
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                
-            if not isinstance(data, list):
-                return self._create_result(file_path, False, "Data is not a list")
+            chunks = iter_record_chunks(file_path, self.chunk_size, self.stream_threshold)
+            first_chunk = next(chunks, None)
                 
-            if not data:
+            if not first_chunk:
                 return self._create_result(file_path, True, "Empty dataset", warnings=["No records to validate"])
                 
             # Determine data category
-            category = data[0].get("_category", "unknown")
+            category = first_chunk[0].get("_category", "unknown")
+            spec = CATEGORY_RULES.get(category, CATEGORY_RULES["generic"])
+            return self._validate_records(file_path, spec, itertools.chain([first_chunk], chunks))
             
-            if category == "permits":
-                return self._validate_permits(file_path, data)
-            elif category == "violations":
-                return self._validate_violations(file_path, data)
-            elif category == "inspections":
-                return self._validate_inspections(file_path, data)
-            elif category in ["bids", "awards"]:
-                return self._validate_awards(file_path, data)
-            elif category == "contractors":
-                return self._validate_contractors(file_path, data)
-            else:
-                return self._validate_generic(file_path, data)
-                
+        except NotAListError:
+            return self._create_result(file_path, False, "Data is not a list")
         except Exception as e:
             return self._create_result(file_path, False, f"Validation error: {str(e)}")
             
-    def _validate_permits(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate permit data."""
-        errors = []
-        warnings = []
+    def _validate_records(self, file_path: str, spec: Dict[str, Any],
+                          chunks: Iterable[List[Any]]) -> Dict[str, Any]:
+        """Evaluate a category's rules chunk by chunk as column masks."""
+        errors = RuleResults(self.max_examples)
+        warnings = RuleResults(self.max_examples)
+        results = {"errors": errors, "warnings": warnings}
         
-        # Check required fields
-        required_fields = ["permit_number", "issued_date", "address"]
-        for i, record in enumerate(data):
-            for field in required_fields:
-                if not record.get(field):
-                    errors.append(f"Record {i}: Missing required field '{field}'")
-                    
-        # Check data types and formats
-        for i, record in enumerate(data):
-            # Date validation
-            issued_date = record.get("issued_date")
-            if issued_date:
-                if not self._is_valid_date(issued_date):
-                    errors.append(f"Record {i}: Invalid date format for 'issued_date': {issued_date}")
-                    
-            # Numeric validation
-            value = record.get("value")
-            if value and not self._is_valid_number(value):
-                warnings.append(f"Record {i}: Invalid numeric value: {value}")
-                
-            # Geographic validation
-            lat, lon = record.get("latitude"), record.get("longitude")
-            if lat and lon:
-                if not self._is_valid_texas_coordinates(lat, lon):
-                    warnings.append(f"Record {i}: Coordinates outside Texas bounds: [REDACTED]")
-                    
-        # Check for duplicates
-        permit_numbers = [r.get("permit_number") for r in data if r.get("permit_number")]
-        duplicates = self._find_duplicates(permit_numbers)
-        if duplicates:
-            warnings.extend([f"Duplicate permit numbers found: {dup}" for dup in duplicates[:5]])
+        columns = list(dict.fromkeys(
+            spec.get("required", []) + list(spec.get("dates", {})) + list(spec.get("numbers", {})) +
+            spec.get("metadata", []) + list(spec.get("present_metrics", {}).values()) +
+            (["latitude", "longitude"] if "coordinates" in spec else []) +
+            ([spec["duplicates"][0]] if "duplicates" in spec else [])
+        ))
+        counts = {name: 0 for name in spec.get("present_metrics", {})}
+        with_coordinates = 0
+        duplicate_keys = []
+        total = 0
+        
+        for chunk in chunks:
+            offset = total
+            total += len(chunk)
+            is_dict = np.fromiter((isinstance(record, dict) for record in chunk), dtype=bool, count=len(chunk))
+            if not is_dict.all():
+                if "metadata" not in spec:
+                    position = int(np.flatnonzero(~is_dict)[0])
+                    raise TypeError(f"Record {offset + position}: Not a dictionary")
+                errors.add("not_dict", ~is_dict, offset, "Not a dictionary",
+                           lambda pos, i: f"Record {i}: Not a dictionary")
+                chunk = [record if isinstance(record, dict) else {} for record in chunk]
+            frame = pd.DataFrame(chunk, columns=columns)
+            present = {column: truthy_mask(frame[column]) for column in columns}
             
-        # Row count validation
-        if len(data) < 10:
-            warnings.append(f"Low record count: {len(data)} records")
+            for field in spec.get("required", []):
+                errors.add(f"required:{field}", ~present[field], offset, f"Missing required field '{field}'",
+                           lambda pos, i, field=field: f"Record {i}: Missing required field '{field}'")
             
-        return self._create_result(
-            file_path, 
-            len(errors) == 0,
-            f"Validated {len(data)} permit records",
-            errors=errors,
-            warnings=warnings,
-            metrics={
-                "total_records": len(data),
-                "records_with_coordinates": sum(1 for r in data if r.get("latitude") and r.get("longitude")),
-                "records_with_value": sum(1 for r in data if r.get("value")),
-                "unique_permit_numbers": len(set(permit_numbers))
-            }
-        )
-        
-    def _validate_violations(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate violation data."""
-        errors = []
-        warnings = []
-        
-        # Check required fields
-        required_fields = ["case_number", "created_date", "address"]
-        for i, record in enumerate(data):
-            for field in required_fields:
-                if not record.get(field):
-                    errors.append(f"Record {i}: Missing required field '{field}'")
-                    
-        # Check data types
-        for i, record in enumerate(data):
-            created_date = record.get("created_date")
-            if created_date and not self._is_valid_date(created_date):
-                errors.append(f"Record {i}: Invalid date format for 'created_date': {created_date}")
-                
-            # Geographic validation
-            lat, lon = record.get("latitude"), record.get("longitude")
-            if lat and lon:
-                if not self._is_valid_texas_coordinates(lat, lon):
-                    warnings.append(f"Record {i}: Coordinates outside Texas bounds: {lat}, {lon}")
-                    
-        # Check for duplicates
-        case_numbers = [r.get("case_number") for r in data if r.get("case_number")]
-        duplicates = self._find_duplicates(case_numbers)
-        if duplicates:
-            warnings.extend([f"Duplicate case numbers found: {dup}" for dup in duplicates[:5]])
+            for field in spec.get("metadata", []):
+                name = field.lstrip('_')
+                warnings.add(f"metadata:{field}", is_dict & ~present[field], offset, f"Missing {name} metadata",
+                             lambda pos, i, name=name: f"Record {i}: Missing {name} metadata")
             
-        return self._create_result(
-            file_path,
-            len(errors) == 0,
-            f"Validated {len(data)} violation records",
-            errors=errors,
-            warnings=warnings,
-            metrics={
-                "total_records": len(data),
-                "records_with_coordinates": sum(1 for r in data if r.get("latitude") and r.get("longitude")),
-                "unique_case_numbers": len(set(case_numbers))
-            }
-        )
-        
-    def _validate_inspections(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate inspection data."""
-        errors = []
-        warnings = []
-        
-        # Check required fields
-        required_fields = ["inspection_id", "inspection_date"]
-        for i, record in enumerate(data):
-            for field in required_fields:
-                if not record.get(field):
-                    errors.append(f"Record {i}: Missing required field '{field}'")
-                    
-        # Date validation
-        for i, record in enumerate(data):
-            inspection_date = record.get("inspection_date")
-            if inspection_date and not self._is_valid_date(inspection_date):
-                errors.append(f"Record {i}: Invalid date format for 'inspection_date': {inspection_date}")
-                
-        return self._create_result(
-            file_path,
-            len(errors) == 0,
-            f"Validated {len(data)} inspection records",
-            errors=errors,
-            warnings=warnings,
-            metrics={"total_records": len(data)}
-        )
-        
-    def _validate_awards(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate award/bid data."""
-        errors = []
-        warnings = []
+            for field, severity in spec.get("dates", {}).items():
+                invalid = present[field] & ~valid_date_mask(frame[field])
+                results[severity].add(
+                    f"date:{field}", invalid, offset, f"Invalid date format for '{field}'",
+                    lambda pos, i, field=field: f"Record {i}: Invalid date format for '{field}': {chunk[pos].get(field)}"
+                )
+            
+            for field, text in spec.get("numbers", {}).items():
+                invalid = present[field] & ~valid_number_mask(frame[field])
+                warnings.add(f"number:{field}", invalid, offset, text,
+                             lambda pos, i, field=field, text=text: f"Record {i}: {text}: {chunk[pos].get(field)}")
+            
+            if "coordinates" in spec:
+                has_coordinates = present["latitude"] & present["longitude"]
+                outside = has_coordinates & ~texas_coordinates_mask(frame["latitude"], frame["longitude"])
+                template = spec["coordinates"]
+                warnings.add("coordinates", outside, offset, "Coordinates outside Texas bounds",
+                             lambda pos, i: template.format(i=i, lat=chunk[pos].get("latitude"),
+                                                            lon=chunk[pos].get("longitude")))
+                with_coordinates += int(has_coordinates.sum())
+            
+            for name, field in spec.get("present_metrics", {}).items():
+                counts[name] += int(present[field].sum())
+            
+            if "duplicates" in spec:
+                key = spec["duplicates"][0]
+                duplicate_keys.append(frame[key][present[key]])
         
-        # Check required fields
-        required_fields = ["contract_number", "award_date", "vendor_name"]
-        for i, record in enumerate(data):
-            for field in required_fields:
-                if not record.get(field):
-                    errors.append(f"Record {i}: Missing required field '{field}'")
-                    
-        # Validate amounts
-        for i, record in enumerate(data):
-            amount = record.get("amount")
-            if amount and not self._is_valid_number(amount):
-                warnings.append(f"Record {i}: Invalid amount: {amount}")
-                
-            award_date = record.get("award_date")
-            if award_date and not self._is_valid_date(award_date):
-                errors.append(f"Record {i}: Invalid date format for 'award_date': {award_date}")
-                
-        return self._create_result(
-            file_path,
-            len(errors) == 0,
-            f"Validated {len(data)} award records",
-            errors=errors,
-            warnings=warnings,
-            metrics={
-                "total_records": len(data),
-                "records_with_amount": sum(1 for r in data if r.get("amount"))
-            }
-        )
+        metrics = {"total_records": total}
+        if "coordinates" in spec:
+            metrics["records_with_coordinates"] = with_coordinates
+        metrics.update(counts)
         
-    def _validate_contractors(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate contractor license data."""
-        errors = []
-        warnings = []
+        # Check for duplicates across all chunks
+        if "duplicates" in spec:
+            key, description = spec["duplicates"]
+            keys = pd.concat(duplicate_keys, ignore_index=True) if duplicate_keys else pd.Series(dtype=object)
+            duplicates = keys[keys.duplicated()].unique()
+            for duplicate in duplicates[:5]:
+                warnings.add_message("duplicates", f"Duplicate {description} found: {duplicate}")
+            metrics[f"unique_{description.replace(' ', '_')}"] = int(keys.nunique())
+            metrics[f"duplicate_{description.replace(' ', '_')}"] = int(len(duplicates))
         
-        # Check required fields
-        required_fields = ["license_number", "business_name"]
-        for i, record in enumerate(data):
-            for field in required_fields:
-                if not record.get(field):
-                    errors.append(f"Record {i}: Missing required field '{field}'")
-                    
-        # Check license numbers for duplicates
-        license_numbers = [r.get("license_number") for r in data if r.get("license_number")]
-        duplicates = self._find_duplicates(license_numbers)
-        if duplicates:
-            warnings.extend([f"Duplicate license numbers found: {dup}" for dup in duplicates[:5]])
-            
-        # Date validation
-        for i, record in enumerate(data):
-            for date_field in ["issue_date", "expiration_date"]:
-                date_value = record.get(date_field)
-                if date_value and not self._is_valid_date(date_value):
-                    warnings.append(f"Record {i}: Invalid date format for '{date_field}': {date_value}")
-                    
-        return self._create_result(
-            file_path,
-            len(errors) == 0,
-            f"Validated {len(data)} contractor records",
-            errors=errors,
-            warnings=warnings,
-            metrics={
-                "total_records": len(data),
-                "unique_license_numbers": len(set(license_numbers))
-            }
-        )
+        # Row count validation
+        if total < spec.get("min_records", 0):
+            warnings.add_message("low_count", f"Low record count: {total} records")
         
-    def _validate_generic(self, file_path: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate generic data records."""
-        errors = []
-        warnings = []
+        metrics["error_count"] = errors.total
+        metrics["warning_count"] = warnings.total
         
-        # Basic structure validation
-        for i, record in enumerate(data):
-            if not isinstance(record, dict):
-                errors.append(f"Record {i}: Not a dictionary")
-                continue
-                
-            # Check for minimum metadata
-            if not record.get("_source"):
-                warnings.append(f"Record {i}: Missing source metadata")
-                
-            if not record.get("_category"):
-                warnings.append(f"Record {i}: Missing category metadata")
-                
         return self._create_result(
             file_path,
-            len(errors) == 0,
-            f"Validated {len(data)} generic records",
-            errors=errors,
-            warnings=warnings,
-            metrics={"total_records": len(data)}
+            errors.total == 0,
+            f"Validated {total} {spec['label']} records",
+            errors=errors.messages(),
+            warnings=warnings.messages(),
+            metrics=metrics
         )
         
-    def _is_valid_date(self, date_value: Any) -> bool:
-        """Check if a value is a valid date."""
-        if not date_value:
-            return False
-            
-        try:
-            if isinstance(date_value, str):
-                # Try common date formats
-                datetime.strptime(date_value, "%Y-%m-%d")
-                return True
-            return False
-        except ValueError:
-            try:
-                datetime.strptime(date_value, "%Y-%m-%dT%H:%M:%S")
-                return True
-            except ValueError:
-                return False
-                
-    def _is_valid_number(self, value: Any) -> bool:
-        """Check if a value is a valid number."""
-        if not value:
-            return False
-            
-        try:
-            float(value)
-            return True
-        except (ValueError, TypeError):
-            return False
-            
-    def _is_valid_texas_coordinates(self, lat: Any, lon: Any) -> bool:
-        """Check if coordinates are within Texas bounds."""
-        try:
-            lat_f = float(lat)
-            lon_f = float(lon)
-            
-            # Texas bounding box (approximate)
-            return (25.0 <= lat_f <= 37.0 and -107.0 <= lon_f <= -93.0)
-        except (ValueError, TypeError):
-            return False
-            
-    def _find_duplicates(self, values: List[Any]) -> List[Any]:
-        """Find duplicate values in a list."""
-        seen = set()
-        duplicates = set()
-        
-        for value in values:
-            if value in seen:
-                duplicates.add(value)
-            else:
-                seen.add(value)
-                
-        return list(duplicates)
-        
     def _create_result(
         self, 
         file_path: str, 
@@ -366,13 +254,13 @@ class DataValidationSuite:
             if result["success"]:
                 logger.info(f"✓ {json_file.name}: {result['message']}")
                 if result["warnings"]:
-                    logger.warning(f"  Warnings: {len(result['warnings'])}")
+                    logger.warning(f"  Warnings: {result['metrics'].get('warning_count', len(result['warnings']))}")
             else:
                 # Sanitize message to avoid logging sensitive data
                 sanitized_message = result['message'].replace("Coordinates outside Texas bounds:", "Coordinates outside Texas bounds: [REDACTED]")
                 logger.error(f"✗ {json_file.name}: {sanitized_message}")
                 if result["errors"]:
-                    logger.error(f"  Errors: {len(result['errors'])}")
+                    logger.error(f"  Errors: {result['metrics'].get('error_count', len(result['errors']))}")
                     
         # Save validation report
         report = {
@@ -394,18 +282,38 @@ class DataValidationSuite:
         
         return report
         
-    def validate_normalized_data(self) -> Dict[str, Any]:
-        """Validate normalized gold table data."""
+    def validate_normalized_data(
+        self,
+        categories: Optional[List[str]] = None,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate normalized gold table data.
+        
+        Only the checked columns of the gold files in the month range are read.
+        
+        Args:
+            categories: Gold categories to validate (default: all)
+            start_month: First issue month to validate ("YYYY-MM", inclusive)
+            end_month: Last issue month to validate ("YYYY-MM", inclusive)
+        """
+        # Imported here so the module still loads when run from data_quality/
+        from lib.gold_store import GOLD_CATEGORIES, GoldStore
+
         gold_dir = self.data_dir / "gold"
         if not gold_dir.exists():
             return {"error": "Gold data directory not found"}
             
         results = []
+        store = GoldStore(str(gold_dir))
+        columns = NORMALIZED_REQUIRED_FIELDS + ["quality_score"]
+        gold_files = [path for category in categories or GOLD_CATEGORIES
+                      for path in store.files(category, start_month, end_month)]
         
-        for json_file in gold_dir.glob("*.json"):
+        for gold_file in gold_files:
             try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
+                data = store.read_file(gold_file, columns, start_month=start_month, end_month=end_month)
                     
                 # Validate normalized structure
                 errors = []
@@ -413,8 +321,7 @@ class DataValidationSuite:
                 
                 for i, record in enumerate(data):
                     # Check for required normalized fields
-                    required_fields = ["id", "source", "category", "jurisdiction", "normalized_at"]
-                    for field in required_fields:
+                    for field in NORMALIZED_REQUIRED_FIELDS:
                         if field not in record:
                             errors.append(f"Record {i}: Missing normalized field '{field}'")
                             
@@ -425,7 +332,7 @@ class DataValidationSuite:
                             warnings.append(f"Record {i}: Invalid quality score: {quality_score}")
                             
                 result = self._create_result(
-                    str(json_file),
+                    str(gold_file),
                     len(errors) == 0,
                     f"Validated {len(data)} normalized records",
                     errors=errors,
@@ -439,7 +346,7 @@ class DataValidationSuite:
                 results.append(result)
                 
             except Exception as e:
-                result = self._create_result(str(json_file), False, f"Validation error: {str(e)}")
+                result = self._create_result(str(gold_file), False, f"Validation error: {str(e)}")
                 results.append(result)
                 
         return {
@@ -8,8 +8,8 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Iterator, Tuple
 from urllib.parse import urlencode
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from permit_leads.utils.http import shared_session
 
 """
 ArcGIS REST API connector for ingesting permit data.
@@ -28,6 +28,9 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# query_layer() retries itself
+QUERY_SESSION = shared_session(max_retries=0)
+
 
 def query_layer(base_url, layer, where="1=1", result_offset=0, result_record_count=1000, out_fields="*", f="json"):
     """
@@ -74,7 +77,7 @@ def query_layer(base_url, layer, where="1=1", result_offset=0, result_record_cou
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(query_url, params=params, headers=headers, timeout=30)
+            response = QUERY_SESSION.get(query_url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -123,16 +126,7 @@ class ArcGISConnector:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
+        return shared_session(max_retries=3)
         
     def _rate_limit(self):
         """Enforce rate limiting between requests."""
@@ -341,13 +335,11 @@ if __name__ == "__main__":
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.retry_count = retry_count
-        self.session = requests.Session()
-        
-        # Set common headers
-        self.session.headers.update({
+        # _make_request() retries itself
+        self.session = shared_session({
             'User-Agent': 'HomeServicesLeadGen/1.0 (Texas Permits Ingestion)',
             'Accept': 'application/json'
-        })
+        }, max_retries=0)
     
     def _make_request(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
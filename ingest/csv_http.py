@@ -9,10 +9,10 @@ import csv
 import io
 import logging
 import time
-import requests
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from permit_leads.utils.http import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class CSVHTTPConnector:
         self.timeout = timeout
         self.retry_count = retry_count
         self.encoding = encoding
-        self.session = requests.Session()
+        self.session = shared_session(max_retries=0)
         
     async def extract_updated_since(self, endpoint: str, updated_field: str, since: Optional[datetime], rate_limit: int = 1) -> List[Dict[str, Any]]:
         """
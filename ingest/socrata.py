@@ -8,8 +8,8 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Iterator, Tuple
 from urllib.parse import urljoin
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from permit_leads.utils.http import shared_session
 
 """
 Socrata Open Data API connector for ingesting permit data.
@@ -28,6 +28,9 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# fetch() retries itself (including 429 backoff)
+FETCH_SESSION = shared_session(max_retries=0)
+
 
 def fetch(domain, dataset, where=None, limit=50000, offset=0, app_token=None):
     """
@@ -79,7 +82,7 @@ def fetch(domain, dataset, where=None, limit=50000, offset=0, app_token=None):
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(base_url, params=params, headers=headers, timeout=30)
+            response = FETCH_SESSION.get(base_url, params=params, headers=headers, timeout=30)
             
             if response.status_code == 429:  # Rate limited
                 if attempt < max_retries - 1:
@@ -134,23 +137,10 @@ class SocrataConnector:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set user agent
-        session.headers.update({
+        return shared_session({
             "User-Agent": "TexasDataIngest/1.0 (LeadLedgerPro)",
             "Accept": "application/json"
-        })
-        
-        return session
+        }, max_retries=3)
         
     def _rate_limit(self):
         """Enforce rate limiting between requests."""
@@ -435,8 +425,6 @@ if __name__ == "__main__":
         self.app_token = app_token
         self.timeout = timeout
         self.retry_count = retry_count
-        self.session = requests.Session()
-        
         # Set common headers
         headers = {
             'User-Agent': 'HomeServicesLeadGen/1.0 (Texas Permits Ingestion)',
@@ -446,7 +434,8 @@ if __name__ == "__main__":
         if app_token:
             headers['X-App-Token'] = app_token
         
-        self.session.headers.update(headers)
+        # _make_request() retries itself
+        self.session = shared_session(headers, max_retries=0)
     
     def _make_request(self, url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
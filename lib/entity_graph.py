@@ -10,8 +10,16 @@ from collections import defaultdict
 import hashlib
 from pathlib import Path
 
+try:
+    from .gold_store import GOLD_CATEGORIES, GoldStore
+except ImportError:
+    from gold_store import GOLD_CATEGORIES, GoldStore
+
 logger = logging.getLogger(__name__)
 
+# Gold columns the graph never reads (raw source payloads)
+GRAPH_EXCLUDED_COLUMNS = ("raw_data",)
+
 
 @dataclass
 class Entity:
@@ -90,18 +98,37 @@ class EntityGraph:
         self.name_similarity_threshold = 0.85
         self.address_similarity_threshold = 0.90
         
-    def load_normalized_data(self) -> int:
-        """Load normalized data and build entity graph."""
+    def load_normalized_data(
+        self,
+        categories: Optional[List[str]] = None,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None
+    ) -> int:
+        """
+        Load normalized data and build entity graph.
+        
+        Only the gold files in the month range are opened, and raw source
+        payloads are not read.
+        
+        Args:
+            categories: Gold categories to load (default: all)
+            start_month: First issue month to load ("YYYY-MM", inclusive)
+            end_month: Last issue month to load ("YYYY-MM", inclusive)
+            
+        Returns:
+            Number of records loaded
+        """
         total_loaded = 0
+        store = GoldStore(str(self.data_dir))
         
         # Load each category of normalized data
-        for category in ["permits", "violations", "inspections", "bids", "awards", "contractors"]:
-            files = list(self.data_dir.glob(f"{category}_*.json"))
+        for category in categories or GOLD_CATEGORIES:
+            files = store.files(category, start_month, end_month)
             
             for file_path in files:
                 try:
-                    with open(file_path, 'r') as f:
-                        records = json.load(f)
+                    records = store.read_file(file_path, exclude=GRAPH_EXCLUDED_COLUMNS,
+                                              start_month=start_month, end_month=end_month)
                         
                     loaded = self._process_category_records(category, records)
                     total_loaded += loaded
@@ -0,0 +1,294 @@
+"""
+Gold-layer storage for file-mode normalization.
+
+Normalized records are stored per category as a Hive-style partitioned
+dataset, one directory per issue month:
+
+    data/gold/permits/issue_month=2024-01/part-20240201_120000-1a2b3c4d.parquet
+
+Every file of a category has the same schema, derived from the record
+dataclass (timestamps, floats and strings; nested values such as raw_data
+as JSON text), so readers can project columns and prune months without
+opening files they do not need. Parquet needs pyarrow; without it the same
+layout is written as JSON files. Flat ``{category}_*.json`` files written
+before the partitioned layout are still read.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import typing
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+GOLD_CATEGORIES = ("permits", "violations", "inspections", "bids", "awards", "contractors")
+
+# Date column that decides a record's issue month partition
+PARTITION_DATE_FIELDS = {
+    "permits": "issued_date",
+    "violations": "created_date",
+    "inspections": "inspection_date",
+    "bids": "bid_date",
+    "awards": "award_date",
+    "contractors": "issue_date",
+}
+PARTITION_KEY = "issue_month"
+UNKNOWN_MONTH = "unknown"
+
+# Parquet schema metadata listing the columns stored as JSON text
+JSON_COLUMNS_KEY = b"gold_json_columns"
+
+# Storage format for new gold files ("parquet" falls back to "json" without pyarrow)
+GOLD_FORMAT = os.getenv("GOLD_FORMAT", "parquet")
+
+ColumnTypes = Dict[str, str]
+
+
+def parquet_available() -> bool:
+    """True if pyarrow is installed."""
+    return pa is not None
+
+
+def column_types(record_cls: type) -> ColumnTypes:
+    """
+    Gold column types for a record dataclass, in field order.
+
+    Returns:
+        Field name -> "string", "float", "int", "bool", "timestamp" or "json"
+    """
+    hints = typing.get_type_hints(record_cls)
+    types = {}
+    for field in dataclasses.fields(record_cls):
+        hint = hints[field.name]
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if typing.get_origin(hint) is typing.Union and len(args) == 1:
+            hint = args[0]
+        if hint in (datetime, date):
+            types[field.name] = "timestamp"
+        elif hint is bool:
+            types[field.name] = "bool"
+        elif hint is int:
+            types[field.name] = "int"
+        elif hint is float:
+            types[field.name] = "float"
+        elif hint is str:
+            types[field.name] = "string"
+        else:
+            types[field.name] = "json"
+    return types
+
+
+def _arrow_schema(types: ColumnTypes):
+    arrow_types = {
+        "string": pa.string(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us"),
+        "json": pa.string(),
+    }
+    json_columns = [name for name, kind in types.items() if kind == "json"]
+    return pa.schema([(name, arrow_types[kind]) for name, kind in types.items()],
+                     metadata={JSON_COLUMNS_KEY: json.dumps(json_columns)})
+
+
+def _month(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m")
+    if isinstance(value, str) and len(value) >= 7 and value[4] == "-":
+        return value[:7]
+    return UNKNOWN_MONTH
+
+
+def _in_range(month: str, start_month: Optional[str], end_month: Optional[str]) -> bool:
+    """Whether an issue month is in the range (unknown months only match an open range)."""
+    if not (start_month or end_month):
+        return True
+    if month == UNKNOWN_MONTH:
+        return False
+    return not ((start_month and month < start_month) or (end_month and month > end_month))
+
+
+def _iso_strings(column) -> List[Optional[str]]:
+    """ISO strings for an Arrow timestamp or date column, formatting each distinct value once."""
+    encoded = column.combine_chunks().dictionary_encode()
+    strings = [value.isoformat() for value in encoded.dictionary.to_pylist()]
+    strings.append(None)
+    return [strings[index] for index in encoded.indices.fill_null(len(strings) - 1).to_pylist()]
+
+
+def _to_json_value(value: Any, kind: str) -> Any:
+    """A value as stored in JSON gold files (ISO timestamps, nested values as-is)."""
+    if kind == "timestamp" and isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class GoldStore:
+    """Reads and writes partitioned gold-layer datasets under one directory."""
+
+    def __init__(self, root: str = "data/gold", storage_format: Optional[str] = None):
+        """
+        Args:
+            root: Gold data directory
+            storage_format: "parquet" or "json" for new files (default: GOLD_FORMAT)
+        """
+        self.root = Path(root)
+        self.storage_format = storage_format or GOLD_FORMAT
+
+    def write(self, category: str, records: List[Dict[str, Any]], types: ColumnTypes) -> List[Path]:
+        """
+        Write normalized records, one file per issue month.
+
+        Args:
+            category: Gold category (e.g. "permits")
+            records: Records keyed by column name (datetimes as datetime objects)
+            types: Column types from column_types(); fixes the schema and column order
+
+        Returns:
+            Paths of the files written
+        """
+        if not records:
+            return []
+
+        if self.storage_format == "parquet" and not parquet_available():
+            logger.warning("pyarrow not installed; writing gold data as JSON")
+            self.storage_format = "json"
+
+        date_field = PARTITION_DATE_FIELDS.get(category)
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            partitions.setdefault(_month(record.get(date_field)), []).append(record)
+
+        part_name = f"part-{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        paths = []
+        for month, month_records in sorted(partitions.items()):
+            directory = self.root / category / f"{PARTITION_KEY}={month}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{part_name}.{self.storage_format}"
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            if self.storage_format == "parquet":
+                self._write_parquet(tmp_path, month_records, types)
+            else:
+                data = [{name: _to_json_value(record.get(name), kind) for name, kind in types.items()}
+                        for record in month_records]
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, default=str)
+            os.replace(tmp_path, path)
+            paths.append(path)
+
+        logger.info(f"Saved {len(records)} {category} records to {len(paths)} partitions under "
+                    f"{self.root / category}")
+        return paths
+
+    @staticmethod
+    def _write_parquet(path: Path, records: List[Dict[str, Any]], types: ColumnTypes):
+        columns = {}
+        for name, kind in types.items():
+            values = [record.get(name) for record in records]
+            if kind == "json":
+                values = [None if value is None else json.dumps(value, default=str) for value in values]
+            columns[name] = values
+        table = pa.Table.from_pydict(columns, schema=_arrow_schema(types))
+        pq.write_table(table, str(path))
+
+    def files(self, category: str, start_month: Optional[str] = None,
+              end_month: Optional[str] = None) -> List[Path]:
+        """
+        Gold files for a category, pruned to a month range.
+
+        Args:
+            category: Gold category
+            start_month: First issue month to include ("YYYY-MM", inclusive)
+            end_month: Last issue month to include ("YYYY-MM", inclusive)
+
+        Returns:
+            Partition files in month order, then legacy flat JSON files
+            (which are filtered by month row by row when read)
+        """
+        paths = []
+        category_dir = self.root / category
+        if category_dir.is_dir():
+            for directory in sorted(category_dir.glob(f"{PARTITION_KEY}=*")):
+                if not _in_range(directory.name.split("=", 1)[1], start_month, end_month):
+                    continue
+                paths.extend(sorted(p for p in directory.iterdir()
+                                    if p.suffix in (".parquet", ".json") and not p.name.startswith(".")))
+        paths.extend(sorted(self.root.glob(f"{category}_*.json")))
+        return paths
+
+    def read_file(self, path: Path, columns: Optional[Sequence[str]] = None, exclude: Sequence[str] = (),
+                  start_month: Optional[str] = None, end_month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Records of one gold file, with timestamps as ISO strings and JSON columns decoded.
+
+        Args:
+            path: File returned by files()
+            columns: Columns to read (default: all); columns the file lacks are left out
+            exclude: Columns to skip
+            start_month: For legacy flat files, drop records issued before this month
+            end_month: For legacy flat files, drop records issued after this month
+
+        Returns:
+            Records as dictionaries, the same shape for Parquet and JSON files
+        """
+        if path.suffix == ".parquet":
+            return self._read_parquet(path, columns, exclude)
+
+        with open(path, "r") as f:
+            records = json.load(f)
+        if path.parent == self.root and (start_month or end_month):
+            # Legacy flat files are not partitioned: filter by month row by row
+            date_field = PARTITION_DATE_FIELDS.get(path.name.split("_", 1)[0])
+            records = [record for record in records
+                       if _in_range(_month(record.get(date_field)), start_month, end_month)]
+        if columns is None and not exclude:
+            return records
+        if columns is None:
+            return [{k: v for k, v in record.items() if k not in exclude} for record in records]
+        names = [name for name in columns if name not in exclude]
+        return [{name: record[name] for name in names if name in record} for record in records]
+
+    @staticmethod
+    def _read_parquet(path: Path, columns: Optional[Sequence[str]], exclude: Sequence[str]) -> List[Dict[str, Any]]:
+        if pq is None:
+            raise ImportError(f"pyarrow is required to read {path}")
+        schema = pq.read_schema(str(path))
+        names = [name for name in (columns or schema.names) if name in schema.names and name not in exclude]
+        json_columns = set(json.loads((schema.metadata or {}).get(JSON_COLUMNS_KEY, b"[]")))
+        table = pq.read_table(str(path), columns=names)
+        values = []
+        for name in names:
+            field_type = schema.field(name).type
+            if pa.types.is_timestamp(field_type) or pa.types.is_date(field_type):
+                column = _iso_strings(table.column(name))
+            elif name in json_columns:
+                column = [None if value is None else json.loads(value) for value in table.column(name).to_pylist()]
+            else:
+                column = table.column(name).to_pylist()
+            values.append(column)
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def iter_records(self, category: str, columns: Optional[Sequence[str]] = None, exclude: Sequence[str] = (),
+                     start_month: Optional[str] = None,
+                     end_month: Optional[str] = None) -> Iterator[Tuple[Path, List[Dict[str, Any]]]]:
+        """
+        Records of a category file by file, with column and month filters pushed down.
+
+        Yields:
+            (file path, records) for each file in the month range
+        """
+        for path in self.files(category, start_month, end_month):
+            yield path, self.read_file(path, columns, exclude, start_month, end_month)
@@ -6,12 +6,16 @@ sources into standardized schemas.
 """
 
 from .field_aliases import PERMIT_ALIASES, JURISDICTION_SPECIFIC_ALIASES
-from .permits import normalize, pick, validate_normalized_record
+from .permits import normalize, normalize_batch, pick, validate_normalized_record
+from .parallel import ParallelNormalizer, normalize_batch_parallel
 
 __all__ = [
     'PERMIT_ALIASES',
     'JURISDICTION_SPECIFIC_ALIASES', 
     'normalize',
+    'normalize_batch',
+    'normalize_batch_parallel',
+    'ParallelNormalizer',
     'pick',
     'validate_normalized_record'
 ]
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Shared date parsing for the permit normalizers.
+
+Every normalizer accepts an ordered list of strptime formats and returns the
+result of the first format that matches. DateParser keeps that contract but
+avoids trying the formats one after another:
+
+- A string can only match a format whose literal characters (everything the
+  digit directives do not consume) equal the string's own non-digit
+  characters, ignoring whitespace and case as strptime does. Formats are
+  grouped by that "skeleton" and each value is tried only against its
+  group - nearly always a single format.
+- Parsed strings are memoized; dates repeat heavily within a pull.
+- parse_many() infers the format of a whole column from the skeletons of its
+  distinct values and converts each group with pandas in one call. The few
+  strings pandas reads more leniently than strptime (leap seconds, fractions
+  beyond microseconds, year 0) and anything pandas rejects go through the
+  exact per-value path.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Directives whose strptime patterns match digits only
+_DIGIT_DIRECTIVES = frozenset('dmyYHIMSfjUW')
+
+# Whitespace is dropped because format spaces match any run and %d also accepts " 1"-" 9"
+_DIGITS_AND_WHITESPACE = re.compile(r'[\d\s]')
+_ASCII_DIGITS_AND_WHITESPACE = str.maketrans('', '', '0123456789 \t\n\r\x0b\x0c')
+
+# pandas converts some strings strptime rejects: second 60/61 and sub-microsecond fractions
+_LONG_FRACTION = re.compile(r'\.\d{7}')
+
+# Distinct strings in a skeleton group before parse_many() hands it to pandas
+VECTORIZE_MIN_VALUES = 64
+
+_MISSING = object()
+
+
+def _skeleton(text: str) -> str:
+    """Characters of a string other than digits and whitespace, case-folded (strptime ignores case)."""
+    if text.isascii():
+        return text.translate(_ASCII_DIGITS_AND_WHITESPACE).lower()
+    return _DIGITS_AND_WHITESPACE.sub('', text).lower()
+
+
+def format_skeleton(date_format: str) -> Optional[str]:
+    """
+    Skeleton every string matching a format must have.
+
+    Args:
+        date_format: strptime format
+
+    Returns:
+        Skeleton, or None if the format has directives that match letters
+        (e.g. %b, %p) and can match strings of any skeleton
+    """
+    literals = []
+    i = 0
+    while i < len(date_format):
+        char = date_format[i]
+        if char == '%' and i + 1 < len(date_format):
+            directive = date_format[i + 1]
+            i += 2
+            if directive == '%':
+                literals.append('%')
+            elif directive not in _DIGIT_DIRECTIVES:
+                return None
+            continue
+        literals.append(char)
+        i += 1
+    return _skeleton(''.join(literals))
+
+
+class DateParser:
+    """Parses strings with the first matching format of an ordered list, like a strptime loop."""
+
+    def __init__(self, formats: Sequence[str], cache_size: int = 100_000):
+        """
+        Args:
+            formats: strptime formats in priority order
+            cache_size: Distinct strings memoized before the cache is reset
+        """
+        self.formats = tuple(formats)
+        self.cache_size = cache_size
+        self._format_skeletons = [format_skeleton(fmt) for fmt in self.formats]
+        self._candidates: Dict[str, Tuple[str, ...]] = {}
+        self._cache: Dict[str, Optional[datetime]] = {}
+
+    def candidates(self, value: str) -> Tuple[str, ...]:
+        """Formats that could match the string, in priority order."""
+        skeleton = _skeleton(value)
+        candidates = self._candidates.get(skeleton)
+        if candidates is None:
+            candidates = tuple(
+                fmt for fmt, fmt_skeleton in zip(self.formats, self._format_skeletons)
+                if fmt_skeleton is None or fmt_skeleton == skeleton
+            )
+            self._candidates[skeleton] = candidates
+        return candidates
+
+    def parse(self, value: str) -> Optional[datetime]:
+        """
+        Parse a string with the first format that matches it.
+
+        Args:
+            value: Date string (callers strip/clean it as before)
+
+        Returns:
+            Parsed datetime or None if no format matches
+        """
+        cached = self._cache.get(value, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        result = None
+        for fmt in self.candidates(value):
+            try:
+                result = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[value] = result
+        return result
+
+    def parse_many(self, values: Iterable[Any]) -> List[Optional[datetime]]:
+        """
+        Parse a column of values; results are identical to parse() per value.
+
+        Args:
+            values: Date strings (anything that is not a str parses as None)
+
+        Returns:
+            Parsed datetimes (or None) in input order
+        """
+        values = list(values)
+        resolved: Dict[str, Optional[datetime]] = {}
+        if pd is not None:
+            pending = [value for value in dict.fromkeys(values)
+                       if isinstance(value, str) and value not in self._cache]
+            if len(pending) >= VECTORIZE_MIN_VALUES:
+                resolved = self._parse_vectorized(pending)
+                room = self.cache_size - len(self._cache)
+                if room > 0:
+                    for value in list(resolved)[:room]:
+                        self._cache[value] = resolved[value]
+
+        return [
+            resolved[value] if value in resolved else self.parse(value) if isinstance(value, str) else None
+            for value in values
+        ]
+
+    def _parse_vectorized(self, strings: List[str]) -> Dict[str, datetime]:
+        """Strings pandas parses exactly with their group's first candidate format."""
+        import numpy as np  # installed with pandas; the permit_leads CLI runs without either
+
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for value in strings:
+            groups.setdefault(self.candidates(value), []).append(value)
+
+        resolved = {}
+        for candidates, group in groups.items():
+            # Only the first candidate is final on success; later ones depend on earlier failures
+            if not candidates or len(group) < VECTORIZE_MIN_VALUES or format_skeleton(candidates[0]) is None:
+                continue
+            series = pd.Series(group, dtype=object)
+            dates = pd.to_datetime(series, format=candidates[0], errors='coerce')
+            # Leap-second and long-fraction lookalikes are left for parse() to check exactly
+            lenient = ['60' in value or '61' in value or ('.' in value and _LONG_FRACTION.search(value) is not None)
+                       for value in group]
+            exact = dates.notna().to_numpy() & ~np.array(lenient, dtype=bool)
+            exact &= dates.dt.year.fillna(0).to_numpy() >= 1
+            if not exact.any():
+                continue
+            converted = np.asarray(dates[exact].dt.to_pydatetime(), dtype=object)
+            resolved.update(zip(series[exact], converted))
+        return resolved
@@ -0,0 +1,106 @@
+"""
+Canonical record hashing for change detection.
+
+A record is hashed by walking a fixed field order, reducing each value to a
+canonical form built from str, int, float, bool and None (lists for
+sequences, tagged tuples for dates, decimals and mappings), and hashing the
+ascii() rendering of that list with BLAKE2b. ascii() renders those types
+unambiguously and identically on every Python version and platform: it
+escapes all non-ASCII characters the same way regardless of the Unicode
+database, and float reprs are the shortest round-trip form. Dates use ISO
+format; mapping keys are sorted, so key order never matters.
+
+Hashes carry a scheme prefix ("v2:"). Scheme 1 hashes are the unprefixed
+hex digests computed before (SHA1/SHA256 of sorted JSON); they never equal a
+scheme 2 hash, so stored rows are rewritten once, on their next upsert, and
+can be told apart until then with hash_scheme_version().
+"""
+
+import hashlib
+import numbers
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+HASH_SCHEME_VERSION = 2
+HASH_PREFIX = f'v{HASH_SCHEME_VERSION}:'
+
+# Types whose ascii() rendering is used as-is
+_PRIMITIVES = frozenset((str, int, float, bool, type(None)))
+
+
+def canonical_form(value: Any) -> Any:
+    """
+    Reduce a value to primitives, lists and tagged tuples.
+
+    Subclasses and numpy scalars reduce like their base type (str enums to
+    their value); types without a canonical form reduce to their str().
+    """
+    if type(value) in _PRIMITIVES:
+        return value
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return ('d', value.isoformat())
+    if isinstance(value, Decimal):
+        return ('D', str(value))
+    if isinstance(value, Mapping):
+        items = [[canonical_form(key), canonical_form(item)] for key, item in value.items()]
+        return ('m', sorted(items, key=ascii))
+    if isinstance(value, (list, tuple)):
+        return [canonical_form(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return ('s', sorted((canonical_form(item) for item in value), key=ascii))
+    return ('o', str(value))
+
+
+def canonical_hash(values: Iterable[Any], digest_size: int = 16) -> str:
+    """
+    Versioned hash of a sequence of values.
+
+    Args:
+        values: Values in their fixed order
+        digest_size: BLAKE2b digest size in bytes
+
+    Returns:
+        Hash string of the form "v2:<hex digest>"
+    """
+    primitives = _PRIMITIVES
+    canonical = [value if type(value) in primitives else canonical_form(value) for value in values]
+    digest = hashlib.blake2b(ascii(canonical).encode('ascii'), digest_size=digest_size).hexdigest()
+    return HASH_PREFIX + digest
+
+
+class RecordHasher:
+    """Hashes mappings over a fixed field order (missing fields hash as None)."""
+
+    def __init__(self, fields: Sequence[str], digest_size: int = 16):
+        """
+        Args:
+            fields: Field names in hashing order
+            digest_size: BLAKE2b digest size in bytes
+        """
+        self.fields = tuple(fields)
+        self.digest_size = digest_size
+
+    def hash(self, record: Mapping[str, Any]) -> str:
+        return canonical_hash(map(record.get, self.fields), self.digest_size)
+
+
+def hash_scheme_version(record_hash: Optional[str]) -> Optional[int]:
+    """
+    Scheme a stored hash was computed with.
+
+    Returns:
+        Version number, 1 for unprefixed legacy hashes, None for no hash
+    """
+    if not record_hash:
+        return None
+    prefix, sep, _ = record_hash.partition(':')
+    if sep and prefix[:1] == 'v' and prefix[1:].isdigit():
+        return int(prefix[1:])
+    return 1
@@ -0,0 +1,164 @@
+"""
+Process-pool execution for batch normalization.
+
+Normalization is pure Python, so a large backfill is CPU-bound on one core.
+ParallelNormalizer shards records into chunks, runs a chunk task in worker
+processes and merges the outputs back in input order together with the
+per-chunk stats. Chunks cross the process boundary packed as one key tuple
+per distinct record shape plus a value tuple per record, instead of a
+pickled dict per record. Small batches (or workers=1) run in-process.
+
+A chunk task is a module-level function ``task(records, context)`` that
+returns ``(output_records, stats)``; stats values are summed (numbers),
+merged (dicts) or concatenated (lists) across chunks.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .permits import normalize_batch
+
+logger = logging.getLogger(__name__)
+
+# Records per chunk sent to a worker
+DEFAULT_CHUNK_SIZE = 5000
+
+# Batches smaller than this are normalized in-process
+MIN_PARALLEL_RECORDS = 20000
+
+PackedRecords = Tuple[List[Tuple[str, ...]], List[Tuple[int, tuple]]]
+ChunkTask = Callable[[List[Dict[str, Any]], Any], Tuple[List[Dict[str, Any]], Dict[str, Any]]]
+
+
+def default_worker_count() -> int:
+    """Worker processes to use when none are given (NORMALIZE_WORKERS, else in-process)."""
+    configured = os.getenv('NORMALIZE_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return 1
+
+
+def pack_records(records: List[Dict[str, Any]]) -> PackedRecords:
+    """Records as (distinct key tuples, [(key tuple index, values)])."""
+    shapes: Dict[Tuple[str, ...], int] = {}
+    rows = []
+    for record in records:
+        keys = tuple(record)
+        index = shapes.get(keys)
+        if index is None:
+            index = shapes[keys] = len(shapes)
+        rows.append((index, tuple(record.values())))
+    return list(shapes), rows
+
+
+def unpack_records(packed: PackedRecords) -> List[Dict[str, Any]]:
+    """Inverse of pack_records()."""
+    shapes, rows = packed
+    return [dict(zip(shapes[index], values)) for index, values in rows]
+
+
+def merge_stats(total: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Add one chunk's stats into the running total (in place)."""
+    for key, value in stats.items():
+        if key not in total:
+            total[key] = dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        elif isinstance(value, dict):
+            merge_stats(total[key], value)
+        elif isinstance(value, list):
+            total[key].extend(value)
+        else:
+            total[key] += value
+    return total
+
+
+def _run_packed_chunk(task: ChunkTask, context: Any, packed: PackedRecords) -> Tuple[PackedRecords, Dict[str, Any]]:
+    outputs, stats = task(unpack_records(packed), context)
+    return pack_records(outputs), stats
+
+
+class ParallelNormalizer:
+    """Runs a chunk task over a batch of records in worker processes, preserving order."""
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 min_parallel_records: int = MIN_PARALLEL_RECORDS):
+        """
+        Args:
+            workers: Worker processes; 1 runs in-process (default: NORMALIZE_WORKERS or 1)
+            chunk_size: Records per chunk
+            min_parallel_records: Smaller batches run in-process
+        """
+        self.workers = max(1, workers or default_worker_count())
+        self.chunk_size = max(1, chunk_size)
+        self.min_parallel_records = min_parallel_records
+
+    def use_workers(self, record_count: int) -> bool:
+        """Whether a batch of this size is sharded across worker processes."""
+        return self.workers > 1 and record_count >= max(self.min_parallel_records, 2 * self.chunk_size)
+
+    def run(self, task: ChunkTask, records: List[Dict[str, Any]],
+            context: Any = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Apply a chunk task to all records.
+
+        Args:
+            task: Module-level function (records, context) -> (outputs, stats)
+            records: Input records
+            context: Picklable argument passed to every chunk (e.g. source metadata)
+
+        Returns:
+            Outputs of all chunks in input order, and the merged stats
+        """
+        if not self.use_workers(len(records)):
+            return task(records, context)
+
+        outputs: List[Dict[str, Any]] = []
+        stats: Dict[str, Any] = {}
+        chunks = (records[start:start + self.chunk_size] for start in range(0, len(records), self.chunk_size))
+        logger.info(f"Normalizing {len(records)} records in chunks of {self.chunk_size} "
+                    f"across {self.workers} workers")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # Keep a bounded number of chunks in flight so packed input is not all held at once
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_run_packed_chunk, task, context, pack_records(chunk)))
+                if len(pending) >= 2 * self.workers:
+                    self._collect(pending.popleft(), outputs, stats)
+            while pending:
+                self._collect(pending.popleft(), outputs, stats)
+
+        return outputs, stats
+
+    @staticmethod
+    def _collect(future, outputs: List[Dict[str, Any]], stats: Dict[str, Any]):
+        packed, chunk_stats = future.result()
+        outputs.extend(unpack_records(packed))
+        merge_stats(stats, chunk_stats)
+
+
+def normalize_permit_chunk(records: List[Dict[str, Any]],
+                           source_meta: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Chunk task for normalizers.permits: normalize_batch() over the chunk."""
+    return normalize_batch(source_meta, records), {'processed': len(records), 'normalized': len(records)}
+
+
+def normalize_batch_parallel(source_meta: Dict[str, Any], records: List[Dict[str, Any]],
+                             workers: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    normalize_batch() across worker processes.
+
+    Args:
+        source_meta: Source metadata (jurisdiction, city, etc.)
+        records: Raw permit records from the source
+        workers: Worker processes (default: NORMALIZE_WORKERS or 1)
+        chunk_size: Records per chunk
+
+    Returns:
+        Normalized records in input order
+    """
+    normalized, _ = ParallelNormalizer(workers, chunk_size).run(normalize_permit_chunk, records, source_meta)
+    return normalized
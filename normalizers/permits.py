@@ -5,19 +5,19 @@ This module provides functions to normalize raw permit data from various
 sources into the standardized gold.permits schema.
 """
 
-import hashlib
-import json
 import logging
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from .dates import DateParser
 from .field_aliases import (
     PERMIT_ALIASES, 
     JURISDICTION_SPECIFIC_ALIASES,
     STATUS_MAPPINGS,
     PERMIT_TYPE_MAPPINGS
 )
+from .hashing import RecordHasher
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,52 @@ TEXAS_MAX_LATITUDE = 36.5
 TEXAS_MIN_LONGITUDE = -107.0
 TEXAS_MAX_LONGITUDE = -93.0
 
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%m/%d/%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%Y%m%d'
+]
+
+_DATE_PARSER = DateParser(DATE_FORMATS)
+
+# Canonical date fields; normalize_batch() parses these a column at a time
+DATE_FIELDS = ('applied_at', 'issued_at', 'finaled_at')
+
+# Canonical data fields in hashing order (everything but provenance, record_hash, updated_at)
+RECORD_HASH_FIELDS = (
+    'source_id', 'permit_id', 'jurisdiction', 'city', 'county', 'state',
+    'applied_at', 'issued_at', 'finaled_at', 'status', 'permit_type', 'subtype', 'work_class',
+    'description', 'address_full', 'postal_code', 'parcel_id', 'valuation',
+    'contractor_name', 'contractor_license', 'latitude', 'longitude', 'geom', 'url',
+)
+
+_RECORD_HASHER = RecordHasher(RECORD_HASH_FIELDS)
+
+_CURRENCY_FORMATTING = re.compile(r'[$,\s]')
+_WHITESPACE_RUNS = re.compile(r'\s+')
+
+# Values pick() treats as missing
+NULL_VALUES = ["", "null", "NULL", "N/A", "n/a"]
+_NULL_STRINGS = frozenset(NULL_VALUES)
+
+# Canonical fields resolved through aliases, in normalize() order
+PICKED_FIELDS = (
+    'permit_id', 'applied_at', 'issued_at', 'finaled_at', 'status', 'permit_type', 'subtype',
+    'work_class', 'description', 'address_full', 'postal_code', 'parcel_id', 'valuation',
+    'contractor_name', 'contractor_license', 'latitude', 'longitude', 'url'
+)
+
+# Compiled plans keyed by (source id, jurisdiction)
+_PLAN_CACHE: Dict[Tuple[str, str], "NormalizationPlan"] = {}
+
 
 def pick(record: Dict[str, Any], aliases: List[str]) -> Any:
     """
@@ -43,11 +89,119 @@ def pick(record: Dict[str, Any], aliases: List[str]) -> Any:
         if alias in record and record[alias] is not None:
             value = record[alias]
             # Skip empty strings and common null values
-            if value not in ["", "null", "NULL", "N/A", "n/a"]:
+            if value not in NULL_VALUES:
                 return value
     return None
 
 
+def _compile_getter(aliases: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    """pick() specialized to a fixed, pre-filtered alias tuple."""
+    def pick_first(record: Dict[str, Any]) -> Any:
+        get = record.get
+        for alias in aliases:
+            value = get(alias)
+            if value is not None and not (isinstance(value, str) and value in _NULL_STRINGS):
+                return value
+        return None
+    return pick_first
+
+
+class NormalizationPlan:
+    """
+    Alias resolution compiled for one source's column set.
+    
+    Each canonical field is bound to only the aliases present in the schema:
+    fields with no alias become constant None, fields with one alias a single
+    lookup, and only ambiguous fields keep an (already filtered) alias walk.
+    Records with columns outside the schema must go through
+    get_normalization_plan(), which recompiles.
+    """
+    
+    def __init__(self, aliases: Dict[str, List[str]], schema: Iterable[str]):
+        """
+        Args:
+            aliases: Canonical field -> source aliases in preference order
+            schema: Source column names
+        """
+        self.aliases = aliases
+        self.schema = frozenset(schema)
+        self.missing: Dict[str, None] = {}
+        self.single: List[Tuple[str, str]] = []
+        self.multiple: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = []
+        for field in PICKED_FIELDS:
+            present = tuple(alias for alias in aliases.get(field, []) if alias in self.schema)
+            if not present:
+                self.missing[field] = None
+            elif len(present) == 1:
+                self.single.append((field, present[0]))
+            else:
+                self.multiple.append((field, _compile_getter(present)))
+    
+    def covers(self, record: Dict[str, Any]) -> bool:
+        """True if every column of the record is in the compiled schema."""
+        return record.keys() <= self.schema
+    
+    def pick_all(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Values of all canonical fields, as pick() would resolve them."""
+        values = dict(self.missing)
+        get = record.get
+        for field, alias in self.single:
+            value = get(alias)
+            if value is not None and not (isinstance(value, str) and value in _NULL_STRINGS):
+                values[field] = value
+            else:
+                values[field] = None
+        for field, getter in self.multiple:
+            values[field] = getter(record)
+        return values
+
+
+def _source_aliases(jurisdiction: str) -> Dict[str, List[str]]:
+    # Use jurisdiction-specific aliases if available
+    return JURISDICTION_SPECIFIC_ALIASES.get(jurisdiction, PERMIT_ALIASES)
+
+
+def get_normalization_plan(source_meta: Dict[str, Any], record: Optional[Dict[str, Any]] = None,
+                           schema: Optional[Iterable[str]] = None) -> NormalizationPlan:
+    """
+    Cached normalization plan for a source.
+    
+    The plan is compiled from a declared schema or the first record's keys and
+    cached per source id and jurisdiction. If a record brings columns the plan
+    has not seen (e.g. Socrata omits null fields), the plan is recompiled over
+    the union of columns.
+    
+    Args:
+        source_meta: Source metadata (id, jurisdiction, ...)
+        record: Record about to be normalized
+        schema: Declared column names for the source
+        
+    Returns:
+        Plan covering the record's columns
+    """
+    jurisdiction = source_meta.get('jurisdiction', 'unknown').lower()
+    key = (source_meta.get('id', 'unknown'), jurisdiction)
+    plan = _PLAN_CACHE.get(key)
+    
+    if (plan is not None and (record is None or plan.covers(record))
+            and (schema is None or plan.schema.issuperset(schema))):
+        return plan
+    
+    columns = set(plan.schema) if plan is not None else set()
+    if schema is not None:
+        columns.update(schema)
+    if record is not None:
+        columns.update(record.keys())
+    plan = NormalizationPlan(_source_aliases(jurisdiction), columns)
+    _PLAN_CACHE[key] = plan
+    return plan
+
+
+def clear_normalization_plans():
+    """Drop cached plans (e.g. after alias tables change)."""
+    _PLAN_CACHE.clear()
+
+
 def normalize_date(value: Any) -> Optional[datetime]:
     """
     Parse various date formats to datetime.
@@ -72,26 +226,9 @@ def normalize_date(value: Any) -> Optional[datetime]:
     if not date_str:
         return None
     
-    # Common date formats
-    date_formats = [
-        '%Y-%m-%d',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S.%f',
-        '%Y-%m-%dT%H:%M:%SZ',
-        '%Y-%m-%dT%H:%M:%S.%fZ',
-        '%m/%d/%Y',
-        '%m/%d/%Y %H:%M:%S',
-        '%m-%d-%Y',
-        '%d-%m-%Y',
-        '%Y%m%d'
-    ]
-    
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
+    parsed = _DATE_PARSER.parse(date_str)
+    if parsed is not None:
+        return parsed
     
     logger.warning(f"Could not parse date: {value}")
     return None
@@ -115,7 +252,7 @@ def normalize_numeric(value: Any) -> Optional[float]:
     
     if isinstance(value, str):
         # Remove currency symbols, commas, and whitespace
-        cleaned = re.sub(r'[$,\s]', '', value.strip())
+        cleaned = _CURRENCY_FORMATTING.sub('', value.strip())
         if not cleaned:
             return None
         
@@ -143,7 +280,7 @@ def normalize_text(value: Any) -> Optional[str]:
     text = str(value).strip()
     
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RUNS.sub(' ', text)
     
     # Skip null-like values
     if text.upper() in ['NULL', 'N/A', 'NA', 'NONE', 'UNKNOWN', '']:
@@ -190,19 +327,17 @@ def compute_record_hash(canonical: Dict[str, Any]) -> str:
     """
     Compute a hash of the canonical record for change detection.
     
+    Only the data fields in RECORD_HASH_FIELDS are hashed; provenance (with its
+    processing timestamp) and update metadata are not, so unchanged source data
+    hashes the same on every run.
+    
     Args:
         canonical: Normalized record dictionary
         
     Returns:
-        SHA1 hash of the sorted JSON representation
+        Versioned BLAKE2b hash ("v2:" + 32 hex digits)
     """
-    # Create a copy with only the data fields (exclude metadata)
-    hashable = {k: v for k, v in canonical.items() 
-                if not k.startswith('_') and v is not None}
-    
-    # Convert to sorted JSON for consistent hashing
-    json_str = json.dumps(hashable, sort_keys=True, default=str)
-    return hashlib.sha1(json_str.encode()).hexdigest()
+    return _RECORD_HASHER.hash(canonical)
 
 
 def build_geometry(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
@@ -239,20 +374,50 @@ def normalize(source_meta: Dict[str, Any], record: Dict[str, Any]) -> Dict[str,
     Returns:
         Normalized permit record ready for gold.permits table
     """
-    source_id = source_meta.get('id', 'unknown')
-    jurisdiction = source_meta.get('jurisdiction', 'unknown').lower()
+    plan = get_normalization_plan(source_meta, record)
+    return _build_canonical(source_meta, record, plan.pick_all(record))
+
+
+def normalize_batch(source_meta: Dict[str, Any], records: List[Dict[str, Any]],
+                    schema: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Normalize many records from one source with a single compiled plan.
     
-    # Use jurisdiction-specific aliases if available
-    aliases = JURISDICTION_SPECIFIC_ALIASES.get(jurisdiction, PERMIT_ALIASES)
-    if jurisdiction not in JURISDICTION_SPECIFIC_ALIASES:
-        aliases = PERMIT_ALIASES
+    Args:
+        source_meta: Source metadata (jurisdiction, city, etc.)
+        records: Raw permit records from the source
+        schema: Declared column names (default: columns of the records)
+        
+    Returns:
+        Normalized records in input order
+    """
+    plan = get_normalization_plan(source_meta, schema=schema)
+    picked = []
+    for record in records:
+        if not plan.covers(record):
+            plan = get_normalization_plan(source_meta, record)
+        picked.append(plan.pick_all(record))
+    
+    # Parsed datetimes pass through normalize_date(); unparsed values keep their original handling
+    for field in DATE_FIELDS:
+        column = [values[field].strip() if isinstance(values[field], str) else None for values in picked]
+        for values, parsed in zip(picked, _DATE_PARSER.parse_many(column)):
+            if parsed is not None:
+                values[field] = parsed
+    
+    return [_build_canonical(source_meta, record, values) for record, values in zip(records, picked)]
+
+
+def _build_canonical(source_meta: Dict[str, Any], record: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """Canonical record from the alias-resolved values of a raw record."""
+    source_id = source_meta.get('id', 'unknown')
     
     # Build canonical record
     canonical = {}
     
     # Core identification
     canonical['source_id'] = source_id
-    canonical['permit_id'] = normalize_text(pick(record, aliases.get('permit_id', [])))
+    canonical['permit_id'] = normalize_text(values['permit_id'])
     
     # Jurisdiction information
     canonical['jurisdiction'] = source_meta.get('jurisdiction')
@@ -261,40 +426,40 @@ def normalize(source_meta: Dict[str, Any], record: Dict[str, Any]) -> Dict[str,
     canonical['state'] = 'TX'  # Fixed for Texas
     
     # Dates (parse to UTC datetime)
-    canonical['applied_at'] = normalize_date(pick(record, aliases.get('applied_at', [])))
-    canonical['issued_at'] = normalize_date(pick(record, aliases.get('issued_at', [])))
-    canonical['finaled_at'] = normalize_date(pick(record, aliases.get('finaled_at', [])))
+    canonical['applied_at'] = normalize_date(values['applied_at'])
+    canonical['issued_at'] = normalize_date(values['issued_at'])
+    canonical['finaled_at'] = normalize_date(values['finaled_at'])
     
     # Status and classification
-    canonical['status'] = normalize_status(pick(record, aliases.get('status', [])))
-    canonical['permit_type'] = normalize_permit_type(pick(record, aliases.get('permit_type', [])))
-    canonical['subtype'] = normalize_text(pick(record, aliases.get('subtype', [])))
-    canonical['work_class'] = normalize_text(pick(record, aliases.get('work_class', [])))
+    canonical['status'] = normalize_status(values['status'])
+    canonical['permit_type'] = normalize_permit_type(values['permit_type'])
+    canonical['subtype'] = normalize_text(values['subtype'])
+    canonical['work_class'] = normalize_text(values['work_class'])
     
     # Description
-    canonical['description'] = normalize_text(pick(record, aliases.get('description', [])))
+    canonical['description'] = normalize_text(values['description'])
     
     # Location
-    canonical['address_full'] = normalize_text(pick(record, aliases.get('address_full', [])))
-    canonical['postal_code'] = normalize_text(pick(record, aliases.get('postal_code', [])))
-    canonical['parcel_id'] = normalize_text(pick(record, aliases.get('parcel_id', [])))
+    canonical['address_full'] = normalize_text(values['address_full'])
+    canonical['postal_code'] = normalize_text(values['postal_code'])
+    canonical['parcel_id'] = normalize_text(values['parcel_id'])
     
     # Project details
-    canonical['valuation'] = normalize_numeric(pick(record, aliases.get('valuation', [])))
+    canonical['valuation'] = normalize_numeric(values['valuation'])
     
     # Parties
-    canonical['contractor_name'] = normalize_text(pick(record, aliases.get('contractor_name', [])))
-    canonical['contractor_license'] = normalize_text(pick(record, aliases.get('contractor_license', [])))
+    canonical['contractor_name'] = normalize_text(values['contractor_name'])
+    canonical['contractor_license'] = normalize_text(values['contractor_license'])
     
     # Geography
-    canonical['latitude'] = normalize_numeric(pick(record, aliases.get('latitude', [])))
-    canonical['longitude'] = normalize_numeric(pick(record, aliases.get('longitude', [])))
+    canonical['latitude'] = normalize_numeric(values['latitude'])
+    canonical['longitude'] = normalize_numeric(values['longitude'])
     
     # Build PostGIS geometry if coordinates are available
     canonical['geom'] = build_geometry(canonical['latitude'], canonical['longitude'])
     
     # Additional fields
-    canonical['url'] = normalize_text(pick(record, aliases.get('url', [])))
+    canonical['url'] = normalize_text(values['url'])
     
     # Provenance information
     canonical['provenance'] = {
@@ -0,0 +1,170 @@
+"""
+Trade classification from permit text.
+
+One keyword table is shared by enrichment (trade tags and the primary
+trade), gold-layer normalization (trade_types) and lead publishing. All
+keywords are compiled into a single regex that is scanned once per text:
+a keyword matches at the start of a word and may run on into a longer word
+("roof" matches "roofing", "plumb" matches "plumber"), except keywords
+shorter than four characters ("spa", "ac", "pv"), which must be whole words
+(optionally plural) so that "space" or "replace" do not match.
+
+Matches are found at every word start, so overlapping keywords from
+different trades ("hot tub" and "tub") all count.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Trade keywords for classification (lowercase; tags are returned in this order)
+TRADE_KEYWORDS: Dict[str, List[str]] = {
+    'roofing': ['roof', 'reroof', 'shingle', 'gutter', 'eave'],
+    'bath': ['bath', 'shower', 'toilet', 'vanity', 'tub'],
+    'kitchen': ['kitchen', 'cabinet', 'countertop', 'appliance'],
+    'pool': ['pool', 'spa', 'jacuzzi', 'hot tub', 'swimming'],
+    'fence': ['fence', 'fencing', 'gate', 'barrier'],
+    'windows': ['window', 'glazing', 'glass', 'sash'],
+    'foundation': ['foundation', 'slab', 'footing', 'pier', 'basement', 'concrete'],
+    'solar': ['solar', 'photovoltaic', 'pv', 'renewable'],
+    'hvac': ['hvac', 'heating', 'cooling', 'air condition', 'furnace', 'heat pump', 'ventilation', 'ac'],
+    'electrical': ['electric', 'wiring', 'panel', 'subpanel', 'outlet'],
+    'plumbing': ['plumb', 'water', 'sewer', 'pipe', 'drain'],
+    'flooring': ['floor', 'tile', 'carpet'],
+    'painting': ['paint'],
+    'framing': ['framing', 'frame', 'structural'],
+}
+
+# Priority for choosing the primary trade (higher number = higher priority)
+TRADE_PRIORITY: Dict[str, int] = {
+    'roofing': 10,      # High-value specialty trade
+    'solar': 9,         # High-value specialty trade
+    'pool': 8,          # High-value specialty trade
+    'kitchen': 7,       # High-value remodel
+    'bath': 6,          # High-value remodel
+    'hvac': 5,          # Important mechanical trade
+    'electrical': 4,    # Important trade
+    'plumbing': 4,      # Important trade
+    'foundation': 3,    # Structural work
+    'windows': 2,       # Common improvement
+    'fence': 1,         # Lower-value work
+}
+
+# Keywords shorter than this must match whole words
+MIN_PREFIX_KEYWORD_LENGTH = 4
+
+Classification = Tuple[List[str], Optional[str]]
+
+
+def _prefix_tree_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation of keywords nested by shared prefix (longest match first)."""
+    tree: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = tree
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = keyword
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        keyword = node.get('')
+        if keyword is None:
+            return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if len(keyword) < MIN_PREFIX_KEYWORD_LENGTH:
+            branches.append(r's?\b')
+            return '(?:' + '|'.join(branches) + ')'
+        return '(?:' + '|'.join(branches) + ')?' if branches else ''
+
+    return build(tree)
+
+
+class TradeClassifier:
+    """Tags text with every matching trade and picks the highest-priority one."""
+
+    def __init__(self, keywords: Mapping[str, Sequence[str]] = TRADE_KEYWORDS,
+                 priority: Mapping[str, int] = TRADE_PRIORITY):
+        """
+        Args:
+            keywords: Trade -> keywords (tags are returned in mapping order)
+            priority: Trade -> priority for the primary trade (default 0; ties go to mapping order)
+        """
+        self.trades = list(keywords)
+        self._rank = {
+            trade: rank for rank, trade in
+            enumerate(sorted(self.trades, key=lambda t: -priority.get(t, 0)))
+        }
+
+        owners: Dict[str, set] = {}
+        for index, trade in enumerate(self.trades):
+            for keyword in keywords[trade]:
+                owners.setdefault(keyword.lower(), set()).add(index)
+
+        # The regex reports the longest keyword at each word start; credit the
+        # trades of the shorter keywords it contains at that position too
+        self._matches: Dict[str, FrozenSet[int]] = {}
+        for keyword in owners:
+            indices = set()
+            for prefix, trades in owners.items():
+                if keyword.startswith(prefix) and (
+                        prefix == keyword or len(prefix) >= MIN_PREFIX_KEYWORD_LENGTH
+                        or not keyword[len(prefix)].isalnum()):
+                    indices |= trades
+            self._matches[keyword] = frozenset(indices)
+
+        # Short keywords also match their plural
+        for keyword, indices in list(self._matches.items()):
+            if len(keyword) < MIN_PREFIX_KEYWORD_LENGTH:
+                self._matches.setdefault(keyword + 's', indices)
+
+        # Lookahead at each word start so overlapping keywords are all found;
+        # the alternation is nested by shared prefix so a word start costs one
+        # branch per character instead of one attempt per keyword
+        self._pattern = re.compile(r'\b(?=(' + _prefix_tree_pattern(owners) + '))')
+
+    def _match(self, text: str) -> FrozenSet[int]:
+        found = frozenset()
+        matches = self._matches
+        for keyword in self._pattern.findall(text.lower()):
+            found |= matches[keyword]
+        return found
+
+    def classify(self, text: Optional[str]) -> Classification:
+        """
+        Classify one text.
+
+        Returns:
+            All matching trades in table order, and the primary trade (None if none match)
+        """
+        if not text:
+            return [], None
+        found = self._match(text)
+        if not found:
+            return [], None
+        tags = [self.trades[index] for index in sorted(found)]
+        return tags, min(tags, key=self._rank.__getitem__)
+
+    def tags(self, text: Optional[str]) -> List[str]:
+        """All trades matching the text, in table order."""
+        return self.classify(text)[0]
+
+    def primary(self, text: Optional[str]) -> Optional[str]:
+        """The highest-priority trade matching the text, or None."""
+        return self.classify(text)[1]
+
+    def classify_many(self, texts: Iterable[Optional[str]]) -> List[Classification]:
+        """
+        Classify a column of texts, scanning each distinct text once.
+
+        Returns:
+            One (tags, primary) pair per text; repeated texts share the tags list
+        """
+        cache: Dict[Optional[str], Classification] = {}
+        results = []
+        for text in texts:
+            result = cache.get(text)
+            if result is None:
+                result = cache[text] = self.classify(text)
+            results.append(result)
+        return results
+
+
+TRADE_CLASSIFIER = TradeClassifier()
@@ -7,11 +7,11 @@ import random
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from urllib.parse import urlencode
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..models.permit import PermitRecord
 from ..config_loader import Jurisdiction
+from ..utils.http import shared_session
+from ..utils.profiling import profile_stage
 
 logger = logging.getLogger(__name__)
 
@@ -56,31 +56,12 @@ class ArcGISAdapter:
     
     def _create_session(self) -> requests.Session:
         """Create HTTP session with enhanced retry strategy including jitter."""
-        session = requests.Session()
-        
-        # Enhanced retry strategy with jitter for 429 and 5xx errors
-        retry_strategy = Retry(
-            total=5,  # Maximum number of retries
-            backoff_factor=1,  # Base backoff factor
-            status_forcelist=[429, 500, 502, 503, 504],  # Retry on these HTTP status codes
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            raise_on_redirect=False,
-            raise_on_status=False
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers
-        session.headers.update({
+        # Enhanced retry strategy with jitter for 429 and 5xx errors; the
+        # last response is returned once retries are exhausted
+        return shared_session({
             'User-Agent': 'PermitLeadBot/1.0 (+contact@example.com)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive'
-        })
-        
-        return session
+            'Accept': 'application/json'
+        }, max_retries=5, raise_on_status=False, raise_on_redirect=False)
     
     def _rate_limit(self):
         """Enforce rate limiting to stay under 5 req/s."""
@@ -230,7 +211,9 @@ class ArcGISAdapter:
                 
                 logger.debug(f"Fetching batch: offset={offset}, count={records_to_fetch}")
                 
-                data = self._make_request_with_jitter(self.feature_server, params)
+                with profile_stage("fetch") as stage:
+                    data = self._make_request_with_jitter(self.feature_server, params)
+                    stage.records = len(data.get('features') or []) if data else 0
                 
                 if not data or 'features' not in data:
                     logger.warning(f"No features found in response for {self.jurisdiction.name}, offset {offset}")
@@ -243,14 +226,16 @@ class ArcGISAdapter:
                 
                 # Parse features in this batch
                 batch_permits = []
-                for feature in features:
-                    try:
-                        permit = self._parse_feature(feature)
-                        if permit:
-                            batch_permits.append(permit)
-                    except Exception as e:
-                        logger.warning(f"Error parsing feature: {e}")
-                        continue
+                with profile_stage("parse") as stage:
+                    for feature in features:
+                        try:
+                            permit = self._parse_feature(feature)
+                            if permit:
+                                batch_permits.append(permit)
+                        except Exception as e:
+                            logger.warning(f"Error parsing feature: {e}")
+                            continue
+                    stage.records = len(batch_permits)
                 
                 permits.extend(batch_permits)
                 records_fetched += len(features)
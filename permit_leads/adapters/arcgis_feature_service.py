@@ -1,4 +1,5 @@
-from typing import Dict, Any, Iterable, Optional
+from typing import Dict, Any, Iterable, List, Optional
+import asyncio
 import datetime as dt
 from urllib.parse import urlencode
 import time
@@ -6,9 +7,8 @@ import random
 import logging
 import requests
 import json
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from .base import BaseAdapter
+from .base import AsyncFetchEngine, BaseAdapter, run_sync
+from ..utils.http import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -51,31 +51,12 @@ class ArcGISFeatureServiceAdapter(BaseAdapter):
 
     def _create_session(self) -> requests.Session:
         """Create HTTP session with enhanced retry strategy including jitter."""
-        session = requests.Session()
-        
-        # Enhanced retry strategy with jitter for 429 and 5xx errors
-        retry_strategy = Retry(
-            total=5,  # Maximum number of retries
-            backoff_factor=1,  # Base backoff factor
-            status_forcelist=[429, 500, 502, 503, 504],  # Retry on these HTTP status codes
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            raise_on_redirect=False,
-            raise_on_status=False
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers
-        session.headers.update({
+        # Enhanced retry strategy with jitter for 429 and 5xx errors; the
+        # last response is returned once retries are exhausted
+        return shared_session({
             'User-Agent': 'PermitLeadBot/1.0 (+contact@example.com)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive'
-        })
-        
-        return session
+            'Accept': 'application/json'
+        }, max_retries=5, raise_on_status=False, raise_on_redirect=False)
     
     def _rate_limit(self):
         """Enforce rate limiting to stay under 5 req/s."""
@@ -176,6 +157,54 @@ class ArcGISFeatureServiceAdapter(BaseAdapter):
             logger.error(f"Error getting total count: {e}")
             return 0
 
+    def fetch_since(self, since: dt.datetime, limit: int = 5000) -> Iterable[Dict[str, Any]]:
+        """Feature attributes since a date (runs fetch_since_async())."""
+        return run_sync(self.fetch_since_async(since, limit))
+
+    async def fetch_since_async(self, since: dt.datetime, limit: int = 5000,
+                                engine: Optional[AsyncFetchEngine] = None) -> List[Dict[str, Any]]:
+        """
+        Feature attributes since a date, on the async fetch engine.
+        
+        The exact count is fetched first, so all pages are requested at once
+        (the engine caps how many are in flight per host).
+        """
+        if engine is None:
+            async with AsyncFetchEngine() as engine:
+                return await self.fetch_since_async(since, limit, engine)
+
+        date_field = self.cfg["date_field"]
+        url = self._query_url()
+        headers = self._session_headers()
+        where = f"{date_field} >= TIMESTAMP '{since.strftime('%Y-%m-%d %H:%M:%S')}'"
+
+        count, metadata = await asyncio.gather(
+            engine.get_json(url, params={'where': where, 'returnCountOnly': 'true', 'f': 'json'}, headers=headers),
+            engine.get_json(self._base_url(), params={'f': 'json'}, headers=headers)
+        )
+        total_count = count.get('count', 0)
+        logger.info(f"ArcGIS total count for query since {since}: {total_count}")
+        
+        # Use the smaller of maxRecordCount or default page size
+        page_size = min(metadata.get('maxRecordCount', 2000), 2000)
+        wanted = min(limit, total_count)
+        pages = await asyncio.gather(*(
+            engine.get_json(url, params={
+                "where": where,
+                "outFields": self.cfg.get("out_fields", "*"),
+                "f": "json",
+                "returnGeometry": "false",
+                "resultOffset": offset,
+                "resultRecordCount": min(page_size, wanted - offset),
+                "orderByFields": f"{date_field} DESC"
+            }, headers=headers)
+            for offset in range(0, wanted, page_size)
+        ))
+
+        records = [feat.get("attributes", {}) for page in pages for feat in page.get("features", [])]
+        logger.info(f"Fetched {len(records)} records from {self.name}")
+        return records
+
     # SourceAdapter interface methods
     def fetch(self, since_days: int) -> Iterable[bytes | str]:
         """Fetch raw JSON data from ArcGIS FeatureServer."""
@@ -1,6 +1,41 @@
-from typing import Protocol, Iterable, Dict, Any
+"""
+Source adapter contract and the async fetch engine.
+
+Adapters implement fetch/parse/normalize, and fetch_since() for runners
+that pull records incrementally. fetch_since_async() is the same pull as a
+coroutine: adapters with paged HTTP APIs implement it on an
+AsyncFetchEngine (one httpx.AsyncClient whose requests are capped per host
+by a semaphore and a rate limit), so fetch_all_since() can drive many
+jurisdictions' pulls concurrently on one event loop. Synchronous callers
+keep calling fetch_since() (or run_fetch_since()), which run the coroutine
+to completion.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Protocol, Iterable, Dict, Any, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
 import datetime as dt
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from ..utils.http import RETRY_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# Requests in flight per host across all adapters on the event loop
+ASYNC_HOST_CONCURRENCY = int(os.getenv('ASYNC_HOST_CONCURRENCY', '4'))
+
+# Requests per second per host (0 = unlimited); adapters promise ≤ 5 req/s
+ASYNC_HOST_RATE_LIMIT = float(os.getenv('ASYNC_HOST_RATE_LIMIT', '5'))
+
+
 class SourceAdapter(Protocol):
     """Formal interface for permit data source adapters.
     
@@ -43,6 +78,112 @@ class SourceAdapter(Protocol):
         pass
 
 
+class AsyncFetchEngine:
+    """Shared async HTTP client with per-host concurrency and rate limits.
+
+    Use as ``async with AsyncFetchEngine() as engine:``; one engine is meant
+    to serve every adapter on the event loop so that connections, host limits
+    and retries are shared.
+    """
+
+    def __init__(self, host_concurrency: int = ASYNC_HOST_CONCURRENCY,
+                 rate_limit: float = ASYNC_HOST_RATE_LIMIT, timeout: float = 30,
+                 max_retries: int = 3, backoff_factor: float = 1, transport=None):
+        """
+        Args:
+            host_concurrency: Requests in flight per host
+            rate_limit: Requests per second per host (0 = unlimited)
+            timeout: Request timeout in seconds
+            max_retries: Retries on RETRY_STATUS_CODES and transport errors
+            backoff_factor: Backoff before retry n is backoff_factor * 2**n plus jitter
+            transport: httpx async transport (e.g. httpx.MockTransport for replay)
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for async fetching (pip install httpx)")
+        self.host_concurrency = max(1, host_concurrency)
+        self.interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            transport=transport,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+            follow_redirects=True
+        )
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_time: Dict[str, float] = {}
+
+    async def __aenter__(self) -> 'AsyncFetchEngine':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    async def _throttle(self, host: str):
+        if not self.interval:
+            return
+        # Reserve the next slot before sleeping so concurrent callers queue up
+        now = time.monotonic()
+        start = max(now, self._next_time.get(host, 0.0))
+        self._next_time[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        GET a URL and decode its JSON body, retrying throttling and server errors.
+
+        The host slot is released while backing off, so other requests to the
+        host proceed.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers (e.g. an adapter session's headers)
+
+        Returns:
+            Decoded JSON body
+
+        Raises:
+            httpx.HTTPStatusError: On an error status once retries are exhausted
+            httpx.TransportError: On connection errors once retries are exhausted
+        """
+        host = urlsplit(url).netloc.lower()
+        slots = self._slots.get(host)
+        if slots is None:
+            slots = self._slots[host] = asyncio.Semaphore(self.host_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            async with slots:
+                await self._throttle(host)
+                try:
+                    response = await self.client.get(url, params=params, headers=headers)
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries:
+                        logger.error(f"Request to {url} failed after {attempt + 1} attempts: {e}")
+                        raise
+                    error = str(e)
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return response.json()
+                    error = f"HTTP {response.status_code}"
+
+            backoff = self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_factor)
+            logger.warning(f"Request to {url} failed ({error}), retrying in {backoff:.2f} seconds")
+            await asyncio.sleep(backoff)
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code (not from inside an event loop)."""
+    return asyncio.run(coro)
+
+
 class BaseAdapter:
     """Base implementation of SourceAdapter interface."""
     
@@ -60,6 +201,28 @@ class BaseAdapter:
         """Legacy method - implement fetch/parse/normalize instead."""
         raise NotImplementedError
         
+    async def fetch_since_async(self, since: dt.datetime, limit: int = 5000,
+                                engine: Optional[AsyncFetchEngine] = None) -> List[Dict[str, Any]]:
+        """Records since a date, as a coroutine.
+
+        Adapters with paged HTTP APIs override this to page through the
+        engine; by default the synchronous fetch_since() runs in a worker
+        thread so every adapter can take part in fetch_all_since().
+
+        Args:
+            since: Earliest record date to fetch
+            limit: Maximum number of records
+            engine: Shared engine (adapters that need one create their own if None)
+
+        Returns:
+            Raw records
+        """
+        return await asyncio.to_thread(lambda: list(self.fetch_since(since, limit)))
+
+    def _session_headers(self) -> Dict[str, str]:
+        """Headers of the adapter's session, for engine requests."""
+        return dict(self.session.headers) if self.session is not None else {}
+
     def fetch(self, since_days: int) -> Iterable[bytes | str]:
         """Fetch raw data from source."""
         raise NotImplementedError
@@ -71,3 +234,55 @@ class BaseAdapter:
     def normalize(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize record to standard format."""
         raise NotImplementedError
+
+
+async def fetch_all_since(adapters: Sequence[BaseAdapter], since: dt.datetime, limit: int = 5000,
+                          engine: Optional[AsyncFetchEngine] = None
+                          ) -> Dict[str, Union[List[Dict[str, Any]], Exception]]:
+    """
+    Run fetch_since_async() for many adapters concurrently on one engine.
+
+    Args:
+        adapters: Adapters to pull (names should be unique)
+        since: Earliest record date to fetch
+        limit: Maximum number of records per adapter
+        engine: Shared engine (default: a new one with default limits)
+
+    Returns:
+        Adapter name -> records, or the exception that adapter's pull raised
+    """
+    if engine is None:
+        async with AsyncFetchEngine() as engine:
+            return await fetch_all_since(adapters, since, limit, engine)
+
+    results = await asyncio.gather(
+        *(adapter.fetch_since_async(since, limit, engine) for adapter in adapters),
+        return_exceptions=True
+    )
+    for adapter, result in zip(adapters, results):
+        if isinstance(result, Exception):
+            logger.error(f"Fetching {adapter.name} failed: {result}")
+        else:
+            logger.info(f"Fetched {len(result)} records from {adapter.name}")
+    return dict(zip((adapter.name for adapter in adapters), results))
+
+
+def run_fetch_since(adapters: Sequence[BaseAdapter], since: dt.datetime, limit: int = 5000,
+                    **engine_options) -> Dict[str, Union[List[Dict[str, Any]], Exception]]:
+    """
+    Synchronous fetch_all_since().
+
+    Args:
+        adapters: Adapters to pull
+        since: Earliest record date to fetch
+        limit: Maximum number of records per adapter
+        **engine_options: AsyncFetchEngine arguments (host_concurrency, rate_limit, ...)
+
+    Returns:
+        Adapter name -> records, or the exception that adapter's pull raised
+    """
+    async def fetch_all():
+        async with AsyncFetchEngine(**engine_options) as engine:
+            return await fetch_all_since(adapters, since, limit, engine)
+
+    return run_sync(fetch_all())
@@ -1,7 +1,6 @@
 """Enhanced ArcGIS adapter with ETL state management for Harris County permits."""
 
 import logging
-import requests
 from datetime import datetime
 from typing import List, Optional
 from urllib.parse import urlencode
@@ -9,6 +8,7 @@ from urllib.parse import urlencode
 from ..models.permit import PermitRecord
 from ..config_loader import Jurisdiction
 from ..etl_state import ETLStateManager
+from ..utils.http import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,7 @@ class ETLAwareArcGISAdapter:
         self.feature_server = self.config['url']
         self.date_field = self.config['date_field']
         self.field_map = self.config.get('field_map', {})
+        self.session = shared_session()
         
         # Initialize ETL state manager
         self.etl_state = ETLStateManager()
@@ -115,7 +116,7 @@ class ETLAwareArcGISAdapter:
             url = f"{self.feature_server}/query"
             logger.debug(f"Querying ArcGIS: {url}?{urlencode(params)}")
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
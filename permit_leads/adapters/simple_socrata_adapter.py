@@ -7,12 +7,11 @@ import logging
 import time
 import json
 import os
-from typing import Optional, Dict, Any, Iterable
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime, timedelta
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from .base import BaseAdapter
+from .base import AsyncFetchEngine, BaseAdapter, run_sync
+from ..utils.http import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -70,25 +69,10 @@ class SimpleSocrataAdapter(BaseAdapter):
     
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy for Socrata APIs."""
-        session = requests.Session()
-        
-        # Retry strategy for Socrata APIs
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
         # Set headers for Socrata APIs
         headers = {
             'User-Agent': 'PermitLeadBot/1.0 (Texas Building Permits)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate'
+            'Accept': 'application/json'
         }
         
         # Add X-App-Token header if available (required for higher rate limits)
@@ -96,9 +80,7 @@ class SimpleSocrataAdapter(BaseAdapter):
             headers['X-App-Token'] = self.app_token
             logger.info(f"Using Socrata app token for {self.name}")
         
-        session.headers.update(headers)
-        
-        return session
+        return shared_session(headers, max_retries=self.max_retries)
     
     def _rate_limit(self):
         """Enforce rate limiting for Socrata APIs."""
@@ -110,22 +92,28 @@ class SimpleSocrataAdapter(BaseAdapter):
         self._last_request_time = time.time()
 
     def fetch_since(self, since: datetime, limit: int = 5000) -> Iterable[Dict[str, Any]]:
-        """Legacy method for backward compatibility."""
+        """Legacy method for backward compatibility (runs fetch_since_async())."""
+        return run_sync(self.fetch_since_async(since, limit))
+
+    async def fetch_since_async(self, since: datetime, limit: int = 5000,
+                                engine: Optional[AsyncFetchEngine] = None) -> List[Dict[str, Any]]:
+        """Page through records since a date on the async fetch engine."""
+        if engine is None:
+            async with AsyncFetchEngine() as engine:
+                return await self.fetch_since_async(since, limit, engine)
+
         logger.info(f"Fetching {self.name} permits since {since}")
+        headers = self._session_headers()
         
-        total_fetched = 0
-        offset = 0
+        fetched = []
         batch_size = 1000  # Socrata recommended batch size
         
-        while total_fetched < limit:
-            # Apply rate limiting
-            self._rate_limit()
-            
+        while len(fetched) < limit:
             # Build SoQL parameters
             params = {
                 "$select": "*",
-                "$limit": min(batch_size, limit - total_fetched),
-                "$offset": offset,
+                "$limit": min(batch_size, limit - len(fetched)),
+                "$offset": len(fetched),
                 "$order": f"{self.date_field} DESC"
             }
             
@@ -135,38 +123,20 @@ class SimpleSocrataAdapter(BaseAdapter):
                 params["$where"] = f"{self.date_field} >= '{since_iso}'"
             
             logger.debug(f"Fetching batch with params: {params}")
+            records = await engine.get_json(self.base_url, params=params, headers=headers)
+            if not records:
+                logger.info("No more records to fetch")
+                break
             
-            try:
-                response = self.session.get(self.base_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                records = response.json()
-                if not records:
-                    logger.info("No more records to fetch")
-                    break
-                
-                logger.debug(f"Fetched {len(records)} records in this batch")
-                
-                for record in records:
-                    yield record
-                
-                total_fetched += len(records)
-                offset += len(records)
-                
-                # If we got fewer records than requested, we're done
-                if len(records) < batch_size:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error fetching data from Socrata API: {e}")
-                if self.max_retries > 0:
-                    logger.info("Retrying after error...")
-                    time.sleep(2)
-                    continue
-                else:
-                    raise
+            logger.debug(f"Fetched {len(records)} records in this batch")
+            fetched.extend(records)
+            
+            # If we got fewer records than requested, we're done
+            if len(records) < params["$limit"]:
+                break
         
-        logger.info(f"Fetched {total_fetched} records from {self.name}")
+        logger.info(f"Fetched {len(fetched)} records from {self.name}")
+        return fetched
 
     # SourceAdapter interface methods
     def fetch(self, since_days: int) -> Iterable[bytes | str]:
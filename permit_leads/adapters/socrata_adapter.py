@@ -7,11 +7,11 @@ import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..config_loader import Jurisdiction
 from ..models.permit import PermitRecord
+from ..utils.http import shared_session
+from ..utils.profiling import profile_stage
 
 logger = logging.getLogger(__name__)
 
@@ -45,28 +45,10 @@ class SocrataAdapter:
     
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy for Socrata APIs."""
-        session = requests.Session()
-        
-        # Retry strategy for Socrata APIs
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers for Socrata APIs
-        session.headers.update({
+        return shared_session({
             'User-Agent': 'PermitLeadBot/1.0 (Texas Building Permits)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate'
-        })
-        
-        return session
+            'Accept': 'application/json'
+        }, max_retries=self.max_retries)
     
     def _rate_limit(self):
         """Enforce rate limiting for Socrata APIs."""
@@ -118,10 +100,12 @@ class SocrataAdapter:
             logger.debug(f"Fetching batch with params: {params}")
             
             try:
-                response = self.session.get(self.base_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                records = response.json()
+                with profile_stage("fetch") as stage:
+                    response = self.session.get(self.base_url, params=params, timeout=30)
+                    response.raise_for_status()
+                    
+                    records = response.json()
+                    stage.records = len(records)
                 if not records:
                     logger.info("No more records to fetch")
                     break
@@ -130,10 +114,12 @@ class SocrataAdapter:
                 
                 # Parse records into PermitRecord objects
                 batch_permits = []
-                for record in records:
-                    permit = self._parse_record(record)
-                    if permit:
-                        batch_permits.append(permit)
+                with profile_stage("parse") as stage:
+                    for record in records:
+                        permit = self._parse_record(record)
+                        if permit:
+                            batch_permits.append(permit)
+                    stage.records = len(batch_permits)
                 
                 permits.extend(batch_permits)
                 total_fetched += len(records)
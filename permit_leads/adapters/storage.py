@@ -103,115 +103,144 @@ class Storage:
         """
         Save multiple PermitRecords.
         
+        The CSV file is opened once and SQLite upserts run in a single
+        connection/transaction instead of once per record.
+        
         Args:
             records: List of PermitRecord objects to save
             
         Returns:
             Number of new records saved (excluding duplicates)
         """
-        saved_count = 0
-        for record in records:
-            if self.save_record(record):
-                saved_count += 1
+        saved = [False] * len(records)
+        
+        if self.csv_path:
+            for i, ok in enumerate(self._save_many_to_csv(records)):
+                saved[i] |= ok
+        
+        if self.db_path:
+            for i, ok in enumerate(self._save_many_to_sqlite(records)):
+                saved[i] |= ok
         
+        saved_count = sum(saved)
         logger.info(f"Saved {saved_count} new records out of {len(records)} total")
         return saved_count
     
-    def _save_to_csv(self, record: PermitRecord) -> bool:
-        """Save record to CSV file with append mode."""
-        try:
-            # Convert record to flat dict for CSV
-            data = record.to_dict()
-            
-            # Handle datetime serialization
-            for key, value in data.items():
-                if isinstance(value, datetime):
-                    data[key] = value.isoformat()
-                elif isinstance(value, dict):
-                    data[key] = json.dumps(value)
-            
-            file_exists = self.csv_path.exists()
-            
-            with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-                if not file_exists or not self._csv_headers_written:
+    @staticmethod
+    def _csv_row(record: PermitRecord) -> Dict[str, Any]:
+        """Convert record to flat dict for CSV."""
+        data = record.to_dict()
+        
+        # Handle datetime serialization
+        for key, value in data.items():
+            if isinstance(value, datetime):
+                data[key] = value.isoformat()
+            elif isinstance(value, dict):
+                data[key] = json.dumps(value)
+        return data
+    
+    def _write_csv_rows(self, f, records: List[PermitRecord]) -> List[bool]:
+        results = []
+        for record in records:
+            try:
+                data = self._csv_row(record)
+                writer = csv.DictWriter(f, fieldnames=data.keys())
+                if not self._csv_headers_written:
                     # Write header if file is new
-                    writer = csv.DictWriter(f, fieldnames=data.keys())
                     writer.writeheader()
                     self._csv_headers_written = True
-                else:
-                    writer = csv.DictWriter(f, fieldnames=data.keys())
-                
                 writer.writerow(data)
-            
-            return True
-            
+                results.append(True)
+            except Exception as e:
+                logger.error(f"Failed to save record to CSV: {e}")
+                results.append(False)
+        return results
+    
+    def _save_to_csv(self, record: PermitRecord) -> bool:
+        """Save record to CSV file with append mode."""
+        return self._save_many_to_csv([record])[0]
+    
+    def _save_many_to_csv(self, records: List[PermitRecord]) -> List[bool]:
+        """Append records to the CSV file using a single file handle."""
+        try:
+            if not self.csv_path.exists():
+                self._csv_headers_written = False
+            with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
+                return self._write_csv_rows(f, records)
         except Exception as e:
-            logger.error(f"Failed to save record to CSV: {e}")
-            return False
+            logger.error(f"Failed to save records to CSV: {e}")
+            return [False] * len(records)
+    
+    @staticmethod
+    def _sqlite_values(record: PermitRecord) -> tuple:
+        """Column values shared by the INSERT and UPDATE statements."""
+        return (
+            record.address, record.latitude, record.longitude, record.description,
+            record.work_class, record.category, record.status,
+            record.issue_date.isoformat() if record.issue_date else None,
+            record.application_date.isoformat() if record.application_date else None,
+            record.expiration_date.isoformat() if record.expiration_date else None,
+            record.applicant, record.owner, record.value, record.source_url,
+            record.scraped_at.isoformat(), json.dumps(record.extra_data),
+            int(record.is_residential())
+        )
+    
+    def _upsert_sqlite(self, conn: sqlite3.Connection, record: PermitRecord) -> bool:
+        record_hash = record.get_hash()
+        
+        # Check if record exists
+        cursor = conn.execute(
+            "SELECT id FROM permits WHERE hash = ? OR (jurisdiction = ? AND permit_id = ?)",
+            (record_hash, record.jurisdiction, record.permit_id)
+        )
+        existing = cursor.fetchone()
+        values = self._sqlite_values(record)
+        
+        if existing:
+            # Update existing record
+            conn.execute("""
+                UPDATE permits SET 
+                    address = ?, latitude = ?, longitude = ?, description = ?,
+                    work_class = ?, category = ?, status = ?, issue_date = ?,
+                    application_date = ?, expiration_date = ?, applicant = ?,
+                    owner = ?, value = ?, source_url = ?, scraped_at = ?,
+                    extra_data = ?, is_residential = ?, updated_at = datetime('now')
+                WHERE id = ?
+            """, values + (existing[0],))
+            logger.debug(f"Updated existing record: {record_hash}")
+            return False  # Not a new record
+        
+        # Insert new record
+        conn.execute("""
+            INSERT INTO permits (
+                hash, jurisdiction, permit_id, address, latitude, longitude,
+                description, work_class, category, status, issue_date,
+                application_date, expiration_date, applicant, owner, value,
+                source_url, scraped_at, extra_data, is_residential
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (record_hash, record.jurisdiction, record.permit_id) + values)
+        logger.debug(f"Inserted new record: {record_hash}")
+        return True  # New record
     
     def _save_to_sqlite(self, record: PermitRecord) -> bool:
         """Save record to SQLite with upsert logic."""
+        return self._save_many_to_sqlite([record])[0]
+    
+    def _save_many_to_sqlite(self, records: List[PermitRecord]) -> List[bool]:
+        """Upsert records to SQLite in a single transaction."""
+        results = []
         try:
-            record_hash = record.get_hash()
-            
             with sqlite3.connect(self.db_path) as conn:
-                # Check if record exists
-                cursor = conn.execute(
-                    "SELECT id FROM permits WHERE hash = ? OR (jurisdiction = ? AND permit_id = ?)",
-                    (record_hash, record.jurisdiction, record.permit_id)
-                )
-                existing = cursor.fetchone()
-                
-                if existing:
-                    # Update existing record
-                    conn.execute("""
-                        UPDATE permits SET 
-                            address = ?, latitude = ?, longitude = ?, description = ?,
-                            work_class = ?, category = ?, status = ?, issue_date = ?,
-                            application_date = ?, expiration_date = ?, applicant = ?,
-                            owner = ?, value = ?, source_url = ?, scraped_at = ?,
-                            extra_data = ?, is_residential = ?, updated_at = datetime('now')
-                        WHERE id = ?
-                    """, (
-                        record.address, record.latitude, record.longitude, record.description,
-                        record.work_class, record.category, record.status,
-                        record.issue_date.isoformat() if record.issue_date else None,
-                        record.application_date.isoformat() if record.application_date else None,
-                        record.expiration_date.isoformat() if record.expiration_date else None,
-                        record.applicant, record.owner, record.value, record.source_url,
-                        record.scraped_at.isoformat(), json.dumps(record.extra_data),
-                        int(record.is_residential()), existing[0]
-                    ))
-                    logger.debug(f"Updated existing record: {record_hash}")
-                    return False  # Not a new record
-                else:
-                    # Insert new record
-                    conn.execute("""
-                        INSERT INTO permits (
-                            hash, jurisdiction, permit_id, address, latitude, longitude,
-                            description, work_class, category, status, issue_date,
-                            application_date, expiration_date, applicant, owner, value,
-                            source_url, scraped_at, extra_data, is_residential
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        record_hash, record.jurisdiction, record.permit_id, record.address,
-                        record.latitude, record.longitude, record.description, record.work_class,
-                        record.category, record.status,
-                        record.issue_date.isoformat() if record.issue_date else None,
-                        record.application_date.isoformat() if record.application_date else None,
-                        record.expiration_date.isoformat() if record.expiration_date else None,
-                        record.applicant, record.owner, record.value, record.source_url,
-                        record.scraped_at.isoformat(), json.dumps(record.extra_data),
-                        int(record.is_residential())
-                    ))
-                    logger.debug(f"Inserted new record: {record_hash}")
-                    return True  # New record
-                
-                conn.commit()
-                
+                for record in records:
+                    try:
+                        results.append(self._upsert_sqlite(conn, record))
+                    except Exception as e:
+                        logger.error(f"Failed to save record to SQLite: {e}")
+                        results.append(False)
         except Exception as e:
-            logger.error(f"Failed to save record to SQLite: {e}")
-            return False
+            logger.error(f"Failed to save records to SQLite: {e}")
+            results.extend([False] * (len(records) - len(results)))
+        return results
     
     def get_latest(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get latest records from SQLite database."""
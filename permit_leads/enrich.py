@@ -12,27 +12,16 @@ from __future__ import annotations
 import os
 import re
 import logging
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 import yaml
 
-logger = logging.getLogger(__name__)
+from normalizers.trades import TRADE_CLASSIFIER
 
-# Trade keywords for classification
-TRADE_KEYWORDS = {
-    'roofing': ['roof', 'roofing', 'shingle', 'gutter', 'eave'],
-    'bath': ['bath', 'bathroom', 'shower', 'toilet', 'vanity', 'tub'],
-    'kitchen': ['kitchen', 'cabinet', 'countertop', 'appliance'],
-    'pool': ['pool', 'spa', 'jacuzzi', 'hot tub', 'swimming'],
-    'fence': ['fence', 'fencing', 'gate', 'barrier'],
-    'windows': ['window', 'glazing', 'glass', 'sash'],
-    'foundation': ['foundation', 'slab', 'footing', 'pier', 'basement'],
-    'solar': ['solar', 'photovoltaic', 'pv', 'renewable'],
-    'hvac': ['hvac', 'heating', 'cooling', 'air condition', 'furnace', 'heat pump'],
-    'electrical': ['electrical', 'electric', 'wiring', 'panel', 'outlet'],
-    'plumbing': ['plumb', 'water', 'sewer', 'pipe', 'drain']
-}
+from .utils.http import HTTP_CLIENTS, shared_session
+from .utils.profiling import profile_stage
+
+logger = logging.getLogger(__name__)
 
 # Budget bands
 BUDGET_BANDS = [
@@ -49,6 +38,12 @@ DEFAULT_INSPECTION_DAYS = {
     'default': 7
 }
 
+# Geocoding and parcel lookups reuse one connection pool per provider host
+ENRICH_SESSION = shared_session(max_retries=2)
+
+# Nominatim usage policy allows at most one request per second
+HTTP_CLIENTS.set_rate_limit('nominatim.openstreetmap.org', 1)
+
 
 def normalize_address(record: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -146,7 +141,7 @@ def _geocode_nominatim(address: str) -> Tuple[Optional[float], Optional[float]]:
         'User-Agent': 'permit-leads-enrichment/1.0'
     }
     
-    response = requests.get(url, params=params, headers=headers, timeout=10)
+    response = ENRICH_SESSION.get(url, params=params, headers=headers, timeout=10)
     response.raise_for_status()
     
     data = response.json()
@@ -163,7 +158,7 @@ def _geocode_mapbox(address: str, api_key: str) -> Tuple[Optional[float], Option
     url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{address}.json"
     params = {'access_token': api_key, 'limit': 1}
     
-    response = requests.get(url, params=params, timeout=10)
+    response = ENRICH_SESSION.get(url, params=params, timeout=10)
     response.raise_for_status()
     
     data = response.json()
@@ -181,7 +176,7 @@ def _geocode_google(address: str, api_key: str) -> Tuple[Optional[float], Option
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {'address': address, 'key': api_key}
     
-    response = requests.get(url, params=params, timeout=10)
+    response = ENRICH_SESSION.get(url, params=params, timeout=10)
     response.raise_for_status()
     
     data = response.json()
@@ -254,7 +249,7 @@ def _query_arcgis_parcel(lat: float, lon: float, config: Dict[str, Any]) -> Opti
         'returnGeometry': 'false'
     }
     
-    response = requests.get(url + '/query', params=params, timeout=15)
+    response = ENRICH_SESSION.get(url + '/query', params=params, timeout=15)
     response.raise_for_status()
     
     data = response.json()
@@ -313,21 +308,6 @@ def normalize_trade(raw_permit: Dict[str, Any]) -> str:
     Returns:
         Single trade classification string
     """
-    # Priority mapping for trade types (higher number = higher priority)
-    TRADE_PRIORITY = {
-        'roofing': 10,      # High-value specialty trade
-        'solar': 9,         # High-value specialty trade  
-        'pool': 8,          # High-value specialty trade
-        'kitchen': 7,       # High-value remodel
-        'bath': 6,          # High-value remodel
-        'hvac': 5,          # Important mechanical trade
-        'electrical': 4,    # Important trade
-        'plumbing': 4,      # Important trade
-        'foundation': 3,    # Structural work
-        'windows': 2,       # Common improvement
-        'fence': 1,         # Lower-value work
-    }
-    
     # Extract relevant text fields for analysis
     description = str(raw_permit.get('work_description', '') or raw_permit.get('description', '')).lower()
     permit_type = str(raw_permit.get('permit_type', '')).lower()
@@ -336,18 +316,10 @@ def normalize_trade(raw_permit: Dict[str, Any]) -> str:
     # Combine all text for comprehensive analysis
     combined_text = f"{description} {permit_type} {permit_class}"
     
-    # Find matching trades from keywords
-    matching_trades = []
-    for trade, keywords in TRADE_KEYWORDS.items():
-        if any(keyword in combined_text for keyword in keywords):
-            priority = TRADE_PRIORITY.get(trade, 0)
-            matching_trades.append((trade, priority))
-    
-    # Return highest priority trade if any matches found
-    if matching_trades:
-        # Sort by priority (descending) and return the highest priority trade
-        matching_trades.sort(key=lambda x: x[1], reverse=True)
-        return matching_trades[0][0].title()
+    # Highest-priority trade among keyword matches (see normalizers.trades.TRADE_PRIORITY)
+    primary_trade = TRADE_CLASSIFIER.primary(combined_text)
+    if primary_trade:
+        return primary_trade.title()
     
     # Fallback to permit_type or permit_class if no keyword matches
     if permit_type and permit_type not in ['', 'null', 'none']:
@@ -384,12 +356,7 @@ def tag_trades(record: Dict[str, Any]) -> Dict[str, Any]:
     """
     description = (record.get('description', '') + ' ' + record.get('work_class', '')).lower()
     
-    trade_tags = []
-    for trade, keywords in TRADE_KEYWORDS.items():
-        if any(keyword in description for keyword in keywords):
-            trade_tags.append(trade)
-    
-    record['trade_tags'] = trade_tags
+    record['trade_tags'] = TRADE_CLASSIFIER.tags(description)
     return record
 
 
@@ -457,20 +424,22 @@ def enrich_record(record: Dict[str, Any], config: Dict[str, Any] = None) -> Dict
     Returns:
         Fully enriched record
     """
-    # Make a copy to avoid mutating input
-    enriched = record.copy()
-    
-    # Apply enrichment functions in sequence
-    enriched = normalize_address(enriched)
-    enriched = geocode(enriched)
-    enriched = fetch_parcel(enriched, config)
-    enriched = derive_owner_kind(enriched)
-    enriched = tag_trades(enriched)
-    
-    # Add budget band and start prediction
-    value = enriched.get('value', 0)
-    enriched['budget_band'] = budget_band(value)
-    enriched = start_by_prediction(enriched)
+    with profile_stage("enrich", record.get('jurisdiction')) as stage:
+        # Make a copy to avoid mutating input
+        enriched = record.copy()
+        
+        # Apply enrichment functions in sequence
+        enriched = normalize_address(enriched)
+        enriched = geocode(enriched)
+        enriched = fetch_parcel(enriched, config)
+        enriched = derive_owner_kind(enriched)
+        enriched = tag_trades(enriched)
+        
+        # Add budget band and start prediction
+        value = enriched.get('value', 0)
+        enriched['budget_band'] = budget_band(value)
+        enriched = start_by_prediction(enriched)
+        stage.records = 1
     
     return enriched
 
@@ -5,7 +5,7 @@ import json
 import hashlib
 import uuid
 from pathlib import Path
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Optional, Tuple, Union
 import datetime as dt
 
 from .adapters.storage import Storage
@@ -18,6 +18,9 @@ from .migrate_db import add_enrichment_columns
 from .region_adapter import RegionAwareAdapter
 from .sinks.supabase_sink import SupabaseSink
 from .utils.finalize_log import finalize_log
+from .utils.profiling import (
+    PROFILER_BACKENDS, enable_profiling, disable_profiling, profile_stage, profile_jurisdiction
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +47,7 @@ def write_jsonl_output(permits: List[PermitRecord], jurisdiction: str, output_pa
     jsonl_file = jurisdiction_dir / f"{date_str}.jsonl"
     with open(jsonl_file, 'a', encoding='utf-8') as f:
         for permit in permits:
-            json_data = permit.dict()
+            json_data = permit.model_dump()
             for key, value in json_data.items():
                 if isinstance(value, dt.datetime):
                     json_data[key] = value.isoformat()
@@ -100,7 +103,8 @@ def write_summary_to_log(record_count: int, message: str) -> None:
         logger.warning(f"Failed to write to log file: {e}")
 
 
-def write_json_summary(summary_path: str, record_count: int, sources_processed: List[str], success: bool) -> None:
+def write_json_summary(summary_path: str, record_count: int, sources_processed: List[str], success: bool,
+                       profile: Optional[Dict] = None) -> None:
     """
     Write a JSON summary file for ETL monitoring.
 
@@ -109,6 +113,7 @@ def write_json_summary(summary_path: str, record_count: int, sources_processed:
         record_count (int): The number of records processed in the ETL run.
         sources_processed (List[str]): A list of source names that were processed.
         success (bool): Whether the ETL run was successful.
+        profile (Optional[Dict]): Per-stage timings from --profile, if enabled.
     """
     try:
         summary_data = {
@@ -118,6 +123,8 @@ def write_json_summary(summary_path: str, record_count: int, sources_processed:
             "success": success,
             "status": "success" if success else "failed"
         }
+        if profile is not None:
+            summary_data["profile"] = profile
         
         summary_file = Path(summary_path)
         summary_file.parent.mkdir(parents=True, exist_ok=True)
@@ -130,6 +137,23 @@ def write_json_summary(summary_path: str, record_count: int, sources_processed:
         logger.warning(f"Failed to write JSON summary: {e}")
 
 
+def finish_profiling() -> Optional[Dict]:
+    """Stop --profile instrumentation, print the stage table and return its summary."""
+    profile = disable_profiling()
+    if not profile:
+        return profile
+    
+    print("\n=== PROFILE ===")
+    print(f"{'stage':<20} {'calls':>7} {'wall_s':>10} {'cpu_s':>10} {'records':>9}")
+    for name, stats in profile["stages"].items():
+        print(f"{name:<20} {stats['calls']:>7} {stats['wall_s']:>10.3f} {stats['cpu_s']:>10.3f} {stats['records']:>9}")
+    if "wall_s" in profile:
+        print(f"Total wall: {profile['wall_s']:.3f}s, CPU: {profile['cpu_s']:.3f}s")
+    if "dump" in profile:
+        print(f"Profiler dump ({profile['dump']['backend']}): {profile['dump']['path']}")
+    return profile
+
+
 def convert_sources_to_jurisdictions(sources: str) -> List[str]:
     """
     Convert comma-separated source names to jurisdiction slugs.
@@ -235,7 +259,9 @@ def write_supabase_output(permits: List[PermitRecord], jurisdiction: str = None)
             permit_dicts.append(payload)
         
         # Upsert to Supabase using RPC endpoint for proper (source, source_record_id) conflict resolution
-        result = sink.upsert_records(permit_dicts, use_rpc=True)
+        with profile_stage("write:supabase", jurisdiction) as stage:
+            result = sink.upsert_records(permit_dicts, use_rpc=True)
+            stage.records = len(permit_dicts)
         logger.info(f"Supabase upsert completed: {result['success']} success, {result['failed']} failed")
         
     except ImportError:
@@ -374,6 +400,9 @@ Examples:
     parser.add_argument("--sleep", type=float, default=2.0, help="Delay between requests seconds (default: 2.0)")
     parser.add_argument("--retries", type=int, default=3, help="Maximum number of retry attempts for HTTP requests (default: 3)")
     parser.add_argument("--user-agent", default="PermitLeadBot/1.0 (+contact@example.com)", help="User-Agent string for requests")
+    parser.add_argument("--profile", action="store_true", help="Record per-stage wall/CPU timings and record counts in the summary")
+    parser.add_argument("--profile-output", help="Write a cProfile (.prof) or pyinstrument (.html/.txt) dump to this path (implies --profile)")
+    parser.add_argument("--profiler", choices=PROFILER_BACKENDS, default="cprofile", help="Profiler used for --profile-output (default: cprofile)")
     
     subparsers = parser.add_subparsers(dest="command")
 
@@ -394,6 +423,9 @@ Examples:
     scrape.add_argument("--sleep", type=float, default=2.0, help="Delay between requests seconds (default: 2.0)")
     scrape.add_argument("--retries", type=int, default=3, help="Maximum number of retry attempts for HTTP requests (default: 3)")
     scrape.add_argument("--user-agent", default="PermitLeadBot/1.0 (+contact@example.com)", help="User-Agent string for requests")
+    scrape.add_argument("--profile", action="store_true", help="Record per-stage wall/CPU timings and record counts in the summary")
+    scrape.add_argument("--profile-output", help="Write a cProfile (.prof) or pyinstrument (.html/.txt) dump to this path (implies --profile)")
+    scrape.add_argument("--profiler", choices=PROFILER_BACKENDS, default="cprofile", help="Profiler used for --profile-output (default: cprofile)")
 
     export = subparsers.add_parser("export-leads", help="Generate scored lead CSVs from existing permits DB")
     export.add_argument("--db", default="data/permits/permits.db", help="Path to permits SQLite DB")
@@ -421,6 +453,10 @@ def handle_scrape(args: argparse.Namespace):
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Debug logging enabled")
     
+    profile_output = getattr(args, 'profile_output', None)
+    if getattr(args, 'profile', False) or profile_output:
+        enable_profiling(dump_path=profile_output, backend=getattr(args, 'profiler', 'cprofile'))
+    
     try:
         # Print current working directory and discovered CSVs
         import glob as glob_module
@@ -491,7 +527,8 @@ def handle_scrape(args: argparse.Namespace):
             
             for source_name in sources_to_run:
                 logger.info(f"Running legacy scraper: {source_name}")
-                permits = run_legacy_scraper(source_name, args, output_paths)
+                with profile_jurisdiction(source_name):
+                    permits = run_legacy_scraper(source_name, args, output_paths)
                 all_permits.extend(permits)
         
         # Save output files
@@ -502,11 +539,17 @@ def handle_scrape(args: argparse.Namespace):
                     temp_jur = "multi-jurisdiction"
                 else:
                     temp_jur = SCRAPERS[sources_to_run[0]]("").jurisdiction
-                write_jsonl_output(all_permits, temp_jur, output_paths)
+                with profile_stage("write:jsonl") as stage:
+                    write_jsonl_output(all_permits, temp_jur, output_paths)
+                    stage.records = len(all_permits)
             if "csv" in args.formats:
-                write_csv_output(all_permits, output_paths)
+                with profile_stage("write:csv") as stage:
+                    write_csv_output(all_permits, output_paths)
+                    stage.records = len(all_permits)
             if "sqlite" in args.formats:
-                write_sqlite_output(all_permits, output_paths)
+                with profile_stage("write:sqlite") as stage:
+                    write_sqlite_output(all_permits, output_paths)
+                    stage.records = len(all_permits)
             
             # Handle Supabase sink (either via --sink supabase or for region-aware TX counties)
             if sink == 'supabase' or (use_region_aware or use_multi_source):
@@ -548,8 +591,9 @@ def handle_scrape(args: argparse.Namespace):
                 call_ensure_artifacts()
             
             # Write JSON summary if requested
+            profile = finish_profiling()
             if getattr(args, 'summary', None):
-                write_json_summary(args.summary, 0, sources_processed, True)
+                write_json_summary(args.summary, 0, sources_processed, True, profile=profile)
             
             # Use finalize_log for "no new data" case - exit with 0 (expected empty)
             finalize_log(0, True)
@@ -576,8 +620,9 @@ def handle_scrape(args: argparse.Namespace):
         write_summary_to_log(total_permits, f"Scraping completed: {total_permits} total permits, {residential_permits} residential")
         
         # Write JSON summary if requested
+        profile = finish_profiling()
         if getattr(args, 'summary', None):
-            write_json_summary(args.summary, total_permits, sources_processed, True)
+            write_json_summary(args.summary, total_permits, sources_processed, True, profile=profile)
         
         # Call ensure_artifacts.py at the end
         call_ensure_artifacts()
@@ -589,8 +634,9 @@ def handle_scrape(args: argparse.Namespace):
         logger.error(f"Scraping failed with error: {e}")
         
         # Write JSON summary for failure if requested
+        profile = finish_profiling()
         if getattr(args, 'summary', None):
-            write_json_summary(args.summary, 0, [], False)
+            write_json_summary(args.summary, 0, [], False, profile=profile)
         
         # Use finalize_log for failure case - exit with 1
         finalize_log(0, False)
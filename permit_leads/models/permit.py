@@ -1,11 +1,43 @@
 """
 Pydantic model for building permit records with normalization helpers.
 """
-import hashlib
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-import json
+
+from normalizers.hashing import canonical_hash
+
+_RESIDENTIAL_CATEGORY_KEYWORDS = ('residential', 'single', 'family', 'duplex')
+_COMMERCIAL_CATEGORY_KEYWORDS = ('commercial', 'office', 'retail', 'industrial')
+
+
+@lru_cache(maxsize=1024)
+def _normalize_category_str(v: str) -> str:
+    v_lower = v.lower()
+    if any(keyword in v_lower for keyword in _RESIDENTIAL_CATEGORY_KEYWORDS):
+        return 'residential'
+    elif any(keyword in v_lower for keyword in _COMMERCIAL_CATEGORY_KEYWORDS):
+        return 'commercial'
+    return v
+
+
+def normalize_category_value(v):
+    """Normalize category to standard values."""
+    if not v:
+        return v
+    if isinstance(v, str):
+        return _normalize_category_str(v)
+    normalized = _normalize_category_str(str(v))
+    return normalized if normalized in ('residential', 'commercial') else v
+
+
+def normalize_address_value(v):
+    """Basic address normalization - collapse whitespace, title case."""
+    if not v:
+        return v
+    address = ' '.join(str(v).split())
+    return address.title() if address else None
 
 
 class PermitRecord(BaseModel):
@@ -83,24 +115,13 @@ class PermitRecord(BaseModel):
     @classmethod
     def normalize_category(cls, v):
         """Normalize category to standard values."""
-        if not v:
-            return v
-        v_lower = str(v).lower()
-        if any(keyword in v_lower for keyword in ['residential', 'single', 'family', 'duplex']):
-            return 'residential'
-        elif any(keyword in v_lower for keyword in ['commercial', 'office', 'retail', 'industrial']):
-            return 'commercial'
-        return v
+        return normalize_category_value(v)
     
     @field_validator('address', mode='before')
     @classmethod
     def normalize_address(cls, v):
         """Basic address normalization."""
-        if not v:
-            return v
-        # Basic cleanup - remove extra whitespace, proper case
-        address = ' '.join(str(v).split())
-        return address.title() if address else None
+        return normalize_address_value(v)
     
     def get_hash(self) -> str:
         """
@@ -109,22 +130,12 @@ class PermitRecord(BaseModel):
         """
         # Primary approach: use jurisdiction + permit_id
         if self.jurisdiction and self.permit_id:
-            key_data = f"{self.jurisdiction}|{self.permit_id}"
-            return hashlib.sha256(key_data.encode('utf-8')).hexdigest()[:16]
+            return canonical_hash((self.jurisdiction, self.permit_id), digest_size=8)
         
         # Fallback: content-based hash of key fields
-        key_fields = {
-            'jurisdiction': self.jurisdiction,
-            'address': self.address,
-            'description': self.description,
-            'issue_date': self.issue_date.isoformat() if self.issue_date else None,
-            'applicant': self.applicant,
-            'value': self.value
-        }
-        
-        # Create deterministic string from sorted key fields
-        key_str = json.dumps(key_fields, sort_keys=True, default=str)
-        return hashlib.sha256(key_str.encode('utf-8')).hexdigest()[:16]
+        return canonical_hash((
+            self.jurisdiction, self.address, self.description, self.issue_date, self.applicant, self.value
+        ), digest_size=8)
     
     def is_residential(self) -> bool:
         """
@@ -149,7 +160,7 @@ class PermitRecord(BaseModel):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage/export."""
-        data = self.dict()
+        data = self.model_dump()
         # Flatten extra_data into main dict for CSV export
         if self.extra_data:
             data.update(self.extra_data)
@@ -184,4 +195,16 @@ class PermitRecord(BaseModel):
         mapped_data['jurisdiction'] = jurisdiction
         mapped_data['extra_data'] = extra_data
         
-        return cls(**mapped_data)
\ No newline at end of file
+        return cls(**mapped_data)
+    
+    def with_updates(self, **updates: Any) -> "PermitRecord":
+        """
+        Return a copy with ``updates`` applied, skipping re-validation.
+        
+        Category/address updates are normalized the same way the validators do.
+        """
+        if 'category' in updates:
+            updates['category'] = normalize_category_value(updates['category'])
+        if 'address' in updates:
+            updates['address'] = normalize_address_value(updates['address'])
+        return self.model_copy(update=updates)
@@ -10,6 +10,9 @@ from typing import Dict, Any, Optional, List, Union
 from decimal import Decimal
 import re
 
+from normalizers.dates import DateParser
+from normalizers.parallel import ParallelNormalizer, merge_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +38,17 @@ class PermitNormalizer:
         'harris_county': 'harris_county',
     }
     
+    # Common date formats in permit data, in priority order
+    DATE_PARSER = DateParser([
+        "%Y-%m-%d",
+        "%m/%d/%Y",
+        "%m-%d-%Y",
+        "%Y-%m-%d %H:%M:%S",
+        "%m/%d/%Y %H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S.%f",
+    ])
+    
     # Work type normalization patterns
     WORK_TYPE_PATTERNS = {
         'residential': [
@@ -143,8 +157,27 @@ class PermitNormalizer:
             self.stats['errors'] += 1
             return None
     
-    def normalize_batch(self, raw_records: List[Dict[str, Any]], source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Normalize a batch of permit records."""
+    def normalize_batch(self, raw_records: List[Dict[str, Any]], source_config: Dict[str, Any],
+                        workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Normalize a batch of permit records.
+        
+        Args:
+            raw_records: Raw permit records from one source
+            source_config: Configuration including mappings and metadata
+            workers: Worker processes for large batches (default: NORMALIZE_WORKERS or 1)
+        """
+        executor = ParallelNormalizer(workers)
+        if executor.use_workers(len(raw_records)):
+            normalized_records, stats = executor.run(_normalize_chunk, raw_records, source_config)
+            merge_stats(self.stats, stats)
+        else:
+            normalized_records = self._normalize_records(raw_records, source_config)
+        
+        logger.info(f"Normalized {len(normalized_records)} out of {len(raw_records)} records")
+        return normalized_records
+    
+    def _normalize_records(self, raw_records: List[Dict[str, Any]], source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         normalized_records = []
         
         for raw_record in raw_records:
@@ -152,7 +185,6 @@ class PermitNormalizer:
             if normalized:
                 normalized_records.append(normalized)
         
-        logger.info(f"Normalized {len(normalized_records)} out of {len(raw_records)} records")
         return normalized_records
     
     def _normalize_jurisdiction(self, jurisdiction: str) -> str:
@@ -236,22 +268,9 @@ class PermitNormalizer:
         except (ValueError, OSError):
             pass
         
-        # Common date formats in permit data
-        formats = [
-            "%Y-%m-%d",
-            "%m/%d/%Y",
-            "%m-%d-%Y",
-            "%Y-%m-%d %H:%M:%S",
-            "%m/%d/%Y %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).isoformat()
-            except ValueError:
-                continue
+        parsed = self.DATE_PARSER.parse(date_str)
+        if parsed is not None:
+            return parsed.isoformat()
         
         logger.warning(f"Could not parse date: {date_str}")
         return None
@@ -402,4 +421,10 @@ class PermitNormalizer:
             **self.stats,
             'success_rate': self.stats['normalized'] / max(self.stats['processed'], 1),
             'error_rate': self.stats['errors'] / max(self.stats['processed'], 1)
-        }
\ No newline at end of file
+        }
+
+
+def _normalize_chunk(raw_records: List[Dict[str, Any]], source_config: Dict[str, Any]):
+    """Chunk task for PermitNormalizer.normalize_batch (runs in a worker process for large batches)."""
+    normalizer = PermitNormalizer()
+    return normalizer._normalize_records(raw_records, source_config), normalizer.stats
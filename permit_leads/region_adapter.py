@@ -11,6 +11,7 @@ from datetime import datetime
 
 from .config_loader import get_config_loader, Jurisdiction, Region
 from .models.permit import PermitRecord
+from .utils.profiling import profile_stage, profile_jurisdiction
 
 logger = logging.getLogger(__name__)
 
@@ -74,11 +75,9 @@ class RegionAwareAdapter:
     
     def annotate_with_region_info(self, permit: PermitRecord, jurisdiction: Jurisdiction, region: Region) -> PermitRecord:
         """Annotate permit record with region/jurisdiction information."""
-        # Create a copy with additional fields
-        permit_dict = permit.dict()
-        
-        # Add region/jurisdiction metadata
-        permit_dict.update({
+        # Region/jurisdiction metadata; the permit itself was already validated
+        # by the adapter, so copy it instead of re-running the validators
+        updates = {
             'jurisdiction_slug': jurisdiction.slug,
             'jurisdiction_id': jurisdiction.slug,  # Use slug as ID for now
             'region_slug': region.slug,
@@ -86,15 +85,15 @@ class RegionAwareAdapter:
             'state': jurisdiction.state,
             'jurisdiction_name': jurisdiction.name,
             'region_name': region.name
-        })
+        }
         
         # Set lat/lon from latitude/longitude if available for PostGIS compatibility
         if hasattr(permit, 'latitude') and hasattr(permit, 'longitude'):
             if permit.latitude and permit.longitude:
-                permit_dict['lat'] = permit.latitude
-                permit_dict['lon'] = permit.longitude
+                updates['lat'] = permit.latitude
+                updates['lon'] = permit.longitude
         
-        return PermitRecord(**permit_dict)
+        return permit.with_updates(**updates)
     
     def scrape_jurisdiction(self, jurisdiction_slug: str, since: datetime, limit: Optional[int] = None, max_retries: int = 3) -> List[PermitRecord]:
         """Scrape permits for a specific jurisdiction."""
@@ -113,14 +112,19 @@ class RegionAwareAdapter:
         logger.info(f"Scraping {jurisdiction.name} ({jurisdiction.provider}) since {since}")
         
         try:
-            scraper = self.create_scraper(jurisdiction, max_retries=max_retries)
-            permits = scraper.scrape_permits(since, limit=limit)
-            
-            # Annotate permits with region information
-            annotated_permits = []
-            for permit in permits:
-                annotated_permit = self.annotate_with_region_info(permit, jurisdiction, region)
-                annotated_permits.append(annotated_permit)
+            with profile_jurisdiction(jurisdiction.slug):
+                scraper = self.create_scraper(jurisdiction, max_retries=max_retries)
+                with profile_stage("scrape") as stage:
+                    permits = scraper.scrape_permits(since, limit=limit)
+                    stage.records = len(permits)
+                
+                # Annotate permits with region information
+                annotated_permits = []
+                with profile_stage("normalize") as stage:
+                    for permit in permits:
+                        annotated_permit = self.annotate_with_region_info(permit, jurisdiction, region)
+                        annotated_permits.append(annotated_permit)
+                    stage.records = len(annotated_permits)
             
             logger.info(f"Scraped {len(annotated_permits)} permits from {jurisdiction.name}")
             return annotated_permits
@@ -7,16 +7,17 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..models.permit import PermitRecord
+from ..utils.http import shared_session
+from ..utils.profiling import profile_stage
 
 # Try to import ingest logging (graceful fallback if not available)
 try:
     import sys
     import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'app'))
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+    from app.ingest_logger import log_ingest_step
     INGEST_LOGGING_AVAILABLE = True
 except ImportError:
     INGEST_LOGGING_AVAILABLE = False
@@ -61,31 +62,12 @@ class BaseScraper(ABC):
     
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy and headers."""
-        session = requests.Session()
-        
-        # Set up retry strategy
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers
-        session.headers.update({
+        return shared_session({
             'User-Agent': self.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
-        
-        return session
+        }, max_retries=self.max_retries)
     
     def _rate_limit(self):
         """Enforce polite delay between requests."""
@@ -179,7 +161,8 @@ class BaseScraper(ABC):
         Args:
             since: Only fetch permits issued/updated since this date
             limit: Maximum number of permits to fetch (None for no limit)
-            trace_id: Optional trace ID for logging ingest steps
+            trace_id: Optional trace ID for logging ingest steps (entries are
+                buffered and bulk-inserted off the scrape path)
             
         Returns:
             List of normalized PermitRecord objects
@@ -194,18 +177,20 @@ class BaseScraper(ABC):
                 "jurisdiction": self.jurisdiction,
                 "since": since.isoformat(),
                 "limit": limit
-            })
+            }, buffered=True)
         
         # Fetch raw data
         try:
-            raw_permits = self.fetch_permits(since, limit)
+            with profile_stage("fetch") as stage:
+                raw_permits = self.fetch_permits(since, limit)
+                stage.records = len(raw_permits) if raw_permits else 0
             if not raw_permits:
                 logger.warning(f"No raw permits fetched for {self.jurisdiction}")
                 if use_tracer:
                     log_ingest_step(trace_id, "fetch_page", False, {
                         "error": "No raw permits fetched",
                         "jurisdiction": self.jurisdiction
-                    })
+                    }, buffered=True)
                 return []
             
             logger.info(f"Fetched {len(raw_permits)} raw permits from {self.jurisdiction}")
@@ -213,31 +198,33 @@ class BaseScraper(ABC):
                 log_ingest_step(trace_id, "fetch_page", True, {
                     "permits_fetched": len(raw_permits),
                     "jurisdiction": self.jurisdiction
-                })
+                }, buffered=True)
         except Exception as e:
             logger.error(f"Error fetching permits: {e}")
             if use_tracer:
                 log_ingest_step(trace_id, "fetch_page", False, {
                     "error": str(e),
                     "jurisdiction": self.jurisdiction
-                })
+                }, buffered=True)
             raise
         
         # Parse and normalize
         permits = []
         parse_errors = 0
         
-        for raw_permit in raw_permits:
-            try:
-                permit = self.parse_permit(raw_permit)
-                if permit:
-                    permits.append(permit)
-                else:
+        with profile_stage("parse") as stage:
+            for raw_permit in raw_permits:
+                try:
+                    permit = self.parse_permit(raw_permit)
+                    if permit:
+                        permits.append(permit)
+                    else:
+                        parse_errors += 1
+                        
+                except Exception as e:
+                    logger.error(f"Error parsing permit: {e}")
                     parse_errors += 1
-                    
-            except Exception as e:
-                logger.error(f"Error parsing permit: {e}")
-                parse_errors += 1
+            stage.records = len(permits)
         
         logger.info(f"Parsed {len(permits)} permits from {self.jurisdiction} "
                    f"({parse_errors} parse errors)")
@@ -248,7 +235,7 @@ class BaseScraper(ABC):
                 "permits_parsed": len(permits),
                 "parse_errors": parse_errors,
                 "jurisdiction": self.jurisdiction
-            })
+            }, buffered=True)
         
         return permits
     
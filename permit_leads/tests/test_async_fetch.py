@@ -0,0 +1,162 @@
+"""
+Tests for the async fetch engine and the async fetch_since contract.
+
+Requests go to an httpx.MockTransport that replays canned Socrata and
+ArcGIS responses, so no network access is needed.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from permit_leads.adapters.arcgis_feature_service import ArcGISFeatureServiceAdapter  # noqa: E402
+from permit_leads.adapters.base import AsyncFetchEngine, BaseAdapter, fetch_all_since, run_fetch_since  # noqa: E402
+from permit_leads.adapters.simple_socrata_adapter import SimpleSocrataAdapter  # noqa: E402
+
+SINCE = datetime(2024, 1, 1)
+
+
+def socrata_adapter(name, host):
+    return SimpleSocrataAdapter({"name": name, "url": f"https://{host}/resource/abcd-1234.json",
+                                 "date_field": "issued_date", "app_token": "token-123"})
+
+
+def arcgis_adapter(name, host):
+    return ArcGISFeatureServiceAdapter({"name": name, "url": f"https://{host}/arcgis/rest/services/Permits/FeatureServer/0",
+                                        "date_field": "ISSUEDDATE"})
+
+
+class Replay:
+    """Mock transport handler serving paged Socrata and ArcGIS responses."""
+
+    def __init__(self, total=2500, max_record_count=1000, latency=0.0, failures=0):
+        self.total = total
+        self.max_record_count = max_record_count
+        self.latency = latency
+        self.failures = failures
+        self.requests = []
+        self.in_flight = {}
+        self.max_in_flight = {}
+
+    async def __call__(self, request):
+        host = request.url.host
+        self.requests.append(request)
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(503)
+            return httpx.Response(200, json=self.body(request))
+        finally:
+            self.in_flight[host] -= 1
+
+    def body(self, request):
+        url = urlsplit(str(request.url))
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.endswith(".json"):
+            offset, limit = int(params["$offset"]), int(params["$limit"])
+            return [{"permit_number": f"P-{i}"} for i in range(offset, min(offset + limit, self.total))]
+        if not url.path.endswith("/query"):
+            return {"maxRecordCount": self.max_record_count}
+        if params.get("returnCountOnly") == "true":
+            return {"count": self.total}
+        offset, count = int(params["resultOffset"]), int(params["resultRecordCount"])
+        return {"features": [{"attributes": {"PERMIT_NUMBER": f"P-{i}"}}
+                             for i in range(offset, min(offset + count, self.total))]}
+
+
+def run(coro_fn, replay, **options):
+    async def main():
+        async with AsyncFetchEngine(transport=httpx.MockTransport(replay), **options) as engine:
+            return await coro_fn(engine)
+    return asyncio.run(main())
+
+
+def test_socrata_pages_until_short_page_with_session_headers():
+    replay = Replay(total=2500)
+    adapter = socrata_adapter("Austin", "data.austintexas.gov")
+
+    records = run(lambda engine: adapter.fetch_since_async(SINCE, 5000, engine), replay, rate_limit=0)
+
+    assert [r["permit_number"] for r in records] == [f"P-{i}" for i in range(2500)]
+    assert len(replay.requests) == 3
+    assert all(r.headers["X-App-Token"] == "token-123" for r in replay.requests)
+    assert "issued_date >= '2024-01-01T00:00:00.000'" in replay.requests[0].url.params["$where"]
+
+
+def test_arcgis_fetches_pages_concurrently_in_order():
+    replay = Replay(total=2500, max_record_count=500, latency=0.01)
+    adapter = arcgis_adapter("Harris", "gis.example.gov")
+
+    records = run(lambda engine: adapter.fetch_since_async(SINCE, 2200, engine), replay,
+                  rate_limit=0, host_concurrency=3)
+
+    assert [r["PERMIT_NUMBER"] for r in records] == [f"P-{i}" for i in range(2200)]
+    # count + metadata + 5 pages, at most 3 at a time
+    assert len(replay.requests) == 7
+    assert replay.max_in_flight["gis.example.gov"] == 3
+
+
+def test_host_concurrency_is_per_host():
+    replay = Replay(total=3000, latency=0.02)
+    adapters = [socrata_adapter(f"city-{i}", f"host{i % 2}.example.gov") for i in range(6)]
+
+    results = run(lambda engine: fetch_all_since(adapters, SINCE, 3000, engine), replay,
+                  rate_limit=0, host_concurrency=2)
+
+    assert all(len(records) == 3000 for records in results.values())
+    assert replay.max_in_flight == {"host0.example.gov": 2, "host1.example.gov": 2}
+
+
+def test_retries_server_errors_then_raises():
+    adapter = socrata_adapter("Dallas", "www.dallasopendata.com")
+
+    replay = Replay(total=10, failures=2)
+    records = run(lambda engine: adapter.fetch_since_async(SINCE, 100, engine), replay,
+                  rate_limit=0, backoff_factor=0)
+    assert len(records) == 10 and len(replay.requests) == 3
+
+    replay = Replay(total=10, failures=5)
+    with pytest.raises(httpx.HTTPStatusError):
+        run(lambda engine: adapter.fetch_since_async(SINCE, 100, engine), replay,
+            rate_limit=0, backoff_factor=0, max_retries=2)
+
+
+def test_rate_limit_spaces_requests_per_host():
+    replay = Replay(total=10)
+    adapter = socrata_adapter("Dallas", "www.dallasopendata.com")
+
+    async def fetch_many(engine):
+        return await asyncio.gather(*(adapter.fetch_since_async(SINCE, 100, engine) for _ in range(5)))
+
+    start = time.monotonic()
+    run(fetch_many, replay, rate_limit=20)
+
+    # First request goes straight out, the other four are spaced 50ms apart
+    assert time.monotonic() - start >= 0.19
+
+
+class SyncOnlyAdapter(BaseAdapter):
+    def fetch_since(self, since, limit=5000):
+        if self.cfg.get("fail"):
+            raise RuntimeError("source unavailable")
+        return iter([{"id": 1}, {"id": 2}])
+
+
+def test_run_fetch_since_mixes_sync_and_async_adapters_and_keeps_errors():
+    adapters = [socrata_adapter("Austin", "data.austintexas.gov"), SyncOnlyAdapter({"name": "legacy"}),
+                SyncOnlyAdapter({"name": "broken", "fail": True})]
+
+    results = run_fetch_since(adapters, SINCE, 1500, transport=httpx.MockTransport(Replay(total=2000)),
+                              rate_limit=0)
+
+    assert len(results["Austin"]) == 1500
+    assert results["legacy"] == [{"id": 1}, {"id": 2}]
+    assert isinstance(results["broken"], RuntimeError)
@@ -0,0 +1,136 @@
+"""
+Tests for shared HTTP sessions.
+
+Runs against a local keep-alive server to check that sessions share
+per-host connection pools, keep their own headers, honour per-host rate
+limits and leave retries to the caller when max_retries=0.
+"""
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from permit_leads.utils.http import (
+    HTTPClientFactory, HostRateLimiter, RetryPolicy, connection_stats, reset_connection_stats, shared_session
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status = 429 if self.path.startswith('/busy') else 200
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        body = json.dumps({'user_agent': self.headers.get('User-Agent')}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.hits = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sessions_share_connections_and_keep_own_headers(server):
+    _, base_url = server
+    factory = HTTPClientFactory()
+    first = factory.session({'User-Agent': 'first'})
+    second = factory.session({'User-Agent': 'second'})
+    reset_connection_stats()
+
+    for _ in range(5):
+        assert first.get(f"{base_url}/a").json() == {'user_agent': 'first'}
+        assert second.get(f"{base_url}/b").json() == {'user_agent': 'second'}
+
+    stats = connection_stats()['127.0.0.1']
+    assert stats == {'new_connections': 1, 'reused_connections': 9, 'requests': 10}
+    factory.close()
+
+
+def test_closing_a_session_keeps_shared_pool(server):
+    _, base_url = server
+    factory = HTTPClientFactory()
+    first = factory.session()
+    reset_connection_stats()
+
+    first.get(f"{base_url}/a")
+    first.close()
+    factory.session().get(f"{base_url}/a")
+
+    assert connection_stats()['127.0.0.1']['new_connections'] == 1
+    factory.close()
+
+
+def test_max_retries_zero_returns_status_unretried(server):
+    httpd, base_url = server
+    session = shared_session(max_retries=0)
+
+    response = session.get(f"{base_url}/busy")
+
+    assert response.status_code == 429
+    assert httpd.hits['/busy'] == 1
+
+
+def test_max_retries_zero_raises_timeout_on_read_timeout():
+    # Accepts the connection but never answers
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    session = shared_session(max_retries=0)
+
+    with pytest.raises(requests.Timeout):
+        session.get(f"http://127.0.0.1:{listener.getsockname()[1]}/slow", timeout=0.2)
+    listener.close()
+
+
+def test_retry_policy_retries_status_codes(server):
+    httpd, base_url = server
+    factory = HTTPClientFactory()
+    session = factory.session(policy=RetryPolicy(total=2, backoff_factor=0, raise_on_status=False))
+
+    response = session.get(f"{base_url}/busy-retried")
+
+    assert response.status_code == 429
+    assert httpd.hits['/busy-retried'] == 3
+    factory.close()
+
+
+def test_rate_limit_applies_across_sessions(server):
+    _, base_url = server
+    factory = HTTPClientFactory()
+    factory.set_rate_limit('127.0.0.1', 20)
+    sessions = [factory.session(), factory.session()]
+
+    start = time.monotonic()
+    for i in range(6):
+        sessions[i % 2].get(f"{base_url}/a")
+
+    # First request goes straight out, the other five are spaced 50ms apart
+    assert time.monotonic() - start >= 0.24
+    factory.close()
+
+
+def test_unlimited_rate_limiter_does_not_wait():
+    limiter = HostRateLimiter(0)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.05
@@ -176,4 +176,31 @@ class TestPermitNormalizerTradeIntegration:
         
         # Should still normalize successfully with fallback trade
         assert result is not None
-        assert result['trade'] == 'General'
\ No newline at end of file
+        assert result['trade'] == 'General'
+
+    def test_normalizer_batch_with_workers(self):
+        """Test that a batch normalized across workers matches the serial result and stats."""
+        from functools import partial
+        from unittest.mock import patch
+
+        from normalizers.parallel import ParallelNormalizer
+
+        raw_records = [{
+            'work_description': 'Roof replacement' if i % 2 else 'Kitchen remodel',
+            'permit_number': f'RP2024{i:03d}',
+            'address': f'{i} Main St'
+        } for i in range(40)]
+        source_config = {'jurisdiction': 'test_city', 'type': 'test', 'mappings': {}}
+
+        serial = PermitNormalizer().normalize_batch(raw_records, source_config)
+        small_chunks = partial(ParallelNormalizer, chunk_size=10, min_parallel_records=0)
+        with patch('permit_leads.normalizer.ParallelNormalizer', small_chunks):
+            parallel = self.normalizer.normalize_batch(raw_records, source_config, workers=2)
+
+        def stable(records):
+            return [{k: v for k, v in r.items() if k != 'ingested_at'} for r in records]
+
+        assert stable(parallel) == stable(serial)
+        assert [r['trade'] for r in parallel[:2]] == ['Kitchen', 'Roofing']
+        assert self.normalizer.stats['processed'] == 40
+        assert self.normalizer.stats['normalized'] == 40
@@ -0,0 +1,40 @@
+"""
+Test cases for PermitRecord copies and batched storage.
+"""
+from permit_leads.models.permit import PermitRecord
+from permit_leads.adapters.storage import Storage
+
+
+ROW = {
+    "jurisdiction": "Harris County",
+    "permit_id": "BP-0001",
+    "address": "  123   main st  ",
+    "category": "Single Family Residence",
+    "issue_date": "2024-03-01T10:30:00",
+    "value": "25000",
+    "description": "Kitchen remodel",
+}
+
+
+def test_with_updates_normalizes_without_revalidating():
+    """with_updates returns a copy and normalizes category/address."""
+    record = PermitRecord(**ROW)
+    updated = record.with_updates(region_slug="tx-houston", category="Retail Office")
+
+    assert updated.region_slug == "tx-houston"
+    assert updated.category == "commercial"
+    assert record.region_slug is None
+
+
+def test_save_records_batches_sqlite_and_csv(tmp_path):
+    """Batched saves report new records and upsert duplicates."""
+    storage = Storage(csv_path=tmp_path / "permits.csv", db_path=tmp_path / "permits.db")
+    records = [PermitRecord(**{**ROW, "permit_id": f"BP-{i}"}) for i in range(3)]
+
+    assert storage.save_records(records) == 3
+    assert Storage(db_path=tmp_path / "permits.db").save_records(records) == 0
+    assert storage.get_stats()["total_permits"] == 3
+
+    lines = (tmp_path / "permits.csv").read_text().splitlines()
+    assert lines[0].startswith("jurisdiction,permit_id")
+    assert len(lines) == 4
@@ -0,0 +1,66 @@
+"""
+Test cases for per-stage profiling hooks.
+"""
+import pstats
+
+from permit_leads.utils.profiling import (
+    StageProfiler, enable_profiling, disable_profiling, get_profiler,
+    profile_stage, profile_jurisdiction
+)
+
+
+def test_profile_stage_is_noop_when_disabled():
+    """Hooks must not record anything while profiling is off."""
+    disable_profiling()
+    with profile_stage("fetch") as stage:
+        stage.records = 10
+    assert get_profiler() is None
+    assert disable_profiling() is None
+
+
+def test_stages_accumulate_overall_and_per_jurisdiction():
+    """Stages are totalled overall and attributed to the active jurisdiction."""
+    enable_profiling()
+    try:
+        with profile_jurisdiction("tx-harris"):
+            for _ in range(2):
+                with profile_stage("fetch") as stage:
+                    stage.records = 5
+            with profile_stage("write:supabase", "tx-dallas") as stage:
+                stage.records = 3
+        with profile_stage("write:csv") as stage:
+            stage.records = 13
+    finally:
+        summary = disable_profiling()
+
+    assert summary["stages"]["fetch"]["calls"] == 2
+    assert summary["stages"]["fetch"]["records"] == 10
+    assert summary["stages"]["write:csv"]["records"] == 13
+    assert summary["jurisdictions"]["tx-harris"]["fetch"]["records"] == 10
+    assert summary["jurisdictions"]["tx-dallas"]["write:supabase"]["records"] == 3
+    assert "write:csv" not in summary["jurisdictions"].get("tx-harris", {})
+    assert summary["wall_s"] >= summary["stages"]["fetch"]["wall_s"]
+
+
+def test_stage_records_time_when_block_raises():
+    """Failed stages are still timed."""
+    profiler = StageProfiler().start()
+    try:
+        with profiler.stage("parse"):
+            raise ValueError("bad row")
+    except ValueError:
+        pass
+    profiler.stop()
+    assert profiler.summary()["stages"]["parse"]["calls"] == 1
+
+
+def test_cprofile_dump_written(tmp_path):
+    """--profile-output writes a loadable pstats file."""
+    dump = tmp_path / "scrape.prof"
+    enable_profiling(dump_path=str(dump))
+    with profile_stage("parse"):
+        sum(range(1000))
+    summary = disable_profiling()
+
+    assert summary["dump"] == {"backend": "cprofile", "path": str(dump)}
+    assert pstats.Stats(str(dump)).total_calls > 0
@@ -1,16 +1,293 @@
 """
 HTTP utilities for permit scraping with retry logic and session management.
+
+Sessions from shared_session() (and get_session()) send every request
+through one process-wide connection pool per host, so adapters, scrapers,
+connectors and enrichment calls to the same host reuse kept-alive TCP/TLS
+connections instead of each opening their own. Retry policies are shared
+per (host, policy), optional per-host rate limits apply across all sessions,
+and connection_stats() reports new vs reused connections per host.
 """
+import os
+import threading
 import time
 import logging
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, NamedTuple, Sequence, Tuple
+from urllib.parse import urlsplit
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.util.retry import Retry
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 logger = logging.getLogger(__name__)
 
+# Kept-alive connections per host (also the number of concurrent requests that
+# reuse a connection; extra concurrent requests open short-lived ones)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))
+
+# Default requests per second per host (0 = unlimited)
+HTTP_RATE_LIMIT = float(os.getenv('HTTP_RATE_LIMIT', '0'))
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Encodings urllib3 can decode here ("gzip, deflate", plus br/zstd when
+# brotli/zstandard are installed)
+ACCEPT_ENCODING = DEFAULT_ACCEPT_ENCODING
+
+
+class RetryPolicy(NamedTuple):
+    """HTTP retry/backoff policy; sessions with equal policies share pools per host."""
+    total: int = 3
+    backoff_factor: float = 1
+    status_forcelist: Tuple[int, ...] = RETRY_STATUS_CODES
+    allowed_methods: Tuple[str, ...] = ("HEAD", "GET", "OPTIONS")
+    raise_on_status: bool = True
+    raise_on_redirect: bool = True
+
+    def to_retry(self) -> Retry:
+        if not self.total:
+            # Same as requests' default: without read=False a read timeout
+            # would surface as ConnectionError instead of requests.Timeout
+            return Retry(0, read=False)
+        return Retry(
+            total=self.total,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=list(self.status_forcelist),
+            allowed_methods=list(self.allowed_methods),
+            raise_on_status=self.raise_on_status,
+            raise_on_redirect=self.raise_on_redirect
+        )
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+_stats_lock = threading.Lock()
+_connection_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'new_connections': 0, 'requests': 0})
+
+
+def _count(host: str, key: str):
+    with _stats_lock:
+        _connection_stats[host][key] += 1
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    New vs reused connections per host since start (or the last reset).
+    
+    Returns:
+        Host -> {'new_connections', 'reused_connections', 'requests'}
+    """
+    with _stats_lock:
+        return {
+            host: {
+                'new_connections': counts['new_connections'],
+                'reused_connections': counts['requests'] - counts['new_connections'],
+                'requests': counts['requests']
+            }
+            for host, counts in _connection_stats.items()
+        }
+
+
+def reset_connection_stats():
+    """Clear the connection counters."""
+    with _stats_lock:
+        _connection_stats.clear()
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(self.host, 'new_connections')
+        super().connect()
+
+    def request(self, *args, **kwargs):
+        _count(self.host, 'requests')
+        return super().request(*args, **kwargs)
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(self.host, 'new_connections')
+        super().connect()
+
+    def request(self, *args, **kwargs):
+        _count(self.host, 'requests')
+        return super().request(*args, **kwargs)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _HostAdapter(HTTPAdapter):
+    """HTTPAdapter for one host whose connections are counted in connection_stats()."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+
+
+class HostRateLimiter:
+    """Spaces requests to one host at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _RoutingAdapter(BaseAdapter):
+    """Sends each request through the shared pool and rate limiter of its host."""
+
+    def __init__(self, factory: 'HTTPClientFactory', policy: RetryPolicy):
+        super().__init__()
+        self.factory = factory
+        self.policy = policy
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        self.factory.rate_limiter(url.hostname or '').wait()
+        return self.factory.host_adapter(url.netloc.lower(), self.policy).send(request, **kwargs)
+
+    def close(self):
+        # Pools are shared across sessions and outlive any one of them
+        pass
+
+
+class HTTPClientFactory:
+    """Process-wide registry of per-host connection pools, retry policies and rate limits."""
+
+    def __init__(self, pool_maxsize: int = HTTP_POOL_MAXSIZE, rate_limit: float = HTTP_RATE_LIMIT):
+        """
+        Args:
+            pool_maxsize: Kept-alive connections per host
+            rate_limit: Default requests per second per host (0 = unlimited)
+        """
+        self.pool_maxsize = pool_maxsize
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self._adapters: Dict[Tuple[str, RetryPolicy], HTTPAdapter] = {}
+        self._rate_limits: Dict[str, float] = {}
+        self._limiters: Dict[str, HostRateLimiter] = {}
+
+    def session(self, headers: Optional[Dict[str, str]] = None,
+                policy: RetryPolicy = DEFAULT_RETRY_POLICY) -> requests.Session:
+        """
+        A session whose requests use the shared per-host pools.
+        
+        Sessions are cheap: keep one per client for its headers, and share
+        the connections underneath.
+        
+        Args:
+            headers: Headers for every request of this session
+            policy: Retry/backoff policy
+            
+        Returns:
+            requests.Session
+        """
+        session = requests.Session()
+        adapter = _RoutingAdapter(self, policy)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def host_adapter(self, host: str, policy: RetryPolicy = DEFAULT_RETRY_POLICY) -> HTTPAdapter:
+        """The shared adapter (connection pool) for a host and retry policy."""
+        key = (host, policy)
+        adapter = self._adapters.get(key)
+        if adapter is None:
+            with self._lock:
+                adapter = self._adapters.get(key)
+                if adapter is None:
+                    # One pool per scheme/port of the host is plenty
+                    adapter = self._adapters[key] = _HostAdapter(
+                        pool_connections=2, pool_maxsize=self.pool_maxsize, max_retries=policy.to_retry()
+                    )
+        return adapter
+
+    def set_rate_limit(self, hostname: str, requests_per_second: float):
+        """Limit requests to a host across all sessions (0 = unlimited)."""
+        hostname = hostname.lower()
+        with self._lock:
+            self._rate_limits[hostname] = requests_per_second
+            self._limiters.pop(hostname, None)
+
+    def rate_limiter(self, hostname: str) -> HostRateLimiter:
+        """The rate limiter shared by all requests to a host."""
+        limiter = self._limiters.get(hostname)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(hostname)
+                if limiter is None:
+                    rate = self._rate_limits.get(hostname, self.rate_limit)
+                    limiter = self._limiters[hostname] = HostRateLimiter(rate)
+        return limiter
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+
+
+HTTP_CLIENTS = HTTPClientFactory()
+
+
+def shared_session(headers: Optional[Dict[str, str]] = None, max_retries: int = 3,
+                   backoff_factor: float = 1, allowed_methods: Sequence[str] = ("HEAD", "GET", "OPTIONS"),
+                   raise_on_status: bool = True, raise_on_redirect: bool = True) -> requests.Session:
+    """
+    Create a session on the shared per-host connection pools.
+    
+    Args:
+        headers: Headers for every request of this session
+        max_retries: Maximum number of retry attempts (0 for callers that
+            retry themselves: errors and status codes come back unretried,
+            as with a plain requests.Session)
+        backoff_factor: Exponential backoff factor between retries
+        allowed_methods: Methods retried on RETRY_STATUS_CODES
+        raise_on_status: Raise once retries on a status code are exhausted
+            (False returns the last response)
+        raise_on_redirect: Raise once redirect retries are exhausted
+        
+    Returns:
+        requests.Session
+    """
+    policy = RetryPolicy(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES if max_retries else (),
+        allowed_methods=tuple(allowed_methods),
+        raise_on_status=raise_on_status,
+        raise_on_redirect=raise_on_redirect
+    )
+    return HTTP_CLIENTS.session(headers, policy)
+
 
 def get_session(user_agent: str = "PermitLeadBot/1.0 (+contact@example.com)", 
                max_retries: int = 3) -> requests.Session:
@@ -24,31 +301,12 @@ def get_session(user_agent: str = "PermitLeadBot/1.0 (+contact@example.com)",
     Returns:
         Configured requests.Session object
     """
-    session = requests.Session()
-    
-    # Set up retry strategy
-    retry_strategy = Retry(
-        total=max_retries,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # Set common headers
-    session.headers.update({
+    return shared_session({
         'User-Agent': user_agent,
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1'
-    })
-    
-    return session
+    }, max_retries=max_retries, allowed_methods=("HEAD", "GET", "OPTIONS", "POST"))
 
 
 @retry(
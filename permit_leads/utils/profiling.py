@@ -0,0 +1,292 @@
+"""
+Per-stage timing and optional profiler dumps for scrape/ETL pipelines.
+
+Stages (fetch, parse, normalize, enrich, write:<sink>, ...) are recorded with
+wall time, CPU time and record counts, overall and per jurisdiction. Hooks are
+no-ops until a profiler is enabled, so they can stay in hot paths:
+
+    from permit_leads.utils.profiling import profile_stage, profile_jurisdiction
+
+    with profile_jurisdiction("tx-harris"):
+        with profile_stage("fetch") as stage:
+            rows = fetch()
+            stage.records = len(rows)
+
+Only the standard library is required; pyinstrument is used for sampling
+dumps when installed.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILER_BACKENDS = ("cprofile", "pyinstrument")
+
+_current_jurisdiction: contextvars.ContextVar = contextvars.ContextVar(
+    "profile_jurisdiction", default=None
+)
+
+
+@dataclass
+class StageStats:
+    """Accumulated timings for one stage."""
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    records: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "records": self.records,
+        }
+
+
+class StageTimer:
+    """Handle yielded by ``stage()``; set ``records`` to report throughput."""
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records = 0
+
+
+class _NullStage:
+    """Shared no-op stage used while profiling is disabled."""
+    __slots__ = ()
+
+    records = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    """Collects per-stage wall/CPU timings and record counts."""
+
+    def __init__(self, dump_path: Optional[str] = None, backend: str = "cprofile"):
+        """
+        Initialize profiler.
+
+        Args:
+            dump_path: Optional file to write a cProfile/pyinstrument dump to
+            backend: Dump backend, one of PROFILER_BACKENDS
+        """
+        if backend not in PROFILER_BACKENDS:
+            raise ValueError(f"Unknown profiler backend: {backend}")
+        self.dump_path = dump_path
+        self.backend = backend
+        self._stages: Dict[Tuple[str, Optional[str]], StageStats] = {}
+        self._started_wall: Optional[float] = None
+        self._started_cpu: Optional[float] = None
+        self._stopped_wall: Optional[float] = None
+        self._stopped_cpu: Optional[float] = None
+        self._sampler = None
+
+    def start(self) -> "StageProfiler":
+        """Start the overall clock and the dump profiler, if configured."""
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+        if self.dump_path:
+            self._sampler = self._start_sampler()
+        return self
+
+    def stop(self) -> None:
+        """Stop the overall clock and write the profiler dump."""
+        if self._started_wall is None or self._stopped_wall is not None:
+            return
+        self._stopped_wall = time.perf_counter()
+        self._stopped_cpu = time.process_time()
+        if self._sampler is not None:
+            self._write_dump(self._sampler)
+            self._sampler = None
+
+    @contextmanager
+    def stage(self, name: str, jurisdiction: Optional[str] = None) -> Iterator[StageTimer]:
+        """
+        Time a block of work as ``name``.
+
+        Args:
+            name: Stage name (e.g. "fetch", "write:csv")
+            jurisdiction: Jurisdiction to attribute the stage to; defaults to
+                the one set by ``jurisdiction()``
+
+        Yields:
+            StageTimer whose ``records`` attribute is added to the stage total
+        """
+        if jurisdiction is None:
+            jurisdiction = _current_jurisdiction.get()
+        timer = StageTimer()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield timer
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._add(name, None, wall, cpu, timer.records)
+            if jurisdiction:
+                self._add(name, jurisdiction, wall, cpu, timer.records)
+
+    def record(self, name: str, wall_s: float, cpu_s: float = 0.0,
+               records: int = 0, jurisdiction: Optional[str] = None) -> None:
+        """Add an externally measured timing to a stage."""
+        if jurisdiction is None:
+            jurisdiction = _current_jurisdiction.get()
+        self._add(name, None, wall_s, cpu_s, records)
+        if jurisdiction:
+            self._add(name, jurisdiction, wall_s, cpu_s, records)
+
+    def _add(self, name: str, jurisdiction: Optional[str], wall: float, cpu: float, records: int) -> None:
+        stats = self._stages.get((name, jurisdiction))
+        if stats is None:
+            stats = self._stages[(name, jurisdiction)] = StageStats()
+        stats.calls += 1
+        stats.wall_s += wall
+        stats.cpu_s += cpu
+        stats.records += records or 0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable summary of all recorded stages.
+
+        Returns:
+            Dictionary with total wall/CPU time, per-stage totals and
+            per-jurisdiction breakdowns
+        """
+        stages: Dict[str, Any] = {}
+        jurisdictions: Dict[str, Dict[str, Any]] = {}
+        for (name, jurisdiction), stats in sorted(
+            self._stages.items(), key=lambda item: (item[0][1] or "", item[0][0])
+        ):
+            if jurisdiction is None:
+                stages[name] = stats.to_dict()
+            else:
+                jurisdictions.setdefault(jurisdiction, {})[name] = stats.to_dict()
+
+        result: Dict[str, Any] = {"stages": stages, "jurisdictions": jurisdictions}
+        if self._started_wall is not None:
+            end_wall = self._stopped_wall if self._stopped_wall is not None else time.perf_counter()
+            end_cpu = self._stopped_cpu if self._stopped_cpu is not None else time.process_time()
+            result["wall_s"] = round(end_wall - self._started_wall, 6)
+            result["cpu_s"] = round(end_cpu - self._started_cpu, 6)
+        if self.dump_path:
+            result["dump"] = {"backend": self.backend, "path": str(self.dump_path)}
+        return result
+
+    def _start_sampler(self):
+        if self.backend == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("pyinstrument not installed; falling back to cProfile")
+                self.backend = "cprofile"
+            else:
+                sampler = Profiler()
+                sampler.start()
+                return sampler
+
+        import cProfile
+        sampler = cProfile.Profile()
+        sampler.enable()
+        return sampler
+
+    def _write_dump(self, sampler) -> None:
+        path = Path(self.dump_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self.backend == "pyinstrument":
+                sampler.stop()
+                if path.suffix == ".html":
+                    path.write_text(sampler.output_html(), encoding="utf-8")
+                else:
+                    path.write_text(sampler.output_text(unicode=True), encoding="utf-8")
+            else:
+                sampler.disable()
+                sampler.dump_stats(str(path))
+            logger.info(f"Profiler dump written to {path}")
+        except Exception as e:
+            logger.warning(f"Failed to write profiler dump to {path}: {e}")
+
+
+# Global profiler instance; None while profiling is disabled
+_profiler: Optional[StageProfiler] = None
+
+
+def enable_profiling(dump_path: Optional[str] = None, backend: str = "cprofile") -> StageProfiler:
+    """
+    Install and start the global profiler.
+
+    Args:
+        dump_path: Optional cProfile (.prof) or pyinstrument (.html/.txt) dump path
+        backend: Dump backend, one of PROFILER_BACKENDS
+
+    Returns:
+        The active StageProfiler
+    """
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+    _profiler = StageProfiler(dump_path=dump_path, backend=backend).start()
+    return _profiler
+
+
+def disable_profiling() -> Optional[Dict[str, Any]]:
+    """
+    Stop and remove the global profiler.
+
+    Returns:
+        Final profile summary, or None if profiling was not enabled
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.summary()
+
+
+def get_profiler() -> Optional[StageProfiler]:
+    """Return the active profiler, or None when profiling is disabled."""
+    return _profiler
+
+
+def profile_stage(name: str, jurisdiction: Optional[str] = None):
+    """
+    Time a stage on the active profiler; a cheap no-op when disabled.
+
+    Args:
+        name: Stage name
+        jurisdiction: Optional jurisdiction override
+
+    Returns:
+        Context manager yielding an object with a writable ``records`` attribute
+    """
+    if _profiler is None:
+        return _NULL_STAGE
+    return _profiler.stage(name, jurisdiction)
+
+
+@contextmanager
+def profile_jurisdiction(jurisdiction: Optional[str]) -> Iterator[None]:
+    """Attribute stages recorded inside the block to ``jurisdiction``."""
+    token = _current_jurisdiction.set(jurisdiction)
+    try:
+        yield
+    finally:
+        _current_jurisdiction.reset(token)
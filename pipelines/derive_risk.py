@@ -626,7 +626,8 @@ class RiskDeriver:
             'POOL': 1.1,         # Seasonal
             'FLOORING': 1.0,     # Standard
             'PAINTING': 0.9,     # Cosmetic
-            'FENCING': 0.9,      # Non-urgent
+            'FENCE': 0.9,        # Non-urgent
+            'FENCING': 0.9,      # Non-urgent (trade_types normalized before the shared classifier)
         }
         
         max_weight = max(trade_weights.get(trade, 1.0) for trade in trade_types)
@@ -319,6 +319,10 @@ import os
 # Add the parent directory to the path to import ingest modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from permit_leads.utils.profiling import profile_stage
+from data_quality.permits_validation import validate_permits_drift
+from data_quality.streaming_profile import ProfileStore, SourceProfile
+
 try:
     from ingest import create_connector
 except ImportError as e:
@@ -332,17 +336,23 @@ except ImportError as e:
 class RawDataLoader:
     """Pipeline for loading raw permit data from various sources."""
     
-    def __init__(self, db_url: str, sources_config_path: str):
+    def __init__(self, db_url: str, sources_config_path: str, profile_dir: Optional[str] = None):
         """
         Initialize the raw data loader.
         
         Args:
             db_url: PostgreSQL connection URL
             sources_config_path: Path to sources_tx.yaml configuration
+            profile_dir: Directory for daily drift sketches (default: INGEST_PROFILE_DIR
+                or data/profiles; profiling is off when INGEST_DRIFT_PROFILING=false)
         """
         self.db_url = db_url
         self.sources_config_path = sources_config_path
         self.sources_config = self._load_sources_config()
+        
+        self.profile_store = None
+        if os.getenv('INGEST_DRIFT_PROFILING', 'true').lower() == 'true':
+            self.profile_store = ProfileStore(profile_dir or os.getenv('INGEST_PROFILE_DIR', 'data/profiles'))
     
     def _load_sources_config(self) -> Dict[str, Any]:
         """Load sources configuration from YAML file."""
@@ -406,6 +416,11 @@ class RawDataLoader:
                 CREATE INDEX IF NOT EXISTS idx_raw_permits_permit_id 
                 ON raw_permits((raw_data->>'permit_id'))
             """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_raw_permits_record_key
+                ON raw_permits(source_id, (raw_data->>'_record_key'))
+                WHERE raw_data->>'_record_key' IS NOT NULL
+            """)
             
             conn.commit()
             logger.info("Raw data tables initialized")
@@ -491,7 +506,30 @@ class RawDataLoader:
         finally:
             conn.close()
     
-    def _store_raw_records(self, source_id: str, source_type: str, records: List[Dict[str, Any]]) -> int:
+    def store_records(self, source_id: str, source_type: str, records: List[Dict[str, Any]],
+                      record_keys: Optional[List[str]] = None) -> int:
+        """
+        Store records fetched outside ingest_source() (e.g. chunks of a TPIA delivery).
+        
+        Args:
+            source_id: Source identifier
+            source_type: Source type (e.g. 'tpia')
+            records: Raw records
+            record_keys: Stable key per record (stored as _record_key); rows of
+                the source stored earlier under the same keys are replaced in
+                the same transaction, so storing a batch again does not
+                duplicate it
+        
+        Returns:
+            Number of records stored
+        """
+        with profile_stage("write:raw", source_id) as stage:
+            stored = self._store_raw_records(source_id, source_type, records, record_keys)
+            stage.records = stored
+        return stored
+    
+    def _store_raw_records(self, source_id: str, source_type: str, records: List[Dict[str, Any]],
+                           record_keys: Optional[List[str]] = None) -> int:
         """Store raw records in database."""
         if not records:
             return 0
@@ -500,6 +538,13 @@ class RawDataLoader:
         try:
             cur = conn.cursor()
             
+            if record_keys is not None:
+                records = [dict(record, _record_key=key) for record, key in zip(records, record_keys)]
+                cur.execute(
+                    "DELETE FROM raw_permits WHERE source_id = %s AND raw_data->>'_record_key' = ANY(%s)",
+                    (source_id, list(record_keys))
+                )
+            
             # Batch insert raw records
             insert_sql = """
                 INSERT INTO raw_permits (source_id, source_type, raw_data)
@@ -528,6 +573,24 @@ class RawDataLoader:
         finally:
             conn.close()
     
+    def _check_drift(self, profile: SourceProfile) -> Optional[Dict[str, Any]]:
+        """Persist the run's profile and check the day so far against the trailing window."""
+        try:
+            day_profile = self.profile_store.save(profile)
+            history = self.profile_store.trailing(profile.source_id, profile.day)
+            drift = validate_permits_drift(day_profile, history)
+        except Exception as e:
+            logger.warning(f"Drift profiling failed for {profile.source_id}: {e}")
+            return None
+        
+        if drift['success']:
+            logger.info(f"Drift check for {profile.source_id}: {drift['message']}")
+        else:
+            logger.warning(f"Drift check for {profile.source_id}: {drift['message']}")
+            for finding in drift['findings']:
+                logger.warning(f"  {finding['message']}")
+        return drift
+    
     def ingest_source(self, source_config: Dict[str, Any], full_refresh: bool = False) -> Dict[str, Any]:
         """
         Ingest data from a single source.
@@ -574,61 +637,75 @@ class RawDataLoader:
             # Update status to running
             self._update_ingest_state(source_id, 'running')
             
-            # Fetch data
+            # Fetch data, profiling records as they arrive for drift checks
             records = []
             latest_date = None
             updated_field = source_config.get('updated_field')
-            
-            if hasattr(connector, 'get_all_data'):
-                # CSV HTTP connector
-                for record in connector.get_all_data(
-                    updated_since=updated_since,
-                    updated_field=updated_field,
-                    max_records=50000  # Reasonable limit for single run
-                ):
-                    records.append(record)
+            profile = SourceProfile(source_id) if self.profile_store else None
+            
+            with profile_stage("fetch", source_id) as stage:
+                if hasattr(connector, 'get_all_data'):
+                    # CSV HTTP connector
+                    for record in connector.get_all_data(
+                        updated_since=updated_since,
+                        updated_field=updated_field,
+                        max_records=50000  # Reasonable limit for single run
+                    ):
+                        records.append(record)
+                        if profile:
+                            profile.update(record)
                     
-                    # Track latest date for state tracking
-                    if updated_field and updated_field.lower() in record:
-                        record_date = record.get(updated_field.lower())
-                        if isinstance(record_date, datetime):
-                            if not latest_date or record_date > latest_date:
-                                latest_date = record_date
-            
-            elif hasattr(connector, 'get_all_features'):
-                # ArcGIS connector
-                for feature in connector.get_all_features(
-                    updated_since=updated_since,
-                    updated_field=updated_field,
-                    max_records=50000
-                ):
-                    records.append(feature)
+                        # Track latest date for state tracking
+                        if updated_field and updated_field.lower() in record:
+                            record_date = record.get(updated_field.lower())
+                            if isinstance(record_date, datetime):
+                                if not latest_date or record_date > latest_date:
+                                    latest_date = record_date
+            
+                elif hasattr(connector, 'get_all_features'):
+                    # ArcGIS connector
+                    for feature in connector.get_all_features(
+                        updated_since=updated_since,
+                        updated_field=updated_field,
+                        max_records=50000
+                    ):
+                        records.append(feature)
+                        if profile:
+                            profile.update(feature)
                     
-                    # Track latest date
-                    if updated_field and updated_field.lower() in feature:
-                        feature_date = feature.get(updated_field.lower())
-                        if isinstance(feature_date, datetime):
-                            if not latest_date or feature_date > latest_date:
-                                latest_date = feature_date
+                        # Track latest date
+                        if updated_field and updated_field.lower() in feature:
+                            feature_date = feature.get(updated_field.lower())
+                            if isinstance(feature_date, datetime):
+                                if not latest_date or feature_date > latest_date:
+                                    latest_date = feature_date
             
-            else:
-                # Socrata or other connector with get_all_data method
-                for record in connector.get_all_data(
-                    updated_since=updated_since,
-                    updated_field=updated_field,
-                    max_records=50000
-                ):
-                    records.append(record)
+                else:
+                    # Socrata or other connector with get_all_data method
+                    for record in connector.get_all_data(
+                        updated_since=updated_since,
+                        updated_field=updated_field,
+                        max_records=50000
+                    ):
+                        records.append(record)
+                        if profile:
+                            profile.update(record)
                     
-                    # Track latest date
-                    if updated_field and updated_field.lower() in record:
-                        record_date = record.get(updated_field.lower())
-                        if isinstance(record_date, datetime):
-                            if not latest_date or record_date > latest_date:
-                                latest_date = record_date
+                        # Track latest date
+                        if updated_field and updated_field.lower() in record:
+                            record_date = record.get(updated_field.lower())
+                            if isinstance(record_date, datetime):
+                                if not latest_date or record_date > latest_date:
+                                    latest_date = record_date
+            
+                stage.records = len(records)
             
             # Store raw records
-            records_stored = self._store_raw_records(source_id, source_kind, records)
+            with profile_stage("write:raw", source_id) as stage:
+                records_stored = self._store_raw_records(source_id, source_kind, records)
+                stage.records = records_stored
+            
+            drift = self._check_drift(profile) if profile else None
             
             # Update ingest state
             metadata = {
@@ -637,6 +714,9 @@ class RawDataLoader:
                 'updated_since': updated_since.isoformat() if updated_since else None,
                 'latest_record_date': latest_date.isoformat() if latest_date else None
             }
+            if drift:
+                metadata['drift_success'] = drift['success']
+                metadata['drift_findings'] = [finding['message'] for finding in drift['findings']]
             
             self._update_ingest_state(
                 source_id=source_id,
@@ -652,6 +732,8 @@ class RawDataLoader:
                 'records_stored': records_stored,
                 'latest_date': latest_date
             }
+            if drift:
+                result['drift'] = drift
             
             logger.info(f"Completed ingest for {source_id}: {result}")
             return result
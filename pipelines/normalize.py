@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import hashlib
 
+from lib.gold_store import GoldStore, column_types
+
 """
 Data normalization pipeline.
 
@@ -27,9 +29,32 @@ import psycopg2
 from psycopg2.extras import Json, RealDictCursor
 import re
 
+from normalizers.dates import DateParser
+from normalizers.trades import TRADE_CLASSIFIER
+
 
 logger = logging.getLogger(__name__)
 
+# Formats tried (in order) for dates in raw files and for mapped source fields
+RAW_DATE_PARSER = DateParser([
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%Y%m%d"
+])
+FIELD_DATE_PARSER = DateParser([
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%m/%d/%y',
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+])
+
 
 
 @dataclass
@@ -133,6 +158,7 @@ class DataNormalizer:
         self.raw_data_dir = Path(raw_data_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.gold_store = GoldStore(str(self.output_dir))
         
         # Quality checks configuration
         self.quality_thresholds = {
@@ -780,22 +806,8 @@ class DataNormalizer:
         if not isinstance(value, str):
             return None
         
-        # Common date formats
-        date_formats = [
-            '%Y-%m-%d',
-            '%m/%d/%Y',
-            '%m/%d/%y',
-            '%Y-%m-%d %H:%M:%S',
-            '%m/%d/%Y %H:%M:%S',
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(value, fmt).date()
-            except ValueError:
-                continue
-        
-        return None
+        parsed = FIELD_DATE_PARSER.parse(value)
+        return parsed.date() if parsed is not None else None
     
     def _parse_number(self, value: Any) -> Optional[float]:
         """Parse numeric values."""
@@ -887,24 +899,9 @@ class DataNormalizer:
         if not date_str:
             return None
             
-        # Common date formats
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%m/%d/%Y",
-            "%m/%d/%Y %H:%M:%S",
-            "%m-%d-%Y",
-            "%d-%m-%Y",
-            "%Y%m%d"
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
+        parsed = RAW_DATE_PARSER.parse(date_str)
+        if parsed is not None:
+            return parsed
                 
         logger.warning(f"Could not parse date: {date_value}")
         return None
@@ -979,40 +976,15 @@ class DataNormalizer:
         return score / total_checks if total_checks > 0 else 0.0
         
     def _save_normalized_data(self, category: str, records: List[NormalizedRecord]):
-        """Save normalized data to JSON files."""
+        """Save normalized data to the gold store (Parquet partitioned by issue month)."""
         if not records:
             return
             
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"{category}_{timestamp}.json"
-        filepath = self.output_dir / filename
-        
-        # Convert records to dictionaries
-        data = []
-        for record in records:
-            record_dict = {
-                "id": record.id,
-                "source": record.source,
-                "category": record.category,
-                "jurisdiction": record.jurisdiction,
-                "normalized_at": record.normalized_at.isoformat(),
-                "quality_score": record.quality_score
-            }
-            
-            # Add specific fields
-            for field_name in record.__dict__:
-                if not field_name.startswith("_") and field_name not in record_dict:
-                    value = getattr(record, field_name)
-                    if isinstance(value, datetime):
-                        value = value.isoformat()
-                    record_dict[field_name] = value
-                    
-            data.append(record_dict)
+        types = column_types(type(records[0]))
+        data = [{name: getattr(record, name) for name in types} for record in records]
             
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            logger.info(f"Saved {len(records)} {category} records to {filepath}")
+            self.gold_store.write(category, data, types)
         except Exception as e:
             logger.error(f"Failed to save normalized data: {e}")
 
@@ -1191,27 +1163,7 @@ def main():
         if not text:
             return []
         
-        text_upper = text.upper()
-        trades = []
-        
-        trade_keywords = {
-            'ELECTRICAL': ['ELECTRICAL', 'ELECTRIC', 'WIRING'],
-            'PLUMBING': ['PLUMBING', 'PLUMBER', 'WATER', 'SEWER'],
-            'HVAC': ['HVAC', 'AIR CONDITIONING', 'HEATING', 'VENTILATION'],
-            'ROOFING': ['ROOF', 'ROOFING', 'SHINGLE'],
-            'CONCRETE': ['CONCRETE', 'FOUNDATION', 'SLAB'],
-            'FRAMING': ['FRAMING', 'FRAME', 'STRUCTURAL'],
-            'FLOORING': ['FLOORING', 'FLOOR', 'TILE', 'CARPET'],
-            'PAINTING': ['PAINT', 'PAINTING'],
-            'FENCING': ['FENCE', 'FENCING'],
-            'POOL': ['POOL', 'SPA'],
-        }
-        
-        for trade, keywords in trade_keywords.items():
-            if any(keyword in text_upper for keyword in keywords):
-                trades.append(trade)
-        
-        return trades
+        return [trade.upper() for trade in TRADE_CLASSIFIER.tags(text)]
     
     def _infer_property_type(self, record: Dict[str, Any]) -> Optional[str]:
         """Infer property type from available fields."""
@@ -10,13 +10,14 @@ import os
 import sys
 import psycopg2
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from psycopg2.extras import Json, RealDictCursor
 
 # Add parent directory to path for imports  
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from normalizers.permits import normalize, validate_normalized_record
+from normalizers.parallel import ParallelNormalizer
+from normalizers.permits import normalize, normalize_batch, validate_normalized_record
 from ingest.state import IngestStateManager
 
 logger = logging.getLogger(__name__)
@@ -25,13 +26,20 @@ logger = logging.getLogger(__name__)
 class PermitsNormalizer:
     """Pipeline for normalizing raw permit data to gold.permits schema."""
     
-    def __init__(self, db_url: Optional[str] = None):
-        """Initialize normalizer with database connection."""
+    def __init__(self, db_url: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Initialize normalizer with database connection.
+        
+        Args:
+            db_url: PostgreSQL connection URL (default: DATABASE_URL)
+            workers: Worker processes for large sources (default: NORMALIZE_WORKERS or 1)
+        """
         self.db_url = db_url or os.environ.get('DATABASE_URL')
         if not self.db_url:
             raise ValueError("DATABASE_URL must be provided or set as environment variable")
         
         self.state_manager = IngestStateManager()
+        self.executor = ParallelNormalizer(workers)
     
     def _get_connection(self):
         """Get database connection."""
@@ -90,28 +98,12 @@ class PermitsNormalizer:
                         # Get source metadata (for jurisdiction info)
                         source_meta = self._get_source_metadata(source_id)
                         
-                        normalized_records = []
-                        errors = []
-                        
-                        for raw_record in raw_records:
-                            try:
-                                # Normalize the record
-                                normalized = normalize(source_meta, raw_record)
-                                
-                                # Validate the normalized record
-                                validation_errors = validate_normalized_record(normalized)
-                                if validation_errors:
-                                    logger.warning(f"Validation errors for {normalized.get('permit_id')}: {validation_errors}")
-                                    errors.extend(validation_errors)
-                                    continue
-                                
-                                normalized_records.append(normalized)
-                                total_processed += 1
-                                
-                            except Exception as e:
-                                logger.error(f"Failed to normalize record: {e}")
-                                errors.append(str(e))
-                                total_errors += 1
+                        normalized_records, stats = self.executor.run(
+                            _normalize_and_validate, raw_records, source_meta
+                        )
+                        errors = stats.get('errors', [])
+                        total_processed += stats.get('processed', 0)
+                        total_errors += stats.get('failed', 0)
                         
                         # Batch upsert normalized records
                         if normalized_records:
@@ -255,12 +247,54 @@ class PermitsNormalizer:
         return cursor.rowcount
 
 
-def normalize_from_raw_data(raw_data_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _normalize_and_validate(raw_records: List[Dict[str, Any]],
+                            source_meta: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Normalize and validate raw records from one source, keeping the valid ones.
+    
+    Runs in a worker process for large sources (see ParallelNormalizer).
+    
+    Returns:
+        Valid normalized records and stats: processed (valid), failed
+        (records that raised) and errors (messages)
+    """
+    failures = []
+    try:
+        candidates = normalize_batch(source_meta, raw_records)
+    except Exception:
+        # Normalize one by one to isolate the records that fail
+        candidates = []
+        for raw_record in raw_records:
+            try:
+                candidates.append(normalize(source_meta, raw_record))
+            except Exception as e:
+                logger.error(f"Failed to normalize record: {e}")
+                failures.append(str(e))
+    
+    normalized_records = []
+    errors = []
+    for normalized in candidates:
+        validation_errors = validate_normalized_record(normalized)
+        if validation_errors:
+            logger.warning(f"Validation errors for {normalized.get('permit_id')}: {validation_errors}")
+            errors.extend(validation_errors)
+            continue
+        normalized_records.append(normalized)
+    
+    return normalized_records, {
+        'processed': len(normalized_records),
+        'failed': len(failures),
+        'errors': errors + failures
+    }
+
+
+def normalize_from_raw_data(raw_data_results: List[Dict[str, Any]], workers: Optional[int] = None) -> Dict[str, Any]:
     """
     Normalize permit data from raw data loading results.
     
     Args:
         raw_data_results: Results from pipelines.load_raw
+        workers: Worker processes for large sources (default: NORMALIZE_WORKERS or 1)
         
     Returns:
         Normalization results
@@ -278,7 +312,7 @@ def normalize_from_raw_data(raw_data_results: List[Dict[str, Any]]) -> Dict[str,
         return {'total_processed': 0, 'total_upserted': 0, 'total_errors': 0}
     
     # Normalize the data
-    normalizer = PermitsNormalizer()
+    normalizer = PermitsNormalizer(workers=workers)
     return normalizer.normalize_raw_permits(source_data)
 
 
@@ -292,6 +326,8 @@ def main():
     
     parser = argparse.ArgumentParser(description='Normalize permit data to gold.permits')
     parser.add_argument('--db-url', help='PostgreSQL connection URL (or set DATABASE_URL env var)')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes for large sources (default: NORMALIZE_WORKERS or 1)')
     
     args = parser.parse_args()
     
@@ -310,7 +346,7 @@ def main():
     try:
         # For standalone execution, we would need to read from somewhere
         # For now, just validate the setup
-        normalizer = PermitsNormalizer(db_url)
+        normalizer = PermitsNormalizer(db_url, workers=args.workers)
         normalizer._ensure_gold_permits_exists()
         
         logger.info("Permits normalizer setup successful")
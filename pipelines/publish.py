@@ -18,6 +18,7 @@ from psycopg2.extras import RealDictCursor
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from normalizers.trades import TRADE_CLASSIFIER
 from scoring.v0 import score_v0
 logger = logging.getLogger(__name__)
 
@@ -146,8 +147,6 @@ class LeadPublisher:
         Returns:
             List of trade category tags
         """
-        tags = []
-        
         # Combine relevant text fields
         text_fields = [
             permit.get('description', ''),
@@ -156,28 +155,9 @@ class LeadPublisher:
             permit.get('subtype', '')
         ]
         
-        combined_text = ' '.join(str(field) for field in text_fields if field).upper()
-        
-        # Trade detection patterns
-        trade_patterns = {
-            'roofing': ['ROOF', 'ROOFING', 'SHINGLE', 'REROOF'],
-            'kitchen': ['KITCHEN', 'REMODEL', 'CABINET', 'COUNTERTOP'],
-            'bath': ['BATH', 'BATHROOM', 'SHOWER', 'TUB'],
-            'pool': ['POOL', 'SPA', 'SWIMMING'],
-            'fence': ['FENCE', 'FENCING'],
-            'windows': ['WINDOW', 'WINDOWS', 'GLASS'],
-            'foundation': ['FOUNDATION', 'CONCRETE', 'SLAB'],
-            'solar': ['SOLAR', 'PHOTOVOLTAIC', 'PV'],
-            'hvac': ['HVAC', 'AIR CONDITIONING', 'HEATING', 'AC'],
-            'electrical': ['ELECTRICAL', 'ELECTRIC', 'WIRING'],
-            'plumbing': ['PLUMBING', 'PLUMBER', 'WATER', 'SEWER']
-        }
-        
-        for trade, patterns in trade_patterns.items():
-            if any(pattern in combined_text for pattern in patterns):
-                tags.append(trade)
+        combined_text = ' '.join(str(field) for field in text_fields if field)
         
-        return tags
+        return TRADE_CLASSIFIER.tags(combined_text)
     
     def _infer_owner_kind(self, permit: Dict[str, Any]) -> str:
         """
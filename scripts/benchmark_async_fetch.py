@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Async Fetch Benchmark
+
+Records one pull of many jurisdictions (Socrata and ArcGIS adapters, one
+host each), then replays the recorded responses with a fixed per-request
+latency and times the same pull adapter by adapter, the way the sync
+runners work, and concurrently on one event loop at several per-host
+concurrency limits. A request that was not recorded gets a 404, so every
+run must issue exactly the recorded requests.
+
+Usage:
+    python scripts/benchmark_async_fetch.py --jurisdictions 24 --latency 0.08
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from permit_leads.adapters.arcgis_feature_service import ArcGISFeatureServiceAdapter  # noqa: E402
+from permit_leads.adapters.base import AsyncFetchEngine, fetch_all_since, httpx  # noqa: E402
+from permit_leads.adapters.simple_socrata_adapter import SimpleSocrataAdapter  # noqa: E402
+
+SINCE = datetime(2024, 1, 1)
+
+
+def make_adapters(n):
+    adapters = []
+    for i in range(n):
+        if i % 2:
+            adapters.append(ArcGISFeatureServiceAdapter({
+                "name": f"arcgis-{i}", "date_field": "ISSUEDDATE",
+                "url": f"https://gis{i}.example.gov/arcgis/rest/services/Permits/FeatureServer/0"}))
+        else:
+            adapters.append(SimpleSocrataAdapter({
+                "name": f"socrata-{i}", "date_field": "issued_date", "app_token": "benchmark",
+                "url": f"https://data{i}.example.gov/resource/abcd-1234.json"}))
+    return adapters
+
+
+def source_response(request, total):
+    """Paged responses of a source with `total` permits (used for recording)."""
+    url = urlsplit(str(request.url))
+    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+    if url.path.endswith(".json"):
+        offset, limit = int(params["$offset"]), int(params["$limit"])
+        body = [{"permit_number": f"P-{i}", "issued_date": "2024-02-01T00:00:00.000",
+                 "work_description": "Residential roof replacement"}
+                for i in range(offset, min(offset + limit, total))]
+    elif not url.path.endswith("/query"):
+        body = {"maxRecordCount": 1000}
+    elif params.get("returnCountOnly") == "true":
+        body = {"count": total}
+    else:
+        offset, count = int(params["resultOffset"]), int(params["resultRecordCount"])
+        body = {"features": [{"attributes": {"PERMIT_NUMBER": f"P-{i}", "ISSUEDDATE": 1706745600000}}
+                             for i in range(offset, min(offset + count, total))]}
+    return httpx.Response(200, json=body)
+
+
+def recorder(total, recording):
+    def handle(request):
+        response = source_response(request, total)
+        recording[str(request.url)] = response.content
+        return response
+    return handle
+
+
+def replayer(recording, latency):
+    async def handle(request):
+        await asyncio.sleep(latency)
+        body = recording.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+    return handle
+
+
+async def pull(adapters, transport, limit, host_concurrency, concurrent):
+    async with AsyncFetchEngine(transport=transport, host_concurrency=host_concurrency, rate_limit=0) as engine:
+        if concurrent:
+            return await fetch_all_since(adapters, SINCE, limit, engine)
+        return {adapter.name: await adapter.fetch_since_async(SINCE, limit, engine) for adapter in adapters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent async fetching of many jurisdictions')
+    parser.add_argument('--jurisdictions', type=int, default=24, help='Jurisdictions to pull (default: 24)')
+    parser.add_argument('--records', type=int, default=5000, help='Permits per jurisdiction (default: 5000)')
+    parser.add_argument('--latency', type=float, default=0.08, help='Seconds per replayed response (default: 0.08)')
+    args = parser.parse_args()
+
+    if httpx is None:
+        sys.exit("httpx is required for this benchmark")
+
+    adapters = make_adapters(args.jurisdictions)
+    recording = {}
+    expected = asyncio.run(pull(adapters, httpx.MockTransport(recorder(args.records, recording)),
+                                args.records, 1, concurrent=False))
+    replay = httpx.MockTransport(replayer(recording, args.latency))
+    assert asyncio.run(pull(adapters, replay, args.records, 4, concurrent=True)) == expected, \
+        "concurrent pull differs from sequential pull"
+
+    print(f"Async fetch benchmark ({args.jurisdictions} jurisdictions x {args.records} permits, "
+          f"{len(recording)} recorded responses, {args.latency * 1000:.0f}ms latency)")
+    start = time.perf_counter()
+    asyncio.run(pull(adapters, replay, args.records, 1, concurrent=False))
+    sequential = time.perf_counter() - start
+    print(f"adapter by adapter:             {sequential:.2f}s")
+    for host_concurrency in (1, 2, 4, 8):
+        start = time.perf_counter()
+        results = asyncio.run(pull(adapters, replay, args.records, host_concurrency, concurrent=True))
+        elapsed = time.perf_counter() - start
+        assert all(not isinstance(records, Exception) for records in results.values())
+        print(f"concurrent, {host_concurrency} per host:         {elapsed:.2f}s ({sequential / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Date Parsing Benchmark
+
+Compares the per-value strptime fallthrough the normalizers used with
+DateParser.parse() (skeleton dispatch + memoization) and
+DateParser.parse_many() (column-wise pandas conversion) on permit-shaped
+date columns: a day-resolution column where dates repeat heavily, a
+timestamp column of mostly distinct values, and a US-format column that
+sits late in the format list. Results are checked for equality first.
+
+Usage:
+    python scripts/benchmark_date_parsing.py --values 500000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalizers.dates import DateParser  # noqa: E402
+from normalizers.permits import DATE_FORMATS  # noqa: E402
+
+
+def make_column(kind, n, seed=0):
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    if kind == 'daily':
+        return [(base + timedelta(days=rng.randrange(730))).strftime('%Y-%m-%d') for _ in range(n)]
+    if kind == 'timestamps':
+        return [(base + timedelta(seconds=rng.randrange(730 * 86400))).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+                for _ in range(n)]
+    return [(base + timedelta(days=rng.randrange(730))).strftime('%m/%d/%Y %H:%M:%S') for _ in range(n)]
+
+
+def legacy_parse(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_each(values):
+    parser = DateParser(DATE_FORMATS)
+    return [parser.parse(v) for v in values]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared date parsing')
+    parser.add_argument('--values', type=int, default=500000, help='Values per column (default: 500000)')
+    args = parser.parse_args()
+
+    print(f"Date parsing benchmark ({args.values} values per column)")
+    print(f"{'column':<12} {'distinct':>9} {'legacy_us':>10} {'parse_us':>10} {'many_us':>10} {'speedup':>8}")
+    for kind in ('daily', 'timestamps', 'us_format'):
+        values = make_column(kind, args.values)
+        n = len(values)
+
+        legacy, expected = timed(lambda: [legacy_parse(v) for v in values])
+        per_value, parsed = timed(lambda: parse_each(values))
+        many, column = timed(lambda: DateParser(DATE_FORMATS).parse_many(values))
+        assert parsed == expected and column == expected, f"{kind}: results differ"
+
+        print(f"{kind:<12} {len(set(values)):>9} {legacy / n * 1e6:>10.2f} {per_value / n * 1e6:>10.2f} "
+              f"{many / n * 1e6:>10.2f} {legacy / min(per_value, many):>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Gold Storage Benchmark
+
+Writes the same normalized permits as the old single indented JSON file and
+as the partitioned gold store, then compares disk footprint and the time to
+load what the entity graph (all columns but raw_data) and the normalized
+data validation (six columns) read, for all months and for one month.
+
+Usage:
+    python scripts/benchmark_gold_storage.py --records 500000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_quality.validation_suite import NORMALIZED_REQUIRED_FIELDS  # noqa: E402
+from lib.entity_graph import GRAPH_EXCLUDED_COLUMNS  # noqa: E402
+from lib.gold_store import GoldStore, parquet_available  # noqa: E402
+
+TYPES = {
+    "id": "string", "source": "string", "category": "string", "jurisdiction": "string", "raw_data": "json",
+    "normalized_at": "timestamp", "quality_score": "float", "permit_number": "string",
+    "issued_date": "timestamp", "address": "string", "description": "string", "status": "string",
+    "work_class": "string", "value": "float", "applicant": "string", "latitude": "float", "longitude": "float",
+}
+
+
+def make_permits(n):
+    normalized_at = datetime(2024, 6, 1, 12, 0, 0)
+    records = []
+    for i in range(n):
+        raw = {
+            "permit_number": f"24{i:07d}", "issued_date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "address": f"{100 + i % 9000} Main St", "description": "Residential remodel, replace roof",
+            "status": "Issued", "work_class": "Alteration", "value": f"{25000 + i % 50000}",
+            "applicant": f"Contractor {i % 500} LLC", "latitude": "29.76", "longitude": "-95.37",
+            "_source": "houston", "_category": "permits", "_jurisdiction": "Houston",
+        }
+        records.append({
+            "id": f"{i:032x}", "source": "houston", "category": "permits", "jurisdiction": "Houston",
+            "raw_data": raw, "normalized_at": normalized_at, "quality_score": 0.85,
+            "permit_number": raw["permit_number"], "issued_date": datetime(2024, i % 12 + 1, i % 28 + 1),
+            "address": raw["address"].upper(), "description": raw["description"], "status": "ACTIVE",
+            "work_class": "Alteration", "value": float(raw["value"]), "applicant": raw["applicant"],
+            "latitude": 29.76, "longitude": -95.37,
+        })
+    return records
+
+
+def write_legacy(gold_dir, records):
+    data = [{k: v.isoformat() if isinstance(v, datetime) else v for k, v in r.items()} for r in records]
+    with open(gold_dir / "permits_20240601_120000.json", "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def timed_load(store, **kwargs):
+    start = time.perf_counter()
+    count = sum(len(records) for _, records in store.iter_records("permits", **kwargs))
+    return time.perf_counter() - start, count
+
+
+def disk_bytes(path):
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark partitioned Parquet gold storage')
+    parser.add_argument('--records', type=int, default=500000, help='Permits to store (default: 500000)')
+    args = parser.parse_args()
+
+    if not parquet_available():
+        sys.exit("pyarrow is required for this benchmark")
+
+    records = make_permits(args.records)
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy_dir = Path(workdir) / "legacy"
+        parquet_dir = Path(workdir) / "parquet"
+        legacy_dir.mkdir()
+        write_legacy(legacy_dir, records)
+        GoldStore(str(parquet_dir), "parquet").write("permits", records, TYPES)
+
+        legacy, parquet = GoldStore(str(legacy_dir)), GoldStore(str(parquet_dir))
+        sample = dict(start_month="2024-03", end_month="2024-03")
+        assert sorted(r["id"] for _, b in legacy.iter_records("permits", columns=["id"], **sample) for r in b) == \
+            sorted(r["id"] for _, b in parquet.iter_records("permits", columns=["id"], **sample) for r in b), \
+            "month filter differs between layouts"
+
+        validation_columns = NORMALIZED_REQUIRED_FIELDS + ["quality_score"]
+        loads = [
+            ("graph, all months", dict(exclude=GRAPH_EXCLUDED_COLUMNS)),
+            ("graph, one month", dict(exclude=GRAPH_EXCLUDED_COLUMNS, **sample)),
+            ("validation, all months", dict(columns=validation_columns)),
+        ]
+
+        print(f"Gold storage benchmark ({args.records} permits)")
+        print(f"disk: legacy json {disk_bytes(legacy_dir) / 1e6:.1f} MB, "
+              f"parquet {disk_bytes(parquet_dir) / 1e6:.1f} MB")
+        print(f"{'load':>24} {'json_s':>8} {'parquet_s':>10} {'speedup':>8}")
+        for name, kwargs in loads:
+            json_s, json_count = timed_load(legacy, **kwargs)
+            parquet_s, parquet_count = timed_load(parquet, **kwargs)
+            assert json_count == parquet_count
+            print(f"{name:>24} {json_s:>8.2f} {parquet_s:>10.2f} {json_s / parquet_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
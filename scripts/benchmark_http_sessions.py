@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+HTTP Session Benchmark
+
+Fetches the same small JSON page from a local keep-alive server the way
+the adapters used to (requests.get(), a new connection per call) and
+through shared sessions (several clients on one pooled connection per
+host), and compares wall time and connections opened. Loopback connects
+are cheap; against a remote HTTPS host each avoided connection also saves
+a TCP and TLS handshake round trip.
+
+Usage:
+    python scripts/benchmark_http_sessions.py --requests 2000
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from permit_leads.utils.http import HTTP_CLIENTS, connection_stats, reset_connection_stats, shared_session  # noqa: E402
+
+BODY = json.dumps({"features": [{"attributes": {"PERMIT_NUMBER": f"BLD-{i}"}} for i in range(20)]}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle's algorithm
+    # holds the body back on kept-alive connections until the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(fetch, url, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fetch(url)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared HTTP sessions against requests.get()')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per mode (default: 2000)')
+    parser.add_argument('--clients', type=int, default=4, help='Sessions sharing the pool (default: 4)')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.connections = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/query"
+
+    sessions = [shared_session({'User-Agent': f'client-{i}'}) for i in range(args.clients)]
+    assert requests.get(url, timeout=10).json() == sessions[0].get(url, timeout=10).json(), \
+        "responses differ between modes"
+
+    server.connections.clear()
+    per_call = run(lambda u: requests.get(u, timeout=10).json(), url, args.requests)
+    per_call_connections = len(server.connections)
+
+    # Start the shared run from an empty pool
+    HTTP_CLIENTS.close()
+    server.connections.clear()
+    reset_connection_stats()
+    turn = iter(range(args.requests))
+    shared = run(lambda u: sessions[next(turn) % len(sessions)].get(u, timeout=10).json(), url, args.requests)
+    stats = connection_stats()['127.0.0.1']
+
+    print(f"HTTP session benchmark ({args.requests} requests, {args.clients} shared clients)")
+    print(f"requests.get():  {per_call:.2f}s, {per_call_connections} connections")
+    print(f"shared sessions: {shared:.2f}s, {stats['new_connections']} connections "
+          f"({stats['reused_connections']} reused)")
+    print(f"speedup: {per_call / shared:.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
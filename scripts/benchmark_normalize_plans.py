@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Permit Normalization Plan Benchmark
+
+Compares per-record alias resolution (pick() over every alias list, as
+normalize() did before plans) with compiled per-source plans, for alias
+resolution alone and for the full normalize() path, on Houston- and
+Dallas-shaped records. Outputs are checked for equality first.
+
+Usage:
+    python scripts/benchmark_normalize_plans.py --records 500000
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalizers.permits import (  # noqa: E402
+    PICKED_FIELDS, _build_canonical, _source_aliases, clear_normalization_plans,
+    get_normalization_plan, normalize, normalize_batch, pick
+)
+
+SOURCES = {
+    "houston": {"id": "houston_permits", "jurisdiction": "Houston", "city": "Houston", "county": "Harris"},
+    "dallas": {"id": "dallas_permits", "jurisdiction": "Dallas", "city": "Dallas", "county": "Dallas"},
+}
+
+STATUSES = ["Issued", "Active", "Finaled", "", "N/A"]
+
+
+def make_records(source, n):
+    """Synthetic raw records shaped like each source's feed."""
+    base = datetime(2024, 1, 1)
+    records = []
+    for i in range(n):
+        issued = (base + timedelta(hours=i % 5000)).strftime('%Y-%m-%dT%H:%M:%S')
+        if source == "houston":
+            records.append({
+                "permit_number": f"24{i:07d}",
+                "issue_date": issued,
+                "status": STATUSES[i % len(STATUSES)],
+                "permit_type": "Building",
+                "work_class": "Alteration",
+                "description": "Residential remodel, replace roof",
+                "project_address": f"{100 + i % 9000} MAIN ST",
+                "zip": "77002",
+                "valuation": f"${25000 + i % 50000:,}",
+                "contractor": "ACME Builders LLC",
+                "latitude": 29.76 + (i % 100) * 0.001,
+                "longitude": -95.36 - (i % 100) * 0.001,
+                "objectid": i,
+            })
+        else:
+            records.append({
+                "permit_number": f"BLD24-{i:06d}",
+                "issued_date": issued,
+                "permit_status": STATUSES[i % len(STATUSES)],
+                "permit_type_desc": "Building - Remodel",
+                "work_description": "Kitchen remodel",
+                "address": f"{100 + i % 9000} Elm St, Dallas, TX",
+                "estimated_cost": str(30000 + i % 40000),
+                "contractor_name": "Smith Construction" if i % 3 else None,
+                "zip_code": "75201",
+            })
+    return records
+
+
+def legacy_pick_all(source_meta, record):
+    aliases = _source_aliases(source_meta.get('jurisdiction', 'unknown').lower())
+    return {field: pick(record, aliases.get(field, [])) for field in PICKED_FIELDS}
+
+
+def legacy_normalize(source_meta, record):
+    return _build_canonical(source_meta, record, legacy_pick_all(source_meta, record))
+
+
+def comparable(canonical):
+    """Canonical record without run-time stamps (processed_at also feeds record_hash)."""
+    provenance = {k: v for k, v in canonical['provenance'].items() if k != 'processed_at'}
+    return {**{k: v for k, v in canonical.items() if k not in ('provenance', 'record_hash', 'updated_at')},
+            'provenance': provenance}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compiled permit normalization plans')
+    parser.add_argument('--records', type=int, default=500000, help='Records per source (default: 500000)')
+    args = parser.parse_args()
+
+    print(f"Normalization plan benchmark ({args.records} records per source)")
+    print(f"{'source':<10} {'stage':<10} {'legacy_us':>10} {'plan_us':>10} {'speedup':>8}")
+    for source, meta in SOURCES.items():
+        records = make_records(source, args.records)
+        clear_normalization_plans()
+
+        sample = records[:5000]
+        plan = get_normalization_plan(meta, sample[0])
+        assert all(plan.pick_all(r) == legacy_pick_all(meta, r) for r in sample), "alias resolution differs"
+        assert ([comparable(c) for c in normalize_batch(meta, sample)] ==
+                [comparable(legacy_normalize(meta, r)) for r in sample]), "normalize output differs"
+
+        n = len(records)
+        legacy = timed(lambda: [legacy_pick_all(meta, r) for r in records])
+        compiled = timed(lambda: [plan.pick_all(r) for r in records])
+        print(f"{source:<10} {'resolve':<10} {legacy / n * 1e6:>10.2f} {compiled / n * 1e6:>10.2f} "
+              f"{legacy / compiled:>7.1f}x")
+
+        legacy = timed(lambda: [legacy_normalize(meta, r) for r in records])
+        per_record = timed(lambda: [normalize(meta, r) for r in records])
+        batch = timed(lambda: normalize_batch(meta, records))
+        print(f"{source:<10} {'normalize':<10} {legacy / n * 1e6:>10.2f} {per_record / n * 1e6:>10.2f} "
+              f"{legacy / per_record:>7.1f}x")
+        print(f"{source:<10} {'batch':<10} {legacy / n * 1e6:>10.2f} {batch / n * 1e6:>10.2f} "
+              f"{legacy / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
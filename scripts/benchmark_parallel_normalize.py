@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Parallel Normalization Benchmark
+
+Times normalize_batch() in-process against normalize_batch_parallel() with
+a given number of worker processes, and compares the pickled size of a
+chunk sent as dicts with the packed form the workers receive.
+
+Usage:
+    python scripts/benchmark_parallel_normalize.py --records 200000 --workers 4
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalizers.parallel import DEFAULT_CHUNK_SIZE, normalize_batch_parallel, pack_records  # noqa: E402
+from normalizers.permits import normalize_batch  # noqa: E402
+
+SOURCE = {"id": "houston_permits", "jurisdiction": "Houston", "city": "Houston", "county": "Harris"}
+
+VOLATILE_FIELDS = ("provenance", "updated_at")
+
+
+def make_raw(n):
+    return [{
+        "permit_number": f"24{i:07d}",
+        "issue_date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "status": "Issued",
+        "permit_type": "Building",
+        "work_class": "Alteration",
+        "description": "Residential remodel, replace roof",
+        "project_address": f"{100 + i % 9000} MAIN ST",
+        "zip": "77002",
+        "valuation": f"${25000 + i % 50000:,}",
+        "contractor": "ACME Builders LLC",
+    } for i in range(n)]
+
+
+def stable(records):
+    return [{k: v for k, v in r.items() if k not in VOLATILE_FIELDS} for r in records]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark process-pool normalization')
+    parser.add_argument('--records', type=int, default=200000, help='Records to normalize (default: 200000)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes (default: 4)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Records per chunk (default: {DEFAULT_CHUNK_SIZE})')
+    args = parser.parse_args()
+
+    raw = make_raw(args.records)
+    sample = raw[:1000]
+    assert stable(normalize_batch_parallel(SOURCE, sample, workers=2, chunk_size=100)) == \
+        stable(normalize_batch(SOURCE, sample)), "parallel output differs from serial"
+
+    start = time.perf_counter()
+    normalize_batch(SOURCE, raw)
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalize_batch_parallel(SOURCE, raw, workers=args.workers, chunk_size=args.chunk_size)
+    parallel = time.perf_counter() - start
+
+    chunk = raw[:args.chunk_size]
+    dict_bytes = len(pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL))
+    packed_bytes = len(pickle.dumps(pack_records(chunk), pickle.HIGHEST_PROTOCOL))
+
+    print(f"Parallel normalization benchmark ({args.records} records, {args.workers} workers)")
+    print(f"{'serial_s':>10} {'parallel_s':>10} {'speedup':>8}")
+    print(f"{serial:>10.2f} {parallel:>10.2f} {serial / parallel:>7.1f}x")
+    print(f"chunk pickle: {dict_bytes} bytes as dicts, {packed_bytes} bytes packed "
+          f"({packed_bytes / dict_bytes:.0%})")
+
+
+if __name__ == '__main__':
+    main()
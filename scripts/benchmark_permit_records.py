@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+PermitRecord Construction Benchmark
+
+Reports records/sec and resident bytes/record for the validated PermitRecord
+constructor, compares region annotation by re-validation against
+with_updates(), and measures batched vs per-record Storage writes.
+
+Usage:
+    python scripts/benchmark_permit_records.py --records 20000
+    python scripts/benchmark_permit_records.py --records 100000 --json results.json
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from permit_leads.models.permit import PermitRecord  # noqa: E402
+from permit_leads.adapters.storage import Storage  # noqa: E402
+
+CATEGORIES = ["Residential - Single Family", "Commercial Office", "Duplex", "Industrial", "Other"]
+REGION_UPDATES = {
+    "jurisdiction_slug": "tx-harris",
+    "jurisdiction_id": "tx-harris",
+    "region_slug": "tx-houston",
+    "region_id": "tx-houston",
+    "state": "TX",
+    "jurisdiction_name": "Harris County",
+    "region_name": "Houston Metro",
+}
+
+
+def make_rows(n):
+    """Generate synthetic rows shaped like adapter output."""
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        rows.append({
+            "jurisdiction": "Harris County",
+            "permit_id": f"BP-{i:08d}",
+            "address": f"  {100 + i % 9000}   main st  houston tx ",
+            "description": "Remodel kitchen and bathroom, replace roof",
+            "work_class": "Alteration",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "status": "Issued",
+            "issue_date": (base + timedelta(minutes=i)).isoformat(),
+            "applicant": "ACME Builders LLC",
+            "value": str(25000 + i % 50000),
+            "latitude": 29.76 + (i % 100) * 0.001,
+            "longitude": -95.36 - (i % 100) * 0.001,
+        })
+    return rows
+
+
+def timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bytes_per_record(fn, n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / n
+
+
+def run(n):
+    rows = make_rows(n)
+    results = {"records": n}
+
+    def validated():
+        return [PermitRecord(**row) for row in rows]
+
+    permits, elapsed = timed(validated)
+    results["validated_construct"] = {"records_per_s": round(n / elapsed)}
+    results["validated_construct"]["bytes_per_record"] = round(bytes_per_record(validated, n))
+
+    _, elapsed = timed(lambda: [PermitRecord(**{**p.model_dump(), **REGION_UPDATES}) for p in permits])
+    results["annotate_revalidate"] = {"records_per_s": round(n / elapsed)}
+    _, elapsed = timed(lambda: [p.with_updates(**REGION_UPDATES) for p in permits])
+    results["annotate_with_updates"] = {"records_per_s": round(n / elapsed)}
+
+    _, elapsed = timed(lambda: [p.to_dict() for p in permits])
+    results["to_dict"] = {"records_per_s": round(n / elapsed)}
+
+    sample = permits[:min(n, 5000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        per_record = Storage(db_path=Path(tmp) / "per_record.db")
+        _, elapsed = timed(lambda: [per_record.save_record(p) for p in sample])
+        results["sqlite_per_record"] = {"records_per_s": round(len(sample) / elapsed)}
+
+        batched = Storage(db_path=Path(tmp) / "batched.db")
+        _, elapsed = timed(lambda: batched.save_records(sample))
+        results["sqlite_batched"] = {"records_per_s": round(len(sample) / elapsed)}
+
+    return results
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark PermitRecord construction and storage paths")
+    parser.add_argument("--records", type=int, default=20000, help="Number of synthetic records (default: 20000)")
+    parser.add_argument("--json", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.records)
+
+    print(f"PermitRecord benchmark ({results['records']} records)")
+    print(f"{'path':<24} {'records/s':>12} {'bytes/record':>14}")
+    for name, stats in results.items():
+        if name == "records":
+            continue
+        print(f"{name:<24} {stats['records_per_s']:>12,} {stats.get('bytes_per_record', '-'):>14}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"📊 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Record Hash Benchmark
+
+Compares the scheme 1 record hash (filtered dict copy, sorted JSON, SHA1)
+with the scheme 2 canonical hash (fixed field order, tagged encoding,
+BLAKE2b) on normalized permit records, plus PermitRecord.get_hash() old
+vs new for its content-hash fallback.
+
+Usage:
+    python scripts/benchmark_record_hash.py --records 200000
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalizers.permits import compute_record_hash, normalize_batch  # noqa: E402
+from permit_leads.models.permit import PermitRecord  # noqa: E402
+
+SOURCE = {"id": "houston_permits", "jurisdiction": "Houston", "city": "Houston", "county": "Harris"}
+
+
+def make_canonical(n):
+    base = datetime(2024, 1, 1)
+    raw = [{
+        "permit_number": f"24{i:07d}",
+        "issue_date": (base + timedelta(hours=i % 5000)).strftime('%Y-%m-%dT%H:%M:%S'),
+        "status": "Issued",
+        "permit_type": "Building",
+        "work_class": "Alteration",
+        "description": "Residential remodel, replace roof",
+        "project_address": f"{100 + i % 9000} MAIN ST",
+        "zip": "77002",
+        "valuation": f"${25000 + i % 50000:,}",
+        "contractor": "ACME Builders LLC",
+        "latitude": 29.76 + (i % 100) * 0.001,
+        "longitude": -95.36 - (i % 100) * 0.001,
+    } for i in range(n)]
+    return normalize_batch(SOURCE, raw)
+
+
+def legacy_record_hash(canonical):
+    hashable = {k: v for k, v in canonical.items() if not k.startswith('_') and v is not None}
+    json_str = json.dumps(hashable, sort_keys=True, default=str)
+    return hashlib.sha1(json_str.encode()).hexdigest()
+
+
+def legacy_permit_hash(record):
+    key_fields = {
+        'jurisdiction': record.jurisdiction,
+        'address': record.address,
+        'description': record.description,
+        'issue_date': record.issue_date.isoformat() if record.issue_date else None,
+        'applicant': record.applicant,
+        'value': record.value,
+    }
+    return hashlib.sha256(json.dumps(key_fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark canonical record hashing')
+    parser.add_argument('--records', type=int, default=200000, help='Records to hash (default: 200000)')
+    args = parser.parse_args()
+
+    canonical = make_canonical(args.records)
+    permits = [PermitRecord(jurisdiction="Houston", permit_id="", address=c['address_full'],
+                            description=c['description'], issue_date=c['issued_at'],
+                            applicant=c['contractor_name'], value=c['valuation']) for c in canonical]
+    n = len(canonical)
+
+    print(f"Record hash benchmark ({n} records)")
+    print(f"{'hash':<16} {'legacy_us':>10} {'v2_us':>10} {'speedup':>8}")
+    for name, legacy, current, items in (
+        ('record_hash', legacy_record_hash, compute_record_hash, canonical),
+        ('get_hash', legacy_permit_hash, PermitRecord.get_hash, permits),
+    ):
+        old = timed(lambda: [legacy(item) for item in items])
+        new = timed(lambda: [current(item) for item in items])
+        print(f"{name:<16} {old / n * 1e6:>10.2f} {new / n * 1e6:>10.2f} {old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+TPIA Delivery Processing Benchmark
+
+Processes a generated delivery CSV the old way (every cleaned row held in a
+list, then one indented JSON document) and with the chunked NDJSON writer,
+each in a fresh process so peak RSS is measured per mode.
+
+Usage:
+    python scripts/benchmark_tpia_processing.py --rows 1000000
+"""
+
+import argparse
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tpia.handler import TPIA_CHUNK_ROWS, TPIAHandler, peak_rss_mb  # noqa: E402
+
+
+def write_delivery(path, n):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Permit Number', 'Issue Date', 'Permit Type', 'Work Description', 'Address',
+                         'Estimated Cost', 'Square Footage', 'Contractor'])
+        for i in range(n):
+            writer.writerow([f'24{i:07d}', f'{i % 12 + 1:02d}/{i % 28 + 1:02d}/2024', 'Building',
+                             'Residential remodel, replace roof', f'{100 + i % 9000} MAIN ST',
+                             f'${25000 + i % 50000:,}', f'{1200 + i % 3000:,}', 'ACME Builders LLC'])
+
+
+def run_legacy(handler, csv_path, output_path):
+    records = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row_num, row in enumerate(csv.DictReader(f), 1):
+            cleaned = handler._clean_csv_row(row)
+            if cleaned:
+                cleaned['_source_id'] = 'tx-bench'
+                cleaned['_row_number'] = row_num
+                records.append(cleaned)
+    with open(output_path, 'w') as f:
+        json.dump({'metadata': {}, 'records': records}, f, indent=2, default=str)
+    return len(records)
+
+
+def run_mode(mode, csv_path, workdir, chunk_size):
+    handler = TPIAHandler(requests_dir=str(Path(workdir) / 'requests'), deliveries_dir=str(Path(workdir) / mode))
+    start = time.perf_counter()
+    if mode == 'legacy':
+        records = run_legacy(handler, csv_path, Path(workdir) / 'legacy.json')
+    else:
+        result = handler.process_delivered_csv(csv_path, 'tx-bench', archive=False, output_format=mode,
+                                               chunk_size=chunk_size)
+        assert result['status'] == 'success', result
+        records = result['processed_records']
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'records': records, 'seconds': elapsed, 'peak_rss_mb': peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chunked TPIA delivery processing')
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the delivery (default: 1000000)')
+    parser.add_argument('--chunk-size', type=int, default=TPIA_CHUNK_ROWS,
+                        help=f'Rows per chunk (default: {TPIA_CHUNK_ROWS})')
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--csv', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.csv, args.workdir, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = str(Path(workdir) / 'delivery.csv')
+        write_delivery(csv_path, args.rows)
+
+        results = {}
+        for mode in ('legacy', 'ndjson', 'ndjson.gz'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--csv', csv_path, '--workdir', workdir,
+                 '--chunk-size', str(args.chunk_size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+        assert len({r['records'] for r in results.values()}) == 1, "record counts differ between modes"
+
+        print(f"TPIA delivery processing benchmark ({args.rows} rows, chunks of {args.chunk_size})")
+        print(f"{'mode':>10} {'seconds':>8} {'rows/s':>9} {'peak_rss_mb':>12}")
+        for mode, r in results.items():
+            print(f"{mode:>10} {r['seconds']:>8.2f} {args.rows / r['seconds']:>9.0f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
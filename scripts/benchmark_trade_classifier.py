@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Trade Classifier Benchmark
+
+Compares the previous per-trade keyword scans (nested any() substring checks,
+as in enrich.tag_trades/normalize_trade) with the compiled TradeClassifier on
+a column of permit descriptions, both per text and with classify_many().
+
+Usage:
+    python scripts/benchmark_trade_classifier.py --records 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from normalizers.trades import TRADE_CLASSIFIER, TRADE_KEYWORDS, TRADE_PRIORITY  # noqa: E402
+
+PHRASES = [
+    "Residential roof replacement", "Kitchen remodel with new cabinets", "Bathroom remodel, new shower",
+    "Install in-ground swimming pool and spa", "Replace wood fence and gate", "Window replacement",
+    "Foundation repair, slab leveling", "Rooftop solar PV system", "Replace HVAC unit and furnace",
+    "Electrical panel upgrade", "Water heater replacement, sewer line repair", "New single family residence",
+    "Interior finish out for retail tenant", "Demolish accessory structure", "Carpet and tile flooring",
+]
+
+
+def legacy_classify(text):
+    text = text.lower()
+    matching = [(trade, TRADE_PRIORITY.get(trade, 0)) for trade, keywords in TRADE_KEYWORDS.items()
+                if any(keyword in text for keyword in keywords)]
+    tags = [trade for trade, _ in matching]
+    matching.sort(key=lambda x: x[1], reverse=True)
+    return tags, matching[0][0] if matching else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark trade classification')
+    parser.add_argument('--records', type=int, default=200000, help='Descriptions to classify (default: 200000)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [f"{rng.choice(PHRASES)} at {rng.randint(100, 9999)} Main St - permit {i}" for i in range(args.records)]
+    n = len(texts)
+
+    timings = {}
+    for name, fn in (
+        ('legacy', lambda: [legacy_classify(t) for t in texts]),
+        ('classify', lambda: [TRADE_CLASSIFIER.classify(t) for t in texts]),
+        ('classify_many', lambda: TRADE_CLASSIFIER.classify_many(texts)),
+        ('many_repeated', lambda: TRADE_CLASSIFIER.classify_many(t.split(' at ')[0] for t in texts)),
+    ):
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+
+    print(f"Trade classifier benchmark ({n} descriptions)")
+    print(f"{'method':<16} {'us_per_text':>12} {'speedup':>8}")
+    for name, elapsed in timings.items():
+        print(f"{name:<16} {elapsed / n * 1e6:>12.2f} {timings['legacy'] / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
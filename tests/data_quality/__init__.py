@@ -0,0 +1 @@
+# Test package for data quality
\ No newline at end of file
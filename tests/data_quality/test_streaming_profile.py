@@ -0,0 +1,120 @@
+"""
+Unit tests for streaming ingest profiles and drift checks.
+"""
+
+import random
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from data_quality.permits_validation import validate_permits_drift
+from data_quality.streaming_profile import ProfileStore, SourceProfile, TDigest
+
+DAY = date(2024, 6, 10)
+
+
+def permit_records(n, seed=0, value_scale=1.0, status_weights=(0.7, 0.2, 0.1), missing_address=0.0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "permit_id": f"BLD-{seed}-{i}",
+            "address": None if rng.random() < missing_address else f"{i} Main St",
+            "value": str(round(rng.lognormvariate(10, 0.5) * value_scale, 2)),
+            "status": rng.choices(["Issued", "Final", "Void"], weights=status_weights)[0],
+        }
+
+
+def profile_for(day, records, source_id="dallas_permits"):
+    profile = SourceProfile(source_id, day)
+    for record in records:
+        profile.update(record)
+    return profile
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    for offset in range(1, 8):
+        store.save(profile_for(DAY - timedelta(days=offset), permit_records(500, seed=offset)))
+    return store
+
+
+def test_tdigest_quantiles_track_exact_values():
+    values = np.random.default_rng(0).lognormal(10, 1, 50_000)
+    digest = TDigest()
+    for value in values:
+        digest.add(float(value))
+
+    restored = TDigest.from_dict(digest.to_dict())
+
+    assert len(digest.means) < 2 * digest.compression
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        assert restored.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+
+
+def test_same_day_runs_merge_and_old_sketches_are_pruned(tmp_path):
+    store = ProfileStore(str(tmp_path), retention_days=30)
+    store.save(profile_for(DAY - timedelta(days=45), permit_records(10)))
+    store.save(profile_for(DAY, permit_records(300, seed=1, missing_address=1.0)))
+
+    merged = store.save(profile_for(DAY, permit_records(100, seed=2)))
+
+    assert merged.row_count == 400 and merged.runs == 2
+    assert merged.fields["address"].null_rate(merged.row_count) == pytest.approx(0.75)
+    assert store.load("dallas_permits", DAY).row_count == 400
+    assert store.load("dallas_permits", DAY - timedelta(days=45)) is None
+
+
+def test_drift_needs_a_trailing_baseline(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    store.save(profile_for(DAY - timedelta(days=1), permit_records(500)))
+
+    result = validate_permits_drift(profile_for(DAY, permit_records(10)), store.trailing("dallas_permits", DAY))
+
+    assert result["success"] is True
+    assert result["message"] == "Building baseline: 1/3 trailing days"
+
+
+def test_stable_day_has_no_drift(store):
+    result = validate_permits_drift(profile_for(DAY, permit_records(480, seed=99)), store.trailing("dallas_permits", DAY))
+
+    assert result["success"] is True, result["findings"]
+    assert result["history_days"] == 7
+    assert result["rowcount_validation"]["success"] is True
+
+
+def test_drifted_day_is_flagged_per_check(store):
+    records = permit_records(150, seed=99, value_scale=5.0, status_weights=(0.1, 0.1, 0.8), missing_address=0.5)
+
+    result = validate_permits_drift(profile_for(DAY, records), store.trailing("dallas_permits", DAY))
+
+    flagged = {(finding["field"], finding["check"]) for finding in result["findings"]}
+    assert result["success"] is False and result["severity"] == "warning"
+    assert {(None, "row_count"), ("address", "null_rate"), ("value", "p50"), ("status", "categories")} <= flagged
+    # High-cardinality identifiers are not compared as categories
+    assert not any(field == "permit_id" for field, _ in flagged)
+
+
+def test_ingest_source_profiles_records_and_persists_daily_sketch(tmp_path):
+    with patch.dict('sys.modules', {'psycopg2': Mock(), 'psycopg2.extras': Mock()}):
+        from pipelines import load_raw
+    RawDataLoader = load_raw.RawDataLoader
+
+    connector = Mock(spec=['test_connection', 'get_all_data'])
+    connector.get_all_data.return_value = iter(list(permit_records(40)))
+    loader = RawDataLoader.__new__(RawDataLoader)
+    loader.profile_store = ProfileStore(str(tmp_path))
+
+    with patch.object(load_raw, 'create_connector', return_value=connector), \
+            patch.object(RawDataLoader, '_get_last_ingest_date', return_value=None), \
+            patch.object(RawDataLoader, '_update_ingest_state') as update_state, \
+            patch.object(RawDataLoader, '_store_raw_records', return_value=40):
+        result = loader.ingest_source({'id': 'dallas_permits', 'kind': 'socrata'})
+
+    assert result['status'] == 'success'
+    assert result['drift']['row_count'] == 40
+    saved = loader.profile_store.load('dallas_permits', date.today())
+    assert saved.row_count == 40 and set(saved.fields) == {'permit_id', 'address', 'value', 'status'}
+    assert update_state.call_args.kwargs['metadata']['drift_success'] is True
@@ -0,0 +1,125 @@
+"""
+Unit tests for the columnar raw data validation suite.
+
+Checks that rules evaluated as column masks report the same findings as the
+record-by-record checks, that examples are capped per rule, and that large
+files are validated in streamed chunks.
+"""
+
+import json
+
+import pytest
+
+from data_quality import columnar_validation
+from data_quality.validation_suite import DataValidationSuite
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def permit(i, **fields):
+    record = {
+        "_category": "permits",
+        "_source": "dallas",
+        "permit_number": f"P{i}",
+        "issued_date": "2024-01-15",
+        "address": f"{i} Main St",
+        "value": "1500.50",
+        "latitude": 32.78,
+        "longitude": -96.8,
+    }
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def permits_file(tmp_path):
+    records = [permit(i) for i in range(12)]
+    records[1] = permit(1, issued_date="2024-13-01")
+    records[2] = permit(2, address="")
+    records[3] = permit(3, value="n/a", latitude=45.0)
+    records[4] = permit(4, issued_date="2024-1-5T7:05:00", value="1_000")
+    records[5] = permit(5, permit_number="P0", issued_date=20240115)
+    del records[6]["issued_date"]
+    return write_json(tmp_path / "permits.json", records)
+
+
+def test_permit_rules_match_record_checks(permits_file):
+    result = DataValidationSuite().validate_raw_data(permits_file)
+
+    assert result["success"] is False
+    assert result["message"] == "Validated 12 permit records"
+    assert sorted(result["errors"]) == sorted([
+        "Record 1: Invalid date format for 'issued_date': 2024-13-01",
+        "Record 2: Missing required field 'address'",
+        "Record 5: Invalid date format for 'issued_date': 20240115",
+        "Record 6: Missing required field 'issued_date'",
+    ])
+    assert sorted(result["warnings"]) == sorted([
+        "Record 3: Invalid numeric value: n/a",
+        "Record 3: Coordinates outside Texas bounds: [REDACTED]",
+        "Duplicate permit numbers found: P0",
+    ])
+    assert result["metrics"] == {
+        "total_records": 12,
+        "records_with_coordinates": 12,
+        "records_with_value": 12,
+        "unique_permit_numbers": 11,
+        "duplicate_permit_numbers": 1,
+        "error_count": 4,
+        "warning_count": 3,
+    }
+
+
+def test_examples_are_capped_per_rule_with_counts(tmp_path):
+    records = [permit(i, issued_date="bad", value="x" if i % 2 else "5") for i in range(50)]
+    path = write_json(tmp_path / "permits.json", records)
+
+    result = DataValidationSuite(max_examples=3, chunk_size=7).validate_raw_data(path)
+
+    assert result["errors"] == [
+        "Record 0: Invalid date format for 'issued_date': bad",
+        "Record 1: Invalid date format for 'issued_date': bad",
+        "Record 2: Invalid date format for 'issued_date': bad",
+        "... and 47 more records: Invalid date format for 'issued_date'",
+    ]
+    assert result["warnings"][-1] == "... and 22 more records: Invalid numeric value"
+    assert result["metrics"]["error_count"] == 50
+    assert result["metrics"]["warning_count"] == 25
+
+
+def test_streamed_chunks_match_in_memory_validation(tmp_path, monkeypatch):
+    records = [permit(i % 40, value=None if i % 3 else "12") for i in range(100)]
+    records[57]["latitude"] = "not a number"
+    path = write_json(tmp_path / "permits.json", records)
+    in_memory = DataValidationSuite(max_examples=None).validate_raw_data(path)
+
+    monkeypatch.setattr(columnar_validation, "READ_BLOCK_BYTES", 64)
+    streamed = DataValidationSuite(max_examples=None, chunk_size=9, stream_threshold=0).validate_raw_data(path)
+
+    for key in ("success", "message", "errors", "warnings", "metrics"):
+        assert streamed[key] == in_memory[key]
+    assert streamed["metrics"]["duplicate_permit_numbers"] == 40
+
+
+@pytest.mark.parametrize("stream_threshold", [columnar_validation.STREAM_THRESHOLD_BYTES, 0])
+def test_non_list_and_empty_files(tmp_path, stream_threshold):
+    suite = DataValidationSuite(stream_threshold=stream_threshold)
+
+    not_a_list = suite.validate_raw_data(write_json(tmp_path / "object.json", {"records": []}))
+    empty = suite.validate_raw_data(write_json(tmp_path / "empty.json", []))
+
+    assert (not_a_list["success"], not_a_list["message"]) == (False, "Data is not a list")
+    assert (empty["success"], empty["message"]) == (True, "Empty dataset")
+
+
+def test_generic_records_report_non_dicts_and_missing_metadata(tmp_path):
+    records = [{"_category": "other", "_source": "x"}, "oops", {"_source": "y"}, {"_category": "other"}]
+    result = DataValidationSuite().validate_raw_data(write_json(tmp_path / "other.json", records))
+
+    assert result["success"] is False
+    assert result["message"] == "Validated 4 generic records"
+    assert result["errors"] == ["Record 1: Not a dictionary"]
+    assert result["warnings"] == ["Record 3: Missing source metadata", "Record 2: Missing category metadata"]
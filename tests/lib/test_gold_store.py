@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the partitioned gold-layer store and its readers.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytest
+
+from data_quality.validation_suite import DataValidationSuite
+from lib.entity_graph import EntityGraph
+from lib.gold_store import GoldStore, column_types, parquet_available
+
+
+@dataclass
+class GoldPermit:
+    id: str
+    source: str
+    category: str
+    jurisdiction: str
+    raw_data: Dict[str, Any]
+    normalized_at: datetime
+    quality_score: float
+    permit_number: Optional[str]
+    issued_date: Optional[datetime]
+    address: Optional[str]
+    value: Optional[float]
+    applicant: Optional[str]
+
+
+FORMATS = ["json", pytest.param("parquet", marks=pytest.mark.skipif(not parquet_available(),
+                                                                   reason="pyarrow not installed"))]
+
+
+def permits(n):
+    return [{
+        "id": f"id-{i}",
+        "source": "dallas",
+        "category": "permits",
+        "jurisdiction": "Dallas",
+        "raw_data": {"permit_number": f"P{i}", "fields": [i, None]},
+        "normalized_at": datetime(2024, 3, 1, 12, 0, 0, 250000),
+        "quality_score": 0.75,
+        "permit_number": f"P{i}",
+        "issued_date": datetime(2024, i % 3 + 1, 15) if i % 4 else None,
+        "address": f"{i} MAIN ST",
+        "value": 1000.5 + i,
+        "applicant": "ACME ROOFING LLC" if i % 2 else None,
+    } for i in range(12)]
+
+
+def test_column_types_follow_dataclass_fields():
+    assert column_types(GoldPermit) == {
+        "id": "string", "source": "string", "category": "string", "jurisdiction": "string", "raw_data": "json",
+        "normalized_at": "timestamp", "quality_score": "float", "permit_number": "string",
+        "issued_date": "timestamp", "address": "string", "value": "float", "applicant": "string",
+    }
+
+
+@pytest.mark.parametrize("storage_format", FORMATS)
+def test_write_partitions_by_issue_month(tmp_path, storage_format):
+    store = GoldStore(str(tmp_path), storage_format)
+    paths = store.write("permits", permits(12), column_types(GoldPermit))
+
+    assert sorted(p.parent.name for p in paths) == [
+        "issue_month=2024-01", "issue_month=2024-02", "issue_month=2024-03", "issue_month=unknown"]
+    assert all(p.suffix == "." + storage_format for p in paths)
+
+    records = [r for _, batch in store.iter_records("permits") for r in batch]
+    assert sorted(records, key=lambda r: r["id"]) == sorted(
+        [json.loads(json.dumps(r, default=lambda v: v.isoformat())) for r in permits(12)], key=lambda r: r["id"])
+
+
+@pytest.mark.parametrize("storage_format", FORMATS)
+def test_column_and_month_filters(tmp_path, storage_format):
+    store = GoldStore(str(tmp_path), storage_format)
+    store.write("permits", permits(12), column_types(GoldPermit))
+    # Flat file from before the partitioned layout
+    (tmp_path / "permits_20240101_000000.json").write_text(json.dumps([
+        {"id": "legacy-1", "issued_date": "2024-02-03T00:00:00", "raw_data": {}},
+        {"id": "legacy-2", "issued_date": "2023-12-03T00:00:00", "raw_data": {}},
+    ]))
+
+    assert len(store.files("permits")) == 5
+    assert len(store.files("permits", start_month="2024-02", end_month="2024-03")) == 3
+
+    batches = dict(store.iter_records("permits", columns=["id", "issued_date"], start_month="2024-02",
+                                      end_month="2024-02"))
+    records = [r for batch in batches.values() for r in batch]
+    assert sorted(r["id"] for r in records) == ["id-1", "id-10", "id-7", "legacy-1"]
+    assert all(set(r) == {"id", "issued_date"} for r in records)
+    assert all("raw_data" not in r for batch in dict(store.iter_records("permits", exclude=["raw_data"])).values()
+               for r in batch)
+
+
+@pytest.mark.parametrize("storage_format", FORMATS)
+def test_entity_graph_and_validation_read_gold_store(tmp_path, storage_format):
+    gold_dir = tmp_path / "gold"
+    records = permits(12)
+    records[3]["quality_score"] = 1.5
+    for record in records:
+        record["applicant"] = None
+    GoldStore(str(gold_dir), storage_format).write("permits", records, column_types(GoldPermit))
+
+    graph = EntityGraph(str(gold_dir))
+    assert graph.load_normalized_data(start_month="2024-01", end_month="2024-02") == 6
+    permit = graph.entities["id-1"]
+    assert permit.attributes["issued_date"] == "2024-02-15T00:00:00"
+    assert "raw_data" not in permit.attributes
+
+    report = DataValidationSuite(str(tmp_path)).validate_normalized_data()
+    assert report["summary"] == {"total_files": 4, "successful_files": 4}
+    warnings = [w for r in report["results"] for w in r["warnings"]]
+    assert warnings == ["Record 0: Invalid quality score: 1.5"]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for shared date parsing.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from normalizers.dates import DateParser, format_skeleton
+from normalizers.permits import DATE_FORMATS, normalize_date
+
+# Format lists of the normalizers that share DateParser
+PERMIT_LEADS_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%Y-%m-%d %H:%M:%S",
+                        "%m/%d/%Y %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]
+PIPELINE_FIELD_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %H:%M:%S']
+LEAD_CSV_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%Y-%m-%d %H:%M:%S']
+
+
+def strptime_loop(formats, value):
+    """The per-value fallthrough DateParser replaces."""
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def sample_values(n, seed=0):
+    """Realistic column values mixed with edge cases strptime and pandas disagree on."""
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    renderings = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f', '%m/%d/%Y',
+                  '%m/%d/%y', '%m-%d-%Y', '%d-%m-%Y', '%Y%m%d', '%Y-%m-%d %H:%M:%S']
+    values = []
+    for _ in range(n):
+        moment = base + timedelta(seconds=rng.randrange(0, 400 * 86400))
+        values.append(moment.strftime(rng.choice(renderings)))
+    values += [
+        '', 'N/A', '2024-13-01', '2024-02-30', '2024-1-5', ' 5-06-2024', '2024-01-15t10:00:00',
+        '2024-01-15   10:00:00', '2024-01-15 10:00:60', '2024-01-15T10:00:00.1234567',
+        '0000-01-01', '2024-01-15T10:00:00Z', '2024-01-15T10:00:00.5Z', '1/2/24', 'Jan 5, 2024',
+    ]
+    return values
+
+
+@pytest.mark.parametrize("formats", [DATE_FORMATS, PERMIT_LEADS_FORMATS, PIPELINE_FIELD_FORMATS, LEAD_CSV_FORMATS])
+def test_parse_and_parse_many_match_strptime_loop(formats):
+    values = sample_values(3000)
+    expected = [strptime_loop(formats, value) for value in values]
+
+    assert DateParser(formats).parse_many(values) == expected
+    assert [DateParser(formats, cache_size=50).parse(value) for value in values] == expected
+
+
+def test_ambiguous_formats_keep_priority_order():
+    parser = DateParser(['%m-%d-%Y', '%d-%m-%Y'])
+    values = [f"{day:02d}-{month:02d}-2024" for day in range(1, 29) for month in range(1, 13)] * 3
+
+    parsed = parser.parse_many(values)
+
+    assert parsed[0] == datetime(2024, 1, 1)
+    assert parser.parse("05-06-2024") == datetime(2024, 5, 6)
+    assert parser.parse("13-06-2024") == datetime(2024, 6, 13)
+    assert parsed == [strptime_loop(parser.formats, value) for value in values]
+
+
+def test_only_formats_with_matching_skeleton_are_tried():
+    parser = DateParser(DATE_FORMATS)
+
+    assert parser.candidates("2024-01-15 10:00:00") == ('%Y-%m-%d %H:%M:%S',)
+    assert parser.candidates("01/15/2024") == ('%m/%d/%Y',)
+    assert parser.candidates("01-15-2024") == ('%Y-%m-%d', '%m-%d-%Y', '%d-%m-%Y')
+    assert parser.candidates("2024-01-15T10:00:00z") == ('%Y-%m-%dT%H:%M:%SZ',)
+    assert parser.candidates("Jan 5 2024") == ()
+    assert format_skeleton('%d %b %Y') is None
+
+
+def test_normalize_date_behaviour_unchanged():
+    assert normalize_date("2024-01-15T10:30:00.000Z") == datetime(2024, 1, 15, 10, 30)
+    assert normalize_date("  20240115 ") == datetime(2024, 1, 15)
+    assert normalize_date("15-01-2024") == datetime(2024, 1, 15)
+    assert normalize_date("not a date") is None
+    assert normalize_date(20240115) is None
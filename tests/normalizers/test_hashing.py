@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for canonical record hashing.
+
+The expected digests below are fixed: they must come out the same on every
+supported Python version and platform, since stored record_hash values are
+compared against them on the next run.
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from normalizers.hashing import HASH_PREFIX, canonical_form, canonical_hash, hash_scheme_version
+from normalizers.permits import RECORD_HASH_FIELDS, compute_record_hash, normalize
+
+
+def test_hashes_are_stable_across_versions():
+    assert canonical_hash(("dallas_permits", "BLD-2024-001", "Dallas", None, 25000.5, 3, True,
+                           datetime(2024, 1, 15, 10, 30), date(2024, 1, 15))) == \
+        "v2:d564482cdea142f90019cc6d2c86342c"
+    assert canonical_hash(("Ünïcode café 🏠", -0.0, 1e-7, 12345678901234567890, Decimal("1.10"),
+                           datetime(2024, 1, 15, tzinfo=timezone.utc))) == \
+        "v2:f314eb85e3e18e284b12da3485810a69"
+    assert canonical_hash((["roofing", "hvac"], {"b": 1, "a": [None, False]})) == \
+        "v2:389ddc3664df5270ef9d10e6542dd3e5"
+    assert canonical_hash(("Houston", "24000123"), digest_size=8) == "v2:be48d1c8ab121724"
+
+
+def test_encoding_is_unambiguous():
+    assert canonical_hash(("ab", "c")) != canonical_hash(("a", "bc"))
+    assert canonical_hash(("1",)) != canonical_hash((1,))
+    assert canonical_hash((1,)) != canonical_hash((1.0,)) != canonical_hash((True,))
+    assert canonical_hash((None,)) != canonical_hash(("",)) != canonical_hash(())
+    assert canonical_hash(([["a"], "b"],)) != canonical_hash((["a", ["b"]],))
+    assert canonical_hash((date(2024, 1, 15),)) != canonical_hash(("2024-01-15",))
+
+
+def test_equivalent_values_hash_alike():
+    assert canonical_hash(({"a": 1, "b": 2},)) == canonical_hash(({"b": 2, "a": 1},))
+    assert canonical_hash((np.float64(2.5), np.int64(7), np.str_("abc"))) == canonical_hash((2.5, 7, "abc"))
+    assert canonical_form({"b": {2, 1}, "a": (datetime(2024, 1, 15),)}) == \
+        ('m', [['a', [('d', '2024-01-15T00:00:00')]], ['b', ('s', [1, 2])]])
+
+
+def test_record_hash_ignores_processing_metadata():
+    source = {"id": "dallas_permits", "jurisdiction": "Dallas", "city": "Dallas", "county": "Dallas"}
+    raw = {"permit_number": "BLD-1", "issued_date": "2024-01-15", "estimated_cost": "$50,000"}
+
+    first, second = normalize(source, raw), normalize(source, raw)
+    changed = normalize(source, dict(raw, estimated_cost="$55,000"))
+
+    assert first["record_hash"] == second["record_hash"]
+    assert first["record_hash"] != changed["record_hash"]
+    assert first["record_hash"] == compute_record_hash({k: first[k] for k in RECORD_HASH_FIELDS})
+
+
+def test_hash_scheme_version():
+    assert hash_scheme_version(HASH_PREFIX + "00ff") == 2
+    assert hash_scheme_version("a94a8fe5ccb19ba61c4c0873d391e987982fbbd3") == 1
+    assert hash_scheme_version(None) is None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for process-pool batch normalization.
+"""
+
+from normalizers.parallel import (
+    ParallelNormalizer, merge_stats, normalize_batch_parallel, normalize_permit_chunk, pack_records,
+    unpack_records
+)
+from normalizers.permits import normalize_batch
+
+SOURCE = {"id": "dallas_permits", "jurisdiction": "Dallas", "city": "Dallas", "county": "Dallas"}
+
+# Fields that change from run to run
+VOLATILE_FIELDS = ("provenance", "updated_at")
+
+
+def make_raw(n):
+    return [{
+        "permit_number": f"BLD-{i:05d}",
+        "issued_date": f"2024-01-{i % 28 + 1:02d}",
+        "work_description": "Residential roof replacement" if i % 2 else "New HVAC system",
+        "address": f"{100 + i} MAIN ST",
+        "estimated_cost": f"${1000 + i:,}",
+        **({"contractor": "ACME LLC"} if i % 3 else {}),
+    } for i in range(n)]
+
+
+def stable(records):
+    return [{k: v for k, v in record.items() if k not in VOLATILE_FIELDS} for record in records]
+
+
+def count_chunk(records, context):
+    return [dict(r, tag=context) for r in records], {"processed": len(records), "errors": [len(records)]}
+
+
+def test_pack_roundtrip_keeps_heterogeneous_keys():
+    records = [{"a": 1, "b": 2}, {"b": 3, "a": 4}, {"a": 5, "b": 6}, {}]
+    shapes, rows = pack_records(records)
+
+    assert len(shapes) == 3
+    assert unpack_records((shapes, rows)) == records
+
+
+def test_merge_stats():
+    total = {}
+    merge_stats(total, {"processed": 2, "errors": ["x"], "by_type": {"roof": 1}})
+    merge_stats(total, {"processed": 3, "errors": ["y"], "by_type": {"roof": 1, "hvac": 2}})
+
+    assert total == {"processed": 5, "errors": ["x", "y"], "by_type": {"roof": 2, "hvac": 2}}
+
+
+def test_small_batches_run_in_process():
+    executor = ParallelNormalizer(workers=4, chunk_size=10, min_parallel_records=100)
+
+    assert not executor.use_workers(99)
+    assert executor.use_workers(100)
+    assert not ParallelNormalizer(workers=1, chunk_size=10, min_parallel_records=0).use_workers(1000)
+
+
+def test_workers_preserve_order_and_merge_stats():
+    records = [{"i": i} for i in range(95)]
+    executor = ParallelNormalizer(workers=2, chunk_size=10, min_parallel_records=0)
+
+    outputs, stats = executor.run(count_chunk, records, "t")
+
+    assert outputs == [{"i": i, "tag": "t"} for i in range(95)]
+    assert stats == {"processed": 95, "errors": [10] * 9 + [5]}
+
+
+def test_parallel_matches_serial_normalization():
+    raw = make_raw(120)
+
+    serial = normalize_batch(SOURCE, raw)
+    executor = ParallelNormalizer(workers=2, chunk_size=25, min_parallel_records=0)
+    parallel, _ = executor.run(normalize_permit_chunk, raw, SOURCE)
+
+    assert stable(parallel) == stable(serial)
+    assert stable(normalize_batch_parallel(SOURCE, raw[:10], workers=2)) == stable(serial[:10])
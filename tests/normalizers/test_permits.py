@@ -7,7 +7,11 @@ and tests to ensure the normalization pipeline correctly processes them.
 
 import pytest
 from datetime import datetime
-from normalizers.permits import normalize, pick, validate_normalized_record
+from normalizers.field_aliases import JURISDICTION_SPECIFIC_ALIASES, PERMIT_ALIASES
+from normalizers.permits import (
+    PICKED_FIELDS, clear_normalization_plans, get_normalization_plan, normalize, normalize_batch, pick,
+    validate_normalized_record
+)
 
 
 # Test fixtures for sample records from each source
@@ -177,7 +181,7 @@ class TestNormalizeDallasPermit:
         
         # Check metadata
         assert result["record_hash"] is not None
-        assert len(result["record_hash"]) == 40  # SHA1 hash length
+        assert result["record_hash"].startswith("v2:") and len(result["record_hash"]) == 35  # versioned BLAKE2b-128
         assert isinstance(result["updated_at"], datetime)
         assert result["provenance"]["source"] == "dallas_permits"
 
@@ -379,6 +383,55 @@ class TestEdgeCases:
         assert result["geom"] is None
 
 
+class TestNormalizationPlans:
+    """Test compiled per-source alias resolution."""
+    
+    @staticmethod
+    def picked_by_aliases(aliases, record):
+        return {field: pick(record, aliases.get(field, [])) for field in PICKED_FIELDS}
+    
+    def test_plan_matches_pick_including_null_fallbacks(self):
+        clear_normalization_plans()
+        meta = {"id": "plan_test", "jurisdiction": "Dallas"}
+        records = [
+            {"permit_number": "A1", "record_id": "R1", "estimated_cost": "N/A", "job_value": 0, "valuation": 5},
+            {"permit_number": "", "record_id": "R2", "estimated_cost": None, "job_value": "null"},
+            {"permit_number": None, "permit_status": "n/a", "status": "Issued", "address": ["unhashable"]},
+        ]
+        
+        for record in records:
+            plan = get_normalization_plan(meta, record)
+            assert plan.pick_all(record) == self.picked_by_aliases(JURISDICTION_SPECIFIC_ALIASES["dallas"], record)
+    
+    def test_plan_is_cached_per_source_and_grows_with_new_columns(self):
+        clear_normalization_plans()
+        meta = {"id": "socrata_feed", "jurisdiction": "Houston"}
+        first = get_normalization_plan(meta, {"permit_number": "1", "status": "Issued"})
+        
+        assert get_normalization_plan(meta, {"permit_number": "2"}) is first
+        assert get_normalization_plan({"id": "other_feed", "jurisdiction": "Houston"}) is not first
+        
+        # A column the feed omitted earlier (e.g. null-valued) recompiles the plan over the union
+        record = {"permit_number": "3", "issue_date": "2024-01-15", "objectid": 7}
+        grown = get_normalization_plan(meta, record)
+        assert grown is not first and {"status", "issue_date", "objectid"} <= grown.schema
+        assert grown.pick_all(record) == self.picked_by_aliases(PERMIT_ALIASES, record)
+    
+    def test_normalize_batch_matches_per_record_normalize(self, dallas_permit_sample, dallas_source_meta):
+        clear_normalization_plans()
+        records = [dict(dallas_permit_sample, permit_number=f"BLD-{i}") for i in range(3)]
+        records.append({"record_id": "R-9", "issued_date": "2024-02-01", "contractor": "Smith LLC"})
+        
+        batch = normalize_batch(dallas_source_meta, records, schema=dallas_permit_sample.keys())
+        single = [normalize(dallas_source_meta, record) for record in records]
+        
+        volatile = ("provenance", "record_hash", "updated_at")
+        assert [{k: v for k, v in r.items() if k not in volatile} for r in batch] == \
+            [{k: v for k, v in r.items() if k not in volatile} for r in single]
+        assert [r["permit_id"] for r in batch] == ["BLD-0", "BLD-1", "BLD-2", "R-9"]
+        assert batch[3]["contractor_name"] == "Smith LLC"
+
+
 if __name__ == "__main__":
     # Run the tests
     pytest.main([__file__, "-v"])
\ No newline at end of file
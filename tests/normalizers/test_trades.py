@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared trade classifier.
+"""
+
+from normalizers.trades import TRADE_CLASSIFIER, TradeClassifier
+
+
+def test_tags_and_primary_in_one_pass():
+    tags, primary = TRADE_CLASSIFIER.classify("Kitchen remodel with plumbing and electrical")
+
+    assert tags == ["kitchen", "electrical", "plumbing"]
+    assert primary == "kitchen"
+    assert TRADE_CLASSIFIER.primary("Solar panel installation with electrical") == "solar"
+    assert TRADE_CLASSIFIER.classify(None) == ([], None)
+    assert TRADE_CLASSIFIER.classify("General construction work") == ([], None)
+
+
+def test_keywords_match_at_word_starts():
+    assert TRADE_CLASSIFIER.tags("RE-ROOFING and gutters") == ["roofing"]
+    assert TRADE_CLASSIFIER.tags("Plumber to replace drains") == ["plumbing"]
+    # Substrings inside other words do not match
+    assert TRADE_CLASSIFIER.tags("Investigate office space for lease") == []
+    assert TRADE_CLASSIFIER.tags("Replace siding") == []
+
+
+def test_short_keywords_match_whole_words():
+    assert TRADE_CLASSIFIER.tags("New AC unit") == ["hvac"]
+    assert TRADE_CLASSIFIER.tags("Rooftop PV, 2 spas") == ["roofing", "pool", "solar"]
+    assert TRADE_CLASSIFIER.tags("Spaces and tubing") == []
+
+
+def test_overlapping_keywords_tag_every_trade():
+    assert TRADE_CLASSIFIER.tags("hot tub") == ["bath", "pool"]
+    assert TRADE_CLASSIFIER.tags("Electrical subpanel") == ["electrical"]
+
+
+def test_priority_ties_follow_table_order():
+    classifier = TradeClassifier({"b": ["beta"], "a": ["alpha"], "c": ["gamma"]}, {"a": 1, "b": 1})
+
+    assert classifier.classify("gamma alpha beta") == (["b", "a", "c"], "b")
+    assert classifier.primary("gamma") == "c"
+
+
+def test_classify_many_matches_classify():
+    texts = ["Roof repair", None, "Pool and spa", "Roof repair", "", "Window glass"]
+
+    assert TRADE_CLASSIFIER.classify_many(texts) == [TRADE_CLASSIFIER.classify(t) for t in texts]
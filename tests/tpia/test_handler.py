@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked TPIA delivery processing.
+"""
+
+import csv
+import gzip
+import json
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+from tpia import handler as tpia_handler
+from tpia.handler import TPIAHandler
+
+
+def write_delivery(path, n):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Permit Number", "Issue Date", "Estimated Cost", "Work-Description"])
+        for i in range(n):
+            if i % 10 == 9:
+                writer.writerow(["", "", "", ""])  # blank row
+                continue
+            writer.writerow([f"BLD-{i:05d}", f"01/{i % 28 + 1:02d}/2024", f"${1000 + i:,}", "Roof repair"])
+
+
+def without_source(records):
+    return [{k: v for k, v in record.items() if k != "_source_id"} for record in records]
+
+
+def read_ndjson(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    return TPIAHandler(requests_dir=str(tmp_path / "requests"), deliveries_dir=str(tmp_path / "deliveries"))
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "ndjson.gz"])
+def test_processes_delivery_in_chunks(handler, tmp_path, output_format):
+    csv_path = tmp_path / "delivery.csv"
+    write_delivery(csv_path, 95)
+    chunks = []
+
+    result = handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, output_format=output_format,
+                                           chunk_size=20, on_chunk=chunks.append)
+
+    assert result["status"] == "success"
+    assert result["total_rows"] == 95
+    assert result["processed_records"] == 86
+    assert result["chunks"] == 5 == len(chunks)
+    assert result["rows_per_second"] > 0
+    assert result["peak_rss_mb"] > 0
+
+    records = read_ndjson(result["processed_file"])
+    assert records == [record for chunk in chunks for record in chunk]
+    assert records[0] == {"permit_number": "BLD-00000", "issue_date": "2024-01-01", "estimated_cost": 1000.0,
+                          "work_description": "Roof repair", "_source_id": "tx-test", "_row_number": 1}
+    assert result["records"] == records[:5]
+    assert [d["filename"] for d in handler.list_deliveries()] == [result["processed_file"].split("/")[-1]]
+
+
+def test_resumes_interrupted_delivery(handler, tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    write_delivery(csv_path, 95)
+    reference = handler.process_delivered_csv(str(csv_path), "tx-ref", archive=False, chunk_size=20)
+
+    def fail_on_third_chunk(chunk):
+        calls.append(chunk)
+        if len(calls) == 3:
+            raise RuntimeError("database went away")
+
+    calls = []
+    failed = handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, chunk_size=20,
+                                           on_chunk=fail_on_third_chunk)
+    assert failed["status"] == "error"
+    assert failed["rows_read"] == 40
+
+    resumed = handler.process_delivered_csv(str(csv_path), "tx-test", chunk_size=20, on_chunk=calls.append)
+
+    assert resumed["status"] == "success"
+    assert resumed["resumed_from_row"] == 40
+    assert resumed["processed_file"] == failed["processed_file"]
+    assert resumed["processed_records"] == reference["processed_records"]
+    assert [r["_row_number"] for r in calls[3][:1]] == [41]
+    assert without_source(read_ndjson(resumed["processed_file"])) == \
+        without_source(read_ndjson(reference["processed_file"]))
+    assert not csv_path.exists()
+
+    with open(resumed["processed_file"] + ".progress.json") as f:
+        progress = json.load(f)
+    assert progress["completed"] and progress["metadata"]["archived_to"] == resumed["archived_to"]
+
+
+def test_changed_file_is_not_resumed(handler, tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    write_delivery(csv_path, 50)
+    handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, chunk_size=20,
+                                  on_chunk=lambda chunk: 1 / 0)
+
+    write_delivery(csv_path, 60)
+    result = handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, chunk_size=20)
+
+    assert result["resumed_from_row"] == 0
+    assert result["total_rows"] == 60
+
+
+def test_parquet_output_has_one_row_group_per_chunk(handler, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    csv_path = tmp_path / "delivery.csv"
+    write_delivery(csv_path, 95)
+    ndjson = handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, chunk_size=20)
+
+    result = handler.process_delivered_csv(str(csv_path), "tx-test", archive=False, output_format="parquet",
+                                           chunk_size=20)
+
+    parquet_file = pq.ParquetFile(result["processed_file"])
+    assert parquet_file.metadata.num_row_groups == result["chunks"] == 5
+    assert parquet_file.schema_arrow.field("estimated_cost").type == "double"
+    assert parquet_file.read().to_pylist() == read_ndjson(ndjson["processed_file"])
+
+
+def test_load_raw_replay_after_resume_replaces_stored_rows(tmp_path, monkeypatch):
+    csv_path = tmp_path / "delivery.csv"
+    write_delivery(csv_path, 95)
+    stored = {}
+    calls = []
+
+    class FakeLoader:
+        def __init__(self, db_url, config_path):
+            pass
+
+        def store_records(self, source_id, source_type, records, record_keys=None):
+            calls.append(record_keys)
+            stored.update(zip(record_keys, records))
+            return len(records)
+
+    load_raw = types.ModuleType("pipelines.load_raw")
+    load_raw.RawDataLoader = FakeLoader
+    pipelines = types.ModuleType("pipelines")
+    pipelines.load_raw = load_raw
+
+    save_progress = TPIAHandler._save_progress
+
+    def killed_before_second_checkpoint(progress_path, progress):
+        # The second chunk is stored, but the process dies before it is checkpointed
+        if progress["chunks"] == 2 and len(calls) == 2:
+            raise RuntimeError("killed")
+        save_progress(progress_path, progress)
+
+    argv = ["handler.py", "process-delivery", str(csv_path), "--source-id", "tx-test", "--chunk-size", "20",
+            "--load-raw", "--no-archive"]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/test")
+    monkeypatch.setattr(sys, "argv", argv)
+    with patch.dict(sys.modules, {"pipelines": pipelines, "pipelines.load_raw": load_raw}):
+        with patch.object(TPIAHandler, "_save_progress", staticmethod(killed_before_second_checkpoint)):
+            assert tpia_handler.main() == 0
+        assert tpia_handler.main() == 0
+
+    # Rows 21-40 were stored twice under the same keys
+    assert len(calls) == 6 and calls[2] == calls[1]
+    assert len(stored) == 86
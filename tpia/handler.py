@@ -7,13 +7,63 @@ and processing manually delivered CSV files from Texas jurisdictions.
 
 import logging
 import csv
+import gzip
+import json
+import os
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from pathlib import Path
 import shutil
 
+from normalizers.dates import DateParser
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 logger = logging.getLogger(__name__)
 
+# Rows cleaned and written per chunk when processing a delivery
+TPIA_CHUNK_ROWS = int(os.getenv('TPIA_CHUNK_ROWS', '50000'))
+
+# Processed delivery formats (also the file extension)
+OUTPUT_FORMATS = ('ndjson', 'ndjson.gz', 'parquet')
+
+# Common formats in TPIA deliveries
+DATE_FORMATS = [
+    '%m/%d/%Y',
+    '%m/%d/%y', 
+    '%Y-%m-%d',
+    '%m-%d-%Y',
+    '%B %d, %Y',
+    '%b %d, %Y'
+]
+TPIA_DATE_PARSER = DateParser(DATE_FORMATS)
+
+CURRENCY_FIELDS = ['estimated_cost', 'project_value', 'valuation']
+NUMBER_FIELDS = ['square_footage', 'sqft']
+
+PROGRESS_SUFFIX = '.progress.json'
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
 
 class TPIAHandler:
     """Handler for TPIA requests and manual CSV processing."""
@@ -28,6 +78,7 @@ class TPIAHandler:
         """
         self.requests_dir = Path(requests_dir)
         self.deliveries_dir = Path(deliveries_dir)
+        self._column_plans: Dict[str, tuple] = {}
         
         # Ensure directories exist
         self.requests_dir.mkdir(parents=True, exist_ok=True)
@@ -81,15 +132,31 @@ class TPIAHandler:
         self, 
         csv_path: str, 
         source_id: str = "tx-houston-tpia",
-        archive: bool = True
+        archive: bool = True,
+        output_format: str = 'ndjson',
+        chunk_size: int = TPIA_CHUNK_ROWS,
+        on_chunk: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        resume: bool = True
     ) -> Dict[str, Any]:
         """
         Process a manually delivered CSV file from TPIA request.
         
+        Rows are cleaned and written chunk by chunk, so memory stays bounded
+        by the chunk size however large the delivery is. After each chunk a
+        progress file next to the output records how far processing got; a
+        later call for the same (unchanged) file resumes from there.
+        
         Args:
             csv_path: Path to the delivered CSV file
             source_id: Source identifier for tracking
             archive: Whether to archive the processed file
+            output_format: 'ndjson', 'ndjson.gz' or 'parquet' (needs pyarrow; no resume)
+            chunk_size: Rows cleaned and written per chunk
+            on_chunk: Called with each chunk of cleaned records (e.g.
+                RawDataLoader.store_records) after it is written and before
+                the checkpoint; chunks after the last checkpoint are handed
+                to it again on resume, so it should be idempotent
+            resume: Whether to resume an interrupted run of the same file
             
         Returns:
             Processing results
@@ -98,52 +165,102 @@ class TPIAHandler:
         
         if not csv_file.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r} (expected one of {OUTPUT_FORMATS})")
         
         logger.info(f"Processing TPIA delivery: {csv_file}")
         
+        started = time.perf_counter()
+        progress = None
         try:
-            # Read and validate CSV
-            records = []
+            if output_format == 'parquet' and pa is None:
+                raise ImportError("pyarrow is required for parquet output")
+            
+            processed_dir = self.deliveries_dir / "processed"
+            processed_dir.mkdir(exist_ok=True)
+            
+            delivery = self._file_identity(csv_file)
+            progress = resume and output_format != 'parquet' and self._find_progress(source_id, delivery, output_format)
+            if progress:
+                processed_path = Path(progress['processed_file'])
+                # Drop anything written after the last checkpoint
+                os.truncate(processed_path, progress['bytes_written'])
+                logger.info(f"Resuming {csv_file.name} after row {progress['rows_read']}")
+            else:
+                processed_filename = f"{source_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+                processed_path = processed_dir / processed_filename
+                if output_format != 'parquet':
+                    processed_path.write_bytes(b'')
+                progress = {
+                    'source_file': str(csv_file),
+                    'source_id': source_id,
+                    'delivery': delivery,
+                    'output_format': output_format,
+                    'processed_file': str(processed_path),
+                    'rows_read': 0,
+                    'records_written': 0,
+                    'bytes_written': 0,
+                    'chunks': 0,
+                    'completed': False
+                }
+            progress_path = Path(str(processed_path) + PROGRESS_SUFFIX)
+            resumed_from_row = progress['rows_read']
+            
+            sample = []
+            writer = None
             with open(csv_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
+                if output_format == 'parquet':
+                    writer = pq.ParquetWriter(str(processed_path), self._parquet_schema(reader.fieldnames or []))
                 
+                chunk = []
+                row_num = 0
                 for row_num, row in enumerate(reader, 1):
+                    if row_num <= resumed_from_row:
+                        continue
                     try:
                         # Clean and validate row
                         cleaned_row = self._clean_csv_row(row)
                         if cleaned_row:
                             cleaned_row['_source_id'] = source_id
                             cleaned_row['_row_number'] = row_num
-                            records.append(cleaned_row)
+                            chunk.append(cleaned_row)
                     except Exception as e:
                         logger.warning(f"Error processing row {row_num}: {e}")
                         continue
+                    
+                    if row_num - progress['rows_read'] >= chunk_size:
+                        self._flush_chunk(chunk, row_num, progress, processed_path, progress_path, writer, on_chunk)
+                        sample = sample or chunk[:5]
+                        chunk = []
+                
+                self._flush_chunk(chunk, max(row_num, progress['rows_read']), progress, processed_path,
+                                  progress_path, writer, on_chunk)
+                sample = sample or chunk[:5]
+            if writer is not None:
+                writer.close()
+            
+            elapsed = time.perf_counter() - started
+            rows_this_run = progress['rows_read'] - resumed_from_row
             
             # Generate processing report
             result = {
                 'source_file': str(csv_file),
                 'source_id': source_id,
-                'total_rows': row_num if 'row_num' in locals() else 0,
-                'processed_records': len(records),
+                'total_rows': progress['rows_read'],
+                'processed_records': progress['records_written'],
                 'processing_date': datetime.now().isoformat(),
-                'records': records[:5] if len(records) > 5 else records,  # Sample
-                'status': 'success'
+                'records': sample,  # Sample
+                'status': 'success',
+                'processed_file': str(processed_path),
+                'output_format': output_format,
+                'chunks': progress['chunks'],
+                'resumed_from_row': resumed_from_row,
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_second': round(rows_this_run / elapsed, 1) if elapsed > 0 else None,
+                'peak_rss_mb': peak_rss_mb()
             }
             
-            # Save processed data
-            processed_filename = f"{source_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            processed_path = self.deliveries_dir / "processed" / processed_filename
-            processed_path.parent.mkdir(exist_ok=True)
-            
-            import json
-            with open(processed_path, 'w') as f:
-                json.dump({
-                    'metadata': {k: v for k, v in result.items() if k != 'records'},
-                    'records': records
-                }, f, indent=2, default=str)
-            
-            result['processed_file'] = str(processed_path)
-            
             # Archive original file if requested
             if archive:
                 archive_path = self.deliveries_dir / "archive" / csv_file.name
@@ -151,17 +268,99 @@ class TPIAHandler:
                 shutil.move(str(csv_file), str(archive_path))
                 result['archived_to'] = str(archive_path)
             
-            logger.info(f"Processed {len(records)} records from TPIA delivery")
+            # The completed progress file doubles as the delivery's metadata
+            progress['completed'] = True
+            progress['metadata'] = {k: v for k, v in result.items() if k != 'records'}
+            self._save_progress(progress_path, progress)
+            
+            logger.info(f"Processed {progress['records_written']} records from TPIA delivery "
+                        f"({result['rows_per_second']} rows/s, peak RSS {result['peak_rss_mb']} MB)")
             return result
             
         except Exception as e:
             logger.error(f"Failed to process TPIA delivery: {e}")
-            return {
+            result = {
                 'source_file': str(csv_file),
                 'status': 'error',
                 'error': str(e),
-                'processing_date': datetime.now().isoformat()
+                'processing_date': datetime.now().isoformat(),
+                'peak_rss_mb': peak_rss_mb()
             }
+            if progress:
+                result['processed_file'] = progress['processed_file']
+                result['rows_read'] = progress['rows_read']
+            return result
+    
+    def _flush_chunk(
+        self,
+        chunk: List[Dict[str, Any]],
+        rows_read: int,
+        progress: Dict[str, Any],
+        processed_path: Path,
+        progress_path: Path,
+        writer,
+        on_chunk: Optional[Callable[[List[Dict[str, Any]]], Any]]
+    ):
+        """Write a chunk of cleaned records, hand it to on_chunk and checkpoint."""
+        if chunk:
+            if writer is not None:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=writer.schema))
+            else:
+                data = ''.join(json.dumps(record, default=str) + '\n' for record in chunk).encode('utf-8')
+                if progress['output_format'] == 'ndjson.gz':
+                    # One gzip member per chunk keeps every checkpoint a valid file boundary
+                    data = gzip.compress(data)
+                with open(processed_path, 'ab') as f:
+                    f.write(data)
+                    progress['bytes_written'] = f.tell()
+            if on_chunk:
+                on_chunk(chunk)
+            progress['records_written'] += len(chunk)
+            progress['chunks'] += 1
+        
+        progress['rows_read'] = rows_read
+        self._save_progress(progress_path, progress)
+        logger.info(f"Processed {rows_read} rows ({progress['records_written']} records)")
+    
+    @staticmethod
+    def _save_progress(progress_path: Path, progress: Dict[str, Any]):
+        tmp_path = progress_path.with_name(progress_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(progress, f, indent=2, default=str)
+        os.replace(tmp_path, progress_path)
+    
+    @staticmethod
+    def _file_identity(csv_file: Path) -> Dict[str, Any]:
+        stat = csv_file.stat()
+        return {'name': csv_file.name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    def _find_progress(self, source_id: str, delivery: Dict[str, Any], output_format: str) -> Optional[Dict[str, Any]]:
+        """Progress of an interrupted run over the same delivery file, if any."""
+        processed_dir = self.deliveries_dir / "processed"
+        for progress_path in sorted(processed_dir.glob(f"{source_id}_*{PROGRESS_SUFFIX}"), reverse=True):
+            try:
+                with open(progress_path) as f:
+                    progress = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if (not progress.get('completed') and progress.get('delivery') == delivery
+                    and progress.get('output_format') == output_format
+                    and Path(progress['processed_file']).exists()):
+                return progress
+        return None
+    
+    def _parquet_schema(self, fieldnames: List[str]):
+        """Parquet schema for cleaned records from a CSV with these columns."""
+        fields = {}
+        for key in fieldnames:
+            if not key:
+                continue
+            clean_key, kind = self._column_plan(key)
+            if clean_key not in fields:
+                fields[clean_key] = pa.float64() if kind in ('currency', 'number') else pa.string()
+        fields['_source_id'] = pa.string()
+        fields['_row_number'] = pa.int64()
+        return pa.schema(list(fields.items()))
     
     def _clean_csv_row(self, row: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Clean and normalize a CSV row from TPIA delivery."""
@@ -180,7 +379,7 @@ class TPIAHandler:
                 continue
             
             # Clean column name
-            clean_key = key.strip().lower().replace(' ', '_').replace('-', '_')
+            clean_key, kind = self._column_plan(key)
             
             # Clean value
             clean_value = value.strip() if value else ''
@@ -190,38 +389,41 @@ class TPIAHandler:
                 continue
             
             # Apply type conversions
-            if 'date' in clean_key:
+            if kind == 'date':
                 clean_value = self._parse_date(clean_value)
-            elif clean_key in ['estimated_cost', 'project_value', 'valuation']:
+            elif kind == 'currency':
                 clean_value = self._parse_currency(clean_value)
-            elif clean_key in ['square_footage', 'sqft']:
+            elif kind == 'number':
                 clean_value = self._parse_number(clean_value)
             
             cleaned[clean_key] = clean_value
         
         return cleaned if cleaned else None
     
+    def _column_plan(self, key: str):
+        """Clean column name and value kind for a CSV column (cached per header)."""
+        plan = self._column_plans.get(key)
+        if plan is None:
+            clean_key = key.strip().lower().replace(' ', '_').replace('-', '_')
+            if 'date' in clean_key:
+                kind = 'date'
+            elif clean_key in CURRENCY_FIELDS:
+                kind = 'currency'
+            elif clean_key in NUMBER_FIELDS:
+                kind = 'number'
+            else:
+                kind = None
+            plan = self._column_plans[key] = (clean_key, kind)
+        return plan
+    
     def _parse_date(self, value: str) -> Optional[str]:
         """Parse date string to ISO format."""
         if not value:
             return None
         
-        # Common formats in TPIA deliveries
-        date_formats = [
-            '%m/%d/%Y',
-            '%m/%d/%y', 
-            '%Y-%m-%d',
-            '%m-%d-%Y',
-            '%B %d, %Y',
-            '%b %d, %Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(value, fmt)
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+        parsed_date = TPIA_DATE_PARSER.parse(value)
+        if parsed_date is not None:
+            return parsed_date.strftime('%Y-%m-%d')
         
         logger.warning(f"Could not parse date: {value}")
         return value  # Return original if parsing fails
@@ -275,7 +477,11 @@ class TPIAHandler:
         
         processed_dir = self.deliveries_dir / "processed"
         if processed_dir.exists():
-            for delivery_file in processed_dir.glob("*.json"):
+            for delivery_file in processed_dir.iterdir():
+                # Processed files (and legacy .json deliveries), not progress files
+                if delivery_file.name.endswith((PROGRESS_SUFFIX, '.tmp')) or not delivery_file.name.endswith(
+                        tuple('.' + fmt for fmt in OUTPUT_FORMATS + ('json',))):
+                    continue
                 stat = delivery_file.stat()
                 deliveries.append({
                     'filename': delivery_file.name,
@@ -290,7 +496,6 @@ class TPIAHandler:
 def main():
     """CLI entry point for TPIA handling."""
     import argparse
-    import json
     
     parser = argparse.ArgumentParser(description='Handle TPIA requests and deliveries')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -310,6 +515,11 @@ def main():
     process_parser.add_argument('csv_file', help='Path to delivered CSV file')
     process_parser.add_argument('--source-id', default='tx-houston-tpia', help='Source identifier')
     process_parser.add_argument('--no-archive', action='store_true', help='Do not archive original file')
+    process_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='ndjson', help='Processed file format')
+    process_parser.add_argument('--chunk-size', type=int, default=TPIA_CHUNK_ROWS, help='Rows per chunk')
+    process_parser.add_argument('--no-resume', action='store_true', help='Start over instead of resuming')
+    process_parser.add_argument('--load-raw', action='store_true',
+                                help='Also store each chunk in raw_permits (needs DATABASE_URL)')
     
     # List commands
     subparsers.add_parser('list-requests', help='List pending TPIA requests')
@@ -348,10 +558,33 @@ def main():
             print(f"Generated TPIA request: {request_path}")
             
         elif args.command == 'process-delivery':
+            on_chunk = None
+            if args.load_raw:
+                from pipelines.load_raw import RawDataLoader
+                
+                db_url = os.environ.get('DATABASE_URL')
+                if not db_url:
+                    logger.error("DATABASE_URL env var required for --load-raw")
+                    return 1
+                config_path = Path(__file__).parent.parent / 'config' / 'sources_tx.yaml'
+                loader = RawDataLoader(db_url, str(config_path))
+                delivery = handler._file_identity(Path(args.csv_file))
+                
+                def on_chunk(chunk):
+                    # Keyed by delivery row: a chunk replayed on resume (stored, but
+                    # not yet checkpointed) replaces its rows instead of adding them again
+                    keys = [f"{delivery['name']}:{delivery['size']}:{delivery['mtime_ns']}:{record['_row_number']}"
+                            for record in chunk]
+                    return loader.store_records(args.source_id, 'tpia', chunk, record_keys=keys)
+            
             result = handler.process_delivered_csv(
                 args.csv_file, 
                 args.source_id, 
-                archive=not args.no_archive
+                archive=not args.no_archive,
+                output_format=args.format,
+                chunk_size=args.chunk_size,
+                on_chunk=on_chunk,
+                resume=not args.no_resume
             )
             print(json.dumps(result, indent=2, default=str))
             